@@ -71,6 +71,8 @@ from cocosearch.deps.query import (
     get_dep_stats,
     get_dependency_tree,
     get_impact,
+    get_impact_summaries,
+    get_top_impact,
 )
 
 
@@ -215,6 +217,9 @@ def index_command(args: argparse.Namespace) -> int:
             chunk_overlap=config.chunk_overlap,
         )
 
+    if getattr(args, "workers", None):
+        config = config.model_copy(update={"chunk_processes": max(0, args.workers)})
+
     # Detect git branch/commit for metadata tracking
     from cocosearch.management.git import (
         get_current_branch,
@@ -2533,6 +2538,18 @@ def deps_stats_command(args: argparse.Namespace) -> int:
     console.print(f"\n[bold]Dependency Graph Statistics[/bold] ({index_name})")
     console.print(f"  Total edges: {stats['total_edges']}")
 
+    try:
+        top_impact = get_top_impact(index_name, limit=5)
+    except Exception:
+        top_impact = []
+    if top_impact:
+        console.print("  Largest blast radius:")
+        for summary in top_impact:
+            console.print(
+                f"    {summary.file}: {summary.dependents} dependents "
+                f"({summary.direct_dependents} direct)"
+            )
+
     return 0
 
 
@@ -2617,6 +2634,22 @@ def deps_impact_command(args: argparse.Namespace) -> int:
 
     dep_type_filter = getattr(args, "type", None)
     depth = getattr(args, "depth", 5)
+    summary = _lookup_impact_summary(index_name, args.file)
+
+    if getattr(args, "summary", False):
+        if summary is None:
+            console.print(
+                "[bold red]Error:[/bold red] No impact summaries for this index. "
+                "Run 'cocosearch deps extract' first."
+            )
+            return 1
+        if getattr(args, "json", False):
+            import json
+
+            console.print(json.dumps(summary.to_dict(), indent=2))
+        else:
+            console.print(_format_impact_summary(summary))
+        return 0
 
     try:
         tree = get_impact(
@@ -2636,10 +2669,44 @@ def deps_impact_command(args: argparse.Namespace) -> int:
     _build_rich_tree(rich_tree, tree)
 
     console.print(f"\n[bold]Impact Tree[/bold] (depth={depth})")
+    if summary is not None:
+        console.print(_format_impact_summary(summary))
     console.print(rich_tree)
     return 0
 
 
+def _lookup_impact_summary(index_name: str, file: str):
+    """Get the precomputed impact summary of a file (best-effort).
+
+    Returns None if the index has no summaries or the lookup fails.
+    """
+    from cocosearch.deps.models import ImpactSummary
+
+    try:
+        summaries = get_impact_summaries(index_name, [file])
+    except Exception:
+        return None
+    if summaries is None:
+        return None
+    return summaries.get(file, ImpactSummary(file, 0, 0))
+
+
+def _format_impact_summary(summary) -> str:
+    """Format an ImpactSummary as one line of counts."""
+    line = (
+        f"[bold]{summary.dependents}[/bold] files depend on {summary.file} "
+        f"({summary.direct_dependents} directly)"
+    )
+    if summary.depth_histogram:
+        by_depth = ", ".join(
+            f"{d}: {n}" for d, n in enumerate(summary.depth_histogram, start=1)
+        )
+        line += f"; by depth {by_depth}"
+    if summary.cycle_size > 1:
+        line += f"; in a dependency cycle of {summary.cycle_size} files"
+    return line
+
+
 def _tree_to_dict(tree) -> dict:
     """Convert a DependencyTree to a JSON-serializable dict."""
     return tree.to_dict()
@@ -2723,6 +2790,12 @@ def main() -> None:
         action="store_true",
         help="Extract dependency graph after indexing",
     )
+    index_parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Chunk files in N worker processes (default: threads in this process)",
+    )
 
     # Search subcommand (also works as default action)
     search_parser = subparsers.add_parser(
@@ -3253,6 +3326,11 @@ def main() -> None:
     deps_impact_parser.add_argument(
         "--json", action="store_true", help="Output as JSON"
     )
+    deps_impact_parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Show only the precomputed impact counts, without the tree",
+    )
     add_config_arg(
         deps_impact_parser,
         "-n",
@@ -58,6 +58,13 @@ embedding: {}
   # baseUrl: http://localhost:8080
   # Override the embedding vector size (only if your model needs it)
   # outputDimension: 768
+  # Store only the first N dimensions of each vector (Matryoshka models such
+  # as nomic-embed-text v1.5 and text-embedding-3-*). Smaller table and index,
+  # faster scans; changing it requires a `--fresh` reindex.
+  # storedDimension: 256
+  # Re-rank the top candidates with full-length vectors from the embedding
+  # cache (only useful together with storedDimension)
+  # fullDimensionRerank: false
   # NOTE: remote providers also need COCOSEARCH_EMBEDDING_API_KEY (env var),
   # unless baseUrl points at a local server. Switching provider/model requires
   # a `cocosearch index . --fresh` reindex.
@@ -254,7 +254,8 @@ class ConfigResolver:
         """Resolve embedding config and bridge to env vars.
 
         Ensures COCOSEARCH_EMBEDDING_PROVIDER, COCOSEARCH_EMBEDDING_MODEL,
-        COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION, and COCOSEARCH_EMBEDDING_BASE_URL
+        COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION, COCOSEARCH_EMBEDDING_STORED_DIMENSION,
+        COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK, and COCOSEARCH_EMBEDDING_BASE_URL
         env vars reflect the full precedence chain (env > config file > default).
 
         Returns:
@@ -267,6 +268,14 @@ class ConfigResolver:
         dim, _ = self.resolve(
             "embedding.outputDimension", None, "COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION"
         )
+        stored_dim, _ = self.resolve(
+            "embedding.storedDimension", None, "COCOSEARCH_EMBEDDING_STORED_DIMENSION"
+        )
+        rerank, _ = self.resolve(
+            "embedding.fullDimensionRerank",
+            None,
+            "COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK",
+        )
 
         base_url, _ = self.resolve(
             "embedding.baseUrl", None, "COCOSEARCH_EMBEDDING_BASE_URL"
@@ -276,6 +285,10 @@ class ConfigResolver:
         os.environ["COCOSEARCH_EMBEDDING_MODEL"] = str(model)
         if dim is not None:
             os.environ["COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION"] = str(dim)
+        if stored_dim is not None:
+            os.environ["COCOSEARCH_EMBEDDING_STORED_DIMENSION"] = str(stored_dim)
+        if rerank:
+            os.environ["COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK"] = "true"
         if base_url is not None:
             os.environ["COCOSEARCH_EMBEDDING_BASE_URL"] = str(base_url)
 
@@ -64,6 +64,8 @@ class EmbeddingSection(BaseModel):
     provider: str = Field(default="ollama")
     model: str | None = Field(default=None)
     outputDimension: int | None = Field(default=None)
+    storedDimension: int | None = Field(default=None, gt=0)
+    fullDimensionRerank: bool = Field(default=False)
     baseUrl: str | None = Field(default=None)
 
     @model_validator(mode="after")
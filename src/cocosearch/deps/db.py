@@ -1,8 +1,8 @@
 """Database operations for dependency edge storage.
 
 Provides functions to create, drop, and populate the dependency edges
-table in PostgreSQL. Uses the shared connection pool from
-``cocosearch.search.db``.
+table, its tracking table and its precomputed impact table in PostgreSQL.
+Uses the shared connection pool from ``cocosearch.search.db``.
 """
 
 import json
@@ -10,7 +10,9 @@ import logging
 
 from cocosearch.deps.models import (
     DependencyEdge,
+    ImpactSummary,
     get_deps_table_name,
+    get_impact_table_name,
     get_tracking_table_name,
 )
 from cocosearch.search.db import get_connection_pool
@@ -295,3 +297,97 @@ def update_tracking(index_name: str, file_hashes: dict[str, tuple[str, str]]) ->
     logger.debug(
         "Updated tracking table %s with %d entries", table_name, len(file_hashes)
     )
+
+
+def create_impact_table(index_name: str) -> None:
+    """Create the precomputed impact summary table.
+
+    One row per file (see ``cocosearch.deps.impact``), with an index for
+    ranking files by transitive dependents.
+
+    Uses IF NOT EXISTS so the operation is idempotent.
+
+    Args:
+        index_name: The index name (validated for safe SQL use).
+    """
+    table_name = get_impact_table_name(index_name)
+    pool = get_connection_pool()
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table_name} (
+                    file TEXT PRIMARY KEY,
+                    dependents INTEGER NOT NULL,
+                    direct_dependents INTEGER NOT NULL,
+                    cycle_size INTEGER NOT NULL,
+                    depth_histogram INTEGER[] NOT NULL
+                )
+            """)
+
+            cur.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{table_name}_dependents
+                ON {table_name} (dependents DESC)
+            """)
+
+        conn.commit()
+
+    logger.debug("Created impact table %s", table_name)
+
+
+def impact_table_exists(index_name: str) -> bool:
+    """Check whether the impact summary table has been created.
+
+    Args:
+        index_name: The index name (validated for safe SQL use).
+    """
+    table_name = get_impact_table_name(index_name)
+    pool = get_connection_pool()
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL", (table_name,))
+            row = cur.fetchone()
+
+    return bool(row and row[0])
+
+
+def replace_impact_summaries(index_name: str, summaries: list[ImpactSummary]) -> None:
+    """Replace all impact summaries of an index.
+
+    Truncates and refills the table in one transaction, so readers see
+    either the previous or the new summaries.
+
+    Args:
+        index_name: The index name (validated for safe SQL use).
+        summaries: One summary per file.
+    """
+    table_name = get_impact_table_name(index_name)
+    pool = get_connection_pool()
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"TRUNCATE TABLE {table_name}")
+
+            if summaries:
+                cur.executemany(
+                    f"INSERT INTO {table_name} (file, dependents, "
+                    f"direct_dependents, cycle_size, depth_histogram) "
+                    f"VALUES (%s, %s, %s, %s, %s)",
+                    [
+                        (
+                            s.file,
+                            s.dependents,
+                            s.direct_dependents,
+                            s.cycle_size,
+                            s.depth_histogram,
+                        )
+                        for s in summaries
+                    ],
+                )
+
+        conn.commit()
+
+    logger.debug(
+        "Replaced impact summaries in %s with %d entries", table_name, len(summaries)
+    )
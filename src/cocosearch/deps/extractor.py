@@ -9,6 +9,9 @@ resolvers (see ``resolver.py``), so that both forward
 Supports incremental extraction: only re-extracts files whose content
 has changed (via SHA-256 hashing), while re-resolving ALL edges to
 maintain correctness.
+
+Each run ends by recomputing the impact summaries of all files (see
+``impact.py``), so impact size and hub ranking are lookups.
 """
 
 import hashlib
@@ -18,13 +21,17 @@ import os
 
 from cocosearch.deps.db import (
     create_deps_table,
+    create_impact_table,
     create_tracking_table,
     get_stored_hashes,
+    impact_table_exists,
     insert_edges,
     read_edges_excluding,
+    replace_impact_summaries,
     truncate_deps_table,
     update_tracking,
 )
+from cocosearch.deps.impact import compute_impact_summaries
 from cocosearch.deps.models import DependencyEdge
 from cocosearch.deps.registry import get_extractor
 from cocosearch.deps.resolver import get_resolver
@@ -261,6 +268,20 @@ def _extract_files(
     return all_edges, files_processed, files_skipped, edges_found, errors
 
 
+def _update_impact_summaries(index_name: str, edges: list[DependencyEdge]) -> None:
+    """Recompute and store the impact summaries of all files (best-effort).
+
+    Impact lookups fall back to traversing the graph when the summaries
+    are missing, so a failure here must not fail the extraction.
+    """
+    try:
+        summaries = compute_impact_summaries(edges)
+        create_impact_table(index_name)
+        replace_impact_summaries(index_name, summaries)
+    except Exception as exc:
+        logger.warning("Could not update impact summaries for %s: %s", index_name, exc)
+
+
 def extract_dependencies(
     index_name: str, codebase_path: str, *, fresh: bool = False
 ) -> dict:
@@ -310,6 +331,7 @@ def extract_dependencies(
 
         truncate_deps_table(index_name)
         insert_edges(index_name, all_edges)
+        _update_impact_summaries(index_name, all_edges)
 
         # Update tracking with current hashes
         current_hashes = _compute_file_hashes(indexed_files, codebase_path)
@@ -351,6 +373,15 @@ def extract_dependencies(
         except Exception:
             total_edges = 0
 
+        # Indexes extracted before impact summaries existed get them now
+        try:
+            if not impact_table_exists(index_name):
+                _update_impact_summaries(
+                    index_name, read_edges_excluding(index_name, set())
+                )
+        except Exception as exc:
+            logger.warning("Could not check impact summaries: %s", exc)
+
         # Still stamp the timestamp so staleness checks pass
         try:
             set_deps_extracted_at(index_name)
@@ -397,6 +428,7 @@ def extract_dependencies(
     # Replace all edges in DB
     truncate_deps_table(index_name)
     insert_edges(index_name, all_edges)
+    _update_impact_summaries(index_name, all_edges)
 
     # Update tracking
     update_tracking(index_name, current_hashes)
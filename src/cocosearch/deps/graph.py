@@ -0,0 +1,270 @@
+"""In-memory dependency graph for long-lived processes.
+
+The MCP server answers dependency questions over and over: the dashboard's
+graph view, impact analysis tools and per-index statistics. Instead of SQL
+per request, :func:`get_dependency_graph` loads an index's
+``cocosearch_deps_{index}`` table once into a :class:`DependencyGraph`:
+file paths interned to integer ids, and edges in CSR (compressed sparse
+row) arrays for both directions, so a file's outgoing or incoming edges
+are one slice.
+
+Graphs are cached per index. Like other per-index caches they are dropped
+when the index changes (see :mod:`cocosearch.search.invalidation`), which
+includes every dependency extraction, and otherwise expire after
+``DEPENDENCY_GRAPH_TTL`` seconds when this process is not listening for
+index changes.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+
+import numpy as np
+
+from cocosearch.deps.models import DependencyEdge, DependencyTree, get_deps_table_name
+from cocosearch.deps.query import _build_trees, _row_to_edge
+from cocosearch.search.db import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+DEPENDENCY_GRAPH_TTL = 60.0
+
+
+def _intern_str(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
+
+
+def _csr(
+    keys: np.ndarray, size: int, edge_ids: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Group edge ids by key (a file id) in CSR form.
+
+    Returns:
+        ``(offsets, edges)``: the edges of key ``k`` are
+        ``edges[offsets[k]:offsets[k + 1]]``, in their original order.
+    """
+    order = np.argsort(keys, kind="stable")
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=offsets[1:])
+    return offsets, edge_ids[order].astype(np.int32)
+
+
+class DependencyGraph:
+    """Compact, read-only dependency graph of one index.
+
+    Args:
+        edges: All edges of the index, in table (id) order.
+    """
+
+    def __init__(self, edges: list[DependencyEdge]):
+        self.files: list[str] = []
+        self._file_ids: dict[str, int] = {}
+        self.dep_types: list[str] = []
+        type_ids: dict[str, int] = {}
+
+        count = len(edges)
+        sources = np.empty(count, dtype=np.int32)
+        targets = np.empty(count, dtype=np.int32)
+        kinds = np.empty(count, dtype=np.int16)
+        self._source_symbols: list[str | None] = []
+        self._target_symbols: list[str | None] = []
+        self._metadata: list[dict | None] = []
+
+        for i, edge in enumerate(edges):
+            sources[i] = self._intern(edge.source_file)
+            targets[i] = (
+                self._intern(edge.target_file) if edge.target_file is not None else -1
+            )
+            kind = type_ids.get(edge.dep_type)
+            if kind is None:
+                kind = type_ids[edge.dep_type] = len(self.dep_types)
+                self.dep_types.append(edge.dep_type)
+            kinds[i] = kind
+            self._source_symbols.append(_intern_str(edge.source_symbol))
+            self._target_symbols.append(_intern_str(edge.target_symbol))
+            self._metadata.append(edge.metadata or None)
+
+        self._type_ids = type_ids
+        self._sources = sources
+        self._targets = targets
+        self._kinds = kinds
+
+        size = len(self.files)
+        all_edges = np.arange(count, dtype=np.int32)
+        self._fwd_offsets, self._fwd_edges = _csr(sources, size, all_edges)
+        # Only resolved edges have a target to traverse back from
+        internal = all_edges[targets >= 0]
+        self._rev_offsets, self._rev_edges = _csr(targets[internal], size, internal)
+
+    def _intern(self, path: str) -> int:
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            file_id = self._file_ids[path] = len(self.files)
+            self.files.append(path)
+        return file_id
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._sources)
+
+    def _edge(self, i: int) -> DependencyEdge:
+        target = int(self._targets[i])
+        return DependencyEdge(
+            source_file=self.files[self._sources[i]],
+            source_symbol=self._source_symbols[i],
+            target_file=self.files[target] if target >= 0 else None,
+            target_symbol=self._target_symbols[i],
+            dep_type=self.dep_types[self._kinds[i]],
+            metadata=dict(self._metadata[i] or {}),
+        )
+
+    def _edges(
+        self,
+        offsets: np.ndarray,
+        edge_ids: np.ndarray,
+        file: str,
+        dep_type: str | None,
+    ) -> list[DependencyEdge]:
+        file_id = self._file_ids.get(file)
+        if file_id is None:
+            return []
+        ids = edge_ids[offsets[file_id] : offsets[file_id + 1]]
+        if dep_type is not None:
+            kind = self._type_ids.get(dep_type)
+            if kind is None:
+                return []
+            ids = ids[self._kinds[ids] == kind]
+        return [self._edge(i) for i in ids]
+
+    def dependencies(
+        self, file: str, dep_type: str | None = None
+    ) -> list[DependencyEdge]:
+        """Edges from *file*, like ``get_dependencies``."""
+        return self._edges(self._fwd_offsets, self._fwd_edges, file, dep_type)
+
+    def dependents(
+        self, file: str, dep_type: str | None = None
+    ) -> list[DependencyEdge]:
+        """Resolved edges to *file*, like ``get_dependents``."""
+        return self._edges(self._rev_offsets, self._rev_edges, file, dep_type)
+
+    def trees(
+        self,
+        files: list[str],
+        max_depth: int,
+        dep_type: str | None = None,
+        reverse: bool = False,
+    ) -> list[DependencyTree]:
+        """Dependency (or, with *reverse*, impact) trees of *files*.
+
+        Same BFS and results as ``get_dependency_tree_batch`` and
+        ``get_impact_batch``.
+        """
+        edges = self.dependents if reverse else self.dependencies
+        return _build_trees(
+            files, lambda file: edges(file, dep_type=dep_type), max_depth, reverse
+        )
+
+    def _top(self, offsets: np.ndarray, limit: int) -> list[tuple[str, int]]:
+        degrees = np.diff(offsets)
+        top = np.argsort(-degrees, kind="stable")[:limit]
+        return [(self.files[i], int(degrees[i])) for i in top if degrees[i] > 0]
+
+    def top_sources(self, limit: int = 10) -> list[tuple[str, int]]:
+        """Files with the most outgoing edges, with their edge counts."""
+        return self._top(self._fwd_offsets, limit)
+
+    def top_targets(self, limit: int = 10) -> list[tuple[str, int]]:
+        """Most depended-on files (hubs), with their incoming edge counts."""
+        return self._top(self._rev_offsets, limit)
+
+    def stats(self) -> dict:
+        """Statistics in the format of ``get_dep_stats_detailed``."""
+        counts = np.bincount(self._kinds, minlength=len(self.dep_types))
+        by_type = {
+            self.dep_types[i]: int(counts[i])
+            for i in np.argsort(-counts, kind="stable")
+        }
+        return {
+            "total_edges": self.edge_count,
+            "by_type": by_type,
+            "top_sources": self.top_sources(),
+            "top_targets": self.top_targets(),
+        }
+
+
+def load_dependency_graph(index_name: str) -> DependencyGraph:
+    """Read every edge of an index into a new :class:`DependencyGraph`."""
+    table_name = get_deps_table_name(index_name)
+    pool = get_connection_pool()
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT source_file, source_symbol, target_file,
+                       target_symbol, dep_type, metadata
+                FROM {table_name}
+                ORDER BY id
+                """
+            )
+            rows = cur.fetchall()
+
+    return DependencyGraph([_row_to_edge(row) for row in rows])
+
+
+# Per-index cache: index name -> (load time, graph)
+_graphs: dict[str, tuple[float, DependencyGraph]] = {}
+# Bumped when an index is forgotten, so a load racing with it is not kept
+_graph_epochs: dict[str, int] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_dependency_graph(index_name: str) -> DependencyGraph:
+    """Get the cached graph of an index, loading it if needed.
+
+    Cached graphs are reused until the index changes when this process
+    listens for index change notifications, and for
+    ``DEPENDENCY_GRAPH_TTL`` seconds otherwise.
+    """
+    from cocosearch.search.invalidation import is_listening
+
+    now = time.monotonic()
+    cached = _graphs.get(index_name)
+    if cached is not None and (
+        now - cached[0] < DEPENDENCY_GRAPH_TTL or is_listening()
+    ):
+        return cached[1]
+
+    epoch = _graph_epochs.get(index_name, 0)
+    graph = load_dependency_graph(index_name)
+    with _graphs_lock:
+        if _graph_epochs.get(index_name, 0) == epoch:
+            _graphs[index_name] = (now, graph)
+    logger.debug(
+        "Loaded dependency graph of %s: %d files, %d edges",
+        index_name,
+        len(graph.files),
+        graph.edge_count,
+    )
+    return graph
+
+
+def forget_dependency_graph(index_name: str) -> None:
+    """Drop the cached graph of an index (it changed)."""
+    with _graphs_lock:
+        _graphs.pop(index_name, None)
+        _graph_epochs[index_name] = _graph_epochs.get(index_name, 0) + 1
+
+
+def reset_dependency_graphs() -> None:
+    """Drop every cached graph.
+
+    Used by tests to ensure clean state between test runs.
+    """
+    with _graphs_lock:
+        _graphs.clear()
+        _graph_epochs.clear()
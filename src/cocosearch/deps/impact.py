@@ -0,0 +1,180 @@
+"""Precomputed blast radius of every file in the dependency graph.
+
+Impact analysis asks "what breaks if I touch this file?", which is the
+transitive reverse closure of the file. Instead of walking it per request,
+:func:`compute_impact_summaries` runs at the end of dependency extraction
+and the result is stored in ``cocosearch_deps_impact_{index}``; impact
+size and hub ranking are then lookups (see ``cocosearch.deps.query``).
+
+The closure sizes come from the condensation of the reverse graph: files
+in one strongly connected component (a dependency cycle) share their
+dependents, and the components form a DAG whose reachable sets are built
+bottom-up as bitsets, one union per component edge. The depth histogram
+(dependents per shortest distance) is built level by level on the file
+graph, up to ``MAX_HISTOGRAM_DEPTH``.
+
+Only resolved edges count, over all dependency types.
+"""
+
+from cocosearch.deps.models import DependencyEdge, ImpactSummary
+
+# Same cap as the depth of impact traversals served to agents
+MAX_HISTOGRAM_DEPTH = 20
+
+
+def _strongly_connected_components(succ: list[list[int]]) -> list[list[int]]:
+    """Tarjan's algorithm, iterative.
+
+    Returns:
+        Components in reverse topological order: every component comes
+        after all components reachable from it.
+    """
+    count = len(succ)
+    index = [-1] * count
+    low = [0] * count
+    on_stack = [False] * count
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, i = work[-1]
+            if i < len(succ[node]):
+                work[-1] = (node, i + 1)
+                nxt = succ[node][i]
+                if index[nxt] == -1:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack[nxt] = True
+                    work.append((nxt, 0))
+                elif on_stack[nxt]:
+                    low[node] = min(low[node], index[nxt])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def _depth_histograms(
+    dependents: list[list[int]], totals: list[int], max_depth: int
+) -> list[list[int]]:
+    """Dependents per shortest distance, for distances 1..max_depth.
+
+    ``within[f]`` holds the files within ``k`` steps of ``f`` after level
+    ``k``; a file stops growing once it holds all of its ``totals[f]``
+    dependents.
+    """
+    count = len(dependents)
+    histograms: list[list[int]] = [[] for _ in range(count)]
+    within = [0] * count
+    active = [f for f in range(count) if totals[f]]
+
+    for _depth in range(max_depth):
+        if not active:
+            break
+        previous = within[:]
+        still_active = []
+        for f in active:
+            bits = previous[f]
+            for g in dependents[f]:
+                bits |= (1 << g) | previous[g]
+            bits &= ~(1 << f)  # A cycle back to f does not impact f
+            size = bits.bit_count()
+            histograms[f].append(size - previous[f].bit_count())
+            within[f] = bits
+            if size < totals[f]:
+                still_active.append(f)
+        active = still_active
+
+    return histograms
+
+
+def compute_impact_summaries(
+    edges: list[DependencyEdge], max_depth: int = MAX_HISTOGRAM_DEPTH
+) -> list[ImpactSummary]:
+    """Compute the impact summary of every file with a resolved edge.
+
+    Args:
+        edges: All dependency edges of an index.
+        max_depth: Number of distances kept in the depth histograms.
+
+    Returns:
+        One ImpactSummary per file, in first-seen order.
+    """
+    file_ids: dict[str, int] = {}
+    files: list[str] = []
+
+    def intern(path: str) -> int:
+        file_id = file_ids.get(path)
+        if file_id is None:
+            file_id = file_ids[path] = len(files)
+            files.append(path)
+        return file_id
+
+    pairs: set[tuple[int, int]] = set()
+    for edge in edges:
+        if edge.target_file is None or edge.target_file == edge.source_file:
+            continue
+        pairs.add((intern(edge.target_file), intern(edge.source_file)))
+
+    # Reverse graph: target -> files that depend on it
+    dependents: list[list[int]] = [[] for _ in files]
+    for target, source in sorted(pairs):
+        dependents[target].append(source)
+
+    components = _strongly_connected_components(dependents)
+    component_of = [0] * len(files)
+    for c, members in enumerate(components):
+        for f in members:
+            component_of[f] = c
+
+    # Files reachable from each component, outside it; components arrive
+    # dependents-first, and reaching one member reaches the whole component
+    member_bits = [sum(1 << f for f in members) for members in components]
+    reach = [0] * len(components)
+    for c, members in enumerate(components):
+        bits = 0
+        for f in members:
+            for g in dependents[f]:
+                d = component_of[g]
+                if d != c:
+                    bits |= member_bits[d] | reach[d]
+        reach[c] = bits
+
+    totals = [
+        reach[component_of[f]].bit_count() + len(components[component_of[f]]) - 1
+        for f in range(len(files))
+    ]
+    histograms = _depth_histograms(dependents, totals, max_depth)
+
+    return [
+        ImpactSummary(
+            file=path,
+            dependents=totals[f],
+            direct_dependents=len(dependents[f]),
+            cycle_size=len(components[component_of[f]]),
+            depth_histogram=histograms[f],
+        )
+        for f, path in enumerate(files)
+    ]
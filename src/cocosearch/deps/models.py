@@ -2,7 +2,8 @@
 
 Defines the core types used to represent dependency relationships
 between code symbols: edges (pairwise relationships), trees
-(recursive dependency chains), and table naming conventions.
+(recursive dependency chains), precomputed impact summaries, and table
+naming conventions.
 """
 
 from dataclasses import dataclass, field
@@ -80,6 +81,41 @@ class DependencyTree:
         return d
 
 
+@dataclass
+class ImpactSummary:
+    """Precomputed blast radius of a file.
+
+    Counts every file that depends on this one, directly or transitively,
+    over all dependency types (see ``cocosearch.deps.impact``).
+
+    Attributes:
+        file: Path to the file.
+        dependents: Number of files that transitively depend on it.
+        direct_dependents: Number of files that depend on it directly.
+        cycle_size: Number of files in its dependency cycle (strongly
+            connected component), 1 if it is in no cycle.
+        depth_histogram: Number of dependents at each shortest distance,
+            starting at 1 (direct). Distances beyond the histogram are
+            counted in ``dependents`` only.
+    """
+
+    file: str
+    dependents: int
+    direct_dependents: int
+    cycle_size: int = 1
+    depth_histogram: list[int] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "file": self.file,
+            "dependents": self.dependents,
+            "direct_dependents": self.direct_dependents,
+            "cycle_size": self.cycle_size,
+            "depth_histogram": list(self.depth_histogram),
+        }
+
+
 def get_deps_table_name(index_name: str) -> str:
     """Return the PostgreSQL table name for dependency edges.
 
@@ -110,3 +146,19 @@ def get_tracking_table_name(index_name: str) -> str:
     """
     validate_index_name(index_name)
     return f"cocosearch_deps_tracking_{index_name}"
+
+
+def get_impact_table_name(index_name: str) -> str:
+    """Return the PostgreSQL table name for precomputed impact summaries.
+
+    Args:
+        index_name: The index name (validated for safe SQL use).
+
+    Returns:
+        Table name in the form ``cocosearch_deps_impact_{index_name}``.
+
+    Raises:
+        IndexValidationError: If the index name is invalid.
+    """
+    validate_index_name(index_name)
+    return f"cocosearch_deps_impact_{index_name}"
@@ -2,7 +2,8 @@
 
 Provides functions for forward lookups (what does a file depend on?),
 reverse lookups (what depends on a file?), transitive BFS traversals
-(full dependency tree and impact analysis), and aggregate statistics.
+(full dependency tree and impact analysis, each fetched with one recursive
+query), lookups of precomputed impact summaries, and aggregate statistics.
 All queries target the ``cocosearch_deps_{index}`` table created by
 ``cocosearch.deps.db``.
 """
@@ -12,8 +13,15 @@ from __future__ import annotations
 import json
 import logging
 from collections import deque
-
-from cocosearch.deps.models import DependencyEdge, DependencyTree, get_deps_table_name
+from collections.abc import Callable
+
+from cocosearch.deps.models import (
+    DependencyEdge,
+    DependencyTree,
+    ImpactSummary,
+    get_deps_table_name,
+    get_impact_table_name,
+)
 from cocosearch.search.db import get_connection_pool
 
 logger = logging.getLogger(__name__)
@@ -176,42 +184,113 @@ def get_dep_stats(index_name: str) -> dict:
     return {"total_edges": total}
 
 
-def get_dependency_tree(
+def _fetch_traversal_edges(
     index_name: str,
-    file: str,
-    max_depth: int = 5,
+    files: list[str],
+    max_depth: int,
     dep_type: str | None = None,
-) -> DependencyTree:
-    """Forward BFS: build a transitive dependency tree.
+    reverse: bool = False,
+) -> dict[str, list[DependencyEdge]]:
+    """Fetch the edges of every node a traversal can expand, in one query.
 
-    Starting from *file*, follows ``target_file`` links to discover
-    what this file depends on transitively.  Cycles are detected via
-    a visited set.
+    A recursive CTE walks the graph from *files* in the database: forward
+    along ``target_file`` links, or backward along ``source_file`` links
+    when *reverse* is set. ``UNION`` keeps each ``(file, depth)`` pair once
+    and the depth bound stops cycles, so the walk visits at most every
+    file once per level. It returns the outgoing (or incoming) edges of
+    each file reached within *max_depth* - 1 steps.
 
     Args:
         index_name: The index name.
-        file: Root file path.
-        max_depth: Maximum traversal depth (default 5).
+        files: Root file paths.
+        max_depth: Maximum traversal depth.
         dep_type: Optional dependency type filter.
+        reverse: Follow edges from target to source (impact analysis).
 
     Returns:
-        A DependencyTree rooted at *file*.
+        Dict mapping each expandable file to its edges, ordered by id.
+    """
+    table_name = get_deps_table_name(index_name)
+    pool = get_connection_pool()
+
+    join_col, next_col = (
+        ("target_file", "source_file") if reverse else ("source_file", "target_file")
+    )
+    type_filter = "AND e.dep_type = %s" if dep_type is not None else ""
+    type_params = [dep_type] if dep_type is not None else []
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                WITH RECURSIVE reach(file, depth) AS (
+                    SELECT root, 0 FROM unnest(%s::text[]) AS root
+                    UNION
+                    SELECT e.{next_col}, r.depth + 1
+                    FROM reach r
+                    JOIN {table_name} e ON e.{join_col} = r.file {type_filter}
+                    WHERE r.depth + 1 < %s AND e.{next_col} IS NOT NULL
+                ),
+                reached AS (SELECT DISTINCT file FROM reach)
+                SELECT e.source_file, e.source_symbol, e.target_file,
+                       e.target_symbol, e.dep_type, e.metadata
+                FROM reached f
+                JOIN {table_name} e ON e.{join_col} = f.file {type_filter}
+                ORDER BY e.id
+                """,
+                (list(files), *type_params, max_depth, *type_params),
+            )
+            rows = cur.fetchall()
+
+    edges_by_file: dict[str, list[DependencyEdge]] = {}
+    for row in rows:
+        edge = _row_to_edge(row)
+        key = edge.target_file if reverse else edge.source_file
+        edges_by_file.setdefault(key, []).append(edge)
+    return edges_by_file
+
+
+def _build_trees(
+    files: list[str],
+    edges_of: Callable[[str], list[DependencyEdge]],
+    max_depth: int,
+    reverse: bool = False,
+) -> list[DependencyTree]:
+    """Assemble BFS trees from already loaded edges.
+
+    Nodes are expanded in BFS order with one visited set shared by all
+    roots, so each file appears once, under the first node to reach it.
+
+    Args:
+        files: Root file paths.
+        edges_of: Returns the edges to expand from a file (outgoing ones,
+            or incoming ones when *reverse* is set).
+        max_depth: Maximum traversal depth.
+        reverse: Children are edge sources instead of targets.
+
+    Returns:
+        List of DependencyTree roots in the same order as *files*.
     """
-    root = DependencyTree(file=file, symbol=None, dep_type="root", children=[])
-    visited: set[str] = {file}
+    roots: list[DependencyTree] = []
+    visited: set[str] = set(files)
+    queue: deque[tuple[DependencyTree, int]] = deque()
 
-    # BFS queue: (parent_tree_node, depth)
-    queue: deque[tuple[DependencyTree, int]] = deque([(root, 0)])
+    for f in files:
+        root = DependencyTree(file=f, symbol=None, dep_type="root", children=[])
+        roots.append(root)
+        queue.append((root, 0))
 
     while queue:
         node, depth = queue.popleft()
         if depth >= max_depth:
             continue
 
-        edges = get_dependencies(index_name, node.file, dep_type=dep_type)
-        for edge in edges:
-            target = edge.target_file
-            if target is None:
+        for edge in edges_of(node.file):
+            if reverse:
+                child_file, child_symbol = edge.source_file, edge.source_symbol
+            else:
+                child_file, child_symbol = edge.target_file, edge.target_symbol
+            if child_file is None:
                 # External/unresolved dependency — add as non-traversable leaf
                 ext_label = (
                     edge.metadata.get("module")
@@ -228,19 +307,73 @@ def get_dependency_tree(
                 )
                 node.children.append(child)
                 continue
-            if target in visited:
+            if child_file in visited:
                 continue
-            visited.add(target)
+            visited.add(child_file)
             child = DependencyTree(
-                file=target,
-                symbol=edge.target_symbol,
+                file=child_file,
+                symbol=child_symbol,
                 dep_type=edge.dep_type,
                 children=[],
             )
             node.children.append(child)
             queue.append((child, depth + 1))
 
-    return root
+    return roots
+
+
+def _traverse(
+    index_name: str,
+    files: list[str],
+    max_depth: int,
+    dep_type: str | None,
+    reverse: bool,
+    use_graph: bool = False,
+) -> list[DependencyTree]:
+    if not files:
+        return []
+    if use_graph:
+        # Lazy import: the graph module builds on this one
+        from cocosearch.deps.graph import get_dependency_graph
+
+        graph = get_dependency_graph(index_name)
+        return graph.trees(files, max_depth, dep_type=dep_type, reverse=reverse)
+    edges_by_file = (
+        _fetch_traversal_edges(index_name, files, max_depth, dep_type, reverse)
+        if max_depth > 0
+        else {}
+    )
+    return _build_trees(
+        files, lambda file: edges_by_file.get(file, []), max_depth, reverse
+    )
+
+
+def get_dependency_tree(
+    index_name: str,
+    file: str,
+    max_depth: int = 5,
+    dep_type: str | None = None,
+    use_graph: bool = False,
+) -> DependencyTree:
+    """Forward BFS: build a transitive dependency tree.
+
+    Starting from *file*, follows ``target_file`` links to discover
+    what this file depends on transitively.  The edges are fetched with
+    a single recursive query; cycles are detected via a visited set.
+
+    Args:
+        index_name: The index name.
+        file: Root file path.
+        max_depth: Maximum traversal depth (default 5).
+        dep_type: Optional dependency type filter.
+        use_graph: Traverse the cached in-memory graph of the index
+            (see ``cocosearch.deps.graph``) instead of querying.
+
+    Returns:
+        A DependencyTree rooted at *file*.
+    """
+    trees = _traverse(index_name, [file], max_depth, dep_type, False, use_graph)
+    return trees[0]
 
 
 def get_impact(
@@ -248,49 +381,28 @@ def get_impact(
     file: str,
     max_depth: int = 5,
     dep_type: str | None = None,
+    use_graph: bool = False,
 ) -> DependencyTree:
     """Reverse BFS: build an impact tree.
 
     Starting from *file*, follows ``source_file`` links to discover
-    what would be impacted if this file changes.  Cycles are detected
-    via a visited set.
+    what would be impacted if this file changes.  The edges are fetched
+    with a single recursive query; cycles are detected via a visited set.
 
     Args:
         index_name: The index name.
         file: Root file path.
         max_depth: Maximum traversal depth (default 5).
         dep_type: Optional dependency type filter.
+        use_graph: Traverse the cached in-memory graph of the index
+            (see ``cocosearch.deps.graph``) instead of querying.
 
     Returns:
         A DependencyTree rooted at *file*, with children being files
         that depend on it (transitively).
     """
-    root = DependencyTree(file=file, symbol=None, dep_type="root", children=[])
-    visited: set[str] = {file}
-
-    queue: deque[tuple[DependencyTree, int]] = deque([(root, 0)])
-
-    while queue:
-        node, depth = queue.popleft()
-        if depth >= max_depth:
-            continue
-
-        edges = get_dependents(index_name, node.file, dep_type=dep_type)
-        for edge in edges:
-            source = edge.source_file
-            if source in visited:
-                continue
-            visited.add(source)
-            child = DependencyTree(
-                file=source,
-                symbol=edge.source_symbol,
-                dep_type=edge.dep_type,
-                children=[],
-            )
-            node.children.append(child)
-            queue.append((child, depth + 1))
-
-    return root
+    trees = _traverse(index_name, [file], max_depth, dep_type, True, use_graph)
+    return trees[0]
 
 
 def get_dependency_tree_batch(
@@ -298,6 +410,7 @@ def get_dependency_tree_batch(
     files: list[str],
     max_depth: int = 5,
     dep_type: str | None = None,
+    use_graph: bool = False,
 ) -> list[DependencyTree]:
     """Forward BFS for multiple files with a shared visited set.
 
@@ -310,59 +423,13 @@ def get_dependency_tree_batch(
         files: List of root file paths.
         max_depth: Maximum traversal depth (default 5).
         dep_type: Optional dependency type filter.
+        use_graph: Traverse the cached in-memory graph of the index
+            (see ``cocosearch.deps.graph``) instead of querying.
 
     Returns:
         List of DependencyTree roots in the same order as *files*.
     """
-    if not files:
-        return []
-
-    roots: list[DependencyTree] = []
-    visited: set[str] = set(files)
-    queue: deque[tuple[DependencyTree, int]] = deque()
-
-    for f in files:
-        root = DependencyTree(file=f, symbol=None, dep_type="root", children=[])
-        roots.append(root)
-        queue.append((root, 0))
-
-    while queue:
-        node, depth = queue.popleft()
-        if depth >= max_depth:
-            continue
-
-        edges = get_dependencies(index_name, node.file, dep_type=dep_type)
-        for edge in edges:
-            target = edge.target_file
-            if target is None:
-                ext_label = (
-                    edge.metadata.get("module")
-                    or edge.metadata.get("ref")
-                    or edge.target_symbol
-                    or "unknown"
-                )
-                child = DependencyTree(
-                    file=ext_label,
-                    symbol=edge.target_symbol,
-                    dep_type=edge.dep_type,
-                    children=[],
-                    is_external=True,
-                )
-                node.children.append(child)
-                continue
-            if target in visited:
-                continue
-            visited.add(target)
-            child = DependencyTree(
-                file=target,
-                symbol=edge.target_symbol,
-                dep_type=edge.dep_type,
-                children=[],
-            )
-            node.children.append(child)
-            queue.append((child, depth + 1))
-
-    return roots
+    return _traverse(index_name, files, max_depth, dep_type, False, use_graph)
 
 
 def get_impact_batch(
@@ -370,6 +437,7 @@ def get_impact_batch(
     files: list[str],
     max_depth: int = 5,
     dep_type: str | None = None,
+    use_graph: bool = False,
 ) -> list[DependencyTree]:
     """Reverse BFS for multiple files with a shared visited set.
 
@@ -382,46 +450,103 @@ def get_impact_batch(
         files: List of root file paths.
         max_depth: Maximum traversal depth (default 5).
         dep_type: Optional dependency type filter.
+        use_graph: Traverse the cached in-memory graph of the index
+            (see ``cocosearch.deps.graph``) instead of querying.
 
     Returns:
         List of DependencyTree roots in the same order as *files*.
     """
-    if not files:
-        return []
+    return _traverse(index_name, files, max_depth, dep_type, True, use_graph)
 
-    roots: list[DependencyTree] = []
-    visited: set[str] = set(files)
-    queue: deque[tuple[DependencyTree, int]] = deque()
 
-    for f in files:
-        root = DependencyTree(file=f, symbol=None, dep_type="root", children=[])
-        roots.append(root)
-        queue.append((root, 0))
+def _row_to_summary(row: tuple) -> ImpactSummary:
+    file, dependents, direct_dependents, cycle_size, depth_histogram = row
+    return ImpactSummary(
+        file=file,
+        dependents=dependents,
+        direct_dependents=direct_dependents,
+        cycle_size=cycle_size,
+        depth_histogram=list(depth_histogram or []),
+    )
 
-    while queue:
-        node, depth = queue.popleft()
-        if depth >= max_depth:
-            continue
 
-        edges = get_dependents(index_name, node.file, dep_type=dep_type)
-        for edge in edges:
-            source = edge.source_file
-            if source in visited:
-                continue
-            visited.add(source)
-            child = DependencyTree(
-                file=source,
-                symbol=edge.source_symbol,
-                dep_type=edge.dep_type,
-                children=[],
+def get_impact_summaries(
+    index_name: str, files: list[str]
+) -> dict[str, ImpactSummary] | None:
+    """Look up the precomputed impact summaries of files.
+
+    Summaries are computed at the end of each dependency extraction (see
+    ``cocosearch.deps.impact``). They count dependents over all dependency
+    types, without a depth limit.
+
+    Args:
+        index_name: The index name.
+        files: File paths to look up.
+
+    Returns:
+        Dict mapping each file with a summary to it; files without one
+        have no dependency edges. None if the index has no summaries yet
+        (dependencies not extracted since they were introduced).
+    """
+    table_name = get_impact_table_name(index_name)
+    pool = get_connection_pool()
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL", (table_name,))
+            row = cur.fetchone()
+            if not (row and row[0]):
+                return None
+            cur.execute(
+                f"""
+                SELECT file, dependents, direct_dependents,
+                       cycle_size, depth_histogram
+                FROM {table_name}
+                WHERE file = ANY(%s)
+                """,
+                (list(files),),
             )
-            node.children.append(child)
-            queue.append((child, depth + 1))
+            rows = cur.fetchall()
 
-    return roots
+    return {row[0]: _row_to_summary(row) for row in rows}
+
+
+def get_top_impact(index_name: str, limit: int = 10) -> list[ImpactSummary]:
+    """Rank files by transitive dependents (largest blast radius first).
+
+    Args:
+        index_name: The index name.
+        limit: Maximum number of files to return.
 
+    Returns:
+        Precomputed impact summaries, empty if there are none yet.
+    """
+    table_name = get_impact_table_name(index_name)
+    pool = get_connection_pool()
 
-def get_dep_stats_detailed(index_name: str) -> dict:
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL", (table_name,))
+            row = cur.fetchone()
+            if not (row and row[0]):
+                return []
+            cur.execute(
+                f"""
+                SELECT file, dependents, direct_dependents,
+                       cycle_size, depth_histogram
+                FROM {table_name}
+                WHERE dependents > 0
+                ORDER BY dependents DESC, file
+                LIMIT %s
+                """,
+                (limit,),
+            )
+            rows = cur.fetchall()
+
+    return [_row_to_summary(row) for row in rows]
+
+
+def get_dep_stats_detailed(index_name: str, use_graph: bool = False) -> dict:
     """Get detailed dependency graph statistics.
 
     Returns per-type edge counts, per-language breakdown, and
@@ -429,11 +554,18 @@ def get_dep_stats_detailed(index_name: str) -> dict:
 
     Args:
         index_name: The index name.
+        use_graph: Compute them from the cached in-memory graph of the
+            index (see ``cocosearch.deps.graph``) instead of querying.
 
     Returns:
         Dict with ``total_edges``, ``by_type``, ``top_sources``,
         and ``top_targets``.
     """
+    if use_graph:
+        from cocosearch.deps.graph import get_dependency_graph
+
+        return get_dependency_graph(index_name).stats()
+
     table_name = get_deps_table_name(index_name)
     pool = get_connection_pool()
 
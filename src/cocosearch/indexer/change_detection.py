@@ -0,0 +1,143 @@
+"""Stat-based change detection for incremental indexing.
+
+Every tracked file records its content hash together with the ``size``,
+``mtime_ns`` and ``inode`` it had when it was indexed. On the next run a
+file whose stat tuple is unchanged is assumed unchanged and is neither read
+nor hashed, so a no-op re-index costs a metadata walk instead of a full
+content read. Files whose stat differs are read and hashed; if the hash
+still matches (e.g. a ``touch`` or a checkout that rewrote identical
+content), only the stored stat is refreshed.
+
+Like git's index, a stat taken while the file may still be changing within
+the filesystem's timestamp granularity ("racy" mtime) is not trusted: it is
+stored as NULL so the file is hashed again next time.
+"""
+
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from typing import Literal, NamedTuple
+
+try:
+    import xxhash as _xxhash
+except ImportError:  # optional: pip install cocosearch[fast-hash]
+    _xxhash = None
+
+logger = logging.getLogger(__name__)
+
+HashAlgorithm = Literal["sha256", "xxh3"]
+
+# mtimes this close to (or after) the start of the walk are considered racy.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class FileStat(NamedTuple):
+    """The stat fields compared by the fast path."""
+
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+@dataclass
+class TrackedFile:
+    """A row of ``cocosearch_index_tracking_<name>``."""
+
+    content_hash: str
+    stat: FileStat | None = None
+
+
+def file_stat(st: os.stat_result, walk_started_ns: int) -> FileStat | None:
+    """Return the trustworthy stat of a file, or None if its mtime is racy."""
+    if st.st_mtime_ns >= walk_started_ns - RACY_WINDOW_NS:
+        return None
+    inode = st.st_ino
+    if inode >= 1 << 63:
+        inode -= 1 << 64  # fits the BIGINT column; equality is preserved
+    return FileStat(st.st_size, st.st_mtime_ns, inode)
+
+
+def stat_unchanged(tracked: TrackedFile | None, current: FileStat | None) -> bool:
+    """True if a file can skip hashing because its stat tuple is unchanged."""
+    return (
+        tracked is not None
+        and tracked.stat is not None
+        and current is not None
+        and tracked.stat == current
+    )
+
+
+def hash_content(content: str, algorithm: HashAlgorithm = "sha256") -> str:
+    """Return the digest used for change detection.
+
+    ``sha256`` digests are stored bare, as they always have been. ``xxh3``
+    is a much faster non-cryptographic hash from the optional ``xxhash``
+    package; without it, BLAKE2b (stdlib) is used instead. Non-default
+    digests carry an ``<algorithm>:`` prefix so switching algorithms is
+    detected as a change rather than silently compared across hash
+    functions.
+    """
+    data = content.encode("utf-8")
+    if algorithm == "sha256":
+        return hashlib.sha256(data).hexdigest()
+    if _xxhash is not None:
+        return "xxh3:" + _xxhash.xxh3_128_hexdigest(data)
+    return "blake2b:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def digest_matches(content: str, digest: str) -> bool:
+    """True if ``content`` hashes to a digest stored by :func:`hash_content`.
+
+    The algorithm is taken from the digest's prefix, so this works whatever
+    the index was built with. An ``xxh3`` digest never matches when
+    ``xxhash`` is not installed in this process.
+    """
+    data = content.encode("utf-8")
+    algorithm, sep, _ = digest.partition(":")
+    if not sep:
+        return hashlib.sha256(data).hexdigest() == digest
+    if algorithm == "xxh3":
+        return (
+            _xxhash is not None and "xxh3:" + _xxhash.xxh3_128_hexdigest(data) == digest
+        )
+    if algorithm == "blake2b":
+        return "blake2b:" + hashlib.blake2b(data, digest_size=16).hexdigest() == digest
+    return False
+
+
+def load_tracked_files(conn, tracking_table: str) -> dict[str, TrackedFile]:
+    """Load stored hashes and stat tuples for all tracked files.
+
+    Rows written before the stat columns existed (or with a racy mtime) get
+    ``stat=None`` and are hashed on the next run. Returns an empty dict if
+    the table cannot be read.
+    """
+    with conn.cursor() as cur:
+        try:
+            cur.execute(
+                f"SELECT filename, content_hash, size, mtime_ns, inode"
+                f" FROM {tracking_table}"
+            )
+            rows = cur.fetchall()
+        except Exception:
+            return {}
+
+    tracked: dict[str, TrackedFile] = {}
+    for filename, content_hash, size, mtime_ns, inode in rows:
+        stat = None
+        if size is not None and mtime_ns is not None and inode is not None:
+            stat = FileStat(size, mtime_ns, inode)
+        tracked[filename] = TrackedFile(content_hash, stat)
+    return tracked
+
+
+__all__ = [
+    "FileStat",
+    "HashAlgorithm",
+    "TrackedFile",
+    "file_stat",
+    "hash_content",
+    "load_tracked_files",
+    "stat_unchanged",
+]
@@ -0,0 +1,118 @@
+"""Chunk-level diffing for incremental re-indexing.
+
+When a tracked file changes, most of its chunks usually don't: an edit in
+one function leaves every other chunk's text identical, though chunks after
+the edit may move to new byte offsets. Instead of re-embedding the whole
+file, the indexer compares the new chunks with the rows already stored for
+the file:
+
+- same byte range, same text, same start line, same enclosing scope and
+  same symbol: the row is *kept* untouched,
+- same text at a different range: the stored embedding is *reused* and the
+  row is rewritten at its new location (no embedding call),
+- anything else is embedded as usual.
+
+Block type and tsvector input are a function of the chunk text, language
+and filename. Symbols are not: they come from parsing the whole file, so a
+qualified name like ``Class.method`` changes when the enclosing class is
+renamed even though the method's chunk is byte-identical. That is why the
+keep check compares the symbol columns too; every row that is not kept is
+rewritten with freshly computed metadata.
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from cocosearch.indexer.embedding_cache import to_floats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredChunk:
+    """A row already in the chunks table for a file."""
+
+    start_byte: int
+    end_byte: int
+    text: str
+    embedding: list[float]
+    start_line: int | None = None
+    scope_start_line: int | None = None
+    scope_end_line: int | None = None
+    symbol_type: str | None = None
+    symbol_name: str | None = None
+    symbol_signature: str | None = None
+
+
+@dataclass
+class ChunkDiff:
+    """Result of comparing new chunks against stored rows.
+
+    Attributes:
+        kept: Indices of new chunks already stored verbatim at the same
+            byte range, line, scope and symbol; they need neither embedding nor writing.
+        reused: Index -> stored embedding for chunks whose text is
+            unchanged but whose location moved.
+    """
+
+    kept: set[int] = field(default_factory=set)
+    reused: dict[int, list[float]] = field(default_factory=dict)
+
+    def needs_embedding(self, index: int) -> bool:
+        return index not in self.kept and index not in self.reused
+
+
+def load_stored_chunks(conn, table_name: str, filename: str) -> list[StoredChunk]:
+    """Fetch the stored chunk rows (with embeddings) for one file."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT lower(location), upper(location), content_text, embedding,"
+            " start_line, scope_start_line, scope_end_line,"
+            " symbol_type, symbol_name, symbol_signature"
+            f" FROM {table_name} WHERE filename = %s",
+            (filename,),
+        )
+        rows = cur.fetchall()
+    return [
+        StoredChunk(start, end, text, to_floats(embedding), *rest)
+        for start, end, text, embedding, *rest in rows
+        if text is not None and embedding is not None
+    ]
+
+
+def diff_chunks(stored: list[StoredChunk], chunks) -> ChunkDiff:
+    """Match new ``PreparedChunk``-like objects against ``stored`` rows."""
+    diff = ChunkDiff()
+    if not stored:
+        return diff
+
+    by_range = {(s.start_byte, s.end_byte): s for s in stored}
+    by_text: dict[str, StoredChunk] = {}
+    for s in stored:
+        by_text.setdefault(s.text, s)
+
+    for i, chunk in enumerate(chunks):
+        same_place = by_range.get((chunk.start_byte, chunk.end_byte))
+        # An edit before the chunk can change its line without moving its
+        # bytes, an edit around it its enclosing scope or (via a renamed
+        # parent) its qualified symbol name, and rows from older versions
+        # have no lines: rewrite those.
+        if (
+            same_place is not None
+            and same_place.text == chunk.text
+            and same_place.start_line == chunk.start_line
+            and same_place.scope_start_line == chunk.scope_start_line
+            and same_place.scope_end_line == chunk.scope_end_line
+            and same_place.symbol_type == chunk.symbol_type
+            and same_place.symbol_name == chunk.symbol_name
+            and same_place.symbol_signature == chunk.symbol_signature
+        ):
+            diff.kept.add(i)
+            continue
+        moved = by_text.get(chunk.text)
+        if moved is not None:
+            diff.reused[i] = moved.embedding
+    return diff
+
+
+__all__ = ["ChunkDiff", "StoredChunk", "diff_chunks", "load_stored_chunks"]
@@ -2,11 +2,13 @@
 
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field
 
+from cocosearch.indexer.change_detection import HashAlgorithm
+
 # CocoIndex built-in language patterns
 # See https://cocoindex.io/docs/ops/functions#supported-languages
 _BASE_INCLUDE_PATTERNS = [
@@ -94,6 +96,37 @@ class IndexingConfig(BaseModel):
     exclude_patterns: list[str] = []
     chunk_size: int = 1000  # bytes
     chunk_overlap: int = 300  # bytes
+    # Pipeline concurrency (see cocosearch.indexer.pipeline)
+    chunk_workers: int = Field(default=2, ge=1)  # chunking + symbol extraction
+    # Processes for the chunk stage's CPU work (chunking, symbols, tsvector
+    # input); 0 = run it on the chunk_workers threads.
+    chunk_processes: int = Field(default=0, ge=0)
+    embed_workers: int = Field(default=8, ge=1)  # files being embedded at once
+    # Embedding scheduler (see cocosearch.indexer.embed_scheduler)
+    embed_concurrency: int = Field(default=2, ge=1)  # requests in flight
+    embed_batch_max_items: int = Field(default=128, ge=1)  # texts per request
+    embed_batch_max_kb: int = Field(default=256, ge=1)  # adaptive size ceiling
+    queue_size: int = Field(default=8, ge=1)  # files buffered between stages
+    write_batch_size: int = Field(default=64, ge=1)  # files per COPY + commit
+    max_inflight_mb: int = Field(default=256, ge=0)  # file content in flight; 0 = off
+    chunk_diff: bool = True  # re-embed only changed chunks of modified files
+    # Content hash for change detection; "xxh3" is non-cryptographic and much
+    # faster (uses the optional xxhash package, else BLAKE2b).
+    hash_algorithm: HashAlgorithm = "sha256"
+    # Vector index, built after the load (see cocosearch.indexer.vector_index)
+    vector_index: Literal["ivfflat", "hnsw"] = "ivfflat"
+    hnsw_m: int = Field(default=16, ge=2)
+    hnsw_ef_construction: int = Field(default=64, ge=4)
+    # Index a halfvec or binary-quantized copy of the embedding; search
+    # re-ranks candidates on the full vectors. Needed above 2000 dims.
+    # Shrinks the index only; the table keeps the full vectors.
+    vector_quantization: Literal["none", "halfvec", "binary"] = "none"
+    index_build_work_mem_mb: int = Field(default=512, ge=64)  # maintenance_work_mem
+    index_build_parallel_workers: int = Field(default=2, ge=0)
+    # Shared embedding cache (see cocosearch.indexer.embedding_cache)
+    embedding_cache: bool = True
+    embedding_cache_max_entries: int = Field(default=2_000_000, ge=0)
+    embedding_cache_max_age_days: int = Field(default=90, ge=1)
 
 
 def load_config(codebase_path: str) -> IndexingConfig:
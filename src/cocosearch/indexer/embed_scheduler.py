@@ -0,0 +1,303 @@
+"""Coalescing, concurrent embedding scheduler for indexing.
+
+The pipeline's embed workers each used to call ``embed_batch`` for one file
+at a time, so a small file meant a tiny request and every request waited
+for the previous one. :class:`EmbeddingScheduler` sits between the embed
+workers and the embedding provider:
+
+- Texts submitted by concurrent callers are coalesced into batches sized by
+  total bytes (a cheap stand-in for tokens, ~4 bytes per token) and item
+  count, so chunks of many small files share one request.
+- Up to ``concurrency`` requests are in flight at once. Requests run on
+  threads, like the rest of the pipeline; ``litellm.embedding`` is blocking.
+- The byte target adapts: fast, successful requests grow it, slow requests
+  and transient errors (rate limits, timeouts, connection errors) shrink it.
+- Transient errors are retried with exponential backoff. Any other error
+  splits the batch in halves, so one bad input fails only its own file.
+
+Callers block in :meth:`EmbeddingScheduler.embed` until all of their texts
+are embedded; results come back in input order.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import litellm
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str]], list[list[float]]]
+
+
+def _transient_errors() -> tuple[type[BaseException], ...]:
+    """Exception types worth retrying unchanged after a pause."""
+    names = (
+        "RateLimitError",
+        "Timeout",
+        "APIConnectionError",
+        "ServiceUnavailableError",
+        "InternalServerError",
+    )
+    found = [getattr(litellm, name, None) for name in names]
+    return (ConnectionError, TimeoutError, *(t for t in found if t is not None))
+
+
+_TRANSIENT_ERRORS = _transient_errors()
+
+
+@dataclass
+class SchedulerStats:
+    """Counters for one scheduler's lifetime."""
+
+    requests: int = 0
+    texts: int = 0
+    retries: int = 0
+    splits: int = 0
+    failed_texts: int = 0
+
+
+@dataclass
+class _Pending:
+    text: str
+    size: int
+    future: Future
+
+
+class EmbeddingScheduler:
+    """Batch embedding requests across callers and keep several in flight.
+
+    Args:
+        embed_fn: Function embedding one batch of texts in one request
+            (typically :func:`cocosearch.indexer.embedder.embed_batch`).
+        concurrency: Maximum number of requests in flight.
+        max_batch_items: Upper bound on texts per request.
+        max_batch_bytes: Upper bound for the adaptive byte target.
+        min_batch_bytes: Lower bound for the adaptive byte target.
+        target_latency: Requests slower than this (seconds) shrink the
+            byte target; requests faster than half of it grow it.
+        max_retries: Retries of a batch after a transient error.
+        backoff: Initial retry delay in seconds, doubled on each retry.
+        linger: Seconds to wait for more texts before sending a batch that
+            is below the byte target.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        *,
+        concurrency: int = 2,
+        max_batch_items: int = 128,
+        max_batch_bytes: int = 256 * 1024,
+        min_batch_bytes: int = 8 * 1024,
+        target_latency: float = 2.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        linger: float = 0.01,
+    ):
+        self._embed_fn = embed_fn
+        self._max_items = max(1, max_batch_items)
+        self._max_bytes = max(1, max_batch_bytes)
+        self._min_bytes = max(1, min(min_batch_bytes, self._max_bytes))
+        self._target_bytes = self._max_bytes // 2 or 1
+        self._target_latency = target_latency
+        self._max_retries = max(0, max_retries)
+        self._backoff = backoff
+        self._linger = linger
+        self.stats = SchedulerStats()
+
+        self._cond = threading.Condition()
+        self._pending: deque[_Pending] = deque()
+        self._pending_bytes = 0
+        self._closed = False
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, concurrency), thread_name_prefix="cocosearch-embed-req"
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="cocosearch-embed-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    @property
+    def target_bytes(self) -> int:
+        """Current adaptive byte target per request."""
+        with self._cond:
+            return self._target_bytes
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed ``texts``, sharing requests with other callers.
+
+        Blocks until every text is embedded. Raises the error of the first
+        text that could not be embedded.
+        """
+        if not texts:
+            return []
+        futures: list[Future] = []
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("EmbeddingScheduler is closed")
+            for text in texts:
+                fut: Future = Future()
+                size = len(text.encode("utf-8"))
+                self._pending.append(_Pending(text, size, fut))
+                self._pending_bytes += size
+                futures.append(fut)
+            self._cond.notify_all()
+        return [fut.result() for fut in futures]
+
+    def close(self) -> None:
+        """Send what is still queued, wait for in-flight requests, stop."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "EmbeddingScheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- dispatching -------------------------------------------------------
+
+    def _dispatch(self) -> None:
+        while True:
+            # Take a slot first: while every request is in flight, texts keep
+            # accumulating into the next (fuller) batch.
+            self._slots.acquire()
+            batch = self._next_batch()
+            if batch is None:
+                self._slots.release()
+                return
+            try:
+                self._pool.submit(self._run_slot, batch)
+            except RuntimeError as e:  # pragma: no cover - pool shut down
+                self._slots.release()
+                _fail(batch, e)
+
+    def _next_batch(self) -> list[_Pending] | None:
+        """Wait for texts and take one batch; None once closed and drained."""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            # Linger briefly so concurrent callers can fill the batch.
+            deadline = time.monotonic() + self._linger
+            while (
+                not self._closed
+                and self._pending_bytes < self._target_bytes
+                and len(self._pending) < self._max_items
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch: list[_Pending] = []
+            size = 0
+            while self._pending and len(batch) < self._max_items:
+                if batch and size + self._pending[0].size > self._target_bytes:
+                    break
+                item = self._pending.popleft()
+                self._pending_bytes -= item.size
+                size += item.size
+                batch.append(item)
+            return batch
+
+    def _run_slot(self, batch: list[_Pending]) -> None:
+        try:
+            self._run(batch)
+        except BaseException as e:  # pragma: no cover - defensive
+            _fail(batch, e)
+        finally:
+            self._slots.release()
+
+    def _run(self, batch: list[_Pending]) -> None:
+        texts = [p.text for p in batch]
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                vectors = self._embed_fn(texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(
+                        f"embedding provider returned {len(vectors)} vectors "
+                        f"for {len(texts)} inputs"
+                    )
+            except _TRANSIENT_ERRORS as e:
+                self._shrink(0.5)
+                if attempt >= self._max_retries:
+                    logger.warning(
+                        "Embedding request for %d texts failed after %d retries: %s",
+                        len(texts),
+                        attempt,
+                        e,
+                    )
+                    self._record(failed_texts=len(batch))
+                    _fail(batch, e)
+                    return
+                delay = self._backoff * (2**attempt)
+                attempt += 1
+                self._record(retries=1)
+                logger.debug(
+                    "Embedding request failed (%s), retrying in %.1fs", e, delay
+                )
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                if len(batch) == 1:
+                    self._record(failed_texts=1)
+                    _fail(batch, e)
+                    return
+                # Probably one bad input: split so the rest still succeeds.
+                self._record(splits=1)
+                mid = len(batch) // 2
+                self._run(batch[:mid])
+                self._run(batch[mid:])
+                return
+
+            self._record(requests=1, texts=len(texts))
+            self._adapt(time.monotonic() - started, sum(p.size for p in batch))
+            for pending, vector in zip(batch, vectors):
+                pending.future.set_result(vector)
+            return
+
+    # -- adaptation --------------------------------------------------------
+
+    def _adapt(self, latency: float, sent_bytes: int) -> None:
+        with self._cond:
+            if latency > self._target_latency:
+                self._target_bytes = max(
+                    self._min_bytes, int(self._target_bytes * 0.75)
+                )
+            elif (
+                latency < self._target_latency / 2
+                and sent_bytes >= self._target_bytes * 0.9
+            ):
+                # Only a full batch tells us the server could take more.
+                self._target_bytes = min(self._max_bytes, int(self._target_bytes * 1.5))
+
+    def _shrink(self, factor: float) -> None:
+        with self._cond:
+            self._target_bytes = max(self._min_bytes, int(self._target_bytes * factor))
+
+    def _record(self, **counts: int) -> None:
+        with self._cond:
+            for name, n in counts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + n)
+
+
+def _fail(batch: list[_Pending], exc: BaseException) -> None:
+    for pending in batch:
+        if not pending.future.done():
+            pending.future.set_exception(exc)
+
+
+__all__ = ["EmbeddingScheduler", "SchedulerStats"]
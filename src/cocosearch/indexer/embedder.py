@@ -4,6 +4,8 @@ Provides shared embedding functions used by both indexing and search
 to ensure consistent embeddings. Uses LiteLLM for provider abstraction.
 """
 
+import asyncio
+import math
 import os
 
 import litellm
@@ -55,6 +57,13 @@ def extract_language(filename: str, content: str) -> str:
     return ext[1:] if ext else ""
 
 
+# Embedding input for a chunk is FILENAME_CONTEXT_PREFIX + filename +
+# FILENAME_CONTEXT_SEPARATOR + text. Search rebuilds it in SQL to look up
+# cached full vectors, so both sides must use these constants.
+FILENAME_CONTEXT_PREFIX = "File: "
+FILENAME_CONTEXT_SEPARATOR = "\n"
+
+
 def add_filename_context(text: str, filename: str) -> str:
     """Prepend filename context to text for embedding generation.
 
@@ -72,7 +81,7 @@ def add_filename_context(text: str, filename: str) -> str:
         Text with filename prefix, or original text if filename is empty.
     """
     if filename:
-        return f"File: {filename}\n{text}"
+        return f"{FILENAME_CONTEXT_PREFIX}{filename}{FILENAME_CONTEXT_SEPARATOR}{text}"
     return text
 
 
@@ -85,7 +94,7 @@ _KNOWN_DIMENSIONS: dict[str, int] = {
 }
 
 
-def _resolve_output_dimension(model: str) -> int | None:
+def resolve_output_dimension(model: str) -> int | None:
     """Resolve embedding output dimension from env var or known models map.
 
     Priority: COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION env var > known map > None.
@@ -96,6 +105,53 @@ def _resolve_output_dimension(model: str) -> int | None:
     return _KNOWN_DIMENSIONS.get(model)
 
 
+def resolve_stored_dimension() -> int | None:
+    """Resolve the dimension embeddings are stored at.
+
+    Set through COCOSEARCH_EMBEDDING_STORED_DIMENSION (``embedding.storedDimension``
+    in cocosearch.yaml). None stores vectors as the model returns them.
+    """
+    stored_dim_str = os.environ.get("COCOSEARCH_EMBEDDING_STORED_DIMENSION")
+    if stored_dim_str and int(stored_dim_str) > 0:
+        return int(stored_dim_str)
+    return None
+
+
+def full_dimension_rerank_enabled() -> bool:
+    """Whether search re-ranks truncated-vector candidates at full dimension.
+
+    Set through COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK
+    (``embedding.fullDimensionRerank`` in cocosearch.yaml).
+    """
+    value = os.environ.get("COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK", "")
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def truncate_embedding(vector: list[float], dimension: int | None) -> list[float]:
+    """Shorten an embedding to ``dimension`` components (Matryoshka truncation).
+
+    Models trained for it (nomic-embed-text v1.5, text-embedding-3-*) keep
+    most of their quality in a prefix of the vector. The prefix is
+    re-normalized to unit length so cosine and inner-product distances stay
+    comparable with full vectors. Vectors already at or below ``dimension``
+    are returned unchanged.
+
+    Args:
+        vector: Full embedding.
+        dimension: Target dimension, or None to keep the full vector.
+
+    Returns:
+        The (possibly) truncated, unit-length vector.
+    """
+    if not dimension or len(vector) <= dimension:
+        return vector
+    prefix = vector[:dimension]
+    norm = math.sqrt(sum(x * x for x in prefix))
+    if norm == 0.0:
+        return prefix
+    return [x / norm for x in prefix]
+
+
 def _default_model(provider: str) -> str:
     """Return the default embedding model for a provider."""
     from cocosearch.config.schema import default_model_for_provider
@@ -143,6 +199,14 @@ def _get_litellm_kwargs() -> dict:
     return kwargs
 
 
+def _query_embedding_cache():
+    """Return (query-embedding cache, key of the current embedding config)."""
+    from cocosearch.indexer.embedding_cache import embedding_cache_key
+    from cocosearch.search.query_embeddings import get_query_embedding_cache
+
+    return get_query_embedding_cache(), embedding_cache_key()
+
+
 def embed_query(text: str) -> list[float]:
     """Embed a single text for search queries.
 
@@ -150,17 +214,59 @@ def embed_query(text: str) -> list[float]:
     This function is used by the search side (query.py, hybrid.py, multi.py)
     to embed search queries without needing a CocoIndex runtime.
 
+    Repeated queries are answered from the query-embedding cache
+    (:mod:`cocosearch.search.query_embeddings`) without calling the provider.
+
     Args:
         text: Text to embed.
 
     Returns:
         Embedding vector as list of floats.
     """
+    cache, key = _query_embedding_cache()
+    cached = cache.get(key, text)
+    if cached is not None:
+        return cached
+
     model = _get_litellm_model()
     kwargs = _get_litellm_kwargs()
 
     response = litellm.embedding(model=model, input=[text], **kwargs)
-    return [float(x) for x in response.data[0]["embedding"]]
+    embedding = [float(x) for x in response.data[0]["embedding"]]
+    cache.put(key, text, embedding)
+    return embedding
+
+
+async def embed_query_async(text: str) -> list[float]:
+    """Embed a single text for search queries without blocking the event loop.
+
+    Async counterpart of :func:`embed_query` (``litellm.aembedding``), used
+    by the async search path of the MCP server. Shares its query-embedding
+    cache, whose disk tier is read and written in a worker thread.
+
+    Args:
+        text: Text to embed.
+
+    Returns:
+        Embedding vector as list of floats.
+    """
+    cache, key = _query_embedding_cache()
+    # The SQLite tier can wait on another process's write lock; only the
+    # memory tier is consulted on the loop.
+    cached = cache.get_memory(key, text)
+    if cached is None:
+        cached = await asyncio.to_thread(cache.get_disk, key, text)
+    if cached is not None:
+        return cached
+
+    model = _get_litellm_model()
+    kwargs = _get_litellm_kwargs()
+
+    response = await litellm.aembedding(model=model, input=[text], **kwargs)
+    embedding = [float(x) for x in response.data[0]["embedding"]]
+    cache.remember(key, text, embedding)
+    await asyncio.to_thread(cache.store, key, text, embedding)
+    return embedding
 
 
 _EMBEDDING_BATCH_SIZE = 128
@@ -0,0 +1,258 @@
+"""Content-addressed embedding cache for the indexer.
+
+Embeddings are a pure function of (provider, model, output dimension, input
+text), so they are cached in one shared table keyed by exactly that, with
+the text reduced to the SHA-256 of the string actually sent to the model
+(i.e. after ``add_filename_context``). Because the table is not tied to an
+index:
+
+- re-indexing a changed file only embeds chunks whose text changed,
+- ``--fresh`` and ``_clean_tables`` (which never drop this table) reuse
+  every vector as long as the model is unchanged,
+- worktrees and sibling indexes of the same code pay embedding cost once.
+
+Entries record ``last_used_at`` and :meth:`EmbeddingCache.evict` removes
+entries unused for ``max_age_days`` and trims the table to ``max_entries``.
+
+Cache errors are never fatal: on any database error the cache disables
+itself for the rest of the run and indexing falls back to plain embedding.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+CACHE_TABLE = "cocosearch_embedding_cache"
+
+# Refresh last_used_at on hits at most this often, so warm re-indexes do not
+# rewrite every cache row.
+_TOUCH_INTERVAL = "1 day"
+
+
+def _get_cs_log():
+    from cocosearch.logging import cs_log
+
+    return cs_log
+
+
+def ensure_embedding_cache_table(conn) -> None:
+    """Create the shared embedding cache table if it doesn't exist."""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {CACHE_TABLE} ("
+            "  provider TEXT NOT NULL,"
+            "  model TEXT NOT NULL,"
+            "  dimension INTEGER NOT NULL,"
+            "  input_hash TEXT NOT NULL,"
+            "  embedding VECTOR NOT NULL,"
+            "  created_at TIMESTAMPTZ DEFAULT now(),"
+            "  last_used_at TIMESTAMPTZ DEFAULT now(),"
+            "  PRIMARY KEY (provider, model, dimension, input_hash)"
+            ")"
+        )
+        cur.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{CACHE_TABLE}_last_used "
+            f"ON {CACHE_TABLE} (last_used_at)"
+        )
+    conn.commit()
+
+
+def hash_embedding_input(text: str) -> str:
+    """Return the cache key digest for an exact embedding input string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def to_floats(value) -> list[float]:
+    """Convert a loaded pgvector value (Vector or ndarray) to a float list."""
+    if hasattr(value, "to_list"):
+        return [float(x) for x in value.to_list()]
+    if hasattr(value, "tolist"):
+        return [float(x) for x in value.tolist()]
+    return [float(x) for x in value]
+
+
+class EmbeddingCache:
+    """Shared embedding cache backed by :data:`CACHE_TABLE`.
+
+    Thread-safe: the embed stage runs on several workers, so access to the
+    single autocommit connection is serialized with a lock. Each lookup and
+    store is one round-trip per file, small next to the embedding call.
+
+    Args:
+        conn: psycopg connection (autocommit, pgvector registered).
+        provider: Embedding provider name.
+        model: Embedding model name.
+        dimension: Requested output dimension, or 0 for the model's native
+            dimension.
+    """
+
+    def __init__(self, conn, provider: str, model: str, dimension: int = 0):
+        self._conn = conn
+        self._key = (provider, model, int(dimension or 0))
+        self._lock = threading.Lock()
+        self._enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def _disable(self, exc: Exception) -> None:
+        if self._enabled:
+            logger.warning("Embedding cache disabled for this run: %s", exc)
+        self._enabled = False
+
+    def embed(
+        self,
+        texts: list[str],
+        embed_fn: Callable[[list[str]], list[list[float]]],
+    ) -> list[list[float]]:
+        """Embed ``texts``, calling ``embed_fn`` only for cache misses.
+
+        Results are returned in input order. Newly computed embeddings are
+        stored for future runs.
+        """
+        if not texts:
+            return []
+        if not self._enabled:
+            return embed_fn(texts)
+
+        digests = [hash_embedding_input(t) for t in texts]
+        found = self._lookup(digests)
+
+        missing = [i for i, d in enumerate(digests) if d not in found]
+        with self._lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            # Identical inputs within one batch are embedded once.
+            unique: dict[str, str] = {}
+            for i in missing:
+                unique.setdefault(digests[i], texts[i])
+            computed = embed_fn(list(unique.values()))
+            fresh = dict(zip(unique.keys(), computed))
+            found.update(fresh)
+            self._store(fresh)
+
+        return [found[d] for d in digests]
+
+    def _lookup(self, digests: list[str]) -> dict[str, list[float]]:
+        provider, model, dimension = self._key
+        try:
+            with self._lock, self._conn.cursor() as cur:
+                cur.execute(
+                    f"SELECT input_hash, embedding FROM {CACHE_TABLE}"
+                    " WHERE provider = %s AND model = %s AND dimension = %s"
+                    " AND input_hash = ANY(%s)",
+                    (provider, model, dimension, list(set(digests))),
+                )
+                rows = cur.fetchall()
+                if rows:
+                    cur.execute(
+                        f"UPDATE {CACHE_TABLE} SET last_used_at = now()"
+                        " WHERE provider = %s AND model = %s AND dimension = %s"
+                        " AND input_hash = ANY(%s)"
+                        f" AND last_used_at < now() - interval '{_TOUCH_INTERVAL}'",
+                        (provider, model, dimension, [r[0] for r in rows]),
+                    )
+        except Exception as e:
+            self._disable(e)
+            return {}
+        return {digest: to_floats(emb) for digest, emb in rows}
+
+    def _store(self, embeddings: dict[str, list[float]]) -> None:
+        if not self._enabled or not embeddings:
+            return
+        provider, model, dimension = self._key
+        try:
+            with self._lock, self._conn.cursor() as cur:
+                cur.executemany(
+                    f"INSERT INTO {CACHE_TABLE}"
+                    " (provider, model, dimension, input_hash, embedding)"
+                    " VALUES (%s, %s, %s, %s, %s)"
+                    " ON CONFLICT DO NOTHING",
+                    [
+                        (provider, model, dimension, digest, emb)
+                        for digest, emb in embeddings.items()
+                    ],
+                )
+        except Exception as e:
+            self._disable(e)
+
+    def evict(self, max_entries: int, max_age_days: int) -> int:
+        """Drop stale entries, then trim to ``max_entries`` (all models).
+
+        Returns the number of rows removed.
+        """
+        if not self._enabled:
+            return 0
+        removed = 0
+        try:
+            with self._lock, self._conn.cursor() as cur:
+                cur.execute(
+                    f"DELETE FROM {CACHE_TABLE}"
+                    " WHERE last_used_at < now() - make_interval(days => %s)",
+                    (max_age_days,),
+                )
+                removed += max(cur.rowcount or 0, 0)
+                # The planner's row estimate is free; only pay for the
+                # ordered trim when the table may be over the cap.
+                cur.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    (CACHE_TABLE,),
+                )
+                row = cur.fetchone()
+                if row is None or row[0] is None or row[0] <= max_entries:
+                    return removed
+                cur.execute(
+                    f"DELETE FROM {CACHE_TABLE} WHERE ctid IN ("
+                    f"  SELECT ctid FROM {CACHE_TABLE}"
+                    "   ORDER BY last_used_at DESC OFFSET %s"
+                    ")",
+                    (max_entries,),
+                )
+                removed += max(cur.rowcount or 0, 0)
+        except Exception as e:
+            self._disable(e)
+        return removed
+
+    def log_stats(self, index_name: str) -> None:
+        """Emit hit/miss counters for this run."""
+        if self.hits or self.misses:
+            _get_cs_log().cache(
+                "Embedding cache stats",
+                index=index_name,
+                hits=self.hits,
+                misses=self.misses,
+            )
+
+
+def embedding_cache_key() -> tuple[str, str, int]:
+    """Return (provider, model, dimension) for the current embedding config."""
+    from cocosearch.config.schema import default_model_for_provider
+    from cocosearch.indexer.embedder import resolve_output_dimension
+
+    provider = os.environ.get("COCOSEARCH_EMBEDDING_PROVIDER", "ollama")
+    model = os.environ.get(
+        "COCOSEARCH_EMBEDDING_MODEL", default_model_for_provider(provider)
+    )
+    dimension = 0
+    if os.environ.get("COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION"):
+        dimension = resolve_output_dimension(model) or 0
+    return provider, model, dimension
+
+
+__all__ = [
+    "CACHE_TABLE",
+    "EmbeddingCache",
+    "embedding_cache_key",
+    "ensure_embedding_cache_table",
+    "hash_embedding_input",
+    "to_floats",
+]
@@ -1,7 +1,13 @@
 """File filtering module for cocosearch indexer."""
 
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
 
+import pathspec
+
 # Default exclusion patterns for common generated/vendored directories.
 # Note: include_patterns already restricts indexed files by extension,
 # so dotfiles like .gitlab-ci.yml or .github/workflows/*.yml are only
@@ -28,22 +34,13 @@ DEFAULT_EXCLUDES: list[str] = [
 ]
 
 
-def load_gitignore_patterns(codebase_path: str) -> list[str]:
-    """Load patterns from .gitignore file if it exists.
-
-    Args:
-        codebase_path: Path to the codebase root directory.
-
-    Returns:
-        List of gitignore pattern lines (stripped, non-empty, non-comment).
-    """
-    gitignore_path = Path(codebase_path) / ".gitignore"
-
-    if not gitignore_path.exists():
+def _read_ignore_file(path: Path) -> list[str]:
+    """Read gitignore-style pattern lines (stripped, non-empty, non-comment)."""
+    if not path.exists():
         return []
 
     try:
-        with open(gitignore_path, "r") as f:
+        with open(path, "r") as f:
             lines = f.readlines()
 
         patterns = []
@@ -58,6 +55,35 @@ def load_gitignore_patterns(codebase_path: str) -> list[str]:
         return []
 
 
+def load_gitignore_patterns(codebase_path: str) -> list[str]:
+    """Load patterns from .gitignore file if it exists.
+
+    Only the root ``.gitignore``; nested ones are applied by
+    :func:`walk_codebase` relative to their own directory.
+
+    Args:
+        codebase_path: Path to the codebase root directory.
+
+    Returns:
+        List of gitignore pattern lines (stripped, non-empty, non-comment).
+    """
+    return _read_ignore_file(Path(codebase_path) / ".gitignore")
+
+
+def load_git_info_exclude_patterns(codebase_path: str) -> list[str]:
+    """Load patterns from ``.git/info/exclude`` if it exists.
+
+    These are anchored at the repository root, like the root ``.gitignore``.
+
+    Args:
+        codebase_path: Path to the codebase root directory.
+
+    Returns:
+        List of pattern lines (stripped, non-empty, non-comment).
+    """
+    return _read_ignore_file(Path(codebase_path) / ".git" / "info" / "exclude")
+
+
 def build_exclude_patterns(
     codebase_path: str,
     user_excludes: list[str] | None = None,
@@ -65,7 +91,9 @@ def build_exclude_patterns(
 ) -> list[str]:
     """Build combined exclusion pattern list.
 
-    Combines default excludes, .gitignore patterns, and user-specified excludes.
+    Combines default excludes, root .gitignore and .git/info/exclude patterns,
+    and user-specified excludes. Nested .gitignore files are not included
+    here; :func:`walk_codebase` applies them relative to their directory.
 
     Args:
         codebase_path: Path to the codebase root directory.
@@ -78,6 +106,7 @@ def build_exclude_patterns(
     patterns = list(DEFAULT_EXCLUDES)
 
     if respect_gitignore:
+        patterns.extend(load_git_info_exclude_patterns(codebase_path))
         gitignore_patterns = load_gitignore_patterns(codebase_path)
         patterns.extend(gitignore_patterns)
 
@@ -88,3 +117,128 @@ def build_exclude_patterns(
     filtered = [p for p in patterns if p and not p.startswith("#")]
 
     return filtered
+
+
+@dataclass
+class WalkStats:
+    """Counters filled in by :func:`walk_codebase`.
+
+    Attributes:
+        files: Files yielded.
+        dirs: Directories scanned.
+        pruned_dirs: Directories skipped without descending into them.
+        seconds: Time spent inside the walker (excludes consumer time).
+    """
+
+    files: int = 0
+    dirs: int = 0
+    pruned_dirs: int = 0
+    seconds: float = 0.0
+
+
+def _spec(patterns: list[str]) -> pathspec.PathSpec | None:
+    return pathspec.PathSpec.from_lines("gitignore", patterns) if patterns else None
+
+
+def _is_ignored(
+    rel: str,
+    root_spec: pathspec.PathSpec | None,
+    nested: list[tuple[str, pathspec.PathSpec]],
+) -> bool:
+    """Apply root patterns, then nested .gitignore specs from shallow to deep.
+
+    As in git, the deepest file with a matching rule (including ``!`` negation)
+    decides. Nested patterns are matched relative to their own directory.
+    """
+    ignored = False
+    if root_spec is not None:
+        ignored = bool(root_spec.check_file(rel).include)
+    for base, spec in nested:
+        result = spec.check_file(rel[len(base) + 1 :]).include
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def walk_codebase(
+    codebase_path: str,
+    include_patterns: list[str],
+    exclude_patterns: list[str],
+    respect_gitignore: bool = True,
+    stats: WalkStats | None = None,
+) -> Iterator[tuple[str, os.stat_result]]:
+    """Lazily yield ``(relative_path, stat)`` for every file to index.
+
+    Uses ``os.scandir`` and checks each directory against the exclude
+    patterns *before* descending, so trees like ``node_modules`` or ``.venv``
+    are never listed. Include patterns apply to files only. Symlinked
+    directories are not followed (as with ``Path.rglob``).
+
+    Args:
+        codebase_path: Path to the codebase root directory.
+        include_patterns: Gitignore-style patterns a file must match.
+        exclude_patterns: Root-anchored exclude patterns, typically from
+            :func:`build_exclude_patterns`.
+        respect_gitignore: Also apply ``.gitignore`` files found in
+            subdirectories, anchored at their directory.
+        stats: Optional :class:`WalkStats` updated while walking.
+
+    Yields:
+        Tuples of POSIX-style relative path and the file's ``os.stat_result``.
+    """
+    if stats is None:
+        stats = WalkStats()
+    root = str(Path(codebase_path).resolve())
+    include_spec = _spec(include_patterns)
+    root_spec = _spec(exclude_patterns)
+
+    # Stack of (relative dir, nested .gitignore specs in effect for it).
+    pending: list[tuple[str, list[tuple[str, pathspec.PathSpec]]]] = [("", [])]
+    started = time.perf_counter()
+    try:
+        while pending:
+            rel_dir, nested = pending.pop()
+            abs_dir = os.path.join(root, rel_dir) if rel_dir else root
+            if respect_gitignore and rel_dir:
+                spec = _spec(_read_ignore_file(Path(abs_dir) / ".gitignore"))
+                if spec is not None:
+                    nested = [*nested, (rel_dir, spec)]
+            try:
+                with os.scandir(abs_dir) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            stats.dirs += 1
+
+            subdirs: list[str] = []
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if _is_ignored(rel + "/", root_spec, nested):
+                            stats.pruned_dirs += 1
+                        else:
+                            subdirs.append(rel)
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if include_spec and not include_spec.match_file(rel):
+                        continue
+                    if _is_ignored(rel, root_spec, nested):
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+
+                stats.files += 1
+                stats.seconds += time.perf_counter() - started
+                try:
+                    yield rel, st
+                finally:
+                    # Consumer time between resumes is not walk time.
+                    started = time.perf_counter()
+
+            # Reversed so the stack pops subdirectories in sorted order.
+            pending.extend((d, nested) for d in reversed(subdirs))
+    finally:
+        stats.seconds += time.perf_counter() - started
@@ -6,20 +6,34 @@ Indexes a codebase by:
 3. Generating embeddings via LiteLLM
 4. Storing results in PostgreSQL with pgvector indexes
 
-Incremental indexing: SHA-256 content hashes track file changes so only
-new/modified files are re-embedded on subsequent runs.
+Steps 2-4 run as a pipeline of worker pools connected by bounded queues
+(``cocosearch.indexer.pipeline``), so the stages work on different files
+concurrently instead of waiting on each other. With
+``IndexingConfig.chunk_processes`` the CPU-bound part of step 2 runs in a
+process pool so it is not limited to one core by the GIL.
+
+Incremental indexing: content hashes track file changes so only
+new/modified files are re-embedded on subsequent runs. Files whose
+size/mtime/inode are unchanged since the last run are not even read
+(``cocosearch.indexer.change_detection``).
 """
 
-import hashlib
+import bisect
+import contextlib
+import dataclasses
+import multiprocessing
 import os
 import pathlib
 import logging
+import threading
+import time
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 
-import pathspec
 import psycopg
 from pgvector.psycopg import register_vector
-from psycopg.types.range import Range
+from tree_sitter import Tree
 
 from cocoindex.ops.text import RecursiveSplitter
 
@@ -30,17 +44,52 @@ from cocosearch.indexer.embedder import (
     extract_language,
     add_filename_context,
     embed_batch,
-    _resolve_output_dimension,
+    truncate_embedding,
+    resolve_output_dimension,
+    resolve_stored_dimension,
 )
 from cocosearch.indexer.tsvector import text_to_tsvector_sql
 from cocosearch.handlers import get_custom_languages, extract_chunk_metadata
-from cocosearch.indexer.file_filter import build_exclude_patterns
-from cocosearch.indexer.symbols import extract_symbol_metadata
+from cocosearch.indexer.change_detection import (
+    FileStat,
+    HashAlgorithm,
+    file_stat,
+    hash_content,
+    load_tracked_files,
+    stat_unchanged,
+)
+from cocosearch.indexer.chunk_diff import ChunkDiff, diff_chunks, load_stored_chunks
+from cocosearch.indexer.embed_scheduler import EmbedFn, EmbeddingScheduler
+from cocosearch.indexer.embedding_cache import (
+    EmbeddingCache,
+    embedding_cache_key,
+    ensure_embedding_cache_table,
+)
+from cocosearch.indexer.file_filter import (
+    WalkStats,
+    build_exclude_patterns,
+    walk_codebase,
+)
+from cocosearch.indexer.symbols import extract_file_symbols, symbols_in_range
+from cocosearch.ts_parsers import get_parser
+from cocosearch.ts_scopes import (
+    DEFINITION_NODE_TYPES,
+    definition_range,
+    language_for_path,
+)
 from cocosearch.indexer.schema_migration import (
     ensure_symbol_columns,
     ensure_parse_results_table,
 )
 from cocosearch.indexer.parse_tracking import track_parse_results
+from cocosearch.indexer.pipeline import MemoryBudget, Stage, run_pipeline
+from cocosearch.indexer.vector_index import (
+    drop_vector_index,
+    embedding_column_dimension,
+    ensure_vector_index,
+    table_has_rows,
+)
+from cocosearch.indexer.writer import BulkWriter, copy_chunk_rows
 from cocosearch.search.cache import invalidate_index_cache
 from cocosearch.validation import validate_index_name
 
@@ -59,7 +108,11 @@ def get_table_name(index_name: str) -> str:
 
 
 def _ensure_chunks_table(conn, table_name: str, embedding_dim: int) -> None:
-    """Create the chunks table and vector index if they don't exist."""
+    """Create the chunks table if it doesn't exist.
+
+    The vector index is built after rows are loaded (see
+    :func:`cocosearch.indexer.vector_index.ensure_vector_index`).
+    """
     with conn.cursor() as cur:
         cur.execute(
             f"CREATE TABLE IF NOT EXISTS {table_name} ("
@@ -74,12 +127,21 @@ def _ensure_chunks_table(conn, table_name: str, embedding_dim: int) -> None:
             "  symbol_type TEXT,"
             "  symbol_name TEXT,"
             "  symbol_signature TEXT,"
+            "  start_line INTEGER,"
+            "  end_line INTEGER,"
+            "  scope_start_line INTEGER,"
+            "  scope_end_line INTEGER,"
             "  PRIMARY KEY (filename, location)"
             ")"
         )
+        # Line and scope columns; NULL on rows written by older versions, for
+        # which search falls back to reading and parsing the source file.
         cur.execute(
-            f"CREATE INDEX IF NOT EXISTS idx_{table_name}_embedding "
-            f"ON {table_name} USING ivfflat (embedding vector_cosine_ops)"
+            f"ALTER TABLE {table_name}"
+            "  ADD COLUMN IF NOT EXISTS start_line INTEGER,"
+            "  ADD COLUMN IF NOT EXISTS end_line INTEGER,"
+            "  ADD COLUMN IF NOT EXISTS scope_start_line INTEGER,"
+            "  ADD COLUMN IF NOT EXISTS scope_end_line INTEGER"
         )
     conn.commit()
 
@@ -95,22 +157,23 @@ def _ensure_tracking_table(conn, index_name: str) -> None:
             "  indexed_at TIMESTAMPTZ DEFAULT now()"
             ")"
         )
+        # Stat fast path columns (see change_detection); NULL on rows
+        # written by older versions, which are simply hashed once more.
+        cur.execute(
+            f"ALTER TABLE {tracking_table}"
+            "  ADD COLUMN IF NOT EXISTS size BIGINT,"
+            "  ADD COLUMN IF NOT EXISTS mtime_ns BIGINT,"
+            "  ADD COLUMN IF NOT EXISTS inode BIGINT"
+        )
     conn.commit()
 
 
-def _get_file_hashes(conn, index_name: str) -> dict[str, str]:
-    """Get stored content hashes for all tracked files."""
-    tracking_table = f"cocosearch_index_tracking_{index_name}"
-    with conn.cursor() as cur:
-        try:
-            cur.execute(f"SELECT filename, content_hash FROM {tracking_table}")
-            return dict(cur.fetchall())
-        except Exception:
-            return {}
-
-
 def _clean_tables(index_name: str, db_url: str) -> None:
-    """Drop all tables for an index (used by --fresh and clear_index)."""
+    """Drop all tables for an index (used by --fresh and clear_index).
+
+    The shared embedding cache is deliberately kept, so a fresh re-index with
+    an unchanged model does not pay for embeddings again.
+    """
     table_name = get_table_name(index_name)
     with psycopg.connect(db_url) as conn:
         with conn.cursor() as cur:
@@ -119,6 +182,7 @@ def _clean_tables(index_name: str, db_url: str) -> None:
             cur.execute(f"DROP TABLE IF EXISTS cocosearch_parse_results_{index_name}")
             cur.execute(f"DROP TABLE IF EXISTS cocosearch_deps_{index_name}")
             cur.execute(f"DROP TABLE IF EXISTS cocosearch_deps_tracking_{index_name}")
+            cur.execute(f"DROP TABLE IF EXISTS cocosearch_deps_impact_{index_name}")
             # Legacy v0 CocoIndex tables
             cur.execute(
                 f"DROP TABLE IF EXISTS codeindex_{index_name}__cocoindex_tracking"
@@ -138,53 +202,152 @@ def _walk_files(
     codebase_path: str,
     include_patterns: list[str],
     exclude_patterns: list[str],
-) -> dict[str, str]:
-    """Walk codebase and return {relative_path: content} for matching files."""
-    root = pathlib.Path(codebase_path).resolve()
-
-    include_spec = (
-        pathspec.PathSpec.from_lines("gitignore", include_patterns)
-        if include_patterns
-        else None
-    )
-    exclude_spec = (
-        pathspec.PathSpec.from_lines("gitignore", exclude_patterns)
-        if exclude_patterns
-        else None
-    )
+    respect_gitignore: bool = True,
+    stats: WalkStats | None = None,
+) -> dict[str, FileStat | None]:
+    """Walk codebase and return {relative_path: stat} for matching files.
+
+    No file content is read here. The stat is None when the file's mtime is
+    too recent to be trusted (see :func:`change_detection.file_stat`).
+    Directory pruning and nested .gitignore handling live in
+    :func:`cocosearch.indexer.file_filter.walk_codebase`.
+    """
+    walk_started_ns = time.time_ns()
+    return {
+        rel: file_stat(st, walk_started_ns)
+        for rel, st in walk_codebase(
+            codebase_path,
+            include_patterns,
+            exclude_patterns,
+            respect_gitignore=respect_gitignore,
+            stats=stats,
+        )
+    }
 
-    files: dict[str, str] = {}
-    for path in root.rglob("*"):
-        if not path.is_file():
-            continue
 
-        rel = str(path.relative_to(root))
+def _read_file(root: pathlib.Path, filename: str) -> str | None:
+    """Read a file as text, or return None if it cannot be read."""
+    try:
+        return (root / filename).read_text(encoding="utf-8", errors="replace")
+    except Exception:
+        return None
+
+
+@dataclass
+class PreparedChunk:
+    """A chunk with every column except its embedding computed."""
+
+    start_byte: int
+    end_byte: int
+    start_line: int
+    end_line: int
+    # Lines of the enclosing function/class (the chunk's own lines when it
+    # has none); None for languages without scope detection.
+    scope_start_line: int | None
+    scope_end_line: int | None
+    text: str
+    tsv_input: str
+    block_type: str
+    hierarchy: str
+    language_id: str
+    symbol_type: str | None
+    symbol_name: str | None
+    symbol_signature: str | None
+
+
+@dataclass
+class PreparedFile:
+    """A file travelling through the indexing pipeline."""
+
+    filename: str
+    content_hash: str
+    stat: FileStat | None = None
+    chunks: list[PreparedChunk] = field(default_factory=list)
+    embeddings: list[list[float] | None] | None = None
+    # Stored rows to diff against (files already in the index).
+    previously_indexed: bool = False
+    # Indices of chunks already stored verbatim (see chunk_diff); the
+    # writer leaves their rows alone and their embedding is None.
+    kept: set[int] = field(default_factory=set)
+    # Bytes held against the run's MemoryBudget while in flight.
+    budget_bytes: int = 0
+
+
+def _newline_offsets(data: bytes) -> list[int]:
+    """Byte offsets of every newline in UTF-8 ``data``, ascending."""
+    offsets = []
+    pos = data.find(b"\n")
+    while pos != -1:
+        offsets.append(pos)
+        pos = data.find(b"\n", pos + 1)
+    return offsets
+
+
+def _line_at(newlines: list[int], byte_offset: int) -> int:
+    """1-based line number of ``byte_offset``, given ``_newline_offsets``.
+
+    Same result as :func:`cocosearch.search.utils.byte_to_line` on the file.
+    """
+    return bisect.bisect_left(newlines, byte_offset) + 1
 
-        if include_spec and not include_spec.match_file(rel):
-            continue
-        if exclude_spec and exclude_spec.match_file(rel):
-            continue
 
-        try:
-            content = path.read_text(encoding="utf-8", errors="replace")
-            files[rel] = content
-        except Exception:
-            continue
+def _parse_for_scopes(filename: str, source: bytes) -> tuple[str, Tree] | None:
+    """Parse a file for enclosing-scope detection.
 
-    return files
+    Returns (tree-sitter language, tree), or None when the language has no
+    scope detection or the file cannot be parsed.
+    """
+    language = language_for_path(filename)
+    if language is None or language not in DEFINITION_NODE_TYPES:
+        return None
+    try:
+        return language, get_parser(language).parse(source)
+    except Exception as e:
+        logger.debug("Cannot parse %s for scopes: %s", filename, e)
+        return None
+
+
+def _scope_lines(
+    parsed: tuple[str, Tree] | None,
+    newlines: list[int],
+    start_line: int,
+    end_line: int,
+) -> tuple[int | None, int | None]:
+    """Lines of the definition enclosing a chunk, as context expansion finds it.
+
+    Looked up from the first byte of the chunk's first line; a chunk outside
+    any definition is its own scope.
+    """
+    if parsed is None:
+        return None, None
+    language, tree = parsed
+    line_start = newlines[start_line - 2] + 1 if start_line > 1 else 0
+    found = definition_range(tree, line_start, language)
+    if found is None:
+        return start_line, end_line
+    return _line_at(newlines, found[0]), _line_at(newlines, found[1])
 
 
-def _index_file(
-    conn,
-    table_name: str,
+def _prepare_chunks(
     filename: str,
     content: str,
     splitter: RecursiveSplitter,
     chunk_size: int,
     chunk_overlap: int,
-) -> int:
-    """Index a single file: chunk, embed, insert rows. Returns chunk count."""
+    project_path: pathlib.Path | None = None,
+) -> list[PreparedChunk]:
+    """Chunk a file and compute metadata, symbols and tsvector input per chunk.
+
+    CPU-bound stage of the pipeline; performs no I/O (symbol queries are
+    cached after their first use). The file is parsed once, for symbols and
+    enclosing scopes; each chunk takes the symbols defined in its byte range
+    and the definition around its first line. Line numbers come from one
+    table of newline offsets per file.
+    """
     language = extract_language(filename, content)
+    source = content.encode("utf-8")
+    parsed = _parse_for_scopes(filename, source)
+    file_symbols = extract_file_symbols(content, language, project_path, parsed)
 
     chunks = splitter.split(
         content,
@@ -193,44 +356,235 @@ def _index_file(
         language=language or None,
     )
 
+    newlines = _newline_offsets(source)
+    prepared: list[PreparedChunk] = []
+    for chunk in chunks:
+        metadata = extract_chunk_metadata(chunk.text, language)
+        symbol_meta = symbols_in_range(
+            file_symbols, chunk.start.byte_offset, chunk.end.byte_offset
+        )
+        start_line = _line_at(newlines, chunk.start.byte_offset)
+        end_line = _line_at(newlines, chunk.end.byte_offset)
+        scope_start_line, scope_end_line = _scope_lines(
+            parsed, newlines, start_line, end_line
+        )
+        prepared.append(
+            PreparedChunk(
+                start_byte=chunk.start.byte_offset,
+                end_byte=chunk.end.byte_offset,
+                start_line=start_line,
+                end_line=end_line,
+                scope_start_line=scope_start_line,
+                scope_end_line=scope_end_line,
+                text=chunk.text,
+                tsv_input=text_to_tsvector_sql(chunk.text, filename),
+                block_type=metadata.block_type,
+                hierarchy=metadata.hierarchy,
+                language_id=metadata.language_id,
+                symbol_type=symbol_meta.symbol_type,
+                symbol_name=symbol_meta.symbol_name,
+                symbol_signature=symbol_meta.symbol_signature,
+            )
+        )
+    return prepared
+
+
+def _prepare_file(
+    root: pathlib.Path,
+    filename: str,
+    hash_algorithm: HashAlgorithm,
+    chunk_size: int,
+    chunk_overlap: int,
+) -> tuple[str, list[PreparedChunk]] | None:
+    """Read, hash and chunk one file. Returns None if it cannot be read."""
+    content = _read_file(root, filename)
+    if content is None:
+        return None
+    chunks = _prepare_chunks(
+        filename, content, _get_splitter(), chunk_size, chunk_overlap, root
+    )
+    # Hash what is actually indexed; the file may have changed since the
+    # change-detection pass.
+    return hash_content(content, hash_algorithm), chunks
+
+
+_CHUNK_FIELDS = tuple(f.name for f in dataclasses.fields(PreparedChunk))
+
+
+def _prepare_file_in_process(
+    root: str,
+    filename: str,
+    hash_algorithm: HashAlgorithm,
+    chunk_size: int,
+    chunk_overlap: int,
+) -> tuple[str, list[tuple]] | None:
+    """Process-pool entry point for :func:`_prepare_file`.
+
+    The worker reads the file itself, so file content never crosses the
+    process boundary. Chunks come back as plain tuples in
+    :class:`PreparedChunk` field order, which pickle much smaller than
+    dataclass instances. Each worker process has its own thread-local
+    splitter and tree-sitter parsers (see :mod:`cocosearch.ts_parsers`).
+    """
+    prepared = _prepare_file(
+        pathlib.Path(root), filename, hash_algorithm, chunk_size, chunk_overlap
+    )
+    if prepared is None:
+        return None
+    content_hash, chunks = prepared
+    return content_hash, [
+        tuple(getattr(chunk, name) for name in _CHUNK_FIELDS) for chunk in chunks
+    ]
+
+
+def _embed_chunks(
+    filename: str,
+    chunks: list[PreparedChunk],
+    embedding_cache: EmbeddingCache | None = None,
+    embed_fn: EmbedFn | None = None,
+    dimension: int | None = None,
+) -> list[list[float]]:
+    """Embed prepared chunks, with filename context prepended to each text.
+
+    Texts go to ``embed_fn`` (``run_index`` passes its
+    :class:`EmbeddingScheduler`), or straight to ``embed_batch``. When
+    ``embedding_cache`` is given, only inputs missing from the cache are
+    sent. With ``dimension``, vectors are truncated to it after the cache,
+    which keeps full-length vectors (used for full-dimension re-ranking).
+    """
+    if not chunks:
+        return []
+    if embed_fn is None:
+        embed_fn = embed_batch
+    embedding_texts = [add_filename_context(c.text, filename) for c in chunks]
+    if embedding_cache is not None:
+        embeddings = embedding_cache.embed(embedding_texts, embed_fn)
+    else:
+        embeddings = embed_fn(embedding_texts)
+    if dimension:
+        embeddings = [truncate_embedding(e, dimension) for e in embeddings]
+    return embeddings
+
+
+def _embed_file(
+    item: PreparedFile,
+    table_name: str,
+    diff_conn=None,
+    embedding_cache: EmbeddingCache | None = None,
+    embed_fn: EmbedFn | None = None,
+    dimension: int | None = None,
+) -> PreparedFile:
+    """Fill ``item.embeddings``, embedding only chunks that actually changed.
+
+    With ``diff_conn`` and a previously indexed file, the new chunks are
+    diffed against the stored rows: unchanged chunks are kept, moved ones
+    reuse their stored embedding, and only the rest go to ``_embed_chunks``.
+    """
+    diff = ChunkDiff()
+    if diff_conn is not None and item.previously_indexed and item.chunks:
+        stored = load_stored_chunks(diff_conn, table_name, item.filename)
+        diff = diff_chunks(stored, item.chunks)
+
+    todo = [i for i in range(len(item.chunks)) if diff.needs_embedding(i)]
+    fresh = iter(
+        _embed_chunks(
+            item.filename,
+            [item.chunks[i] for i in todo],
+            embedding_cache,
+            embed_fn,
+            dimension,
+        )
+    )
+    embeddings: list[list[float] | None] = []
+    for i in range(len(item.chunks)):
+        if i in diff.kept:
+            embeddings.append(None)
+        elif i in diff.reused:
+            embeddings.append(diff.reused[i])
+        else:
+            embeddings.append(next(fresh))
+
+    if diff.kept or diff.reused:
+        logger.debug(
+            "Chunk diff for %s: %d kept, %d moved, %d embedded",
+            item.filename,
+            len(diff.kept),
+            len(diff.reused),
+            len(todo),
+        )
+    item.kept = diff.kept
+    item.embeddings = embeddings
+    return item
+
+
+def _write_chunks(
+    conn,
+    table_name: str,
+    filename: str,
+    chunks: list[PreparedChunk],
+    embeddings: list[list[float]],
+) -> int:
+    """Replace a file's rows in the chunks table. Returns chunk count.
+
+    Does not commit; the caller owns the transaction.
+    """
     if not chunks:
         return 0
 
     with conn.cursor() as cur:
         cur.execute(f"DELETE FROM {table_name} WHERE filename = %s", (filename,))
+        return copy_chunk_rows(cur, table_name, filename, chunks, embeddings)
 
-        embedding_texts = [
-            add_filename_context(chunk.text, filename) for chunk in chunks
-        ]
-        embeddings = embed_batch(embedding_texts)
 
-        for chunk, embedding in zip(chunks, embeddings):
-            metadata = extract_chunk_metadata(chunk.text, language)
-            symbol_meta = extract_symbol_metadata(chunk.text, language)
-            tsv_input = text_to_tsvector_sql(chunk.text, filename)
+def _index_file(
+    conn,
+    table_name: str,
+    filename: str,
+    content: str,
+    splitter: RecursiveSplitter,
+    chunk_size: int,
+    chunk_overlap: int,
+    embedding_cache: EmbeddingCache | None = None,
+) -> int:
+    """Index a single file sequentially: chunk, embed, write. Returns chunk count.
 
-            cur.execute(
-                f"INSERT INTO {table_name}"
-                " (filename, location, embedding, content_text, content_tsv_input,"
-                "  block_type, hierarchy, language_id,"
-                "  symbol_type, symbol_name, symbol_signature)"
-                " VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                (
-                    filename,
-                    Range(chunk.start.byte_offset, chunk.end.byte_offset),
-                    embedding,
-                    chunk.text,
-                    tsv_input,
-                    metadata.block_type,
-                    metadata.hierarchy,
-                    metadata.language_id,
-                    symbol_meta.symbol_type,
-                    symbol_meta.symbol_name,
-                    symbol_meta.symbol_signature,
-                ),
-            )
+    Equivalent to one trip through the pipeline used by ``run_index``; kept
+    for callers that index individual files outside a full run.
+    """
+    chunks = _prepare_chunks(filename, content, splitter, chunk_size, chunk_overlap)
+    embeddings = _embed_chunks(filename, chunks, embedding_cache)
+    return _write_chunks(conn, table_name, filename, chunks, embeddings)
+
+
+_thread_local = threading.local()
+
+
+def _announce_index_change(conn, index_name: str) -> None:
+    """Bump the index generation so other processes drop their caches.
+
+    A running MCP server or REPL listens for the bump (see
+    :mod:`cocosearch.search.invalidation`). Failures are non-fatal.
+    """
+    from cocosearch.management.metadata import bump_index_generation
+
+    try:
+        bump_index_generation(index_name, conn=conn)
+    except Exception as e:
+        conn.rollback()
+        logger.warning("Index generation bump failed (non-fatal): %s", e)
 
-    return len(chunks)
+
+def _get_splitter() -> RecursiveSplitter:
+    """Return a RecursiveSplitter owned by the calling thread.
+
+    Chunk workers each get their own splitter, mirroring how
+    ``cocosearch.ts_parsers`` keeps tree-sitter parsers thread-local.
+    """
+    splitter = getattr(_thread_local, "splitter", None)
+    if splitter is None:
+        splitter = RecursiveSplitter(custom_languages=get_custom_languages())
+        _thread_local.splitter = splitter
+    return splitter
 
 
 def run_index(
@@ -248,7 +602,9 @@ def run_index(
     1. Preflight: verify infrastructure is reachable
     2. Walk files and compute content hashes
     3. Determine changed/new/deleted files (incremental)
-    4. Chunk, embed, and store changed files
+    4. Chunk, embed, and store changed files through a staged pipeline
+       (see ``cocosearch.indexer.pipeline``) so chunking, embedding requests
+       and database writes for different files overlap
     5. Post-processing: cache invalidation, parse tracking
 
     Args:
@@ -257,8 +613,9 @@ def run_index(
         config: Optional indexing configuration (uses defaults if not provided).
         respect_gitignore: Whether to respect .gitignore patterns (default True).
         fresh: If True, drop and recreate all tables.
-        stop_event: Optional threading.Event checked between files to allow
-            cancellation from the dashboard or MCP server.
+        stop_event: Optional threading.Event checked by every pipeline stage
+            before each file to allow cancellation from the dashboard or MCP
+            server.
         progress_callback: Optional callable invoked as
             ``progress_callback(files_done, files_total, chunks_total)`` at the
             start and at the same cadence as progress logging. Lets callers
@@ -325,14 +682,37 @@ def run_index(
         "COCOSEARCH_EMBEDDING_MODEL",
         default_model_for_provider(embedding_provider),
     )
-    embedding_dim = _resolve_output_dimension(raw_model) or 768
+    embedding_dim = resolve_output_dimension(raw_model) or 768
+    # Matryoshka truncation: store (and index) only a prefix of each vector.
+    stored_dim = resolve_stored_dimension()
+    if stored_dim and stored_dim < embedding_dim:
+        embedding_dim = stored_dim
+    else:
+        stored_dim = None
 
     with psycopg.connect(db_url) as conn:
         register_vector(conn)
         _ensure_chunks_table(conn, table_name, embedding_dim)
+        table_dim = embedding_column_dimension(conn, table_name)
+        if table_dim and table_dim != embedding_dim:
+            logger.warning(
+                "Index '%s' stores %d-dimension embeddings but current config "
+                "uses %d. Use --fresh to reindex with the new dimension.",
+                index_name,
+                table_dim,
+                embedding_dim,
+            )
+            if table_dim < embedding_dim:
+                stored_dim = table_dim  # keep writes valid until then
+        if not table_has_rows(conn, table_name):
+            # Bulk load into an empty table: no index to maintain row by
+            # row (older versions created one here); it is built after.
+            drop_vector_index(conn, table_name)
         _ensure_tracking_table(conn, index_name)
         ensure_symbol_columns(conn, table_name)
         ensure_parse_results_table(conn, index_name)
+        if config.embedding_cache:
+            ensure_embedding_cache_table(conn)
 
     exclude_patterns = build_exclude_patterns(
         codebase_path=codebase_path,
@@ -340,23 +720,77 @@ def run_index(
         respect_gitignore=respect_gitignore,
     )
 
-    files = _walk_files(codebase_path, config.include_patterns, exclude_patterns)
+    walk_stats = WalkStats()
+    current_stats = _walk_files(
+        codebase_path,
+        config.include_patterns,
+        exclude_patterns,
+        respect_gitignore=respect_gitignore,
+        stats=walk_stats,
+    )
+    _get_cs_log().index(
+        "File walk completed",
+        index=index_name,
+        files=walk_stats.files,
+        dirs=walk_stats.dirs,
+        pruned_dirs=walk_stats.pruned_dirs,
+        seconds=round(walk_stats.seconds, 3),
+    )
 
+    tracking_table = f"cocosearch_index_tracking_{index_name}"
     with psycopg.connect(db_url) as conn:
-        stored_hashes = _get_file_hashes(conn, index_name)
+        tracked = load_tracked_files(conn, tracking_table)
+
+    # Stat fast path: tracked files whose (size, mtime_ns, inode) match their
+    # row are unchanged without being read. Other tracked files are read and
+    # hashed -- on a thread pool, since hashlib releases the GIL on large
+    # buffers -- and their content is dropped straight away; the chunk stage
+    # reads it again. New files need no hash to be classified. This has to
+    # finish before diffing (deletions and the progress total need the
+    # complete picture), so it runs ahead of the pipeline.
+    new_files = set(current_stats) - set(tracked)
+    to_hash = [
+        f
+        for f in current_stats
+        if f in tracked and not stat_unchanged(tracked[f], current_stats[f])
+    ]
 
-    current_hashes = {
-        fname: hashlib.sha256(content.encode("utf-8")).hexdigest()
-        for fname, content in files.items()
-    }
+    root = pathlib.Path(codebase_path).resolve()
+    hash_algorithm = config.hash_algorithm
+
+    def _hash_file(filename: str) -> str | None:
+        content = _read_file(root, filename)
+        if content is None:
+            return None
+        return hash_content(content, hash_algorithm)
+
+    changed_files: set[str] = set()
+    unreadable: set[str] = set()
+    # Read but identical (touched, re-checked-out, or legacy rows without a
+    # stat): only their stored stat needs refreshing.
+    restat_files: dict[str, FileStat | None] = {}
+    with ThreadPoolExecutor(max_workers=config.chunk_workers) as pool:
+        for f, digest in zip(to_hash, pool.map(_hash_file, to_hash)):
+            if digest is None:
+                unreadable.add(f)  # treated as absent, like before
+            elif digest != tracked[f].content_hash:
+                changed_files.add(f)
+            else:
+                restat_files[f] = current_stats[f]
+
+    deleted_files = (set(tracked) - set(current_stats)) | unreadable
+
+    logger.debug(
+        "Change detection: %d files, %d new, %d hashed, %d unchanged by stat",
+        len(current_stats),
+        len(new_files),
+        len(to_hash),
+        len(current_stats) - len(new_files) - len(to_hash),
+    )
 
-    new_files = set(current_hashes) - set(stored_hashes)
-    deleted_files = set(stored_hashes) - set(current_hashes)
-    changed_files = {
-        f
-        for f in set(current_hashes) & set(stored_hashes)
-        if current_hashes[f] != stored_hashes[f]
-    }
+    if restat_files:
+        with psycopg.connect(db_url) as conn:
+            BulkWriter(conn, table_name, tracking_table).refresh_stats(restat_files)
 
     files_to_index = new_files | changed_files
     total_changes = len(files_to_index) + len(deleted_files)
@@ -365,10 +799,17 @@ def run_index(
         logger.info(
             "No file changes detected — skipping parse tracking and cache invalidation"
         )
+        # A previous run may have been cancelled before building the index.
+        with psycopg.connect(db_url) as conn:
+            if ensure_vector_index(conn, table_name, index_name, config):
+                _announce_index_change(conn, index_name)
         _get_cs_log().index("No changes detected", index=index_name)
         return {"files_indexed": 0, "files_deleted": 0, "chunks_total": 0}
 
     total_to_index = len(files_to_index)
+    # Each file's size is held against this budget from the moment its
+    # content is read (chunk stage) until it is handed to the writer.
+    memory_budget = MemoryBudget(config.max_inflight_mb * 1024 * 1024)
     _get_cs_log().index(
         "Changes detected",
         index=index_name,
@@ -378,8 +819,6 @@ def run_index(
         to_index=total_to_index,
     )
 
-    splitter = RecursiveSplitter(custom_languages=get_custom_languages())
-
     # Log progress roughly every 10% (at least every file for small sets,
     # capped so large repos don't spam).
     progress_step = max(1, min(50, total_to_index // 10 or 1))
@@ -395,70 +834,185 @@ def run_index(
 
     chunks_total = 0
     files_indexed = 0
-    cancelled = False
-    # Emit an initial 0/total so the dashboard can show the work scope at once.
-    _report_progress(0, 0)
-    with psycopg.connect(db_url) as conn:
-        register_vector(conn)
-        tracking_table = f"cocosearch_index_tracking_{index_name}"
 
-        for filename in files_to_index:
-            if stop_event is not None and stop_event.is_set():
-                logger.info("Indexing cancelled after %d files", files_indexed)
-                cancelled = True
-                break
-
-            try:
-                n = _index_file(
-                    conn,
-                    table_name,
+    def _chunk_stage(filename: str) -> PreparedFile | None:
+        path = root / filename
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return None  # vanished since the walk
+        if not memory_budget.acquire(size):
+            return None  # run cancelled while waiting for budget
+        try:
+            if process_pool is not None:
+                remote = process_pool.submit(
+                    _prepare_file_in_process,
+                    str(root),
                     filename,
-                    files[filename],
-                    splitter,
+                    hash_algorithm,
+                    config.chunk_size,
+                    config.chunk_overlap,
+                ).result()
+                prepared = None
+                if remote is not None:
+                    content_hash, rows = remote
+                    prepared = content_hash, [PreparedChunk(*row) for row in rows]
+            else:
+                prepared = _prepare_file(
+                    root,
+                    filename,
+                    hash_algorithm,
                     config.chunk_size,
                     config.chunk_overlap,
                 )
-                chunks_total += n
-                files_indexed += 1
-
-                if (
-                    files_indexed % progress_step == 0
-                    or files_indexed == total_to_index
-                ):
-                    _get_cs_log().index(
-                        "Indexing progress",
-                        index=index_name,
-                        files=f"{files_indexed}/{total_to_index}",
-                        chunks=chunks_total,
-                    )
-                    _report_progress(files_indexed, chunks_total)
-
-                with conn.cursor() as cur:
-                    cur.execute(
-                        f"INSERT INTO {tracking_table} (filename, content_hash)"
-                        " VALUES (%s, %s)"
-                        " ON CONFLICT (filename) DO UPDATE SET"
-                        "   content_hash = EXCLUDED.content_hash,"
-                        "   indexed_at = now()",
-                        (filename, current_hashes[filename]),
-                    )
-                conn.commit()
-            except Exception as e:
-                logger.warning("Failed to index %s: %s", filename, e)
-                conn.rollback()
+            if prepared is None:
+                memory_budget.release(size)
+                return None
+            content_hash, chunks = prepared
+            item = PreparedFile(
+                filename=filename,
+                content_hash=content_hash,
+                stat=current_stats[filename],
+                previously_indexed=filename in changed_files,
+                budget_bytes=size,
+                chunks=chunks,
+            )
+        except Exception:
+            memory_budget.release(size)
+            raise
+        return item
+
+    def _embed_stage(item: PreparedFile) -> PreparedFile:
+        return _embed_file(
+            item,
+            table_name,
+            diff_conn=aux_conn if config.chunk_diff else None,
+            embedding_cache=embedding_cache,
+            embed_fn=scheduler.embed,
+            dimension=stored_dim,
+        )
+
+    def _on_error(stage: str, item, exc: Exception) -> None:
+        filename = item
+        if isinstance(item, PreparedFile):
+            filename = item.filename
+            memory_budget.release(item.budget_bytes)
+        logger.warning("Failed to index %s (%s stage): %s", filename, stage, exc)
+
+    # Emit an initial 0/total so the dashboard can show the work scope at once.
+    _report_progress(0, 0)
+    # The embed workers share an autocommit connection for the embedding
+    # cache and chunk diffing, while ``conn`` belongs to the writer thread.
+    aux_conn_ctx = (
+        psycopg.connect(db_url, autocommit=True)
+        if config.embedding_cache or config.chunk_diff
+        else contextlib.nullcontext()
+    )
+    with psycopg.connect(db_url) as conn, aux_conn_ctx as aux_conn:
+        register_vector(conn)
+        embedding_cache = None
+        if aux_conn is not None:
+            register_vector(aux_conn)
+            if config.embedding_cache:
+                embedding_cache = EmbeddingCache(aux_conn, *embedding_cache_key())
+
+        last_reported = 0
+
+        def _on_flushed(files: int, chunks: int) -> None:
+            # Called by the writer after each committed batch.
+            nonlocal chunks_total, files_indexed, last_reported
+            chunks_total += chunks
+            files_indexed += files
+            if (
+                files_indexed - last_reported >= progress_step
+                or files_indexed == total_to_index
+            ):
+                last_reported = files_indexed
+                _get_cs_log().index(
+                    "Indexing progress",
+                    index=index_name,
+                    files=f"{files_indexed}/{total_to_index}",
+                    chunks=chunks_total,
+                )
+                _report_progress(files_indexed, chunks_total)
+
+        # Single writer thread: owns ``conn`` and, via _on_flushed, the
+        # progress counters. Rows go out in COPY batches (see writer.py).
+        writer = BulkWriter(
+            conn,
+            table_name,
+            tracking_table,
+            batch_size=config.write_batch_size,
+            on_flushed=_on_flushed,
+        )
+
+        def _write_stage(item: PreparedFile) -> PreparedFile:
+            # The writer's buffer is bounded by its own row cap, so budget
+            # is released here; holding it until a batch commits could
+            # starve the chunk stage of the very files that fill the batch.
+            memory_budget.release(item.budget_bytes)
+            writer.add(item)
+            return item
+
+        # Embed workers hand their texts to one scheduler, which coalesces
+        # them across files into right-sized, concurrent requests.
+        scheduler = EmbeddingScheduler(
+            embed_batch,
+            concurrency=config.embed_concurrency,
+            max_batch_items=config.embed_batch_max_items,
+            max_batch_bytes=config.embed_batch_max_kb * 1024,
+        )
+        # Optional process pool for the CPU-bound chunk stage. Chunk threads
+        # then only feed it, one file each, so there are at least as many
+        # threads as processes. "spawn" keeps the workers free of this
+        # process's threads, connections and tree-sitter objects.
+        chunk_threads = config.chunk_workers
+        process_pool_ctx: contextlib.AbstractContextManager = contextlib.nullcontext()
+        if config.chunk_processes:
+            chunk_threads = max(chunk_threads, config.chunk_processes)
+            process_pool_ctx = ProcessPoolExecutor(
+                max_workers=config.chunk_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        with scheduler, process_pool_ctx as process_pool:
+            pipeline_result = run_pipeline(
+                files_to_index,
+                [
+                    Stage("chunk", _chunk_stage, workers=chunk_threads),
+                    Stage("embed", _embed_stage, workers=config.embed_workers),
+                    Stage("write", _write_stage, workers=1),
+                ],
+                queue_size=config.queue_size,
+                stop_event=stop_event,
+                on_error=_on_error,
+                memory_budget=memory_budget,
+            )
+        logger.debug("Embedding scheduler: %s", scheduler.stats)
+        # Files already embedded when a stop was requested are still written.
+        writer.flush()
+        cancelled = pipeline_result.cancelled
+        if cancelled:
+            logger.info("Indexing cancelled after %d files", files_indexed)
 
         if deleted_files and not cancelled:
-            with conn.cursor() as cur:
-                for filename in deleted_files:
-                    cur.execute(
-                        f"DELETE FROM {table_name} WHERE filename = %s",
-                        (filename,),
-                    )
-                    cur.execute(
-                        f"DELETE FROM {tracking_table} WHERE filename = %s",
-                        (filename,),
-                    )
-            conn.commit()
+            writer.delete_files(sorted(deleted_files))
+
+        # Built once the rows are in, so ivfflat lists reflect the data
+        # and the load did not maintain an index row by row.
+        rebuilt = ensure_vector_index(conn, table_name, index_name, config)
+
+        if files_indexed > 0 or deleted_files or rebuilt:
+            _announce_index_change(conn, index_name)
+
+        if embedding_cache is not None:
+            embedding_cache.log_stats(index_name)
+            if not cancelled:
+                evicted = embedding_cache.evict(
+                    config.embedding_cache_max_entries,
+                    config.embedding_cache_max_age_days,
+                )
+                if evicted:
+                    logger.info("Evicted %d embedding cache entries", evicted)
 
     if cancelled:
         _get_cs_log().index(
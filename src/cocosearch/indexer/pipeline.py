@@ -0,0 +1,285 @@
+"""Staged, bounded-queue pipeline used by the indexer.
+
+``run_index`` used to handle one file at a time: chunk, embed, write, repeat.
+The CPU, the embedding server and PostgreSQL therefore spent most of a run
+waiting on each other. This module connects the per-file steps as *stages*,
+each served by its own pool of worker threads and linked by bounded queues,
+so that e.g. the embedding request for file N+1 is in flight while file N is
+being written.
+
+Design notes:
+- Queues are bounded (``queue_size``) so a fast stage can never run far ahead
+  of a slow one and buffer the whole repository in memory.
+- Items flow through stages in arbitrary order; stages must not rely on order.
+- A stage function returning ``None`` drops the item (nothing downstream).
+- A stage function raising ``Exception`` drops the item and reports it via
+  ``on_error``; the rest of the run continues (same as the old per-file
+  ``try/except`` in ``run_index``).
+- A ``BaseException`` (e.g. a pyo3 ``PanicException``) aborts the run: all
+  workers drain their queues without processing and the exception is
+  re-raised from :func:`run_pipeline` once every thread has exited.
+- When ``stop_event`` is set, every stage stops processing and drains, so
+  cancellation is observed within one item per worker.
+- Queue bounds limit the number of items in flight, not their size. A
+  :class:`MemoryBudget` additionally caps the bytes held by in-flight items:
+  a stage acquires an item's size before loading it and a later stage
+  releases it, so a run of huge files cannot exhaust memory.
+
+Worker threads are plain ``threading.Thread`` objects. Stages that use
+tree-sitter get per-thread parsers via :mod:`cocosearch.ts_parsers`, so no
+parser is ever shared across threads.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Marker placed on a queue to tell one worker that its input is exhausted.
+_SENTINEL = object()
+
+
+@dataclass
+class Stage:
+    """One step of the pipeline.
+
+    Attributes:
+        name: Short stage name, used for thread names and logging.
+        func: Callable applied to every item. Its return value is passed to
+            the next stage; ``None`` drops the item.
+        workers: Number of threads serving this stage.
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+class MemoryBudget:
+    """Counting semaphore over bytes, shared by the stages of one run.
+
+    :meth:`acquire` blocks while admitting ``n`` more bytes would exceed the
+    budget. An item larger than the whole budget is still admitted once
+    nothing else is in flight, so oversized files are processed alone
+    rather than never.
+
+    Args:
+        max_bytes: Budget in bytes; ``0`` disables throttling.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._max = max(0, max_bytes)
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def in_use(self) -> int:
+        """Bytes currently acquired and not yet released."""
+        with self._cond:
+            return self._in_use
+
+    def acquire(self, n: int) -> bool:
+        """Reserve ``n`` bytes, waiting for releases if necessary.
+
+        Returns False without reserving anything once the budget is closed.
+        """
+        n = max(0, n)
+        with self._cond:
+            while (
+                not self._closed
+                and self._max
+                and self._in_use
+                and self._in_use + n > self._max
+            ):
+                self._cond.wait()
+            if self._closed:
+                return False
+            self._in_use += n
+            return True
+
+    def release(self, n: int) -> None:
+        """Return ``n`` previously acquired bytes to the budget."""
+        with self._cond:
+            self._in_use = max(0, self._in_use - max(0, n))
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Fail current and future :meth:`acquire` calls.
+
+        Called by :func:`run_pipeline` when the run is cancelled or aborted:
+        drained items are never released, so waiting on them would hang.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a :func:`run_pipeline` call.
+
+    Attributes:
+        completed: Items that made it through the final stage.
+        failed: Items dropped because a stage raised ``Exception``.
+        cancelled: True if ``stop_event`` caused at least one item to be
+            skipped.
+        stage_seconds: Cumulative busy time per stage (summed across that
+            stage's workers), useful to spot the bottleneck stage.
+    """
+
+    completed: int = 0
+    failed: int = 0
+    cancelled: bool = False
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    stages: list[Stage],
+    *,
+    queue_size: int = 8,
+    stop_event: threading.Event | None = None,
+    on_error: Callable[[str, Any, Exception], None] | None = None,
+    memory_budget: MemoryBudget | None = None,
+) -> PipelineResult:
+    """Push ``items`` through ``stages`` and wait for the pipeline to drain.
+
+    Args:
+        items: Input items for the first stage. Consumed lazily, so a
+            generator keeps only ``queue_size`` items buffered.
+        stages: Ordered list of stages. Must not be empty.
+        queue_size: Capacity of each inter-stage queue.
+        stop_event: Optional cancellation event. Checked before every item
+            in every stage.
+        on_error: Optional callback ``on_error(stage_name, item, exc)``
+            invoked when a stage function raises ``Exception``.
+        memory_budget: Optional :class:`MemoryBudget` acquired and released
+            by the stage functions. It is closed as soon as the run is
+            cancelled or aborted so no stage stays blocked in ``acquire``.
+
+    Returns:
+        A :class:`PipelineResult` with completion counters.
+
+    Raises:
+        BaseException: The first non-``Exception`` error raised by any stage
+            (re-raised after all workers have stopped).
+    """
+    if not stages:
+        raise ValueError("run_pipeline requires at least one stage")
+
+    queues: list[queue.Queue] = [
+        queue.Queue(maxsize=max(1, queue_size)) for _ in stages
+    ]
+    result = PipelineResult(stage_seconds={s.name: 0.0 for s in stages})
+    state_lock = threading.Lock()
+    abort = threading.Event()
+    fatal: list[BaseException] = []
+    # Number of still-running workers per stage; the last one to exit hands
+    # one sentinel per worker to the next stage.
+    remaining = [max(1, s.workers) for s in stages]
+
+    def _halted() -> bool:
+        halted = abort.is_set() or (stop_event is not None and stop_event.is_set())
+        if halted and memory_budget is not None:
+            memory_budget.close()
+        return halted
+
+    def _worker(idx: int) -> None:
+        stage = stages[idx]
+        inbox = queues[idx]
+        outbox = queues[idx + 1] if idx + 1 < len(stages) else None
+        busy = 0.0
+        try:
+            while True:
+                item = inbox.get()
+                if item is _SENTINEL:
+                    break
+                if _halted():
+                    if not abort.is_set():
+                        with state_lock:
+                            result.cancelled = True
+                    continue
+                started = time.perf_counter()
+                try:
+                    out = stage.func(item)
+                except Exception as exc:
+                    with state_lock:
+                        result.failed += 1
+                    if on_error is not None:
+                        try:
+                            on_error(stage.name, item, exc)
+                        except Exception:  # pragma: no cover - defensive
+                            pass
+                    continue
+                except BaseException as exc:
+                    with state_lock:
+                        if not fatal:
+                            fatal.append(exc)
+                    abort.set()
+                    if memory_budget is not None:
+                        memory_budget.close()
+                    continue
+                finally:
+                    busy += time.perf_counter() - started
+                if out is None:
+                    continue
+                if outbox is not None:
+                    outbox.put(out)
+                else:
+                    with state_lock:
+                        result.completed += 1
+        finally:
+            with state_lock:
+                result.stage_seconds[stage.name] += busy
+                remaining[idx] -= 1
+                last = remaining[idx] == 0
+            if last and outbox is not None:
+                for _ in range(max(1, stages[idx + 1].workers)):
+                    outbox.put(_SENTINEL)
+
+    threads: list[threading.Thread] = []
+    for idx, stage in enumerate(stages):
+        for n in range(max(1, stage.workers)):
+            t = threading.Thread(
+                target=_worker,
+                args=(idx,),
+                name=f"cocosearch-{stage.name}-{n}",
+                daemon=True,
+            )
+            t.start()
+            threads.append(t)
+
+    first = queues[0]
+    try:
+        for item in items:
+            if _halted():
+                if not abort.is_set():
+                    result.cancelled = True
+                break
+            first.put(item)
+    finally:
+        for _ in range(max(1, stages[0].workers)):
+            first.put(_SENTINEL)
+        for t in threads:
+            t.join()
+
+    if fatal:
+        raise fatal[0]
+
+    logger.debug(
+        "Pipeline finished: completed=%d failed=%d cancelled=%s stage_seconds=%s",
+        result.completed,
+        result.failed,
+        result.cancelled,
+        {k: round(v, 3) for k, v in result.stage_seconds.items()},
+    )
+    return result
+
+
+__all__ = ["MemoryBudget", "PipelineResult", "Stage", "run_pipeline"]
@@ -24,13 +24,19 @@ Features:
 - User-extensible: override queries in ~/.cocosearch/queries/ or .cocosearch/queries/
 - Methods use qualified names: "ClassName.method_name"
 - Graceful error handling (returns NULL fields on parse errors)
+
+Indexing parses each file once (:func:`extract_file_symbols`) and assigns
+symbols to chunks by byte range (:func:`symbols_in_range`). Query files are
+resolved once per (language, project) and compiled once per thread.
 """
 
 import dataclasses
+import functools
 import logging
 import importlib.resources
+import threading
 from pathlib import Path
-from tree_sitter import Query, QueryCursor
+from tree_sitter import Query, QueryCursor, Tree
 from tree_sitter_language_pack import get_language
 
 from cocosearch.ts_parsers import get_parser
@@ -40,7 +46,11 @@ logger = logging.getLogger(__name__)
 
 @dataclasses.dataclass
 class SymbolMetadata:
-    """Metadata extracted from a code symbol."""
+    """Metadata extracted from a code symbol.
+
+    Describes the first symbol defined in the chunk, the one stored in the
+    chunks table.
+    """
 
     symbol_type: str | None
     symbol_name: str | None
@@ -144,16 +154,55 @@ def resolve_query_file(language: str, project_path: Path | None = None) -> str |
         return None
 
 
+@functools.lru_cache(maxsize=256)
+def _cached_query_text(language: str, project_path: Path | None) -> str | None:
+    """:func:`resolve_query_file`, read from disk once per process."""
+    return resolve_query_file(language, project_path)
+
+
+_query_local = threading.local()
+# Bumped by clear_query_cache() so every thread drops its compiled queries.
+_query_generation = 0
+
+
+def _get_query(language: str, project_path: Path | None = None) -> Query | None:
+    """Return the compiled symbol query for ``language``, or None.
+
+    Compiled queries are cached per thread (like parsers in
+    :mod:`cocosearch.ts_parsers`) and keyed by project so project-level
+    overrides apply to their own project only.
+    """
+    cache = getattr(_query_local, "queries", None)
+    if cache is None or _query_local.generation != _query_generation:
+        cache = {}
+        _query_local.queries = cache
+        _query_local.generation = _query_generation
+
+    key = (language, project_path)
+    if key not in cache:
+        query_text = _cached_query_text(language, project_path)
+        cache[key] = Query(get_language(language), query_text) if query_text else None
+    return cache[key]
+
+
+def clear_query_cache() -> None:
+    """Forget resolved and compiled queries (e.g. after editing overrides)."""
+    global _query_generation
+    _cached_query_text.cache_clear()
+    _query_generation += 1
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
 
-def _get_node_text(source_text: str, node) -> str:
+def _get_node_text(source_text: str | bytes, node) -> str:
     """Extract text from syntax tree node.
 
     Args:
-        source_text: The full source code text.
+        source_text: The full source code, ideally as the UTF-8 bytes that
+            were parsed (node offsets are byte offsets).
         node: Tree-sitter node to extract text from.
 
     Returns:
@@ -161,6 +210,10 @@ def _get_node_text(source_text: str, node) -> str:
     """
     if node is None:
         return ""
+    if isinstance(source_text, bytes):
+        return source_text[node.start_byte : node.end_byte].decode(
+            "utf-8", errors="replace"
+        )
     return source_text[node.start_byte : node.end_byte]
 
 
@@ -189,7 +242,7 @@ def _map_symbol_type(raw_type: str) -> str:
     return mapping.get(raw_type, "function")
 
 
-def _get_container_name(node, chunk_text: str, language: str) -> str | None:
+def _get_container_name(node, chunk_text: str | bytes, language: str) -> str | None:
     """Extract name from container node (class, struct, module, etc.).
 
     Args:
@@ -213,7 +266,9 @@ def _get_container_name(node, chunk_text: str, language: str) -> str | None:
     return None
 
 
-def _build_qualified_name(node, name: str, chunk_text: str, language: str) -> str:
+def _build_qualified_name(
+    node, name: str, chunk_text: str | bytes, language: str
+) -> str:
     """Build qualified name with parent context (e.g., ClassName.method_name).
 
     Args:
@@ -291,7 +346,9 @@ def _build_qualified_name(node, name: str, chunk_text: str, language: str) -> st
     return separator.join(reversed(parents)) + separator + name
 
 
-def _build_signature(node, chunk_text: str, language: str, symbol_type: str) -> str:
+def _build_signature(
+    node, chunk_text: str | bytes, language: str, symbol_type: str
+) -> str:
     """Build symbol signature from node.
 
     Extracts the declaration line without the body. For functions, this means
@@ -307,7 +364,7 @@ def _build_signature(node, chunk_text: str, language: str, symbol_type: str) ->
     Returns:
         Symbol signature string.
     """
-    node_text = _get_node_text(chunk_text, node)
+    node_text = _get_node_text(source, node)
 
     # For most languages, find the body and extract everything before it
     if language == "python":
@@ -365,11 +422,28 @@ def _extract_symbols_with_query(
     Returns:
         List of symbol dicts with symbol_type, symbol_name, symbol_signature.
     """
-    lang = get_language(language)
-    parser = get_parser(language)
-    tree = parser.parse(bytes(chunk_text, "utf8"))
+    query = Query(get_language(language), query_text)
+    return [
+        {k: sym[k] for k in ("symbol_type", "symbol_name", "symbol_signature")}
+        for sym in _extract_symbols(chunk_text.encode("utf-8"), language, query)
+    ]
+
+
+def _extract_symbols(
+    source: bytes, language: str, query: Query, tree: Tree | None = None
+) -> list[dict]:
+    """Parse ``source`` once and run the compiled symbol ``query`` over it.
+
+    ``tree`` skips the parse when the caller has already parsed ``source``
+    with the same grammar.
+
+    Returns:
+        Symbol dicts with symbol_type, symbol_name, symbol_signature and the
+        definition's start_byte/end_byte, in query capture order.
+    """
+    if tree is None:
+        tree = get_parser(language).parse(source)
 
-    query = Query(lang, query_text)
     cursor = QueryCursor(query)
     captures_dict = cursor.captures(tree.root_node)
 
@@ -393,7 +467,7 @@ def _extract_symbols_with_query(
                 parent = node.parent
                 while parent:
                     if parent.id in definitions:
-                        names[parent.id] = chunk_text[node.start_byte : node.end_byte]
+                        names[parent.id] = _get_node_text(source, node)
                         break
                     parent = parent.parent
 
@@ -401,14 +475,16 @@ def _extract_symbols_with_query(
         name = names.get(node_id)
         if name:
             # Build qualified name for methods
-            qualified_name = _build_qualified_name(node, name, chunk_text, language)
-            signature = _build_signature(node, chunk_text, language, symbol_type)
+            qualified_name = _build_qualified_name(node, name, source, language)
+            signature = _build_signature(node, source, language, symbol_type)
 
             symbols.append(
                 {
                     "symbol_type": _map_symbol_type(symbol_type),
                     "symbol_name": qualified_name,
                     "symbol_signature": signature,
+                    "start_byte": node.start_byte,
+                    "end_byte": node.end_byte,
                 }
             )
 
@@ -420,67 +496,109 @@ def _extract_symbols_with_query(
 # ============================================================================
 
 
-def extract_symbol_metadata(text: str, language: str) -> SymbolMetadata:
-    """Extract symbol metadata from code chunk.
-
-    This is a CocoIndex transform function that extracts symbol information
-    from code chunks during indexing. Supports Python, JavaScript, TypeScript,
-    Go, and Rust.
+def extract_file_symbols(
+    text: str,
+    language: str,
+    project_path: Path | None = None,
+    parsed: tuple[str, Tree] | None = None,
+) -> list[dict]:
+    """Extract every symbol of a whole file with a single parse.
 
     Args:
-        text: The chunk text content.
-        language: Language identifier (e.g., "py", "python", "js", "ts", "go", "rs").
+        text: The file content.
+        language: Language identifier (e.g., "py", "python", "js", "go").
+        project_path: Optional project root, for project-level query
+            overrides in ``.cocosearch/queries/``.
+        parsed: Optional (tree-sitter language, tree) the caller already
+            parsed from ``text``; reused when the language matches.
 
     Returns:
-        Dict with three fields:
-        - symbol_type: "function", "class", "method", "interface", or None
-        - symbol_name: Symbol name (qualified for methods), or None
-        - symbol_signature: Full signature as written, or None
-
-        Returns NULL fields if:
-        - Chunk contains no symbols
-        - Parse error occurs
-        - Language not supported
+        Symbol dicts (symbol_type, symbol_name, symbol_signature, start_byte,
+        end_byte). Byte offsets are into the UTF-8 encoding
+        of ``text``. Empty for unsupported languages or on parse errors.
     """
-    # Map extension to tree-sitter language name
     ts_language = LANGUAGE_MAP.get(language)
-
-    # Return NULL fields for unsupported languages
     if ts_language is None:
-        return SymbolMetadata(
-            symbol_type=None,
-            symbol_name=None,
-            symbol_signature=None,
-        )
+        return []
 
     try:
-        query_text = resolve_query_file(ts_language)
-        if query_text is None:
+        query = _get_query(ts_language, project_path)
+        if query is None:
             # No query file for this language - index without symbols
-            return SymbolMetadata(
-                symbol_type=None,
-                symbol_name=None,
-                symbol_signature=None,
-            )
+            return []
+        tree = parsed[1] if parsed is not None and parsed[0] == ts_language else None
+        return _extract_symbols(text.encode("utf-8"), ts_language, query, tree)
+    except Exception as e:
+        # Catastrophic failure - log and return no symbols
+        logger.error(f"Symbol extraction failed: {e}", exc_info=True)
+        return []
 
-        symbols = _extract_symbols_with_query(text, ts_language, query_text)
 
-        if symbols:
-            return SymbolMetadata(**symbols[0])
-        return SymbolMetadata(
-            symbol_type=None,
-            symbol_name=None,
-            symbol_signature=None,
-        )
+def symbols_in_range(
+    symbols: list[dict], start_byte: int, end_byte: int
+) -> SymbolMetadata:
+    """Build a chunk's :class:`SymbolMetadata` from its file's symbols.
 
-    except Exception as e:
-        # Catastrophic failure - log and return NULLs
-        logger.error(f"Symbol extraction failed: {e}", exc_info=True)
+    A symbol belongs to a chunk when its definition starts inside the
+    chunk's byte range, which is what parsing the chunk on its own used to
+    find. Enclosing definitions that start earlier are not repeated in every
+    chunk of their body. Only the first such symbol is kept, matching the
+    single set of symbol columns in the chunks table.
+
+    Args:
+        symbols: Output of :func:`extract_file_symbols`.
+        start_byte: Chunk start offset (inclusive).
+        end_byte: Chunk end offset (exclusive).
+    """
+    first = next(
+        (sym for sym in symbols if start_byte <= sym["start_byte"] < end_byte),
+        None,
+    )
+    if first is None:
         return SymbolMetadata(
             symbol_type=None,
             symbol_name=None,
             symbol_signature=None,
         )
+    return SymbolMetadata(
+        symbol_type=first["symbol_type"],
+        symbol_name=first["symbol_name"],
+        symbol_signature=first["symbol_signature"],
+    )
 
 
-__all__ = ["extract_symbol_metadata", "SymbolMetadata", "LANGUAGE_MAP"]
+def extract_symbol_metadata(text: str, language: str) -> SymbolMetadata:
+    """Extract symbol metadata from code chunk.
+
+    Parses ``text`` on its own. The indexer instead parses each file once
+    with :func:`extract_file_symbols` and slices it with
+    :func:`symbols_in_range`.
+
+    Args:
+        text: The chunk text content.
+        language: Language identifier (e.g., "py", "python", "js", "ts", "go", "rs").
+
+    Returns:
+        SymbolMetadata with:
+        - symbol_type: "function", "class", "method", "interface", or None
+        - symbol_name: Symbol name (qualified for methods), or None
+        - symbol_signature: Full signature as written, or None
+        - symbols: every symbol found
+
+        Returns NULL fields if:
+        - Chunk contains no symbols
+        - Parse error occurs
+        - Language not supported
+    """
+    return symbols_in_range(
+        extract_file_symbols(text, language), 0, len(text.encode("utf-8")) + 1
+    )
+
+
+__all__ = [
+    "extract_file_symbols",
+    "extract_symbol_metadata",
+    "symbols_in_range",
+    "SymbolMetadata",
+    "LANGUAGE_MAP",
+]
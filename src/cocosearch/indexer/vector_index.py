@@ -0,0 +1,304 @@
+"""Deferred, tuned build of the chunks table's vector index.
+
+The chunks table used to get an ``ivfflat`` index the moment it was created.
+IVFFlat picks its cluster centres when the index is built, so an index built
+on an empty table has meaningless lists, recalls poorly, and still has to be
+maintained by every COPY of a bulk load.
+
+Instead the index is built after rows are loaded:
+
+- ``ivfflat``: ``lists`` follows pgvector's guidance (rows / 1000 up to one
+  million rows, sqrt(rows) beyond) and the index is rebuilt once the table
+  has grown well past the size it was tuned for.
+- ``hnsw``: ``m`` and ``ef_construction`` come from the indexing config;
+  the graph needs no retraining, so it is only rebuilt when they change.
+
+With ``vector_quantization`` the index is built over a quantized expression
+of the embedding (``halfvec`` or ``binary_quantize(...)::bit``) instead of
+the full vector. The table keeps full vectors, so search runs an
+oversampled ANN scan on the small index and re-ranks the candidates by
+exact cosine distance (see :func:`cocosearch.search.hybrid.build_vector_query`).
+Only the index shrinks: the table still stores full ``vector`` columns, and
+the re-rank reads them from the heap for every candidate, so table size and
+heap I/O per search are those of an unquantized index (or more, with
+oversampling). Quantized indexes are also the only option for models above pgvector's
+2000-dimension limit for ``vector`` indexes (``halfvec``: 4000, ``bit``:
+64000).
+
+Builds raise ``maintenance_work_mem`` and
+``max_parallel_maintenance_workers`` for their own transaction only. A
+replacement index is built under a temporary name and swapped in, so
+searches keep using the old index while the new one is built. The chosen
+parameters are stored as the index's comment (read back to decide on
+rebuilds) and copied to ``cocosearch_index_metadata.vector_index``.
+"""
+
+import json
+import logging
+import math
+import time
+
+from cocosearch.indexer.config import IndexingConfig
+
+logger = logging.getLogger(__name__)
+
+# Rebuild an ivfflat index once the table is this many times larger than
+# when its lists were chosen.
+IVFFLAT_REBUILD_GROWTH = 2.0
+
+
+# Operator class and distance operator per quantization. The index
+# expression and the search's ORDER BY must match exactly for the planner
+# to use the index, so both are built by quantized_expression().
+_OPCLASSES = {
+    "none": "vector_cosine_ops",
+    "halfvec": "halfvec_cosine_ops",
+    "binary": "bit_hamming_ops",
+}
+DISTANCE_OPERATORS = {"none": "<=>", "halfvec": "<=>", "binary": "<~>"}
+
+
+def quantized_expression(quantization: str, dim: int, operand: str) -> str:
+    """SQL expression quantizing ``operand`` (a column or ``%s::vector``)."""
+    if quantization == "halfvec":
+        return f"({operand})::halfvec({int(dim)})"
+    if quantization == "binary":
+        return f"binary_quantize({operand})::bit({int(dim)})"
+    return operand
+
+
+def vector_index_name(table_name: str) -> str:
+    """Name of the embedding index of a chunks table."""
+    return f"idx_{table_name}_embedding"
+
+
+def ivfflat_lists(rows: int) -> int:
+    """Number of IVFFlat lists for ``rows`` rows (pgvector's recommendation)."""
+    if rows <= 1_000_000:
+        return max(1, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def _estimated_rows(conn, table_name: str) -> int:
+    """Planner row estimate of a table (``pg_class.reltuples``).
+
+    Close enough to size lists and judge growth, without the full scan of
+    ``count(*)`` on every run. A table never analyzed yet (-1, or 0 before
+    PostgreSQL 14) is analyzed first, which only samples rows.
+    """
+    query = "SELECT reltuples FROM pg_class WHERE oid = %s::regclass"
+    with conn.cursor() as cur:
+        cur.execute(query, (table_name,))
+        row = cur.fetchone()
+        if not row or row[0] is None or row[0] <= 0:
+            cur.execute(f"ANALYZE {table_name}")
+            cur.execute(query, (table_name,))
+            row = cur.fetchone()
+    return max(int(row[0] or 0), 0) if row else 0
+
+
+def table_has_rows(conn, table_name: str) -> bool:
+    """Whether the chunks table holds any row (cheaper than count)."""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT EXISTS (SELECT 1 FROM {table_name})")
+        row = cur.fetchone()
+    return bool(row and row[0])
+
+
+def current_vector_index(conn, table_name: str) -> tuple[bool, dict | None]:
+    """Return (exists, recorded parameters) of the embedding index.
+
+    Parameters are None for an index built before they were recorded.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT to_regclass(%s) IS NOT NULL, "
+            "obj_description(to_regclass(%s), 'pg_class')",
+            (vector_index_name(table_name),) * 2,
+        )
+        row = cur.fetchone()
+    if not row or not row[0]:
+        return False, None
+    try:
+        params = json.loads(row[1]) if row[1] else None
+    except ValueError:
+        params = None
+    return True, params if isinstance(params, dict) else None
+
+
+def embedding_column_dimension(conn, table_name: str) -> int:
+    """Declared dimension of the table's embedding column (0 if unknown)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT atttypmod FROM pg_attribute "
+            "WHERE attrelid = to_regclass(%s) AND attname = 'embedding'",
+            (table_name,),
+        )
+        row = cur.fetchone()
+    return int(row[0]) if row and row[0] and row[0] > 0 else 0
+
+
+def drop_vector_index(conn, table_name: str) -> None:
+    """Drop the embedding index, e.g. before bulk-loading an empty table."""
+    with conn.cursor() as cur:
+        cur.execute(f"DROP INDEX IF EXISTS {vector_index_name(table_name)}")
+    conn.commit()
+
+
+def plan_vector_index(config: IndexingConfig, rows: int, dim: int = 0) -> dict:
+    """Index parameters the config asks for at ``rows`` rows."""
+    if config.vector_index == "hnsw":
+        planned = {
+            "method": "hnsw",
+            "m": config.hnsw_m,
+            "ef_construction": config.hnsw_ef_construction,
+        }
+    else:
+        planned = {"method": "ivfflat", "lists": ivfflat_lists(rows)}
+    if config.vector_quantization != "none":
+        planned["quantization"] = config.vector_quantization
+        planned["dim"] = dim
+    return planned
+
+
+def needs_rebuild(previous: dict | None, planned: dict, rows: int) -> bool:
+    """Whether an existing index built with ``previous`` should be rebuilt.
+
+    ``previous`` is None for indexes created before parameters were
+    recorded (ivfflat built on an empty table), which are always rebuilt.
+    """
+    if not previous or previous.get("method") != planned["method"]:
+        return True
+    if previous.get("quantization", "none") != planned.get("quantization", "none"):
+        return True
+    if planned["method"] == "hnsw":
+        return (previous.get("m"), previous.get("ef_construction")) != (
+            planned["m"],
+            planned["ef_construction"],
+        )
+    built_rows = previous.get("rows") or 0
+    return rows > max(built_rows, 1000) * IVFFLAT_REBUILD_GROWTH
+
+
+def build_vector_index(
+    conn, table_name: str, planned: dict, config: IndexingConfig
+) -> None:
+    """Build (or replace) the embedding index with ``planned`` parameters.
+
+    ``planned`` is stored as the index comment in the same transaction.
+    """
+    name = vector_index_name(table_name)
+    tmp_name = f"tmp_{name}"
+    quantization = planned.get("quantization", "none")
+    column = quantized_expression(quantization, planned.get("dim", 0), "embedding")
+    if quantization != "none":
+        column = f"({column})"  # expression indexes need parentheses
+    key = f"{column} {_OPCLASSES[quantization]}"
+    if planned["method"] == "hnsw":
+        using = (
+            f"hnsw ({key}) WITH "
+            f"(m = {int(planned['m'])}, "
+            f"ef_construction = {int(planned['ef_construction'])})"
+        )
+    else:
+        using = f"ivfflat ({key}) WITH (lists = {int(planned['lists'])})"
+    with conn.cursor() as cur:
+        # SET LOCAL: the settings end with this transaction. SET does not
+        # accept bind parameters, hence the int() formatting.
+        cur.execute(
+            f"SET LOCAL maintenance_work_mem = '{int(config.index_build_work_mem_mb)}MB'"
+        )
+        cur.execute(
+            "SET LOCAL max_parallel_maintenance_workers = "
+            f"{int(config.index_build_parallel_workers)}"
+        )
+        cur.execute(f"DROP INDEX IF EXISTS {tmp_name}")
+        cur.execute(f"CREATE INDEX {tmp_name} ON {table_name} USING {using}")
+        # The old index serves searches until this point.
+        cur.execute(f"DROP INDEX IF EXISTS {name}")
+        cur.execute(f"ALTER INDEX {tmp_name} RENAME TO {name}")
+        comment = json.dumps(planned).replace("'", "''")
+        cur.execute(f"COMMENT ON INDEX {name} IS '{comment}'")
+    conn.commit()
+
+
+def record_vector_index(conn, index_name: str, params: dict) -> None:
+    """Store the parameters of the built index in the index metadata row."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE cocosearch_index_metadata SET vector_index = %s::jsonb "
+                "WHERE index_name = %s",
+                (json.dumps(params), index_name),
+            )
+        conn.commit()
+    except Exception as e:
+        # Metadata table or column not created yet; the index itself is fine.
+        conn.rollback()
+        logger.debug("Could not record vector index parameters: %s", e)
+
+
+def ensure_vector_index(
+    conn, table_name: str, index_name: str, config: IndexingConfig
+) -> dict | None:
+    """Build the embedding index after a load if it is missing or stale.
+
+    Args:
+        conn: Connection owning no open transaction.
+        table_name: Chunks table.
+        index_name: Index name, for the metadata row.
+        config: Indexing config (index method and build resources).
+
+    Returns:
+        The parameters of a newly built index, or None if nothing was built
+        (index up to date, empty table, or the build failed).
+    """
+    if not table_has_rows(conn, table_name):
+        return None  # nothing to cluster yet; built on the first real load
+    rows = max(_estimated_rows(conn, table_name), 1)
+    dim = 0
+    if config.vector_quantization != "none":
+        dim = embedding_column_dimension(conn, table_name)
+    planned = {**plan_vector_index(config, rows, dim), "rows": rows}
+    if config.vector_quantization != "none" and not dim:
+        logger.warning(
+            "Cannot quantize %s: embedding column has no declared dimension",
+            table_name,
+        )
+        return None
+    exists, previous = current_vector_index(conn, table_name)
+    if exists and not needs_rebuild(previous, planned, rows):
+        return None
+
+    started = time.perf_counter()
+    try:
+        build_vector_index(conn, table_name, planned, config)
+    except Exception as e:
+        conn.rollback()
+        logger.warning("Vector index build failed (search still works): %s", e)
+        return None
+
+    logger.info(
+        "Built %s vector index on %d rows in %.1fs: %s",
+        planned["method"],
+        rows,
+        time.perf_counter() - started,
+        planned,
+    )
+    record_vector_index(conn, index_name, planned)
+    return planned
+
+
+__all__ = [
+    "DISTANCE_OPERATORS",
+    "current_vector_index",
+    "drop_vector_index",
+    "embedding_column_dimension",
+    "ensure_vector_index",
+    "ivfflat_lists",
+    "needs_rebuild",
+    "plan_vector_index",
+    "quantized_expression",
+    "table_has_rows",
+    "vector_index_name",
+]
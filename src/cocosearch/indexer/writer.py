@@ -0,0 +1,338 @@
+"""Batched PostgreSQL writer for indexed chunks.
+
+Writing one file used to take a ``DELETE``, one ``INSERT`` per chunk, a
+tracking upsert and a ``COMMIT`` -- dozens of round-trips per file, which
+dominated write time on large repositories. :class:`BulkWriter` instead
+buffers prepared files and flushes them together:
+
+1. One ``DELETE ... WHERE filename = ANY(%s)`` for every file in the batch,
+   sparing rows that chunk diffing (:mod:`.chunk_diff`) kept in place.
+2. One ``COPY ... FROM STDIN (FORMAT BINARY)`` streaming all chunk rows.
+   Embeddings go through pgvector's binary dumper (``register_vector`` must
+   have been called on the connection), so vectors are never formatted as
+   text.
+3. One set-based tracking upsert (``unnest`` of filename, hash and stat
+   arrays; see :mod:`.change_detection`).
+4. One ``COMMIT``.
+
+If a batch fails (e.g. one file produced an embedding of the wrong
+dimension), it is rolled back and retried one file at a time so a single
+bad file cannot take its neighbours down with it.
+"""
+
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from psycopg.types.range import Range
+
+logger = logging.getLogger(__name__)
+
+# Column order shared by the COPY statement and the rows produced below.
+CHUNK_COLUMNS = (
+    "filename",
+    "location",
+    "embedding",
+    "content_text",
+    "content_tsv_input",
+    "block_type",
+    "hierarchy",
+    "language_id",
+    "symbol_type",
+    "symbol_name",
+    "symbol_signature",
+    "start_line",
+    "end_line",
+    "scope_start_line",
+    "scope_end_line",
+)
+
+# PostgreSQL type names for CHUNK_COLUMNS, required by binary COPY.
+_CHUNK_COLUMN_TYPES = (
+    "text",
+    "int4range",
+    "vector",
+    "text",
+    "text",
+    "text",
+    "text",
+    "text",
+    "text",
+    "text",
+    "text",
+    "int4",
+    "int4",
+    "int4",
+    "int4",
+)
+
+# Flush early once this many chunk rows are buffered, regardless of the
+# configured file batch size, to keep memory bounded for huge files.
+MAX_PENDING_ROWS = 5000
+
+
+@dataclass
+class WriteResult:
+    """Outcome of a :meth:`BulkWriter.flush` call."""
+
+    files: int = 0
+    chunks: int = 0
+    failed: int = 0
+
+
+def copy_chunk_rows(cur, table_name: str, filename: str, chunks, embeddings) -> int:
+    """Stream one file's chunk rows into ``table_name`` with binary COPY.
+
+    ``chunks`` are ``PreparedChunk``-like objects and ``embeddings`` the
+    matching vectors. Returns the number of rows written. The caller is
+    responsible for deleting stale rows first and for committing.
+    """
+    return _copy_rows(cur, table_name, [(filename, chunks, embeddings, ())])
+
+
+def _copy_rows(cur, table_name: str, files: Iterable[tuple]) -> int:
+    """COPY the chunk rows of several ``(filename, chunks, embeddings, skip)``.
+
+    ``skip`` holds chunk indices that are already stored and not rewritten.
+    """
+    rows = 0
+    with cur.copy(
+        f"COPY {table_name} ({', '.join(CHUNK_COLUMNS)}) FROM STDIN (FORMAT BINARY)"
+    ) as copy:
+        copy.set_types(list(_CHUNK_COLUMN_TYPES))
+        for filename, chunks, embeddings, skip in files:
+            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+                if i in skip:
+                    continue
+                copy.write_row(
+                    (
+                        filename,
+                        Range(chunk.start_byte, chunk.end_byte),
+                        embedding,
+                        chunk.text,
+                        chunk.tsv_input,
+                        chunk.block_type,
+                        chunk.hierarchy,
+                        chunk.language_id,
+                        chunk.symbol_type,
+                        chunk.symbol_name,
+                        chunk.symbol_signature,
+                        chunk.start_line,
+                        chunk.end_line,
+                        chunk.scope_start_line,
+                        chunk.scope_end_line,
+                    )
+                )
+                rows += 1
+    return rows
+
+
+def _stat_columns(stats: Iterable) -> tuple[list, list, list]:
+    """Split ``FileStat``-or-None values into size/mtime_ns/inode columns."""
+    sizes: list[int | None] = []
+    mtimes: list[int | None] = []
+    inodes: list[int | None] = []
+    for st in stats:
+        sizes.append(st.size if st is not None else None)
+        mtimes.append(st.mtime_ns if st is not None else None)
+        inodes.append(st.inode if st is not None else None)
+    return sizes, mtimes, inodes
+
+
+class BulkWriter:
+    """Buffer indexed files and write them in batched transactions.
+
+    Not thread-safe: use from a single thread that owns ``conn`` (the
+    pipeline's write stage).
+
+    Args:
+        conn: psycopg connection with pgvector registered.
+        table_name: Chunks table name.
+        tracking_table: File tracking table name.
+        batch_size: Number of files committed per transaction.
+        on_flushed: Optional callback ``on_flushed(files, chunks)`` invoked
+            after every successful commit with the counts just written.
+    """
+
+    def __init__(
+        self,
+        conn,
+        table_name: str,
+        tracking_table: str,
+        batch_size: int = 64,
+        on_flushed: Callable[[int, int], None] | None = None,
+    ):
+        self._conn = conn
+        self._table_name = table_name
+        self._tracking_table = tracking_table
+        self._batch_size = max(1, batch_size)
+        self._on_flushed = on_flushed
+        self._pending: list = []
+        self._pending_rows = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered files not yet written."""
+        return len(self._pending)
+
+    def add(self, item) -> WriteResult | None:
+        """Buffer a ``PreparedFile``; flushes when a batch is full.
+
+        Returns the flush result if this call triggered a flush.
+        """
+        self._pending.append(item)
+        self._pending_rows += len(item.chunks)
+        if (
+            len(self._pending) >= self._batch_size
+            or self._pending_rows >= MAX_PENDING_ROWS
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> WriteResult:
+        """Write all buffered files. Failed files are logged and skipped."""
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if not batch:
+            return WriteResult()
+
+        try:
+            result = self._write_batch(batch)
+        except Exception as e:
+            self._conn.rollback()
+            if len(batch) == 1:
+                logger.warning(
+                    "Failed to index %s (write stage): %s", batch[0].filename, e
+                )
+                return WriteResult(failed=1)
+            logger.debug("Batch write of %d files failed, retrying singly", len(batch))
+            result = self._write_singly(batch)
+
+        if self._on_flushed is not None and result.files:
+            self._on_flushed(result.files, result.chunks)
+        return result
+
+    def _write_singly(self, batch: list) -> WriteResult:
+        result = WriteResult()
+        for item in batch:
+            try:
+                single = self._write_batch([item])
+            except Exception as e:
+                self._conn.rollback()
+                logger.warning("Failed to index %s (write stage): %s", item.filename, e)
+                result.failed += 1
+                continue
+            result.files += single.files
+            result.chunks += single.chunks
+        return result
+
+    def _write_batch(self, batch: list) -> WriteResult:
+        filenames = [item.filename for item in batch]
+        with self._conn.cursor() as cur:
+            # Files that produced no chunks keep their old rows, matching
+            # the historical per-file behaviour.
+            replaced = [item for item in batch if item.chunks]
+            if replaced:
+                self._delete_stale_rows(cur, replaced)
+                _copy_rows(
+                    cur,
+                    self._table_name,
+                    (
+                        (item.filename, item.chunks, item.embeddings, item.kept)
+                        for item in replaced
+                    ),
+                )
+            sizes, mtimes, inodes = _stat_columns(item.stat for item in batch)
+            cur.execute(
+                f"INSERT INTO {self._tracking_table}"
+                " (filename, content_hash, size, mtime_ns, inode)"
+                " SELECT * FROM unnest("
+                "   %s::text[], %s::text[], %s::int8[], %s::int8[], %s::int8[]"
+                " )"
+                " ON CONFLICT (filename) DO UPDATE SET"
+                "   content_hash = EXCLUDED.content_hash,"
+                "   size = EXCLUDED.size,"
+                "   mtime_ns = EXCLUDED.mtime_ns,"
+                "   inode = EXCLUDED.inode,"
+                "   indexed_at = now()",
+                (
+                    filenames,
+                    [item.content_hash for item in batch],
+                    sizes,
+                    mtimes,
+                    inodes,
+                ),
+            )
+        self._conn.commit()
+        return WriteResult(
+            files=len(batch), chunks=sum(len(item.chunks) for item in batch)
+        )
+
+    def _delete_stale_rows(self, cur, items: list) -> None:
+        """Delete the rows of ``items`` except chunks kept by chunk diffing."""
+        filenames = [item.filename for item in items]
+        kept = [
+            (item.filename, item.chunks[i].start_byte, item.chunks[i].end_byte)
+            for item in items
+            for i in item.kept
+        ]
+        if not kept:
+            cur.execute(
+                f"DELETE FROM {self._table_name} WHERE filename = ANY(%s)",
+                (filenames,),
+            )
+            return
+        kept_names, kept_starts, kept_ends = (list(col) for col in zip(*kept))
+        cur.execute(
+            f"DELETE FROM {self._table_name} WHERE filename = ANY(%s)"
+            " AND (filename, lower(location), upper(location)) NOT IN ("
+            "   SELECT * FROM unnest(%s::text[], %s::int4[], %s::int4[])"
+            " )",
+            (filenames, kept_names, kept_starts, kept_ends),
+        )
+
+    def refresh_stats(self, stats: dict) -> int:
+        """Update the stored stat of tracked files whose content is unchanged.
+
+        ``stats`` maps filename to a ``FileStat`` (or None for a racy mtime).
+        Returns the number of filenames processed.
+        """
+        names = list(stats)
+        step = max(self._batch_size, 1000)
+        for start in range(0, len(names), step):
+            part = names[start : start + step]
+            sizes, mtimes, inodes = _stat_columns(stats[name] for name in part)
+            with self._conn.cursor() as cur:
+                cur.execute(
+                    f"UPDATE {self._tracking_table} AS t SET"
+                    "   size = s.size, mtime_ns = s.mtime_ns, inode = s.inode"
+                    " FROM unnest(%s::text[], %s::int8[], %s::int8[], %s::int8[])"
+                    "   AS s(filename, size, mtime_ns, inode)"
+                    " WHERE t.filename = s.filename",
+                    (part, sizes, mtimes, inodes),
+                )
+            self._conn.commit()
+        return len(names)
+
+    def delete_files(self, filenames: Iterable[str]) -> int:
+        """Remove files from the chunks and tracking tables, batch by batch.
+
+        Returns the number of filenames processed.
+        """
+        names = list(filenames)
+        step = max(self._batch_size, 1000)
+        for start in range(0, len(names), step):
+            part = names[start : start + step]
+            with self._conn.cursor() as cur:
+                cur.execute(
+                    f"DELETE FROM {self._table_name} WHERE filename = ANY(%s)",
+                    (part,),
+                )
+                cur.execute(
+                    f"DELETE FROM {self._tracking_table} WHERE filename = ANY(%s)",
+                    (part,),
+                )
+            self._conn.commit()
+        return len(names)
+
+
+__all__ = ["BulkWriter", "CHUNK_COLUMNS", "WriteResult", "copy_chunk_rows"]
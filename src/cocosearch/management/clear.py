@@ -76,6 +76,14 @@ def clear_index(index_name: str) -> dict:
             except Exception:
                 pass  # Table may not exist for indexes without deps extraction
 
+            # Drop precomputed impact summaries if they exist (non-critical)
+            deps_impact_table = f"cocosearch_deps_impact_{index_name}"
+            try:
+                cur.execute(f"DROP TABLE IF EXISTS {deps_impact_table}")
+                conn.commit()
+            except Exception:
+                pass  # Table may not exist for indexes without deps extraction
+
             # Drop legacy CocoIndex tracking table (non-critical)
             tracking_table = f"codeindex_{index_name}__cocoindex_tracking"
             try:
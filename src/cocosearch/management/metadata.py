@@ -11,6 +11,7 @@ from pathlib import Path
 
 from cocosearch.management.context import get_canonical_path
 from cocosearch.search.db import get_connection_pool
+from cocosearch.search.invalidation import notify_index_changed
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,7 @@ def ensure_metadata_table() -> None:
     - index_name (TEXT PRIMARY KEY)
     - canonical_path (TEXT NOT NULL)
     - created_at, updated_at (TIMESTAMP)
+    - generation (BIGINT): bumped on every index or dependency change
 
     Idempotent - safe to call multiple times.
     """
@@ -65,6 +67,14 @@ def ensure_metadata_table() -> None:
                 ALTER TABLE cocosearch_index_metadata
                     ADD COLUMN IF NOT EXISTS deps_extracted_at TIMESTAMPTZ
             """)
+            cur.execute("""
+                ALTER TABLE cocosearch_index_metadata
+                    ADD COLUMN IF NOT EXISTS vector_index JSONB
+            """)
+            cur.execute("""
+                ALTER TABLE cocosearch_index_metadata
+                    ADD COLUMN IF NOT EXISTS generation BIGINT NOT NULL DEFAULT 0
+            """)
             cur.execute("""
                 CREATE INDEX IF NOT EXISTS idx_cocosearch_metadata_path
                     ON cocosearch_index_metadata(canonical_path)
@@ -95,7 +105,8 @@ def get_index_metadata(index_name: str) -> dict | None:
                     SELECT index_name, canonical_path, created_at, updated_at, status,
                            branch, commit_hash, branch_commit_count,
                            embedding_provider, embedding_model, deps_extracted_at,
-                           EXTRACT(EPOCH FROM (NOW() - updated_at))
+                           EXTRACT(EPOCH FROM (NOW() - updated_at)),
+                           vector_index, generation
                     FROM cocosearch_index_metadata
                     WHERE index_name = %s
                     """,
@@ -119,6 +130,8 @@ def get_index_metadata(index_name: str) -> dict | None:
                     "embedding_provider": row[8] if len(row) > 8 else None,
                     "embedding_model": row[9] if len(row) > 9 else None,
                     "deps_extracted_at": row[10] if len(row) > 10 else None,
+                    "vector_index": row[12] if len(row) > 12 else None,
+                    "generation": row[13] if len(row) > 13 else None,
                 }
 
                 # Provide elapsed time so callers can warn about
@@ -274,6 +287,8 @@ def clear_index_path(index_name: str) -> bool:
                     (index_name,),
                 )
                 deleted = cur.rowcount > 0
+                if deleted:
+                    notify_index_changed(cur, index_name, None)
             conn.commit()
 
         # Clear cache since database changed
@@ -390,11 +405,57 @@ def set_index_status(
         return False
 
 
+def bump_index_generation(index_name: str, conn=None) -> int | None:
+    """Advance an index's generation and notify listening processes.
+
+    Called after every change to an index's chunks or vector index.
+    Processes running an index change listener drop their cached results
+    and table lookups for the index when this commits.
+
+    Args:
+        index_name: The name of the index.
+        conn: Connection to use (and commit) instead of a pooled one.
+
+    Returns:
+        The new generation, or None if the index has no metadata row
+        (including when metadata table doesn't exist yet on fresh database).
+    """
+    if conn is not None:
+        return _bump_generation(conn, index_name)
+    pool = get_connection_pool()
+    try:
+        with pool.connection() as pooled:
+            return _bump_generation(pooled, index_name)
+    except Exception:
+        # Table doesn't exist yet (fresh database)
+        return None
+
+
+def _bump_generation(conn, index_name: str) -> int | None:
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE cocosearch_index_metadata
+            SET generation = generation + 1
+            WHERE index_name = %s
+            RETURNING generation
+            """,
+            (index_name,),
+        )
+        row = cur.fetchone()
+        generation = row[0] if row else None
+        if generation is not None:
+            notify_index_changed(cur, index_name, generation)
+    conn.commit()
+    return generation
+
+
 def set_deps_extracted_at(index_name: str) -> bool:
     """Stamp the current time as the last dependency extraction time.
 
     Called at the end of a successful dependency extraction run so that
     staleness checks can compare it against the index ``updated_at``.
+    Also bumps the index generation, since dependency data changed.
 
     Args:
         index_name: The name of the index.
@@ -410,12 +471,16 @@ def set_deps_extracted_at(index_name: str) -> bool:
                 cur.execute(
                     """
                     UPDATE cocosearch_index_metadata
-                    SET deps_extracted_at = NOW()
+                    SET deps_extracted_at = NOW(), generation = generation + 1
                     WHERE index_name = %s
+                    RETURNING generation
                     """,
                     (index_name,),
                 )
                 updated = cur.rowcount > 0
+                if updated:
+                    row = cur.fetchone()
+                    notify_index_changed(cur, index_name, row[0] if row else None)
             conn.commit()
         return updated
     except Exception:
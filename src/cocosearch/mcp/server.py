@@ -73,9 +73,16 @@ from cocosearch.management.stats import (  # noqa: E402
     get_grammar_failures,
     get_parse_failures,
 )
-from cocosearch.search import byte_to_line, multi_search, read_chunk_content, search  # noqa: E402
+from cocosearch.search import (  # noqa: E402
+    byte_to_line,
+    multi_search_async,
+    read_chunk_content,
+    search_async,
+)
 from cocosearch.search.analyze import analyze as run_analyze  # noqa: E402
 from cocosearch.search.context_expander import ContextExpander  # noqa: E402
+from cocosearch.search.db import get_indexed_file_hashes  # noqa: E402
+from cocosearch.search.file_cache import get_file_cache  # noqa: E402
 
 
 def _get_cs_log():
@@ -259,7 +266,9 @@ def build_all_stats(include_failures: bool = False) -> list[dict]:
             try:
                 from cocosearch.deps.query import get_dep_stats_detailed
 
-                result["dep_stats"] = get_dep_stats_detailed(idx["name"])
+                result["dep_stats"] = get_dep_stats_detailed(
+                    idx["name"], use_graph=True
+                )
             except Exception:
                 result["dep_stats"] = None
             all_stats.append(result)
@@ -290,7 +299,7 @@ def build_single_stats(index_name: str, include_failures: bool = False) -> dict:
     try:
         from cocosearch.deps.query import get_dep_stats_detailed
 
-        result["dep_stats"] = get_dep_stats_detailed(index_name)
+        result["dep_stats"] = get_dep_stats_detailed(index_name, use_graph=True)
     except Exception:
         result["dep_stats"] = None
     return result
@@ -300,13 +309,23 @@ def build_single_stats(index_name: str, include_failures: bool = False) -> dict:
 async def _server_lifespan(app: FastMCP) -> AsyncIterator[None]:
     """Lifespan context manager for the MCP server.
 
+    Startup subscribes to index change notifications, so re-indexing from
+    another process (e.g. the CLI) invalidates this server's caches.
+
     Teardown closes the DB connection pool and cancels active indexing threads
     so PostgreSQL connections are released promptly on server shutdown — even
     when atexit handlers don't fire (e.g. SIGTERM/SIGKILL).
     """
+    from cocosearch.search.invalidation import (
+        start_index_listener,
+        stop_index_listener,
+    )
+
+    start_index_listener()
     yield
     # --- teardown ---
     _get_cs_log().system("Server shutting down — releasing resources")
+    stop_index_listener()
     # Cancel active indexing threads
     with _indexing_lock:
         for name, (thread, stop_event) in list(_active_indexing.items()):
@@ -314,10 +333,11 @@ async def _server_lifespan(app: FastMCP) -> AsyncIterator[None]:
     with _indexing_lock:
         for name, (thread, stop_event) in list(_active_indexing.items()):
             thread.join(timeout=2.0)
-    # Close the database connection pool
-    from cocosearch.search.db import close_pool
+    # Close the database connection pools
+    from cocosearch.search.db import close_async_pool, close_pool
 
     close_pool()
+    await close_async_pool()
 
 
 # Create FastMCP server instance
@@ -1277,7 +1297,8 @@ async def api_analyze(request) -> JSONResponse:
         )
 
     try:
-        result = run_analyze(
+        result = await asyncio.to_thread(
+            run_analyze,
             query=query,
             index_name=index_name,
             limit=limit,
@@ -1439,7 +1460,7 @@ async def api_search(request) -> JSONResponse:
         # Cross-index search
         _api_warnings: list[dict] = []
         try:
-            results = multi_search(
+            results = await multi_search_async(
                 query=query,
                 index_names=index_names_param,
                 limit=limit,
@@ -1470,7 +1491,7 @@ async def api_search(request) -> JSONResponse:
     else:
         # Single-index search (existing behavior)
         try:
-            results = search(
+            results = await search_async(
                 query=query,
                 index_name=index_name,
                 limit=limit,
@@ -1495,8 +1516,13 @@ async def api_search(request) -> JSONResponse:
 
     # Create context expander if context is requested
     expander = None
+    file_hashes: dict = {}
     if smart_context or context_before is not None or context_after is not None:
         expander = ContextExpander()
+        if smart_context and context_before is None and context_after is None:
+            file_hashes = await asyncio.to_thread(
+                _indexed_file_hashes, results, None if is_multi else index_name
+            )
 
     # Resolve relative DB paths to absolute using the index's canonical_path
     if not is_multi:
@@ -1526,9 +1552,7 @@ async def api_search(request) -> JSONResponse:
                 filepath = (
                     os.path.join(source_path, r.filename) if source_path else r.filename
                 )
-            start_line = byte_to_line(filepath, r.start_byte)
-            end_line = byte_to_line(filepath, r.end_byte)
-            content = read_chunk_content(filepath, r.start_byte, r.end_byte)
+            start_line, end_line, content = _chunk_lines_and_content(filepath, r)
 
             result_dict = {
                 "file_path": r.filename,
@@ -1563,6 +1587,7 @@ async def api_search(request) -> JSONResponse:
                         smart=smart_context
                         and (context_before is None and context_after is None),
                         language=language_name,
+                        **_stored_scope(r, file_hashes, index_name),
                     )
                 )
 
@@ -1650,16 +1675,17 @@ async def api_file_content(request) -> JSONResponse:
 
     max_lines = 50_000
     try:
-        with open(file_path, encoding="utf-8", errors="replace") as f:
-            lines = f.readlines()
+        cached = get_file_cache().get(file_path)
+        if cached is None:
+            raise OSError(f"cannot read {file_path}")
 
-        truncated = len(lines) > max_lines
+        truncated = len(cached.lines) > max_lines
         if truncated:
-            lines = lines[:max_lines]
-
-        content = "".join(lines)
+            content = "\n".join(cached.lines[:max_lines]) + "\n"
+        else:
+            content = cached.text
         language = _get_prism_language(file_path)
-        total_lines = len(lines)
+        total_lines = min(len(cached.lines), max_lines)
 
         result = {
             "content": content,
@@ -1757,11 +1783,13 @@ async def api_deps_graph(request) -> JSONResponse:
         edges: list[dict] = []
 
         # Forward dependencies (what this file imports)
-        fwd_tree = get_dependency_tree(index_name, file, max_depth=depth)
+        fwd_tree = get_dependency_tree(
+            index_name, file, max_depth=depth, use_graph=True
+        )
         _tree_to_graph(fwd_tree, nodes, edges, seen, direction="forward")
 
         # Reverse dependencies (what imports this file)
-        rev_tree = get_impact(index_name, file, max_depth=depth)
+        rev_tree = get_impact(index_name, file, max_depth=depth, use_graph=True)
         _tree_to_graph(rev_tree, nodes, edges, seen, direction="reverse")
 
         return JSONResponse({"nodes": nodes, "edges": edges})
@@ -1800,6 +1828,52 @@ def _tree_to_graph(
         _tree_to_graph(child, nodes, edges, seen, direction=direction)
 
 
+def _chunk_lines_and_content(filepath: str, r) -> tuple[int, int, str]:
+    """Line range and text of a search result.
+
+    Served from the index (no file I/O) when it stores them; indexes
+    without line columns fall back to reading the source file.
+    """
+    if r.start_line is not None and r.end_line is not None:
+        start_line, end_line = r.start_line, r.end_line
+    else:
+        start_line = byte_to_line(filepath, r.start_byte)
+        end_line = byte_to_line(filepath, r.end_byte)
+    if r.content is not None:
+        content = r.content
+    else:
+        content = read_chunk_content(filepath, r.start_byte, r.end_byte)
+    return start_line, end_line, content
+
+
+def _indexed_file_hashes(
+    results, index_name: str | None = None
+) -> dict[tuple[str, str], str]:
+    """Indexed content hash per (index, filename) of results with a stored scope.
+
+    One tracking-table lookup per index. Context expansion uses a result's
+    stored scope only while its file still has this hash.
+    """
+    files_by_index: dict[str, set[str]] = {}
+    for r in results:
+        name = r.index_name or index_name
+        if r.scope_start_line is not None and name:
+            files_by_index.setdefault(name, set()).add(r.filename)
+    return {
+        (name, filename): digest
+        for name, files in files_by_index.items()
+        for filename, digest in get_indexed_file_hashes(name, sorted(files)).items()
+    }
+
+
+def _stored_scope(r, file_hashes: dict, index_name: str | None = None) -> dict:
+    """``get_context_lines`` arguments for a result's stored enclosing scope."""
+    digest = file_hashes.get((r.index_name or index_name, r.filename))
+    if digest is None or r.scope_start_line is None or r.scope_end_line is None:
+        return {}
+    return {"scope": (r.scope_start_line, r.scope_end_line), "file_hash": digest}
+
+
 def _get_treesitter_language(ext: str) -> str | None:
     """Map file extension to tree-sitter language name."""
     mapping = {
@@ -2346,7 +2420,7 @@ async def search_code(
     # Execute search
     rewrite_info: dict = {}
     try:
-        results = search(
+        results = await search_async(
             query=query,
             index_name=index_name,
             limit=limit,
@@ -2395,17 +2469,20 @@ async def search_code(
     # Resolve relative DB paths to absolute using the index's canonical_path
     source_path = metadata.get("canonical_path") if metadata else None
 
+    # Scopes stored at index time spare parsing files that are unchanged
+    file_hashes: dict = {}
+    if smart_context and context_before is None and context_after is None:
+        file_hashes = await asyncio.to_thread(_indexed_file_hashes, results, index_name)
+
     # Convert results to dicts with line numbers, content, and context.
-    # Wrap in try/finally to ensure expander cache is always cleared,
-    # preventing LRU cache leaks (up to 128 files) on exceptions.
+    # Wrap in try/finally to ensure the expander's hash checks are always
+    # cleared, even on exceptions.
     try:
         for r in results:
             filepath = (
                 os.path.join(source_path, r.filename) if source_path else r.filename
             )
-            start_line = byte_to_line(filepath, r.start_byte)
-            end_line = byte_to_line(filepath, r.end_byte)
-            content = read_chunk_content(filepath, r.start_byte, r.end_byte)
+            start_line, end_line, content = _chunk_lines_and_content(filepath, r)
 
             # Get context if requested or smart context enabled
             context_before_text = ""
@@ -2426,6 +2503,7 @@ async def search_code(
                         smart=smart_context
                         and (context_before is None and context_after is None),
                         language=language_name,
+                        **_stored_scope(r, file_hashes, index_name),
                     )
                 )
 
@@ -2571,7 +2649,7 @@ async def _multi_index_search(
 
     search_warnings: list[dict] = []
     try:
-        results = multi_search(
+        results = await multi_search_async(
             query=query,
             index_names=index_names,
             limit=limit,
@@ -2594,6 +2672,9 @@ async def _multi_index_search(
             metadata_by_index[idx_name] = meta
 
     expander = ContextExpander()
+    file_hashes: dict = {}
+    if smart_context and context_before is None and context_after is None:
+        file_hashes = await asyncio.to_thread(_indexed_file_hashes, results)
 
     search_header: dict = {
         "type": "search_context",
@@ -2637,9 +2718,7 @@ async def _multi_index_search(
             filepath = (
                 os.path.join(source_path, r.filename) if source_path else r.filename
             )
-            start_line = byte_to_line(filepath, r.start_byte)
-            end_line = byte_to_line(filepath, r.end_byte)
-            content = read_chunk_content(filepath, r.start_byte, r.end_byte)
+            start_line, end_line, content = _chunk_lines_and_content(filepath, r)
 
             context_before_text = ""
             context_after_text = ""
@@ -2658,6 +2737,7 @@ async def _multi_index_search(
                         smart=smart_context
                         and (context_before is None and context_after is None),
                         language=language_name,
+                        **_stored_scope(r, file_hashes),
                     )
                 )
 
@@ -2777,7 +2857,8 @@ async def analyze_query(
         try:
             from cocosearch.search.analyze import multi_analyze as run_multi_analyze
 
-            result = run_multi_analyze(
+            result = await asyncio.to_thread(
+                run_multi_analyze,
                 query=query,
                 index_names=index_names,
                 limit=limit,
@@ -2831,7 +2912,8 @@ async def analyze_query(
 
     # Run analysis
     try:
-        result = run_analyze(
+        result = await asyncio.to_thread(
+            run_analyze,
             query=query,
             index_name=index_name,
             limit=limit,
@@ -3130,6 +3212,24 @@ def _append_deps_warnings(result: dict, index_name: str) -> dict:
     return result
 
 
+def _impact_summaries(index_name: str, files: list[str]) -> dict[str, dict] | None:
+    """Precomputed impact summaries of *files* as dicts (best-effort).
+
+    Files without a stored summary have no dependents. Returns None if the
+    index has no summaries yet or the lookup fails.
+    """
+    try:
+        from cocosearch.deps.models import ImpactSummary
+        from cocosearch.deps.query import get_impact_summaries
+
+        summaries = get_impact_summaries(index_name, files)
+    except Exception:
+        return None
+    if summaries is None:
+        return None
+    return {f: summaries.get(f, ImpactSummary(f, 0, 0)).to_dict() for f in files}
+
+
 @mcp.tool()
 @log_mcp_tool
 async def get_file_dependencies(
@@ -3219,6 +3319,13 @@ async def get_file_impact(
         str | None,
         Field(description="Filter by type: import, call, reference"),
     ] = None,
+    summary_only: Annotated[
+        bool,
+        Field(
+            description="Return only the precomputed impact summary "
+            "(dependent counts), without the impact tree"
+        ),
+    ] = False,
 ) -> dict:
     """Get impact analysis for a file (what would be affected if it changes).
 
@@ -3229,6 +3336,12 @@ async def get_file_impact(
     up to the specified depth (max 20). Useful for understanding the blast
     radius of changes.
 
+    Also returns ``impact_summary``: the total number of transitive
+    dependents, direct dependents, dependency cycle size and dependents per
+    distance, precomputed at dependency extraction. Set summary_only to get
+    just the summary, which is a single lookup; the tree is still built if
+    no summary is available.
+
     Use dep_type to filter by dependency kind (import, call, reference).
     """
     try:
@@ -3239,13 +3352,22 @@ async def get_file_impact(
             if not index_name:
                 return {"error": "Could not auto-detect index. Provide index_name."}
 
+        summaries = _impact_summaries(index_name, [file])
+        if summary_only and summaries is not None:
+            result = {"file": file, "impact_summary": summaries[file]}
+            return _append_deps_warnings(result, index_name)
+
         depth = min(depth, 20)
-        tree = _get_impact(index_name, file, max_depth=depth, dep_type=dep_type)
+        tree = _get_impact(
+            index_name, file, max_depth=depth, dep_type=dep_type, use_graph=True
+        )
         result = {
             "file": file,
             "depth": depth,
             "impact_tree": _dep_tree_to_dict(tree),
         }
+        if summaries is not None:
+            result["impact_summary"] = summaries[file]
         return _append_deps_warnings(result, index_name)
     except Exception as e:
         return {"error": str(e)}
@@ -3355,6 +3477,13 @@ async def get_batch_impact(
         str | None,
         Field(description="Filter by type: import, call, reference"),
     ] = None,
+    summary_only: Annotated[
+        bool,
+        Field(
+            description="Return only the precomputed impact summaries "
+            "(dependent counts), without the impact trees"
+        ),
+    ] = False,
 ) -> dict:
     """Get impact analysis for multiple files in a single batch call.
 
@@ -3364,7 +3493,8 @@ async def get_batch_impact(
     dependency subgraphs.
 
     Returns impact trees per file showing what would be affected if each
-    file changes.
+    file changes, each with its precomputed ``impact_summary`` when
+    available. Set summary_only to skip the trees.
     """
     try:
         from cocosearch.deps.query import get_impact_batch as _get_impact_batch
@@ -3374,14 +3504,28 @@ async def get_batch_impact(
             if not index_name:
                 return {"error": "Could not auto-detect index. Provide index_name."}
 
+        summaries = _impact_summaries(index_name, files)
+        if summary_only and summaries is not None:
+            result = {
+                "files_requested": len(files),
+                "results": [{"file": f, "impact_summary": summaries[f]} for f in files],
+            }
+            return _append_deps_warnings(result, index_name)
+
         depth = min(depth, 20)
-        trees = _get_impact_batch(index_name, files, max_depth=depth, dep_type=dep_type)
+        trees = _get_impact_batch(
+            index_name, files, max_depth=depth, dep_type=dep_type, use_graph=True
+        )
+        results = []
+        for t in trees:
+            entry = {"file": t.file, "impact_tree": _dep_tree_to_dict(t)}
+            if summaries is not None:
+                entry["impact_summary"] = summaries[t.file]
+            results.append(entry)
         result = {
             "files_requested": len(files),
             "depth": depth,
-            "results": [
-                {"file": t.file, "impact_tree": _dep_tree_to_dict(t)} for t in trees
-            ],
+            "results": results,
         }
         return _append_deps_warnings(result, index_name)
     except Exception as e:
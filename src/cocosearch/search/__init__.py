@@ -13,8 +13,8 @@ from cocosearch.search.analyze import (
     analyze,
     multi_analyze,
 )
-from cocosearch.search.multi import multi_search
-from cocosearch.search.query import SearchResult, search
+from cocosearch.search.multi import multi_search, multi_search_async
+from cocosearch.search.query import SearchResult, search, search_async
 from cocosearch.search.utils import byte_to_line, read_chunk_content
 
 # Note: SearchREPL and run_repl are not exported here to avoid circular imports.
@@ -24,6 +24,8 @@ __all__ = [
     # Core search
     "search",
     "multi_search",
+    "search_async",
+    "multi_search_async",
     "SearchResult",
     # Pipeline analysis
     "analyze",
@@ -439,6 +439,11 @@ def analyze(
                 symbol_type=r.symbol_type,
                 symbol_name=r.symbol_name,
                 symbol_signature=r.symbol_signature,
+                start_line=r.start_line,
+                end_line=r.end_line,
+                content=r.content,
+                scope_start_line=r.scope_start_line,
+                scope_end_line=r.scope_end_line,
             )
             for r in vector_results[:limit]
         ]
@@ -513,6 +518,11 @@ def analyze(
                 symbol_type=hr.symbol_type,
                 symbol_name=hr.symbol_name,
                 symbol_signature=hr.symbol_signature,
+                start_line=hr.start_line,
+                end_line=hr.end_line,
+                content=hr.content,
+                scope_start_line=hr.scope_start_line,
+                scope_end_line=hr.scope_end_line,
             )
             for hr in pre_filter
         ]
@@ -530,6 +540,11 @@ def analyze(
                 symbol_type=r.symbol_type,
                 symbol_name=r.symbol_name,
                 symbol_signature=r.symbol_signature,
+                start_line=r.start_line,
+                end_line=r.end_line,
+                content=r.content,
+                scope_start_line=r.scope_start_line,
+                scope_end_line=r.scope_end_line,
             )
             for r in vector_results[:limit]
         ]
@@ -2,16 +2,27 @@
 
 Implements two-level caching for search queries:
 1. Exact match: Hash-based lookup for identical queries
-2. Semantic: Embedding similarity for paraphrased queries (cosine > 0.95)
-
-Cache is in-memory for the session and invalidates on reindex.
+2. Semantic: Embedding similarity for paraphrased queries (cosine >= 0.92)
+   with identical filters, scored against every cached embedding of the
+   index with one matrix-vector product
+
+Entries are kept in memory and persisted to a SQLite file under
+``~/.cache/cocosearch/queries`` shared by every process, so CLI runs, REPL
+sessions and MCP server restarts start warm. The file also holds a
+generation number per index: every entry records the generation it was
+computed at, and reindexing bumps it, which invalidates the index's entries
+in all processes at once. Reindexes from other machines never touch that
+file; processes that do not follow index change notifications catch them
+by comparing the generation stored in the database now and then.
 """
 
 import hashlib
+import json
 import os
+import sqlite3
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, is_dataclass
 from typing import Any
 
 import numpy as np
@@ -28,11 +39,18 @@ def _get_cs_log():
 DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/cocosearch/queries")
 
 # Cache settings
-MAX_CACHE_ENTRIES = 500  # Max entries before LRU eviction
-MAX_SEMANTIC_SCAN = 50  # Max entries to scan for semantic similarity (O(n) search)
+MAX_CACHE_ENTRIES = 500  # Max in-memory entries before LRU eviction
+MAX_DISK_ENTRIES = 5000  # Max persisted entries before LRU eviction
 DEFAULT_TTL = 86400  # 24 hours
 SEMANTIC_THRESHOLD = 0.92  # Cosine similarity threshold for semantic cache hits
 
+# Trim the disk store every this many stores rather than on each one.
+_TRIM_EVERY = 64
+
+# Seconds a process without an index change listener relies on its last look
+# at an index's database generation (see QueryCache._check_database_generation).
+DATABASE_GENERATION_CHECK_INTERVAL = 10.0
+
 
 @dataclass
 class CacheEntry:
@@ -42,6 +60,57 @@ class CacheEntry:
     embedding: list[float] | None  # Query embedding for semantic matching
     timestamp: float
     index_name: str
+    generation: int = 0  # Index generation the results were computed at
+
+
+def _database_generation(index_name: str) -> int | None:
+    """The index's generation in ``cocosearch_index_metadata``.
+
+    None when the database cannot be reached or the index has no metadata
+    row; the cache then goes by its local generation alone.
+    """
+    from cocosearch.search.db import get_connection_pool
+
+    try:
+        with get_connection_pool().connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT generation FROM cocosearch_index_metadata"
+                    " WHERE index_name = %s",
+                    (index_name,),
+                )
+                row = cur.fetchone()
+    except Exception as e:
+        _get_cs_log().cache(
+            "Index generation lookup failed", level="DEBUG", error=str(e)
+        )
+        return None
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def _filters_signature(
+    index_name: str,
+    limit: int,
+    min_score: float,
+    language_filter: str | None,
+    use_hybrid: bool | None,
+    symbol_type: str | list[str] | None,
+    symbol_name: str | None,
+) -> str:
+    """Everything in the cache key except the query text.
+
+    Semantic hits are only valid between searches that agree on all of it.
+    """
+    return _compute_cache_key(
+        "",
+        index_name,
+        limit,
+        min_score,
+        language_filter,
+        use_hybrid,
+        symbol_type,
+        symbol_name,
+    )
 
 
 def _compute_cache_key(
@@ -118,45 +187,410 @@ def cosine_similarity(a: list[float], b: list[float]) -> float:
     return float(dot / (norm_a * norm_b))
 
 
+class _EmbeddingMatrix:
+    """Unit-normalized query embeddings of one index, one row per entry.
+
+    Rows live in a preallocated float32 matrix that doubles when full;
+    removal moves the last row into the freed slot.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.matrix = np.zeros((16, dim), dtype=np.float32)
+        self.keys: list[str] = []
+        self.signatures: list[str] = []
+        self._rows: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, signature: str, embedding: list[float]) -> None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            if row == self.matrix.shape[0]:
+                grown = np.zeros((row * 2, self.dim), dtype=np.float32)
+                grown[:row] = self.matrix
+                self.matrix = grown
+            self.keys.append(key)
+            self.signatures.append(signature)
+            self._rows[key] = row
+        else:
+            self.signatures[row] = signature
+        self.matrix[row] = vector / norm
+
+    def remove(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self.keys) - 1
+        if row != last:
+            self.matrix[row] = self.matrix[last]
+            self.keys[row] = self.keys[last]
+            self.signatures[row] = self.signatures[last]
+            self._rows[self.keys[row]] = row
+        self.keys.pop()
+        self.signatures.pop()
+
+    def similarities(self, embedding: list[float]) -> np.ndarray:
+        """Cosine similarity of ``embedding`` to every row (one mat-vec)."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0 or vector.shape[0] != self.dim:
+            return np.zeros(len(self.keys), dtype=np.float32)
+        return self.matrix[: len(self.keys)] @ (vector / norm)
+
+
+def _encode_results(results: list[Any]) -> str | None:
+    """Serialize results for the disk store, or None if they can't be."""
+    if results and all(is_dataclass(r) for r in results):
+        payload = {"type": "search_result", "items": [asdict(r) for r in results]}
+    else:
+        payload = {"type": "json", "items": results}
+    try:
+        return json.dumps(payload)
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode_results(data: str) -> list[Any]:
+    """Inverse of :func:`_encode_results`."""
+    payload = json.loads(data)
+    if payload["type"] == "search_result":
+        # Lazy import: query imports this module
+        from cocosearch.search.query import SearchResult
+
+        return [SearchResult(**item) for item in payload["items"]]
+    return payload["items"]
+
+
 class QueryCache:
     """Two-level query cache with exact and semantic matching.
 
     Level 1 (Exact): Hash-based lookup for identical queries
     Level 2 (Semantic): Embedding similarity for paraphrased queries
 
-    Cache entries expire after TTL and are invalidated on reindex.
+    Entries live in memory and in a SQLite store shared across processes.
+    They expire after TTL and are invalidated on reindex by bumping the
+    index's generation number. Disk errors are never fatal: the disk store
+    disables itself and the in-memory cache keeps working.
     """
 
     def __init__(
         self,
-        cache_dir: str = DEFAULT_CACHE_DIR,
+        cache_dir: str | None = DEFAULT_CACHE_DIR,
         ttl: int = DEFAULT_TTL,
         semantic_threshold: float = SEMANTIC_THRESHOLD,
+        max_disk_entries: int = MAX_DISK_ENTRIES,
     ):
         """Initialize the query cache.
 
         Args:
-            cache_dir: Directory for persistent cache storage.
+            cache_dir: Directory for persistent cache storage, or None to
+                keep the cache in memory only.
             ttl: Time-to-live in seconds (default 24 hours).
             semantic_threshold: Cosine similarity threshold for semantic hits.
+            max_disk_entries: Entries kept on disk (least recently used are
+                dropped first).
         """
         self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "results.db") if cache_dir else None
         self.ttl = ttl
         self.semantic_threshold = semantic_threshold
+        self.max_disk_entries = max_disk_entries
         self._lock = threading.Lock()
 
-        # In-memory cache for fast access (session-scoped)
+        # In-memory cache for fast access
         # Key: cache_key, Value: CacheEntry
         self._cache: dict[str, CacheEntry] = {}
 
-        # Embedding index for semantic search (index_name -> list of (key, embedding))
-        self._embedding_index: dict[str, list[tuple[str, list[float]]]] = {}
+        # Embedding index for semantic search (index_name -> embedding matrix)
+        self._embedding_index: dict[str, _EmbeddingMatrix] = {}
+
+        # Generation each index's in-memory state was built at
+        self._generations: dict[str, int] = {}
+        # Generations when the disk store is unavailable
+        self._local_generations: dict[str, int] = {}
+        # Database generation last acted on, when the disk store is unavailable
+        self._local_database_generations: dict[str, int] = {}
+        # When each index's database generation was last looked at (monotonic)
+        self._database_checks: dict[str, float] = {}
 
-        # Ensure cache directory exists
-        os.makedirs(cache_dir, exist_ok=True)
+        self._conn: sqlite3.Connection | None = None
+        self._disk_enabled = self.path is not None
+        self._stores = 0
 
         _get_cs_log().cache("Query cache initialized", level="DEBUG", path=cache_dir)
 
+    def _disk(self) -> sqlite3.Connection | None:
+        """Open the SQLite store on first use. Must hold self._lock."""
+        if not self._disk_enabled:
+            return None
+        if self._conn is None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS query_results ("
+                    "  cache_key TEXT PRIMARY KEY,"
+                    "  index_name TEXT NOT NULL,"
+                    "  generation INTEGER NOT NULL,"
+                    "  signature TEXT NOT NULL,"
+                    "  embedding BLOB,"
+                    "  results TEXT NOT NULL,"
+                    "  created_at REAL NOT NULL,"
+                    "  last_used_at REAL NOT NULL"
+                    ")"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS query_results_index"
+                    " ON query_results (index_name, generation)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS index_generations ("
+                    "  index_name TEXT PRIMARY KEY,"
+                    "  generation INTEGER NOT NULL"
+                    ")"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS database_generations ("
+                    "  index_name TEXT PRIMARY KEY,"
+                    "  generation INTEGER NOT NULL"
+                    ")"
+                )
+                conn.commit()
+                self._conn = conn
+            except Exception as e:
+                self._disable_disk(e)
+        return self._conn
+
+    def _disable_disk(self, exc: Exception) -> None:
+        if self._disk_enabled:
+            _get_cs_log().cache(
+                "Query cache disk store disabled", level="WARNING", error=str(exc)
+            )
+        self._disk_enabled = False
+        self._conn = None
+
+    def _current_generation(self, index_name: str) -> int:
+        """Read the index's generation number. Must hold self._lock."""
+        conn = self._disk()
+        if conn is not None:
+            try:
+                row = conn.execute(
+                    "SELECT generation FROM index_generations WHERE index_name = ?",
+                    (index_name,),
+                ).fetchone()
+                return row[0] if row else 0
+            except Exception as e:
+                self._disable_disk(e)
+        return self._local_generations.get(index_name, 0)
+
+    def _seen_database_generation(self, index_name: str) -> int | None:
+        """Database generation the cache was last invalidated for.
+
+        Shared through the disk store, so a reindex seen by one process is
+        acted on once. Must hold self._lock.
+        """
+        conn = self._disk()
+        if conn is not None:
+            try:
+                row = conn.execute(
+                    "SELECT generation FROM database_generations WHERE index_name = ?",
+                    (index_name,),
+                ).fetchone()
+                return row[0] if row else None
+            except Exception as e:
+                self._disable_disk(e)
+        return self._local_database_generations.get(index_name)
+
+    def _check_database_generation(self, index_name: str) -> None:
+        """Invalidate an index that was reindexed from elsewhere.
+
+        The disk store's generation only moves when this machine reindexes
+        or hears of a change through an IndexChangeListener. Processes
+        without a listener (one-shot CLI searches) compare the generation
+        in the database instead, at most every
+        ``DATABASE_GENERATION_CHECK_INTERVAL`` seconds.
+        """
+        from cocosearch.search.invalidation import is_listening
+
+        if is_listening():
+            return
+        now = time.monotonic()
+        with self._lock:
+            checked = self._database_checks.get(index_name)
+            if (
+                checked is not None
+                and now - checked < DATABASE_GENERATION_CHECK_INTERVAL
+            ):
+                return
+            self._database_checks[index_name] = now
+
+        generation = _database_generation(index_name)
+        if generation is None:
+            return
+        with self._lock:
+            if self._seen_database_generation(index_name) == generation:
+                return
+            removed = self._invalidate(index_name, database_generation=generation)
+        _get_cs_log().cache(
+            "Index changed in database, cache invalidated",
+            index=index_name,
+            generation=generation,
+            entries_removed=removed,
+        )
+
+    def _sync_index(self, index_name: str) -> int:
+        """Bring the in-memory state of an index up to its current generation.
+
+        Drops entries of older generations (another process reindexed) and
+        loads the embeddings persisted at the current one into the semantic
+        index. Must hold self._lock.
+
+        Returns:
+            The current generation.
+        """
+        generation = self._current_generation(index_name)
+        if self._generations.get(index_name) == generation:
+            return generation
+
+        for key in [k for k, e in self._cache.items() if e.index_name == index_name]:
+            del self._cache[key]
+        self._embedding_index.pop(index_name, None)
+        self._generations[index_name] = generation
+
+        conn = self._disk()
+        if conn is not None:
+            try:
+                rows = conn.execute(
+                    "SELECT cache_key, signature, embedding FROM query_results"
+                    " WHERE index_name = ? AND generation = ?"
+                    " AND embedding IS NOT NULL AND created_at > ?"
+                    " ORDER BY created_at",
+                    (index_name, generation, time.time() - self.ttl),
+                ).fetchall()
+            except Exception as e:
+                self._disable_disk(e)
+                rows = []
+            for cache_key, signature, blob in rows:
+                self._index_embedding(
+                    index_name,
+                    cache_key,
+                    signature,
+                    np.frombuffer(blob, dtype=np.float32),
+                )
+        return generation
+
+    def _index_embedding(
+        self, index_name: str, cache_key: str, signature: str, embedding: Any
+    ) -> None:
+        """Add an entry's embedding to the semantic index. Must hold self._lock."""
+        matrix = self._embedding_index.get(index_name)
+        if matrix is None or matrix.dim != len(embedding):
+            # New index, or the embedding model changed
+            matrix = _EmbeddingMatrix(len(embedding))
+            self._embedding_index[index_name] = matrix
+        matrix.add(cache_key, signature, embedding)
+
+    def _load_entry(
+        self, cache_key: str, index_name: str, generation: int
+    ) -> CacheEntry | None:
+        """Read an entry of the current generation from disk into memory.
+
+        Must hold self._lock.
+        """
+        conn = self._disk()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT signature, embedding, results, created_at FROM query_results"
+                " WHERE cache_key = ? AND generation = ?",
+                (cache_key, generation),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE query_results SET last_used_at = ? WHERE cache_key = ?",
+                (time.time(), cache_key),
+            )
+            conn.commit()
+        except Exception as e:
+            self._disable_disk(e)
+            return None
+
+        signature, blob, data, created_at = row
+        try:
+            results = _decode_results(data)
+        except Exception:
+            # Written by an incompatible version; treat as a miss
+            return None
+        embedding = (
+            np.frombuffer(blob, dtype=np.float32).tolist() if blob is not None else None
+        )
+        entry = CacheEntry(
+            results=results,
+            embedding=embedding,
+            timestamp=created_at,
+            index_name=index_name,
+            generation=generation,
+        )
+        self._cache[cache_key] = entry
+        if embedding:
+            self._index_embedding(index_name, cache_key, signature, embedding)
+        if len(self._cache) > MAX_CACHE_ENTRIES:
+            self._evict_oldest()
+        return entry
+
+    def _store(self, cache_key: str, signature: str, entry: CacheEntry) -> None:
+        """Persist an entry. Must hold self._lock."""
+        conn = self._disk()
+        if conn is None:
+            return
+        data = _encode_results(entry.results)
+        if data is None:
+            return
+        blob = (
+            np.asarray(entry.embedding, dtype=np.float32).tobytes()
+            if entry.embedding
+            else None
+        )
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO query_results"
+                " (cache_key, index_name, generation, signature, embedding,"
+                " results, created_at, last_used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key,
+                    entry.index_name,
+                    entry.generation,
+                    signature,
+                    blob,
+                    data,
+                    entry.timestamp,
+                    entry.timestamp,
+                ),
+            )
+            self._stores += 1
+            if self._stores % _TRIM_EVERY == 0:
+                conn.execute(
+                    "DELETE FROM query_results WHERE rowid IN ("
+                    "  SELECT rowid FROM query_results"
+                    "  ORDER BY last_used_at DESC LIMIT -1 OFFSET ?"
+                    ")",
+                    (self.max_disk_entries,),
+                )
+            conn.commit()
+        except Exception as e:
+            self._disable_disk(e)
+
     def get(
         self,
         query: str,
@@ -198,38 +632,58 @@ class QueryCache:
             symbol_name,
         )
 
+        self._check_database_generation(index_name)
         with self._lock:
+            generation = self._sync_index(index_name)
+            now = time.time()
+
             # Level 1: Exact match
-            if cache_key in self._cache:
-                entry = self._cache[cache_key]
+            entry = self._cache.get(cache_key) or self._load_entry(
+                cache_key, index_name, generation
+            )
+            if entry is not None:
                 # Check TTL
-                if time.time() - entry.timestamp < self.ttl:
+                if now - entry.timestamp < self.ttl:
                     _get_cs_log().cache("Cache hit (exact)", query=query[:100])
                     return entry.results, "exact"
                 else:
                     # Expired - remove from cache
-                    del self._cache[cache_key]
+                    self._cache.pop(cache_key, None)
                     self._remove_from_embedding_index(index_name, cache_key)
 
             # Level 2: Semantic match (only if we have embedding)
-            # Scan only the most recent entries to bound O(n) cost
-            if query_embedding and index_name in self._embedding_index:
-                entries = self._embedding_index[index_name]
-                for key, cached_embedding in entries[-MAX_SEMANTIC_SCAN:]:
-                    if key in self._cache:
-                        entry = self._cache[key]
-                        # Check TTL
-                        if time.time() - entry.timestamp >= self.ttl:
-                            continue
-
-                        sim = cosine_similarity(query_embedding, cached_embedding)
-                        if sim >= self.semantic_threshold:
-                            _get_cs_log().cache(
-                                "Cache hit (semantic)",
-                                similarity=f"{sim:.3f}",
-                                query=query[:100],
-                            )
-                            return entry.results, "semantic"
+            # All cached embeddings of the index are scored at once; only
+            # entries with the same filters and limit qualify.
+            matrix = self._embedding_index.get(index_name)
+            if query_embedding and matrix:
+                signature = _filters_signature(
+                    index_name,
+                    limit,
+                    min_score,
+                    language_filter,
+                    use_hybrid,
+                    symbol_type,
+                    symbol_name,
+                )
+                sims = matrix.similarities(query_embedding)
+                for row in np.argsort(-sims):
+                    sim = float(sims[row])
+                    if sim < self.semantic_threshold:
+                        break
+                    if matrix.signatures[row] != signature:
+                        continue
+                    key = matrix.keys[row]
+                    entry = self._cache.get(key) or self._load_entry(
+                        key, index_name, generation
+                    )
+                    if entry is None or now - entry.timestamp >= self.ttl:
+                        continue
+                    _get_cs_log().cache(
+                        "Cache hit (semantic)",
+                        similarity=f"{sim:.3f}",
+                        query=query[:100],
+                    )
+                    return entry.results, "semantic"
 
         return None, "miss"
 
@@ -248,6 +702,10 @@ class QueryCache:
     ) -> None:
         """Store query results in cache.
 
+        Results are recorded under the index generation seen by the last
+        lookup, so results computed while the index was being rebuilt are
+        never served after the rebuild.
+
         Args:
             query: Search query text.
             index_name: Index being searched.
@@ -270,33 +728,48 @@ class QueryCache:
             symbol_type,
             symbol_name,
         )
-
-        entry = CacheEntry(
-            results=results,
-            embedding=query_embedding,
-            timestamp=time.time(),
-            index_name=index_name,
+        signature = _filters_signature(
+            index_name,
+            limit,
+            min_score,
+            language_filter,
+            use_hybrid,
+            symbol_type,
+            symbol_name,
         )
 
         with self._lock:
+            generation = self._generations.get(index_name)
+            if generation is None:
+                generation = self._sync_index(index_name)
+
+            entry = CacheEntry(
+                results=results,
+                embedding=query_embedding,
+                timestamp=time.time(),
+                index_name=index_name,
+                generation=generation,
+            )
             self._cache[cache_key] = entry
 
             # Add to embedding index if we have embedding
             if query_embedding:
-                if index_name not in self._embedding_index:
-                    self._embedding_index[index_name] = []
-                self._embedding_index[index_name].append((cache_key, query_embedding))
+                self._index_embedding(index_name, cache_key, signature, query_embedding)
 
             # LRU eviction: remove oldest entries when cache exceeds limit
             if len(self._cache) > MAX_CACHE_ENTRIES:
                 self._evict_oldest()
 
+            self._store(cache_key, signature, entry)
+
         _get_cs_log().cache("Cache store", query=query[:100], index=index_name)
 
     def invalidate_index(self, index_name: str) -> int:
         """Remove all cached entries for an index.
 
-        Called when reindexing to ensure fresh results.
+        Called when reindexing to ensure fresh results. Bumps the index's
+        generation, which invalidates the entries held by other processes
+        on their next lookup.
 
         Args:
             index_name: Index to invalidate.
@@ -305,30 +778,74 @@ class QueryCache:
             Number of entries removed.
         """
         with self._lock:
-            removed = 0
-
-            # Remove from main cache
-            keys_to_remove = [
-                key
-                for key, entry in self._cache.items()
-                if entry.index_name == index_name
-            ]
-            for key in keys_to_remove:
-                del self._cache[key]
-                removed += 1
-
-            # Remove from embedding index
-            if index_name in self._embedding_index:
-                del self._embedding_index[index_name]
+            removed = self._invalidate(index_name)
 
         _get_cs_log().cache(
             "Cache invalidated", index=index_name, entries_removed=removed
         )
         return removed
 
+    def _invalidate(
+        self, index_name: str, database_generation: int | None = None
+    ) -> int:
+        """Drop an index's entries and bump its generation.
+
+        ``database_generation``, when given, is recorded in the same disk
+        transaction (see :meth:`_check_database_generation`). Must hold
+        self._lock.
+        """
+        removed = 0
+
+        # Remove from main cache
+        keys_to_remove = [
+            key for key, entry in self._cache.items() if entry.index_name == index_name
+        ]
+        for key in keys_to_remove:
+            del self._cache[key]
+            removed += 1
+
+        # Remove from embedding index
+        if index_name in self._embedding_index:
+            del self._embedding_index[index_name]
+        self._generations.pop(index_name, None)
+        self._local_generations[index_name] = (
+            self._local_generations.get(index_name, 0) + 1
+        )
+        if database_generation is not None:
+            self._local_database_generations[index_name] = database_generation
+
+        conn = self._disk()
+        if conn is not None:
+            try:
+                if database_generation is not None:
+                    conn.execute(
+                        "INSERT INTO database_generations (index_name, generation)"
+                        " VALUES (?, ?) ON CONFLICT (index_name)"
+                        " DO UPDATE SET generation = excluded.generation",
+                        (index_name, database_generation),
+                    )
+                conn.execute(
+                    "INSERT INTO index_generations (index_name, generation)"
+                    " VALUES (?, 1) ON CONFLICT (index_name)"
+                    " DO UPDATE SET generation = generation + 1",
+                    (index_name,),
+                )
+                cur = conn.execute(
+                    "DELETE FROM query_results WHERE index_name = ?",
+                    (index_name,),
+                )
+                conn.commit()
+                removed = max(removed, cur.rowcount)
+            except Exception as e:
+                self._disable_disk(e)
+        return removed
+
     def _evict_oldest(self) -> None:
         """Evict oldest cache entries to stay within MAX_CACHE_ENTRIES.
 
+        Evicted entries stay on disk, so their embeddings are kept in the
+        semantic index unless the disk store is unavailable.
+
         Must be called while holding self._lock.
         """
         entries_to_remove = len(self._cache) - MAX_CACHE_ENTRIES
@@ -339,26 +856,34 @@ class QueryCache:
         sorted_keys = sorted(self._cache.keys(), key=lambda k: self._cache[k].timestamp)
         for key in sorted_keys[:entries_to_remove]:
             entry = self._cache.pop(key)
-            self._remove_from_embedding_index(entry.index_name, key)
+            if not self._disk_enabled:
+                self._remove_from_embedding_index(entry.index_name, key)
 
     def _remove_from_embedding_index(self, index_name: str, cache_key: str) -> None:
         """Remove a single entry from the embedding index.
 
-        Deletes the key entirely when the list becomes empty to prevent
-        accumulating empty lists over time.
+        Deletes the index's matrix entirely when it becomes empty to prevent
+        accumulating empty matrices over time.
         """
-        if index_name in self._embedding_index:
-            self._embedding_index[index_name] = [
-                (k, e) for k, e in self._embedding_index[index_name] if k != cache_key
-            ]
-            if not self._embedding_index[index_name]:
+        matrix = self._embedding_index.get(index_name)
+        if matrix is not None:
+            matrix.remove(cache_key)
+            if not matrix:
                 del self._embedding_index[index_name]
 
     def clear(self) -> None:
-        """Clear all cached entries."""
+        """Clear all cached entries, in memory and on disk."""
         with self._lock:
             self._cache.clear()
             self._embedding_index.clear()
+            self._generations.clear()
+            conn = self._disk()
+            if conn is not None:
+                try:
+                    conn.execute("DELETE FROM query_results")
+                    conn.commit()
+                except Exception as e:
+                    self._disable_disk(e)
         _get_cs_log().cache("Cache cleared")
 
 
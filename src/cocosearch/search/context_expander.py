@@ -2,22 +2,26 @@
 
 Provides intelligent context expansion for search results by finding
 enclosing function/class boundaries using tree-sitter AST parsing.
-Includes LRU caching for efficient file reading during search sessions.
+Files and parse trees come from the process-wide file cache, so they are
+reused across search requests.
 
 Features:
 - Smart boundary detection finds enclosing function or class
-- LRU caching (128 files) prevents repeated I/O
+- Shared file and tree cache (see cocosearch.search.file_cache)
 - 50-line hard limit enforced on all results
 - Graceful fallback on parse errors
 """
 
 import logging
 from functools import lru_cache
-from pathlib import Path
 
-from tree_sitter import Parser
-
-from cocosearch.ts_parsers import get_parser
+from cocosearch.indexer.change_detection import digest_matches
+from cocosearch.search.file_cache import FileCache, get_file_cache
+from cocosearch.ts_scopes import (
+    DEFINITION_NODE_TYPES,
+    definition_range,
+    language_for_path,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,71 +32,9 @@ logger = logging.getLogger(__name__)
 MAX_CONTEXT_LINES = 50  # Hard limit per CONTEXT.md
 LINE_TRUNCATION_LENGTH = 200  # Truncate long lines at this length
 
-# Definition node types by language for enclosing scope detection
-DEFINITION_NODE_TYPES: dict[str, set[str]] = {
-    "python": {"function_definition", "class_definition"},
-    "javascript": {
-        "function_declaration",
-        "class_declaration",
-        "method_definition",
-        "arrow_function",
-    },
-    "typescript": {
-        "function_declaration",
-        "class_declaration",
-        "method_definition",
-        "arrow_function",
-        "interface_declaration",
-    },
-    "go": {"function_declaration", "method_declaration", "type_declaration"},
-    "rust": {"function_item", "impl_item", "struct_item", "trait_item"},
-    "scala": {
-        "class_definition",
-        "trait_definition",
-        "object_definition",
-        "function_definition",
-    },
-    "hcl": {"block"},
-    "terraform": {"block"},
-    "dockerfile": {"from_instruction"},
-    "yaml": {"block_mapping_pair"},
-}
-
 # Languages that support smart context expansion (derived from DEFINITION_NODE_TYPES)
 CONTEXT_EXPANSION_LANGUAGES: set[str] = set(DEFINITION_NODE_TYPES.keys())
 
-# File extension to tree-sitter language mapping
-EXTENSION_TO_LANGUAGE: dict[str, str] = {
-    # Python
-    ".py": "python",
-    # JavaScript
-    ".js": "javascript",
-    ".jsx": "javascript",
-    ".mjs": "javascript",
-    ".cjs": "javascript",
-    # TypeScript
-    ".ts": "typescript",
-    ".tsx": "typescript",
-    ".mts": "typescript",
-    ".cts": "typescript",
-    # Go
-    ".go": "go",
-    # Rust
-    ".rs": "rust",
-    # Scala
-    ".scala": "scala",
-    # HCL / Terraform
-    ".tf": "terraform",
-    ".hcl": "hcl",
-    ".tfvars": "terraform",
-    # Dockerfile
-    ".dockerfile": "dockerfile",
-    # YAML
-    ".yaml": "yaml",
-    ".yml": "yaml",
-}
-
-
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -107,8 +49,7 @@ def _get_language_from_path(filepath: str) -> str | None:
     Returns:
         Tree-sitter language name, or None if extension not supported.
     """
-    ext = Path(filepath).suffix.lower()
-    return EXTENSION_TO_LANGUAGE.get(ext)
+    return language_for_path(filepath)
 
 
 def _truncate_line(line: str, max_length: int = LINE_TRUNCATION_LENGTH) -> str:
@@ -126,37 +67,6 @@ def _truncate_line(line: str, max_length: int = LINE_TRUNCATION_LENGTH) -> str:
     return line[: max_length - 3] + "..."
 
 
-def _line_to_byte(lines: list[str], line_number: int) -> int:
-    """Convert 1-based line number to byte offset.
-
-    Args:
-        lines: List of file lines (with line endings stripped).
-        line_number: 1-based line number.
-
-    Returns:
-        Byte offset of start of line in original file.
-    """
-    # Accumulate bytes for all lines before target
-    byte_offset = 0
-    for i in range(min(line_number - 1, len(lines))):
-        # Add line length + 1 for newline
-        byte_offset += len(lines[i].encode("utf-8")) + 1
-    return byte_offset
-
-
-def _byte_to_line(content: bytes, byte_offset: int) -> int:
-    """Convert byte offset to 1-based line number.
-
-    Args:
-        content: File content as bytes.
-        byte_offset: Byte offset in the file.
-
-    Returns:
-        1-based line number.
-    """
-    return content[:byte_offset].count(b"\n") + 1
-
-
 # ============================================================================
 # Context Expander Class
 # ============================================================================
@@ -166,9 +76,13 @@ class ContextExpander:
     """Manages context expansion with caching.
 
     Provides smart context expansion using tree-sitter to find enclosing
-    function/class boundaries. Caches file content per instance and reuses
-    thread-local tree-sitter parsers for efficient repeated access during
-    search sessions.
+    function/class boundaries. File lines and parse trees come from the
+    process-wide :class:`~cocosearch.search.file_cache.FileCache`, so an
+    expander created per request still reuses earlier requests' reads.
+
+    Args:
+        file_cache: Cache to read files through (defaults to the
+            process-wide one).
 
     Usage:
         expander = ContextExpander()
@@ -182,45 +96,24 @@ class ContextExpander:
         expander.clear_cache()
     """
 
-    def __init__(self):
-        """Initialize context expander with empty caches."""
-        # Create instance-level LRU cache for file reading
-        self._read_file_cached = lru_cache(maxsize=128)(self._read_file_impl)
+    def __init__(self, file_cache: FileCache | None = None):
+        """Initialize context expander."""
+        self._file_cache = file_cache or get_file_cache()
+        # Hash checks against the index, per search session
+        self._is_indexed_cached = lru_cache(maxsize=128)(self._is_indexed_impl)
 
-    def _get_parser(self, language: str) -> Parser:
-        """Get a tree-sitter parser for the language (cached per thread).
+    def _is_indexed_impl(self, filepath: str, file_hash: str) -> bool:
+        """Check the file against its indexed hash (implementation for LRU cache).
 
-        Delegates to the centralized thread-local provider rather than caching
-        on the instance: tree-sitter ``Parser`` objects are unsendable across
-        threads, so a ContextExpander shared across a thread pool must never
-        hand a parser from one thread to another. See :mod:`cocosearch.ts_parsers`.
-
-        Args:
-            language: Tree-sitter language name.
-
-        Returns:
-            Parser instance configured for the language, owned by this thread.
+        The cached text is decoded the way the indexer reads files, so an
+        unchanged file hashes to the digest stored in the index's tracking
+        table.
         """
-        return get_parser(language)
-
-    def _read_file_impl(self, filepath: str) -> list[str]:
-        """Read file lines (implementation for LRU cache).
-
-        Args:
-            filepath: Path to the source file.
-
-        Returns:
-            List of lines with line endings stripped.
-        """
-        try:
-            with open(filepath, encoding="utf-8", errors="replace") as f:
-                return [line.rstrip("\n\r") for line in f.readlines()]
-        except (FileNotFoundError, IOError, OSError) as e:
-            logger.debug(f"Cannot read file {filepath}: {e}")
-            return []
+        cached = self._file_cache.get(filepath)
+        return cached is not None and digest_matches(cached.text, file_hash)
 
     def get_file_lines(self, filepath: str) -> list[str]:
-        """Get file lines with LRU caching (max 128 files).
+        """Get file lines through the shared file cache.
 
         Args:
             filepath: Path to the source file.
@@ -228,7 +121,8 @@ class ContextExpander:
         Returns:
             List of lines with line endings stripped, or empty list on error.
         """
-        return self._read_file_cached(filepath)
+        cached = self._file_cache.get(filepath)
+        return cached.lines if cached is not None else []
 
     def find_enclosing_scope(
         self, filepath: str, start_line: int, end_line: int, language: str
@@ -254,13 +148,11 @@ class ContextExpander:
                 logger.debug(f"Language {language} not supported for scope detection")
                 return (start_line, end_line)
 
-            # Read file as bytes for tree-sitter
-            with open(filepath, "rb") as f:
-                content = f.read()
-
-            # Parse with tree-sitter
-            parser = self._get_parser(language)
-            tree = parser.parse(content)
+            # Parse with tree-sitter (tree reused while the file is unchanged)
+            parsed = self._file_cache.tree(filepath, language)
+            if parsed is None:
+                return (start_line, end_line)
+            cached, tree = parsed
 
             # Log if parse has errors (still try to use partial tree)
             if tree.root_node.has_error:
@@ -268,32 +160,19 @@ class ContextExpander:
                     f"Parse errors in {filepath}, using best-effort boundaries"
                 )
 
-            # Get file lines for byte offset calculation
-            lines = self.get_file_lines(filepath)
-            if not lines:
+            if not cached.lines:
                 return (start_line, end_line)
 
             # Calculate byte offset for start line
-            start_byte = _line_to_byte(lines, start_line)
+            start_byte = cached.line_to_byte(start_line)
 
-            # Find node at position
-            node = tree.root_node.descendant_for_byte_range(start_byte, start_byte)
-            if node is None:
+            # Walk up from the position to the nearest definition
+            found = definition_range(tree, start_byte, language)
+            if found is None:
                 return (start_line, end_line)
 
-            # Walk up parent chain looking for definition types
-            definition_types = DEFINITION_NODE_TYPES[language]
-            current = node
-            while current is not None:
-                if current.type in definition_types:
-                    # Found enclosing scope - convert byte range to lines
-                    scope_start = _byte_to_line(content, current.start_byte)
-                    scope_end = _byte_to_line(content, current.end_byte)
-                    return (scope_start, scope_end)
-                current = current.parent
-
-            # No enclosing scope found
-            return (start_line, end_line)
+            # Found enclosing scope - convert byte range to lines
+            return (cached.byte_to_line(found[0]), cached.byte_to_line(found[1]))
 
         except Exception as e:
             logger.debug(f"Error finding enclosing scope in {filepath}: {e}")
@@ -308,6 +187,8 @@ class ContextExpander:
         context_after: int = 0,
         smart: bool = True,
         language: str | None = None,
+        scope: tuple[int, int] | None = None,
+        file_hash: str | None = None,
     ) -> tuple[
         list[tuple[int, str]], list[tuple[int, str]], list[tuple[int, str]], bool, bool
     ]:
@@ -317,6 +198,10 @@ class ContextExpander:
         using tree-sitter, then applies 50-line hard limit centered on original
         match. When smart=False, uses explicit context_before/context_after values.
 
+        An enclosing scope stored at index time is used instead of parsing
+        the file, as long as the file still matches the hash it was indexed
+        with. Otherwise the scope is found by parsing, as before.
+
         Args:
             filepath: Path to the source file.
             start_line: 1-based start line of the match.
@@ -325,6 +210,9 @@ class ContextExpander:
             context_after: Lines to include after match (when smart=False).
             smart: Whether to use smart boundary detection.
             language: Tree-sitter language name (auto-detected if None).
+            scope: Enclosing scope (start_line, end_line) stored in the index.
+            file_hash: Content hash the file was indexed with; required for
+                ``scope`` to be used.
 
         Returns:
             Tuple of (before_lines, match_lines, after_lines, is_bof, is_eof).
@@ -346,10 +234,18 @@ class ContextExpander:
 
         # Determine context range
         if smart and language:
-            # Use tree-sitter to find enclosing scope
-            scope_start, scope_end = self.find_enclosing_scope(
-                filepath, start_line, end_line, language
-            )
+            if (
+                scope is not None
+                and file_hash
+                and self._is_indexed_cached(filepath, file_hash)
+            ):
+                # File unchanged since indexing: the stored scope is current
+                scope_start, scope_end = scope
+            else:
+                # Use tree-sitter to find enclosing scope
+                scope_start, scope_end = self.find_enclosing_scope(
+                    filepath, start_line, end_line, language
+                )
 
             # Calculate total scope size
             total_scope_lines = scope_end - scope_start + 1
@@ -411,11 +307,12 @@ class ContextExpander:
         return (before_lines, match_lines, after_lines, is_bof, is_eof)
 
     def clear_cache(self):
-        """Clear file cache after search session.
+        """Clear per-session hash checks after a search session.
 
-        Should be called after each search to free memory.
+        The shared file cache is kept; it revalidates files on every lookup
+        and stays within its own memory budget.
         """
-        self._read_file_cached.cache_clear()
+        self._is_indexed_cached.cache_clear()
 
 
 # ============================================================================
@@ -4,12 +4,15 @@ Provides connection pool management and table name resolution for
 querying CocoIndex-created vector tables in PostgreSQL.
 """
 
+import asyncio
 import atexit
+import json
 import logging
 import threading
+import time
 
-from pgvector.psycopg import register_vector
-from psycopg_pool import ConnectionPool
+from pgvector.psycopg import register_vector, register_vector_async
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
 from cocosearch.config.env_validation import get_database_url
 from cocosearch.validation import validate_index_name
@@ -26,9 +29,24 @@ def _get_cs_log():
 _pool: ConnectionPool | None = None
 _pool_lock = threading.Lock()
 
+# Async pool for the MCP server's event loop, and the loop it belongs to
+# (an AsyncConnectionPool cannot be shared across loops).
+_async_pool: AsyncConnectionPool | None = None
+_async_pool_loop: asyncio.AbstractEventLoop | None = None
+
 # Module-level cache for symbol column availability per table
 _symbol_columns_available: dict[str, bool] = {}
 
+# Module-level cache for line column availability per table
+_line_columns_available: dict[str, bool] = {}
+
+# Vector index parameters and embedding dimension per table:
+# table -> (fetched_at, params, dimension). Expires because a re-index may
+# rebuild the index with other parameters, unless this process follows index
+# change notifications (see cocosearch.search.invalidation).
+_vector_index_params: dict[str, tuple[float, dict | None, int | None]] = {}
+VECTOR_INDEX_PARAMS_TTL = 60.0
+
 
 def get_connection_pool() -> ConnectionPool:
     """Get or create the database connection pool.
@@ -89,6 +107,57 @@ def close_pool() -> None:
         _pool = None
 
 
+async def get_async_connection_pool() -> AsyncConnectionPool:
+    """Get or create the async connection pool of the running event loop.
+
+    Async counterpart of :func:`get_connection_pool` for the MCP server:
+    queries awaited on it never block the event loop. Same database URL,
+    sizing and pgvector registration. Closed with
+    :func:`close_async_pool` (the server lifespan does this).
+
+    Returns:
+        An open AsyncConnectionPool bound to the running loop.
+    """
+    global _async_pool, _async_pool_loop
+    loop = asyncio.get_running_loop()
+    if _async_pool is not None and _async_pool_loop is loop:
+        return _async_pool
+
+    async def configure(conn):
+        try:
+            await register_vector_async(conn)
+        except Exception as e:
+            # Same as the sync pool: fresh database without pgvector yet.
+            logger.debug(f"pgvector registration skipped: {e}")
+
+    pool = AsyncConnectionPool(
+        conninfo=get_database_url(),
+        min_size=2,
+        max_size=10,
+        configure=configure,
+        open=False,
+    )
+    await pool.open()
+    # Another task may have created one while this one was opening.
+    if _async_pool is not None and _async_pool_loop is loop:
+        await pool.close()
+        return _async_pool
+    _async_pool, _async_pool_loop = pool, loop
+    _get_cs_log().infra("Async database connection pool created")
+    return pool
+
+
+async def close_async_pool() -> None:
+    """Close the async connection pool, if one was created."""
+    global _async_pool, _async_pool_loop
+    pool, _async_pool, _async_pool_loop = _async_pool, None, None
+    if pool is not None:
+        try:
+            await pool.close()
+        except Exception:
+            pass
+
+
 def get_table_name(index_name: str) -> str:
     """Get the PostgreSQL table name for an index.
 
@@ -172,7 +241,38 @@ def check_symbol_columns_exist(table_name: str) -> bool:
 
 def _check_all_symbol_columns(table_name: str) -> bool:
     """Internal: Check if all three symbol columns exist."""
-    required_columns = {"symbol_type", "symbol_name", "symbol_signature"}
+    return _check_all_columns(
+        table_name, {"symbol_type", "symbol_name", "symbol_signature"}
+    )
+
+
+def check_line_columns_exist(table_name: str) -> bool:
+    """Check if the line and enclosing-scope columns exist in a table.
+
+    Uses module-level caching like :func:`check_symbol_columns_exist`.
+    Indexes created before line numbers were stored lack them; their
+    results get line numbers, content and scopes from the source files
+    instead.
+
+    Args:
+        table_name: Full table name (e.g., "codeindex_myproject__myproject_chunks")
+
+    Returns:
+        True if start_line, end_line, scope_start_line and scope_end_line
+        all exist.
+    """
+    if table_name in _line_columns_available:
+        return _line_columns_available[table_name]
+
+    result = _check_all_columns(
+        table_name, {"start_line", "end_line", "scope_start_line", "scope_end_line"}
+    )
+    _line_columns_available[table_name] = result
+    return result
+
+
+def _check_all_columns(table_name: str, required_columns: set[str]) -> bool:
+    """Internal: Check if all of ``required_columns`` exist."""
     existing = set()
 
     pool = get_connection_pool()
@@ -191,9 +291,138 @@ def _check_all_symbol_columns(table_name: str) -> bool:
 
 
 def reset_symbol_columns_cache() -> None:
-    """Reset the symbol columns availability cache.
+    """Reset the symbol and line column availability caches.
 
     Used by tests to ensure clean state between test runs.
     """
-    global _symbol_columns_available
+    global _symbol_columns_available, _line_columns_available
     _symbol_columns_available = {}
+    _line_columns_available = {}
+
+
+def _vector_layout(table_name: str) -> tuple[dict | None, int | None]:
+    """Return (vector index parameters, embedding column dimension), cached.
+
+    Both come from the catalog in one round-trip and are cached per table
+    for ``VECTOR_INDEX_PARAMS_TTL`` seconds, or until the index changes when
+    this process listens for index change notifications. Lookup failures
+    yield ``(None, None)``, i.e. plain vector search.
+    """
+    from cocosearch.search.invalidation import is_listening
+
+    now = time.monotonic()
+    cached = _vector_index_params.get(table_name)
+    if cached is not None and (
+        now - cached[0] < VECTOR_INDEX_PARAMS_TTL or is_listening()
+    ):
+        return cached[1], cached[2]
+
+    from cocosearch.indexer.vector_index import vector_index_name
+
+    params = None
+    dimension = None
+    try:
+        pool = get_connection_pool()
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT obj_description(to_regclass(%s), 'pg_class'), "
+                    "(SELECT atttypmod FROM pg_attribute "
+                    " WHERE attrelid = to_regclass(%s) AND attname = 'embedding')",
+                    (vector_index_name(table_name), table_name),
+                )
+                row = cur.fetchone()
+        if row and row[0]:
+            parsed = json.loads(row[0])
+            params = parsed if isinstance(parsed, dict) else None
+        if row and row[1] and row[1] > 0:
+            dimension = int(row[1])
+    except Exception as e:
+        logger.debug(f"Vector index lookup failed for {table_name}: {e}")
+
+    _vector_index_params[table_name] = (now, params, dimension)
+    return params, dimension
+
+
+def get_vector_index_params(table_name: str) -> dict | None:
+    """Get the parameters recorded on a table's vector index.
+
+    Search uses them to match a quantized index (see
+    :mod:`cocosearch.indexer.vector_index`).
+
+    Args:
+        table_name: Full table name (e.g., "codeindex_myproject__myproject_chunks")
+
+    Returns:
+        The recorded parameters, or None when the index is missing, predates
+        recorded parameters, or the lookup fails (plain vector search).
+    """
+    return _vector_layout(table_name)[0]
+
+
+def get_embedding_dimension(table_name: str) -> int | None:
+    """Get the declared dimension of a table's embedding column.
+
+    Indexes built with ``storedDimension`` hold truncated vectors, so query
+    embeddings are truncated to this dimension before searching them.
+
+    Args:
+        table_name: Full table name (e.g., "codeindex_myproject__myproject_chunks")
+
+    Returns:
+        The column dimension, or None if unknown.
+    """
+    return _vector_layout(table_name)[1]
+
+
+def get_indexed_file_hashes(index_name: str, filenames: list[str]) -> dict[str, str]:
+    """Get the content hashes files were last indexed with.
+
+    Read from the index's tracking table in one round-trip. Context
+    expansion compares them with the files on disk to decide whether
+    enclosing scopes stored at index time are still current.
+
+    Args:
+        index_name: The name of the search index.
+        filenames: Indexed (relative) file names.
+
+    Returns:
+        filename -> content hash for the files found; empty when the
+        lookup fails.
+    """
+    if not filenames:
+        return {}
+    validate_index_name(index_name)
+    try:
+        pool = get_connection_pool()
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT filename, content_hash"
+                    f" FROM cocosearch_index_tracking_{index_name}"
+                    " WHERE filename = ANY(%s)",
+                    (list(set(filenames)),),
+                )
+                return {name: digest for name, digest in cur.fetchall() if digest}
+    except Exception as e:
+        logger.debug(f"File hash lookup failed for {index_name}: {e}")
+        return {}
+
+
+def forget_table_capabilities(table_name: str) -> None:
+    """Drop the cached column and vector layout lookups of a table.
+
+    Called when the table's index changes; the next search looks them up
+    again.
+    """
+    _symbol_columns_available.pop(table_name, None)
+    _line_columns_available.pop(table_name, None)
+    _vector_index_params.pop(table_name, None)
+
+
+def reset_vector_index_cache() -> None:
+    """Reset the vector index parameters cache.
+
+    Used by tests to ensure clean state between test runs.
+    """
+    _vector_index_params.clear()
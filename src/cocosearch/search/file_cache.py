@@ -0,0 +1,274 @@
+"""Process-wide cache of source files and their tree-sitter trees.
+
+Rendering search results reads source files: line numbers and chunk text on
+indexes without line columns (:mod:`cocosearch.search.utils`), context lines
+and enclosing scopes (:class:`~cocosearch.search.context_expander.ContextExpander`)
+and the dashboard file viewer. Agents ask about the same files over and
+over, so one thread-safe cache serves all of them across requests.
+
+Entries are keyed by path and validated against the file's
+``(mtime_ns, size)`` on every lookup, so an edited file is read again (each
+lookup costs a ``stat``, not a read). The cache is bounded by the estimated
+memory of its entries rather than their number, since one generated file can
+outweigh hundreds of small modules; least recently used entries go first.
+
+Parse trees are not shared: like the parsers that produce them (see
+:mod:`cocosearch.ts_parsers`), tree-sitter trees must stay on the thread that
+created them, including when they are dropped. Each thread keeps its own
+budgeted LRU of trees in a :class:`threading.local`, keyed by path, language
+and the content's ``(mtime_ns, size)``; it goes away with the thread.
+"""
+
+import bisect
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# Budget for each thread's parse trees (see FileCache.tree)
+MAX_TREE_BYTES_PER_THREAD = 16 * 1024 * 1024
+
+# Rough memory of a parsed tree per source byte: tree-sitter nodes take a
+# few dozen bytes each, about one per handful of source bytes.
+TREE_BYTES_PER_SOURCE_BYTE = 8
+
+# Estimated overhead of each line string beyond its characters.
+_LINE_OVERHEAD_BYTES = 56
+
+
+def _decode(data: bytes) -> str:
+    """Decode like ``open(path, encoding="utf-8", errors="replace")``.
+
+    Text mode translates ``\\r\\n`` and ``\\r`` to ``\\n``; the indexer reads
+    files that way, so content hashes and line numbers agree.
+    """
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+@dataclass
+class CachedFile:
+    """A file's content as read at ``(mtime_ns, size)``.
+
+    Attributes:
+        path: Path the file was read from.
+        mtime_ns: Modification time of the content.
+        size: Size in bytes of the content.
+        data: Raw bytes (byte offsets and tree-sitter parsing use these).
+        text: Decoded text, with line endings normalized to ``\\n``.
+        lines: Lines of ``text`` without their line endings.
+    """
+
+    path: str
+    mtime_ns: int
+    size: int
+    data: bytes
+    text: str
+    lines: list[str]
+    _newlines: list[int] | None = None
+
+    @classmethod
+    def from_bytes(cls, path: str, mtime_ns: int, data: bytes) -> "CachedFile":
+        text = _decode(data)
+        lines = text.split("\n")
+        if lines[-1] == "":
+            lines.pop()  # text ends with a newline (or is empty)
+        return cls(path, mtime_ns, len(data), data, text, lines)
+
+    @property
+    def cost(self) -> int:
+        """Estimated memory of the content (bytes, text and lines)."""
+        return 3 * self.size + _LINE_OVERHEAD_BYTES * len(self.lines)
+
+    def _newline_offsets(self) -> list[int]:
+        if self._newlines is None:
+            newlines = []
+            pos = self.data.find(b"\n")
+            while pos != -1:
+                newlines.append(pos)
+                pos = self.data.find(b"\n", pos + 1)
+            self._newlines = newlines
+        return self._newlines
+
+    def byte_to_line(self, byte_offset: int) -> int:
+        """1-based line number of a byte offset into ``data``."""
+        return bisect.bisect_left(self._newline_offsets(), byte_offset) + 1
+
+    def line_to_byte(self, line_number: int) -> int:
+        """Byte offset into ``data`` where a 1-based line starts."""
+        if line_number <= 1:
+            return 0
+        newlines = self._newline_offsets()
+        if line_number - 2 >= len(newlines):
+            return self.size
+        return newlines[line_number - 2] + 1
+
+
+class _ThreadTrees(threading.local):
+    """One thread's parse trees: (path, language) -> (version, tree, cost)."""
+
+    def __init__(self):
+        self.trees: OrderedDict[tuple[str, str], tuple] = OrderedDict()
+        self.bytes = 0
+        self.generation = 0
+
+
+class FileCache:
+    """Thread-safe LRU of :class:`CachedFile` bounded by estimated bytes.
+
+    Args:
+        max_bytes: Memory budget for file contents. A file larger than the
+            budget is returned but not kept.
+        max_tree_bytes: Memory budget for the parse trees of each thread.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = MAX_CACHE_BYTES,
+        max_tree_bytes: int = MAX_TREE_BYTES_PER_THREAD,
+    ):
+        self.max_bytes = max_bytes
+        self.max_tree_bytes = max_tree_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedFile] = OrderedDict()
+        self._bytes = 0
+        self._trees = _ThreadTrees()
+        # Bumped by clear(); threads drop their trees when they see it change
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.tree_hits = 0
+        self.tree_misses = 0
+
+    def get(self, path: str) -> CachedFile | None:
+        """Return the current content of ``path``, or None if unreadable."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if (
+                entry is not None
+                and entry.mtime_ns == st.st_mtime_ns
+                and entry.size == st.st_size
+            ):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Read outside the lock; concurrent misses on one file both read it
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.debug(f"Cannot read file {path}: {e}")
+            return None
+
+        entry = CachedFile.from_bytes(path, st.st_mtime_ns, data)
+        if entry.size != st.st_size:
+            return entry  # Changed while reading; don't keep a torn stat key
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old.cost
+            if entry.cost <= self.max_bytes:
+                self._entries[path] = entry
+                self._bytes += entry.cost
+                self._evict()
+        return entry
+
+    def tree(self, path: str, language: str):
+        """Return ``(CachedFile, tree)`` of ``path`` parsed as ``language``.
+
+        Trees are cached in the calling thread's own LRU (see the module
+        docstring) and tagged with the content version they were parsed
+        from, so an edited file is parsed again. Returns None if the file
+        cannot be read; parse errors propagate.
+        """
+        entry = self.get(path)
+        if entry is None:
+            return None
+        local = self._trees
+        if local.generation != self._generation:
+            local.trees.clear()
+            local.bytes = 0
+            local.generation = self._generation
+
+        key = (path, language)
+        version = (entry.mtime_ns, entry.size)
+        cached = local.trees.get(key)
+        if cached is not None and cached[0] == version:
+            local.trees.move_to_end(key)
+            with self._lock:
+                self.tree_hits += 1
+            return entry, cached[1]
+
+        # Lazy import: plain file lookups need no tree-sitter
+        from cocosearch.ts_parsers import get_parser
+
+        tree = get_parser(language).parse(entry.data)
+        with self._lock:
+            self.tree_misses += 1
+        if cached is not None:
+            del local.trees[key]
+            local.bytes -= cached[2]
+        cost = TREE_BYTES_PER_SOURCE_BYTE * entry.size
+        if cost <= self.max_tree_bytes:
+            local.trees[key] = (version, tree, cost)
+            local.bytes += cost
+            while local.bytes > self.max_tree_bytes:
+                _key, (_version, _tree, old_cost) = local.trees.popitem(last=False)
+                local.bytes -= old_cost
+        return entry, tree
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size (trees: calling thread's)."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "tree_hits": self.tree_hits,
+                "tree_misses": self.tree_misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "tree_bytes": self._trees.bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached file; each thread drops its trees on next use."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+
+    def _evict(self) -> None:
+        """Drop least recently used entries over budget. Must hold self._lock."""
+        while self._bytes > self.max_bytes and self._entries:
+            _path, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.cost
+
+
+# Module-level singleton
+_cache: FileCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_file_cache() -> FileCache:
+    """Get or create the process-wide file cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FileCache()
+    return _cache
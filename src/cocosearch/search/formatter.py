@@ -52,8 +52,7 @@ def format_json(
 
     output = []
     for r in results:
-        start_line = byte_to_line(r.filename, r.start_byte)
-        end_line = byte_to_line(r.filename, r.end_byte)
+        start_line, end_line = _result_lines(r)
 
         item = {
             "file_path": r.filename,
@@ -82,7 +81,7 @@ def format_json(
             item["symbol_signature"] = r.symbol_signature
 
         if include_content:
-            item["content"] = read_chunk_content(r.filename, r.start_byte, r.end_byte)
+            item["content"] = _result_content(r)
 
             if should_expand_context and expander is not None:
                 # Use ContextExpander for smart or explicit context
@@ -179,6 +178,23 @@ _TREE_SITTER_LANG_MAP = {
 }
 
 
+def _result_lines(result: SearchResult) -> tuple[int, int]:
+    """Line range of a result: stored in the index, else read from the file."""
+    if result.start_line is not None and result.end_line is not None:
+        return result.start_line, result.end_line
+    return (
+        byte_to_line(result.filename, result.start_byte),
+        byte_to_line(result.filename, result.end_byte),
+    )
+
+
+def _result_content(result: SearchResult) -> str:
+    """Text of a result: stored in the index, else read from the file."""
+    if result.content is not None:
+        return result.content
+    return read_chunk_content(result.filename, result.start_byte, result.end_byte)
+
+
 def _get_tree_sitter_language(filepath: str) -> str | None:
     """Get tree-sitter language name from file extension.
 
@@ -282,8 +298,7 @@ def format_pretty(
         console.print(f"[bold blue]{rel_path}[/bold blue]")
 
         for r in file_results:
-            start_line = byte_to_line(r.filename, r.start_byte)
-            end_line = byte_to_line(r.filename, r.end_byte)
+            start_line, end_line = _result_lines(r)
 
             # Build match type indicator for hybrid search results
             match_indicator = ""
@@ -362,7 +377,7 @@ def format_pretty(
                     console.print("[dim]  [End of file][/dim]")
             else:
                 # No context expansion - show content with syntax highlighting (legacy mode)
-                content = read_chunk_content(r.filename, r.start_byte, r.end_byte)
+                content = _result_content(r)
                 if content:
                     lexer = _PYGMENTS_LEXER_MAP.get(display_lang, display_lang)
                     try:
@@ -9,15 +9,29 @@ RRF is chosen over score normalization because:
 - Double-matched results naturally rank higher (both ranks contribute)
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 
-from cocosearch.indexer.embedder import embed_query
+from cocosearch.indexer.embedder import (
+    FILENAME_CONTEXT_PREFIX,
+    FILENAME_CONTEXT_SEPARATOR,
+    embed_query,
+    embed_query_async,
+    full_dimension_rerank_enabled,
+    truncate_embedding,
+)
+from cocosearch.indexer.embedding_cache import CACHE_TABLE, embedding_cache_key
+from cocosearch.indexer.vector_index import DISTANCE_OPERATORS, quantized_expression
 from cocosearch.search.db import (
     check_column_exists,
+    check_line_columns_exist,
     check_symbol_columns_exist,
+    get_async_connection_pool,
     get_connection_pool,
+    get_embedding_dimension,
     get_table_name,
+    get_vector_index_params,
 )
 from cocosearch.search.filters import build_symbol_where_clause
 from cocosearch.search.query_analyzer import normalize_query_for_keyword
@@ -36,6 +50,33 @@ DEFINITION_BOOST_MULTIPLIER = 2.0
 # Fetching more candidates improves fusion quality at modest cost.
 MAX_PREFETCH = 100
 
+# Candidates fetched from a quantized vector index per requested result,
+# before the exact re-rank on full vectors. Binary codes lose far more
+# ordering information than half precision.
+QUANTIZED_OVERSAMPLE = {"halfvec": 2, "binary": 10}
+
+# Candidates fetched per result when re-ranking a truncated (storedDimension)
+# index with full-dimension vectors.
+FULL_DIMENSION_RERANK_OVERSAMPLE = 4
+
+# Columns stored at index time so results need no file reads: chunk lines,
+# chunk text and the enclosing scope. Selected last when the table has them,
+# and mapped onto result fields by ``_line_fields``.
+LINE_COLUMNS = (
+    "start_line",
+    "end_line",
+    "content_text",
+    "scope_start_line",
+    "scope_end_line",
+)
+_LINE_FIELDS = (
+    "start_line",
+    "end_line",
+    "content",
+    "scope_start_line",
+    "scope_end_line",
+)
+
 
 @dataclass
 class KeywordResult:
@@ -69,6 +110,12 @@ class VectorResult:
         symbol_type: Symbol type ("function", "class", "method", "interface", or None).
         symbol_name: Symbol name (e.g., "process_data", or None).
         symbol_signature: Symbol signature (e.g., "def process_data(items: list)", or None).
+        start_line: 1-based first line of the chunk (None on older indexes).
+        end_line: 1-based last line of the chunk (None on older indexes).
+        content: Chunk text from the index (None on older indexes).
+        scope_start_line: First line of the enclosing function/class, stored
+            at index time (None on older indexes or unsupported languages).
+        scope_end_line: Last line of the enclosing function/class.
     """
 
     filename: str
@@ -81,6 +128,11 @@ class VectorResult:
     symbol_type: str | None = None
     symbol_name: str | None = None
     symbol_signature: str | None = None
+    start_line: int | None = None
+    end_line: int | None = None
+    content: str | None = None
+    scope_start_line: int | None = None
+    scope_end_line: int | None = None
 
 
 @dataclass
@@ -101,6 +153,12 @@ class HybridSearchResult:
         symbol_type: Symbol type ("function", "class", "method", "interface", or None).
         symbol_name: Symbol name (e.g., "process_data", or None).
         symbol_signature: Symbol signature (e.g., "def process_data(items: list)", or None).
+        start_line: 1-based first line of the chunk (None if not stored).
+        end_line: 1-based last line of the chunk (None if not stored).
+        content: Chunk text from the index (None if not stored).
+        scope_start_line: First line of the enclosing function/class
+            (None if not stored).
+        scope_end_line: Last line of the enclosing function/class.
     """
 
     filename: str
@@ -116,6 +174,11 @@ class HybridSearchResult:
     symbol_type: str | None = None
     symbol_name: str | None = None
     symbol_signature: str | None = None
+    start_line: int | None = None
+    end_line: int | None = None
+    content: str | None = None
+    scope_start_line: int | None = None
+    scope_end_line: int | None = None
 
 
 def _make_result_key(filename: str, start_byte: int, end_byte: int) -> str:
@@ -123,38 +186,19 @@ def _make_result_key(filename: str, start_byte: int, end_byte: int) -> str:
     return f"{filename}:{start_byte}:{end_byte}"
 
 
-def execute_keyword_search(
+def build_keyword_query(
     query: str,
     table_name: str,
-    limit: int = 10,
+    limit: int,
     where_clause: str = "",
     where_params: list | None = None,
-) -> list[KeywordResult]:
-    """Execute keyword search using PostgreSQL full-text search.
-
-    Builds a tsquery from the normalized query and searches against
-    the content_tsv column using the GIN index.
-
-    Args:
-        query: Search query (will be normalized to split identifiers).
-        table_name: PostgreSQL table name.
-        limit: Maximum results to return.
-        where_clause: Optional SQL condition (without "WHERE") to filter results.
-        where_params: Optional list of parameters for where_clause placeholders.
+) -> tuple[str, list]:
+    """Build the full-text query of a keyword search.
 
     Returns:
-        List of KeywordResult ordered by ts_rank (highest first).
-        Empty list if content_tsv column doesn't exist or no matches.
+        (sql, params) ready for ``cursor.execute``. Rows are
+        ``filename, start_byte, end_byte, rank``.
     """
-    pool = get_connection_pool()
-
-    # Check if hybrid search column exists
-    if not check_column_exists(table_name, "content_tsv"):
-        logger.debug(
-            f"Table {table_name} lacks content_tsv column, skipping keyword search"
-        )
-        return []
-
     # Normalize query to split identifiers
     normalized = normalize_query_for_keyword(query)
 
@@ -183,6 +227,44 @@ def execute_keyword_search(
     if where_params:
         params.extend(where_params)
     params.append(limit)
+    return sql, params
+
+
+def execute_keyword_search(
+    query: str,
+    table_name: str,
+    limit: int = 10,
+    where_clause: str = "",
+    where_params: list | None = None,
+) -> list[KeywordResult]:
+    """Execute keyword search using PostgreSQL full-text search.
+
+    Builds a tsquery from the normalized query and searches against
+    the content_tsv column using the GIN index.
+
+    Args:
+        query: Search query (will be normalized to split identifiers).
+        table_name: PostgreSQL table name.
+        limit: Maximum results to return.
+        where_clause: Optional SQL condition (without "WHERE") to filter results.
+        where_params: Optional list of parameters for where_clause placeholders.
+
+    Returns:
+        List of KeywordResult ordered by ts_rank (highest first).
+        Empty list if content_tsv column doesn't exist or no matches.
+    """
+    pool = get_connection_pool()
+
+    # Check if hybrid search column exists
+    if not check_column_exists(table_name, "content_tsv"):
+        logger.debug(
+            f"Table {table_name} lacks content_tsv column, skipping keyword search"
+        )
+        return []
+
+    sql, params = build_keyword_query(
+        query, table_name, limit, where_clause, where_params
+    )
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
@@ -197,6 +279,10 @@ def execute_keyword_search(
                 )
                 return []
 
+    return _keyword_rows_to_results(rows)
+
+
+def _keyword_rows_to_results(rows: list[tuple]) -> list[KeywordResult]:
     return [
         KeywordResult(
             filename=row[0],
@@ -208,6 +294,157 @@ def execute_keyword_search(
     ]
 
 
+def build_vector_query(
+    table_name: str,
+    select_cols: str,
+    where_sql: str,
+    where_params: list,
+    query_embedding: list[float],
+    limit: int,
+) -> tuple[str, list]:
+    """Build the nearest-neighbour query for a chunks table.
+
+    ``select_cols`` must start its placeholders with the one in the score
+    column (``1 - (embedding <=> %s::vector)``); ``where_sql`` is empty or
+    a full ``WHERE ...`` clause.
+
+    ``query_embedding`` is the model's full vector. It is truncated to the
+    table's embedding dimension when the index was built with
+    ``storedDimension``. Plain indexes are then searched directly. Otherwise
+    an oversampled candidate set is re-ranked:
+
+    - quantized index (halfvec or binary): candidates come from the ANN scan
+      on the quantized expression and are re-ranked by exact cosine distance;
+    - ``fullDimensionRerank`` on a truncated index: candidates are re-ranked
+      by full-dimension distance to their cached full vectors (looked up in
+      the embedding cache by the hash of their embedding input). Full and
+      truncated distances are not comparable, so this only happens when
+      every candidate has a cached vector; otherwise the stored-dimension
+      order is kept. The score column follows the same choice. The cache
+      table is shared and evictable, so rerank quality depends on
+      ``cocosearch_embedding_cache`` still holding the candidates' rows.
+
+    Returns:
+        (sql, params) ready for ``cursor.execute``.
+    """
+    index_params = get_vector_index_params(table_name) or {}
+    full_embedding = query_embedding
+    query_embedding = truncate_embedding(
+        query_embedding, get_embedding_dimension(table_name)
+    )
+    rerank_full = (
+        len(query_embedding) < len(full_embedding) and full_dimension_rerank_enabled()
+    )
+    quantization = index_params.get("quantization", "none")
+    dim = index_params.get("dim")
+
+    oversample = 1
+    coarse = "embedding <=> %s::vector"
+    if quantization in QUANTIZED_OVERSAMPLE and dim:
+        oversample = QUANTIZED_OVERSAMPLE[quantization]
+        coarse = (
+            f"{quantized_expression(quantization, dim, 'embedding')} "
+            f"{DISTANCE_OPERATORS[quantization]} "
+            f"{quantized_expression(quantization, dim, '%s::vector')}"
+        )
+    if rerank_full:
+        oversample = max(oversample, FULL_DIMENSION_RERANK_OVERSAMPLE)
+
+    if oversample == 1:
+        sql = f"""
+        SELECT{select_cols}
+        FROM {table_name}
+        {where_sql}
+        ORDER BY embedding <=> %s::vector
+        LIMIT %s
+    """
+        return sql, [query_embedding, *where_params, query_embedding, limit]
+
+    candidates = f"""
+            SELECT * FROM {table_name}
+            {where_sql}
+            ORDER BY {coarse}
+            LIMIT %s
+    """
+    candidate_params = [*where_params, query_embedding, limit * oversample]
+    distance = "embedding <=> %s::vector"
+    if rerank_full:
+        # Same input string as add_filename_context() at index time, hashed
+        # like hash_embedding_input().
+        provider, model, dimension = embedding_cache_key()
+        candidates = f"""
+            SELECT coarse.*, (
+                SELECT cache.embedding <=> %s::vector
+                FROM {CACHE_TABLE} AS cache
+                WHERE cache.provider = %s AND cache.model = %s
+                  AND cache.dimension = %s
+                  AND cache.input_hash = encode(sha256(convert_to(
+                      %s::text || coarse.filename || %s::text || coarse.content_text,
+                      'UTF8')), 'hex')
+            ) AS full_distance
+            FROM ({candidates}) AS coarse
+    """
+        # The cache is evictable: one missing vector keeps the whole set on
+        # the truncated scale rather than mixing the two.
+        candidates = f"""
+            SELECT looked_up.*,
+                bool_and(full_distance IS NOT NULL) OVER () AS all_full
+            FROM ({candidates}) AS looked_up
+    """
+        candidate_params = [
+            full_embedding,
+            provider,
+            model,
+            dimension,
+            FILENAME_CONTEXT_PREFIX,
+            FILENAME_CONTEXT_SEPARATOR,
+            *candidate_params,
+        ]
+        distance = f"CASE WHEN all_full THEN full_distance ELSE {distance} END"
+        select_cols = select_cols.replace("embedding <=> %s::vector", distance, 1)
+
+    sql = f"""
+        SELECT{select_cols}
+        FROM ({candidates}) AS candidates
+        ORDER BY {distance}
+        LIMIT %s
+    """
+    params = [query_embedding, *candidate_params, query_embedding, limit]
+    return sql, params
+
+
+def _vector_select_cols(
+    include_symbol_columns: bool, include_line_columns: bool = False
+) -> str:
+    """SELECT list of a vector search (score placeholder first).
+
+    Line columns, when requested, come last (see ``_line_fields``).
+    """
+    select_cols = """
+            filename,
+            lower(location) as start_byte,
+            upper(location) as end_byte,
+            1 - (embedding <=> %s::vector) AS score,
+            block_type,
+            hierarchy,
+            language_id"""
+    if include_symbol_columns:
+        select_cols += """,
+            symbol_type,
+            symbol_name,
+            symbol_signature"""
+    if include_line_columns:
+        select_cols += ", " + ", ".join(LINE_COLUMNS)
+    return select_cols
+
+
+def _line_fields(row: tuple, include_line_columns: bool) -> dict:
+    """Result fields of a row ending in the line columns (``LINE_COLUMNS``)."""
+    if not include_line_columns:
+        return {}
+    return dict(zip(_LINE_FIELDS, row[-len(LINE_COLUMNS) :]))
+
+
 def execute_vector_search(
     query: str,
     table_name: str,
@@ -241,44 +478,31 @@ def execute_vector_search(
     # Build WHERE clause if provided
     where_sql = f"WHERE {where_clause}" if where_clause else ""
 
-    # Check if symbol columns exist (cached, essentially free)
+    # Check if symbol and line columns exist (cached, essentially free)
     include_symbol_columns = check_symbol_columns_exist(table_name)
+    include_line_columns = check_line_columns_exist(table_name)
 
-    # Build SELECT columns
-    select_cols = """
-            filename,
-            lower(location) as start_byte,
-            upper(location) as end_byte,
-            1 - (embedding <=> %s::vector) AS score,
-            block_type,
-            hierarchy,
-            language_id"""
-    if include_symbol_columns:
-        select_cols += """,
-            symbol_type,
-            symbol_name,
-            symbol_signature"""
-
-    # Query with metadata columns
-    sql = f"""
-        SELECT{select_cols}
-        FROM {table_name}
-        {where_sql}
-        ORDER BY embedding <=> %s::vector
-        LIMIT %s
-    """
-
-    # Build parameters: embedding (for score), where_params, embedding (for ORDER BY), limit
-    params: list = [query_embedding]
-    if where_params:
-        params.extend(where_params)
-    params.extend([query_embedding, limit])
+    # Query with metadata columns (two-stage when the index is quantized)
+    sql, params = build_vector_query(
+        table_name,
+        _vector_select_cols(include_symbol_columns, include_line_columns),
+        where_sql,
+        where_params or [],
+        query_embedding,
+        limit,
+    )
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(sql, params)
             rows = cur.fetchall()
 
+    return _vector_rows_to_results(rows, include_symbol_columns, include_line_columns)
+
+
+def _vector_rows_to_results(
+    rows: list[tuple], include_symbol_columns: bool, include_line_columns: bool = False
+) -> list[VectorResult]:
     # Build results, including symbol columns when available
     return [
         VectorResult(
@@ -298,6 +522,7 @@ def execute_vector_search(
                 if include_symbol_columns
                 else {}
             ),
+            **_line_fields(row, include_line_columns),
         )
         for row in rows
     ]
@@ -357,6 +582,11 @@ def rrf_fusion(
         symbol_type: str | None = None
         symbol_name: str | None = None
         symbol_signature: str | None = None
+        start_line: int | None = None
+        end_line: int | None = None
+        content: str | None = None
+        scope_start_line: int | None = None
+        scope_end_line: int | None = None
 
         # Get filename and byte positions from either source
         if key in vector_by_key:
@@ -369,6 +599,11 @@ def rrf_fusion(
             symbol_type = v_result.symbol_type
             symbol_name = v_result.symbol_name
             symbol_signature = v_result.symbol_signature
+            start_line = v_result.start_line
+            end_line = v_result.end_line
+            content = v_result.content
+            scope_start_line = v_result.scope_start_line
+            scope_end_line = v_result.scope_end_line
             filename = v_result.filename
             start_byte = v_result.start_byte
             end_byte = v_result.end_byte
@@ -403,6 +638,11 @@ def rrf_fusion(
                 symbol_type=symbol_type,
                 symbol_name=symbol_name,
                 symbol_signature=symbol_signature,
+                start_line=start_line,
+                end_line=end_line,
+                content=content,
+                scope_start_line=scope_start_line,
+                scope_end_line=scope_end_line,
             )
         )
 
@@ -466,6 +706,11 @@ def apply_definition_boost(
                     symbol_type=result.symbol_type,
                     symbol_name=result.symbol_name,
                     symbol_signature=result.symbol_signature,
+                    start_line=result.start_line,
+                    end_line=result.end_line,
+                    content=result.content,
+                    scope_start_line=result.scope_start_line,
+                    scope_end_line=result.scope_end_line,
                 )
             )
         else:
@@ -481,37 +726,231 @@ def apply_definition_boost(
     return boosted_results
 
 
-def hybrid_search(
+def build_fused_query(
     query: str,
-    index_name: str,
-    limit: int = 10,
-    symbol_type: str | list[str] | None = None,
-    symbol_name: str | None = None,
-    language_filter: str | None = None,
-    query_embedding: list[float] | None = None,
-) -> list[HybridSearchResult]:
-    """Execute hybrid search combining vector and keyword matching.
+    table_name: str,
+    limit: int,
+    where_clause: str,
+    where_params: list,
+    query_embedding: list[float],
+    include_symbol_columns: bool,
+    prefetch: int,
+    include_line_columns: bool = False,
+) -> tuple[str, list]:
+    """Build one statement running both searches and fusing them in SQL.
+
+    Same ranking as ``rrf_fusion`` followed by ``apply_definition_boost``:
+    the vector and keyword top-``prefetch`` lists are CTEs, ranked with
+    ``row_number()``, joined on chunk location with a ``FULL OUTER JOIN``
+    and scored ``1/(k + rank)`` per list. Definitions (``symbol_type`` set)
+    are multiplied by ``DEFINITION_BOOST_MULTIPLIER`` when symbol columns
+    exist. Without keyword matches the vector score is used directly over
+    the top ``limit`` vector results, as in the two-query path.
 
-    Performs both vector similarity search and keyword search (if available),
-    then fuses results using RRF algorithm. Supports symbol and language filtering
-    applied BEFORE RRF fusion for accurate filtering.
+    Returns:
+        (sql, params) ready for ``cursor.execute``. Rows are
+        ``filename, start_byte, end_byte, combined_score, vector_score,
+        keyword_score, block_type, hierarchy, language_id`` plus the symbol
+        columns, then ``LINE_COLUMNS``, when requested.
+    """
+    where_sql = f"WHERE {where_clause}" if where_clause else ""
+    vector_sql, vector_params = build_vector_query(
+        table_name,
+        _vector_select_cols(include_symbol_columns, include_line_columns),
+        where_sql,
+        where_params,
+        query_embedding,
+        prefetch,
+    )
 
-    Args:
-        query: Search query (natural language or code identifier).
-        index_name: Name of the index to search.
-        limit: Maximum results to return.
-        symbol_type: Filter by symbol type ("function", "class", "method", "interface").
-            Can be a single string or list of types.
-        symbol_name: Filter by symbol name using glob pattern (supports * and ?).
-        language_filter: Filter by language via filename extension pattern.
-            Format: comma-separated language names (e.g., "python,javascript").
+    keyword_where = "content_tsv @@ plainto_tsquery('simple', %s)"
+    if where_clause:
+        keyword_where += f" AND ({where_clause})"
+    normalized = normalize_query_for_keyword(query)
+
+    symbol_cols = ""
+    boost = "1"
+    if include_symbol_columns:
+        symbol_cols = ", v.symbol_type, v.symbol_name, v.symbol_signature"
+        boost = "CASE WHEN symbol_type IS NOT NULL THEN %s ELSE 1 END"
+
+    # Keyword-only matches carry their own lines and text
+    keyword_line_cols = ""
+    fused_line_cols = ""
+    line_cols = ""
+    if include_line_columns:
+        keyword_line_cols = ", " + ", ".join(LINE_COLUMNS)
+        fused_line_cols = "".join(
+            f",\n                COALESCE(v.{col}, k.{col}) AS {col}"
+            for col in LINE_COLUMNS
+        )
+        line_cols = keyword_line_cols
+
+    sql = f"""
+        WITH vector AS ({vector_sql}),
+        vector_ranked AS (
+            SELECT *, row_number() OVER (ORDER BY score DESC) AS v_rank
+            FROM vector
+        ),
+        keyword AS (
+            SELECT
+                filename,
+                lower(location) AS start_byte,
+                upper(location) AS end_byte,
+                ts_rank(content_tsv, plainto_tsquery('simple', %s)) AS rank{keyword_line_cols}
+            FROM {table_name}
+            WHERE {keyword_where}
+            ORDER BY rank DESC
+            LIMIT %s
+        ),
+        keyword_ranked AS (
+            SELECT *, row_number() OVER (ORDER BY rank DESC) AS k_rank
+            FROM keyword
+        ),
+        fused AS (
+            SELECT
+                COALESCE(v.filename, k.filename) AS filename,
+                COALESCE(v.start_byte, k.start_byte) AS start_byte,
+                COALESCE(v.end_byte, k.end_byte) AS end_byte,
+                CASE WHEN EXISTS (SELECT 1 FROM keyword)
+                    THEN COALESCE(1.0 / (%s + v.v_rank), 0)
+                        + COALESCE(1.0 / (%s + k.k_rank), 0)
+                    ELSE v.score
+                END AS base_score,
+                v.v_rank,
+                v.score AS vector_score,
+                k.rank AS keyword_score,
+                v.block_type,
+                v.hierarchy,
+                v.language_id{symbol_cols}{fused_line_cols}
+            FROM vector_ranked v
+            FULL OUTER JOIN keyword_ranked k
+                ON v.filename = k.filename
+                AND v.start_byte = k.start_byte
+                AND v.end_byte = k.end_byte
+        )
+        SELECT
+            filename,
+            start_byte,
+            end_byte,
+            (base_score * {boost})::float8 AS combined_score,
+            vector_score,
+            keyword_score,
+            block_type,
+            hierarchy,
+            language_id{symbol_cols.replace("v.", "")}{line_cols}
+        FROM fused
+        WHERE EXISTS (SELECT 1 FROM keyword) OR v_rank <= %s
+        ORDER BY combined_score DESC, (keyword_score IS NOT NULL) DESC
+        LIMIT %s
+    """
+    params = [
+        *vector_params,
+        normalized,
+        normalized,
+        *where_params,
+        prefetch,
+        RRF_K,
+        RRF_K,
+    ]
+    if include_symbol_columns:
+        params.append(DEFINITION_BOOST_MULTIPLIER)
+    params.extend([limit, limit])
+    return sql, params
+
+
+def execute_fused_search(
+    query: str,
+    table_name: str,
+    limit: int,
+    where_clause: str = "",
+    where_params: list | None = None,
+    query_embedding: list[float] | None = None,
+) -> list[HybridSearchResult] | None:
+    """Run hybrid search as a single statement (see ``build_fused_query``).
+
+    One round-trip on one connection instead of two, and both scans see
+    the same snapshot.
 
     Returns:
-        List of HybridSearchResult ordered by combined score (highest first).
-        Falls back to vector-only results if keyword search unavailable.
+        Fused, boosted results, or None if the statement failed (the caller
+        falls back to separate vector and keyword queries).
     """
-    table_name = get_table_name(index_name)
+    if query_embedding is None:
+        query_embedding = embed_query(query)
+    include_symbol_columns = check_symbol_columns_exist(table_name)
+    include_line_columns = check_line_columns_exist(table_name)
+    sql, params = build_fused_query(
+        query,
+        table_name,
+        limit,
+        where_clause,
+        where_params or [],
+        query_embedding,
+        include_symbol_columns,
+        min(limit * 2, MAX_PREFETCH),
+        include_line_columns,
+    )
+
+    pool = get_connection_pool()
+    try:
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+    except Exception as e:
+        logger.warning(f"Fused hybrid query failed (running separate queries): {e}")
+        return None
 
+    return _fused_rows_to_results(rows, include_symbol_columns, include_line_columns)
+
+
+def _fused_rows_to_results(
+    rows: list[tuple], include_symbol_columns: bool, include_line_columns: bool = False
+) -> list[HybridSearchResult]:
+    results = []
+    for row in rows:
+        vector_score = float(row[4]) if row[4] is not None else None
+        keyword_score = float(row[5]) if row[5] is not None else None
+        if vector_score is not None and keyword_score is not None:
+            match_type = "both"
+        elif vector_score is not None:
+            match_type = "semantic"
+        else:
+            match_type = "keyword"
+        results.append(
+            HybridSearchResult(
+                filename=row[0],
+                start_byte=int(row[1]),
+                end_byte=int(row[2]),
+                combined_score=float(row[3]),
+                match_type=match_type,
+                vector_score=vector_score,
+                keyword_score=keyword_score,
+                block_type=row[6] if row[6] else "",
+                hierarchy=row[7] if row[7] else "",
+                language_id=row[8] if row[8] else "",
+                **(
+                    {
+                        "symbol_type": row[9] if row[9] else None,
+                        "symbol_name": row[10] if row[10] else None,
+                        "symbol_signature": row[11] if row[11] else None,
+                    }
+                    if include_symbol_columns
+                    else {}
+                ),
+                **_line_fields(row, include_line_columns),
+            )
+        )
+    return results
+
+
+def _build_filters(
+    symbol_type: str | list[str] | None,
+    symbol_name: str | None,
+    language_filter: str | None,
+) -> tuple[str, list]:
+    """Symbol and language filters as (condition, params), applied before fusion."""
     # Build WHERE clause for symbol filters (applied before fusion)
     where_parts = []
     where_params: list = []
@@ -550,6 +989,61 @@ def hybrid_search(
 
     # Combine WHERE parts
     where_clause = " AND ".join(where_parts) if where_parts else ""
+    return where_clause, where_params
+
+
+def hybrid_search(
+    query: str,
+    index_name: str,
+    limit: int = 10,
+    symbol_type: str | list[str] | None = None,
+    symbol_name: str | None = None,
+    language_filter: str | None = None,
+    query_embedding: list[float] | None = None,
+) -> list[HybridSearchResult]:
+    """Execute hybrid search combining vector and keyword matching.
+
+    Performs both vector similarity search and keyword search (if available),
+    then fuses results using RRF algorithm. Supports symbol and language filtering
+    applied BEFORE RRF fusion for accurate filtering.
+
+    When the keyword column exists, both searches and the fusion run as one
+    SQL statement (``execute_fused_search``); the separate queries fused in
+    Python remain the fallback.
+
+    Args:
+        query: Search query (natural language or code identifier).
+        index_name: Name of the index to search.
+        limit: Maximum results to return.
+        symbol_type: Filter by symbol type ("function", "class", "method", "interface").
+            Can be a single string or list of types.
+        symbol_name: Filter by symbol name using glob pattern (supports * and ?).
+        language_filter: Filter by language via filename extension pattern.
+            Format: comma-separated language names (e.g., "python,javascript").
+
+    Returns:
+        List of HybridSearchResult ordered by combined score (highest first).
+        Falls back to vector-only results if keyword search unavailable.
+    """
+    table_name = get_table_name(index_name)
+    where_clause, where_params = _build_filters(
+        symbol_type, symbol_name, language_filter
+    )
+
+    if check_column_exists(table_name, "content_tsv"):
+        # Embed once: the fallback below reuses the vector.
+        if query_embedding is None:
+            query_embedding = embed_query(query)
+        fused_results = execute_fused_search(
+            query,
+            table_name,
+            limit,
+            where_clause,
+            where_params,
+            query_embedding=query_embedding,
+        )
+        if fused_results is not None:
+            return fused_results
 
     # Execute both searches
     # Request more results from each to have better fusion
@@ -572,6 +1066,16 @@ def hybrid_search(
         where_params if where_params else None,
     )
 
+    return _fuse_legs(vector_results, keyword_results, index_name, limit)
+
+
+def _fuse_legs(
+    vector_results: list[VectorResult],
+    keyword_results: list[KeywordResult],
+    index_name: str,
+    limit: int,
+) -> list[HybridSearchResult]:
+    """Fuse separately fetched vector and keyword results (RRF + boost)."""
     # If no keyword results, return vector-only with match_type="semantic"
     if not keyword_results:
         vector_only_results = [
@@ -589,6 +1093,11 @@ def hybrid_search(
                 symbol_type=r.symbol_type,
                 symbol_name=r.symbol_name,
                 symbol_signature=r.symbol_signature,
+                start_line=r.start_line,
+                end_line=r.end_line,
+                content=r.content,
+                scope_start_line=r.scope_start_line,
+                scope_end_line=r.scope_end_line,
             )
             for r in vector_results[:limit]
         ]
@@ -602,3 +1111,116 @@ def hybrid_search(
     boosted = apply_definition_boost(fused, index_name)
 
     return boosted[:limit]
+
+
+async def _fetch_all_async(sql: str, params: list) -> list[tuple]:
+    """Run one query on the async pool and return all rows."""
+    pool = await get_async_connection_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(sql, params)
+            return await cur.fetchall()
+
+
+def _table_capabilities(table_name: str) -> tuple[bool, bool, bool]:
+    """Return (has keyword column, has symbol columns, has line columns).
+
+    Also warms the cached vector layout that ``build_vector_query`` reads,
+    so the async path can run this once in a worker thread and then build
+    its SQL without touching the sync pool.
+    """
+    get_vector_index_params(table_name)
+    return (
+        check_column_exists(table_name, "content_tsv"),
+        check_symbol_columns_exist(table_name),
+        check_line_columns_exist(table_name),
+    )
+
+
+async def _keyword_rows_async(
+    query: str, table_name: str, limit: int, where_clause: str, where_params: list
+) -> list[tuple]:
+    sql, params = build_keyword_query(
+        query, table_name, limit, where_clause, where_params
+    )
+    try:
+        return await _fetch_all_async(sql, params)
+    except Exception as e:
+        logger.warning(f"Keyword search failed (falling back to vector-only): {e}")
+        return []
+
+
+async def hybrid_search_async(
+    query: str,
+    index_name: str,
+    limit: int = 10,
+    symbol_type: str | list[str] | None = None,
+    symbol_name: str | None = None,
+    language_filter: str | None = None,
+    query_embedding: list[float] | None = None,
+) -> list[HybridSearchResult]:
+    """Async counterpart of :func:`hybrid_search` for the MCP server.
+
+    The query is embedded with ``litellm.aembedding`` while the (cached)
+    schema checks run in a worker thread, and the SQL is awaited on the
+    async pool, so the event loop is never blocked. When the fused
+    statement is unavailable or fails, the vector and keyword queries run
+    concurrently on two pooled connections before being fused in Python.
+
+    Args and return value are the same as :func:`hybrid_search`.
+    """
+    table_name = get_table_name(index_name)
+    where_clause, where_params = _build_filters(
+        symbol_type, symbol_name, language_filter
+    )
+
+    capabilities = asyncio.to_thread(_table_capabilities, table_name)
+    if query_embedding is None:
+        query_embedding, table_caps = await asyncio.gather(
+            embed_query_async(query), capabilities
+        )
+    else:
+        table_caps = await capabilities
+    has_tsv, include_symbol_columns, include_line_columns = table_caps
+
+    prefetch = min(limit * 2, MAX_PREFETCH)
+    if has_tsv:
+        sql, params = build_fused_query(
+            query,
+            table_name,
+            limit,
+            where_clause,
+            where_params,
+            query_embedding,
+            include_symbol_columns,
+            prefetch,
+            include_line_columns,
+        )
+        try:
+            rows = await _fetch_all_async(sql, params)
+            return _fused_rows_to_results(
+                rows, include_symbol_columns, include_line_columns
+            )
+        except Exception as e:
+            logger.warning(f"Fused hybrid query failed (running separate queries): {e}")
+
+    vector_sql, vector_params = build_vector_query(
+        table_name,
+        _vector_select_cols(include_symbol_columns, include_line_columns),
+        f"WHERE {where_clause}" if where_clause else "",
+        where_params,
+        query_embedding,
+        prefetch,
+    )
+    legs = [_fetch_all_async(vector_sql, vector_params)]
+    if has_tsv:
+        legs.append(
+            _keyword_rows_async(query, table_name, prefetch, where_clause, where_params)
+        )
+    rows = await asyncio.gather(*legs)
+
+    vector_results = _vector_rows_to_results(
+        rows[0], include_symbol_columns, include_line_columns
+    )
+    keyword_results = _keyword_rows_to_results(rows[1]) if has_tsv else []
+    return _fuse_legs(vector_results, keyword_results, index_name, limit)
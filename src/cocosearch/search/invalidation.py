@@ -0,0 +1,223 @@
+"""Cross-process cache invalidation for cocosearch search.
+
+Every index has a generation number in ``cocosearch_index_metadata``,
+bumped whenever its chunks, vector index or dependency data change. The
+bump and a ``NOTIFY`` on :data:`INDEX_CHANGED_CHANNEL` happen in the same
+transaction, so listeners hear about it exactly when the change commits.
+
+Long-lived processes (the MCP server, the REPL) run an
+:class:`IndexChangeListener`. It holds one dedicated connection and, on each
+notification, drops what this process remembers about the index: cached
+query results, its in-memory dependency graph and per-table capability
+lookups (symbol columns, vector index layout, hybrid support). Searches
+therefore never check the database for staleness. After a lost connection
+the listener compares generations on reconnect, so notifications missed in
+between still invalidate.
+
+Processes without a listener fall back to bounded staleness: per-table
+lookups expire after a TTL, and the query cache compares the index's
+generation at most every few seconds (see :mod:`cocosearch.search.cache`).
+"""
+
+import json
+import logging
+import threading
+
+import psycopg
+
+from cocosearch.config.env_validation import get_database_url
+
+logger = logging.getLogger(__name__)
+
+INDEX_CHANGED_CHANNEL = "cocosearch_index_changed"
+
+# Seconds between reconnection attempts, doubling up to the maximum.
+_RECONNECT_DELAY = 1.0
+_MAX_RECONNECT_DELAY = 30.0
+
+
+def _get_cs_log():
+    from cocosearch.logging import cs_log
+
+    return cs_log
+
+
+def notify_index_changed(cur, index_name: str, generation: int | None) -> None:
+    """Queue a change notification for an index on ``cur``'s transaction.
+
+    Postgres delivers it to listeners when the transaction commits (and
+    drops it on rollback).
+
+    Args:
+        cur: Cursor of the transaction that changed the index.
+        index_name: Index that changed.
+        generation: Its new generation, or None when it was deleted.
+    """
+    cur.execute(
+        "SELECT pg_notify(%s, %s)",
+        (
+            INDEX_CHANGED_CHANNEL,
+            json.dumps({"index": index_name, "generation": generation}),
+        ),
+    )
+
+
+def forget_index(index_name: str) -> None:
+    """Drop everything this process caches about an index.
+
+    Clears its query cache entries, its dependency graph, its table's
+    symbol-column and vector layout lookups, the hybrid-support flag and the
+    path-to-index mapping.
+    """
+    # Lazy imports: the indexer imports this module for notify_index_changed
+    from cocosearch.deps.graph import forget_dependency_graph
+    from cocosearch.management.metadata import get_index_for_path
+    from cocosearch.search.cache import invalidate_index_cache
+    from cocosearch.search.db import forget_table_capabilities, get_table_name
+    from cocosearch.search.query import reset_hybrid_capability
+
+    invalidate_index_cache(index_name)
+    forget_dependency_graph(index_name)
+    try:
+        forget_table_capabilities(get_table_name(index_name))
+    except ValueError:
+        pass  # Not a valid index name; no table state was cached for it
+    reset_hybrid_capability()
+    get_index_for_path.cache_clear()
+
+
+class IndexChangeListener:
+    """Background thread that invalidates caches on index change notifications.
+
+    Args:
+        conninfo: Database URL (defaults to the configured one).
+        on_change: Called with the index name of each change (defaults to
+            :func:`forget_index`).
+    """
+
+    def __init__(self, conninfo: str | None = None, on_change=None):
+        self.conninfo = conninfo or get_database_url()
+        self.on_change = on_change or forget_index
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Last seen generation per index; None until the first connection
+        self._generations: dict[str, int | None] | None = None
+
+    @property
+    def connected(self) -> bool:
+        """True while subscribed (notifications are being received)."""
+        return self._connected.is_set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="cocosearch-index-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        delay = _RECONNECT_DELAY
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {INDEX_CHANGED_CHANNEL}")
+                    self._resync(conn)
+                    self._connected.set()
+                    _get_cs_log().infra("Listening for index changes")
+                    delay = _RECONNECT_DELAY
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            self._handle(notify.payload)
+            except Exception as e:
+                if self._connected.is_set():
+                    logger.warning("Index change listener disconnected: %s", e)
+                else:
+                    logger.debug("Index change listener cannot connect: %s", e)
+            self._connected.clear()
+            self._stop.wait(delay)
+            delay = min(delay * 2, _MAX_RECONNECT_DELAY)
+
+    def _resync(self, conn) -> None:
+        """Catch up with changes made while not subscribed."""
+        try:
+            rows = conn.execute(
+                "SELECT index_name, generation FROM cocosearch_index_metadata"
+            ).fetchall()
+        except Exception:
+            rows = []  # Metadata table not created yet
+        current = {name: generation for name, generation in rows}
+        previous, self._generations = self._generations, current
+        if previous is None:
+            return
+        for name in previous.keys() | current.keys():
+            if previous.get(name) != current.get(name):
+                self._invalidate(name, current.get(name))
+
+    def _handle(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            name = message["index"]
+            generation = message.get("generation")
+        except (ValueError, KeyError, TypeError):
+            logger.debug("Ignoring malformed index change payload: %r", payload)
+            return
+
+        known = self._generations.get(name) if self._generations else None
+        if generation is not None and known is not None and generation <= known:
+            return  # Already handled
+        if self._generations is not None:
+            if generation is None:
+                self._generations.pop(name, None)
+            else:
+                self._generations[name] = generation
+        self._invalidate(name, generation)
+
+    def _invalidate(self, name: str, generation: int | None) -> None:
+        _get_cs_log().cache(
+            "Index changed, caches invalidated", index=name, generation=generation
+        )
+        try:
+            self.on_change(name)
+        except Exception as e:
+            logger.warning("Invalidating caches of index '%s' failed: %s", name, e)
+
+
+# Module-level singleton
+_listener: IndexChangeListener | None = None
+_listener_lock = threading.Lock()
+
+
+def start_index_listener() -> IndexChangeListener:
+    """Start the process-wide index change listener (idempotent)."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = IndexChangeListener()
+            _listener.start()
+        return _listener
+
+
+def stop_index_listener() -> None:
+    """Stop the process-wide index change listener, if running."""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def is_listening() -> bool:
+    """True while this process receives index change notifications.
+
+    Cached per-table lookups need no expiry while this holds.
+    """
+    listener = _listener
+    return listener is not None and listener.connected
@@ -6,13 +6,14 @@ the existing search() function, results are tagged with their source
 index, and then merged into a single ranked list by score.
 """
 
+import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from cocosearch.indexer.embedder import embed_query
+from cocosearch.indexer.embedder import embed_query, embed_query_async
 from cocosearch.management.discovery import list_indexes
 from cocosearch.management.metadata import get_index_metadata
-from cocosearch.search.query import SearchResult, search
+from cocosearch.search.query import SearchResult, search, search_async
 
 logger = logging.getLogger(__name__)
 
@@ -72,19 +73,7 @@ def multi_search(
     # pre-computed embedding and every per-index search() use the same rewritten
     # query. Each search() below is told to skip its own rewrite. No-op when the
     # controller is disabled (the default).
-    if not skip_rewrite:
-        from cocosearch.search.controller import rewrite_query
-
-        original_query = query
-        query, was_rewritten = rewrite_query(query)
-        if was_rewritten and warnings is not None:
-            warnings.append(
-                {
-                    "type": "query_rewrite",
-                    "original": original_query,
-                    "rewritten": query,
-                }
-            )
+    query = _rewrite_once(query, warnings, skip_rewrite)
 
     # Single index: just delegate directly
     if len(index_names) == 1:
@@ -105,42 +94,7 @@ def multi_search(
             r.index_name = index_names[0]
         return results
 
-    # Validate all index names exist
-    available = {idx["name"] for idx in list_indexes()}
-    unknown = [name for name in index_names if name not in available]
-    if unknown:
-        raise ValueError(
-            f"Unknown index(es): {', '.join(unknown)}. "
-            f"Available: {', '.join(sorted(available))}"
-        )
-
-    # Check embedding model compatibility across indexes
-    models_seen: dict[str, str] = {}
-    for idx_name in index_names:
-        meta = get_index_metadata(idx_name)
-        if meta:
-            model = meta.get("embedding_model", "unknown")
-            provider = meta.get("embedding_provider", "unknown")
-            key = f"{provider}/{model}"
-            models_seen[idx_name] = key
-
-    unique_models = set(models_seen.values())
-    if len(unique_models) > 1:
-        model_details = ", ".join(f"{k}={v}" for k, v in models_seen.items())
-        warning_msg = (
-            "Cross-index search with mismatched embedding models — "
-            f"scores may not be directly comparable: {model_details}"
-        )
-        logger.warning(warning_msg)
-        if warnings is not None:
-            warnings.append(
-                {
-                    "type": "embedding_model_mismatch",
-                    "warning": "Mismatched embedding models across indexes",
-                    "message": warning_msg,
-                    "models": dict(models_seen),
-                }
-            )
+    _check_indexes(index_names, warnings)
 
     # Pre-compute query embedding once
     query_embedding = embed_query(query)
@@ -186,6 +140,156 @@ def multi_search(
                 errors[idx_name] = str(e)
                 logger.warning("Search failed for index '%s': %s", idx_name, e)
 
+    return _merge_results(all_results, errors, limit)
+
+
+async def multi_search_async(
+    query: str,
+    index_names: list[str],
+    limit: int = 10,
+    min_score: float = 0.0,
+    language_filter: str | None = None,
+    use_hybrid: bool | None = None,
+    symbol_type: str | list[str] | None = None,
+    symbol_name: str | None = None,
+    no_cache: bool = False,
+    include_deps: bool = False,
+    warnings: list[dict] | None = None,
+    skip_rewrite: bool = False,
+) -> list[SearchResult]:
+    """Async counterpart of :func:`multi_search` for the MCP server.
+
+    Same arguments, merging and errors. The per-index searches are
+    :func:`~cocosearch.search.query.search_async` coroutines gathered on the
+    event loop instead of threads, sharing one awaited query embedding.
+    """
+    if not index_names:
+        return []
+
+    query = await asyncio.to_thread(_rewrite_once, query, warnings, skip_rewrite)
+    options = {
+        "min_score": min_score,
+        "language_filter": language_filter,
+        "use_hybrid": use_hybrid,
+        "symbol_type": symbol_type,
+        "symbol_name": symbol_name,
+        "no_cache": no_cache,
+        "include_deps": include_deps,
+        "_skip_rewrite": True,
+    }
+
+    # Single index: just delegate directly
+    if len(index_names) == 1:
+        results = await search_async(
+            query=query, index_name=index_names[0], limit=limit, **options
+        )
+        for r in results:
+            r.index_name = index_names[0]
+        return results
+
+    await asyncio.to_thread(_check_indexes, index_names, warnings)
+
+    # Pre-compute query embedding once
+    query_embedding = await embed_query_async(query)
+
+    outcomes = await asyncio.gather(
+        *(
+            search_async(
+                query=query,
+                index_name=idx_name,
+                limit=limit * 2,
+                query_embedding=query_embedding,
+                **options,
+            )
+            for idx_name in index_names
+        ),
+        return_exceptions=True,
+    )
+
+    all_results: list[SearchResult] = []
+    errors: dict[str, str] = {}
+    for idx_name, outcome in zip(index_names, outcomes):
+        if isinstance(outcome, Exception):
+            errors[idx_name] = str(outcome)
+            logger.warning("Search failed for index '%s': %s", idx_name, outcome)
+        elif isinstance(outcome, BaseException):
+            raise outcome  # cancellation
+        else:
+            for r in outcome:
+                r.index_name = idx_name
+            all_results.extend(outcome)
+
+    return _merge_results(all_results, errors, limit)
+
+
+def _rewrite_once(query: str, warnings: list[dict] | None, skip_rewrite: bool) -> str:
+    """Run the optional query-rewrite controller, recording a rewrite warning."""
+    if skip_rewrite:
+        return query
+
+    from cocosearch.search.controller import rewrite_query
+
+    original_query = query
+    query, was_rewritten = rewrite_query(query)
+    if was_rewritten and warnings is not None:
+        warnings.append(
+            {
+                "type": "query_rewrite",
+                "original": original_query,
+                "rewritten": query,
+            }
+        )
+    return query
+
+
+def _check_indexes(index_names: list[str], warnings: list[dict] | None) -> None:
+    """Validate index names and warn about mismatched embedding models.
+
+    Raises:
+        ValueError: If any index name is not found.
+    """
+    # Validate all index names exist
+    available = {idx["name"] for idx in list_indexes()}
+    unknown = [name for name in index_names if name not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown index(es): {', '.join(unknown)}. "
+            f"Available: {', '.join(sorted(available))}"
+        )
+
+    # Check embedding model compatibility across indexes
+    models_seen: dict[str, str] = {}
+    for idx_name in index_names:
+        meta = get_index_metadata(idx_name)
+        if meta:
+            model = meta.get("embedding_model", "unknown")
+            provider = meta.get("embedding_provider", "unknown")
+            key = f"{provider}/{model}"
+            models_seen[idx_name] = key
+
+    unique_models = set(models_seen.values())
+    if len(unique_models) > 1:
+        model_details = ", ".join(f"{k}={v}" for k, v in models_seen.items())
+        warning_msg = (
+            "Cross-index search with mismatched embedding models — "
+            f"scores may not be directly comparable: {model_details}"
+        )
+        logger.warning(warning_msg)
+        if warnings is not None:
+            warnings.append(
+                {
+                    "type": "embedding_model_mismatch",
+                    "warning": "Mismatched embedding models across indexes",
+                    "message": warning_msg,
+                    "models": dict(models_seen),
+                }
+            )
+
+
+def _merge_results(
+    all_results: list[SearchResult], errors: dict[str, str], limit: int
+) -> list[SearchResult]:
+    """Merge per-index results by score, raising if every index failed."""
     # If all indexes failed, raise
     if errors and not all_results:
         error_details = "; ".join(f"{k}: {v}" for k, v in errors.items())
@@ -4,19 +4,25 @@ Provides the core search functionality that embeds queries and
 performs vector similarity searches against the PostgreSQL database.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 
-from cocosearch.indexer.embedder import embed_query
+from cocosearch.indexer.embedder import embed_query, embed_query_async
 from cocosearch.search.cache import get_query_cache
 from cocosearch.search.db import (
     check_column_exists,
+    check_line_columns_exist,
     check_symbol_columns_exist,
+    get_async_connection_pool,
     get_connection_pool,
     get_table_name,
+    get_vector_index_params,
 )
 from cocosearch.search.filters import build_symbol_where_clause
+from cocosearch.search.hybrid import LINE_COLUMNS, _line_fields, build_vector_query
 from cocosearch.search.hybrid import hybrid_search as execute_hybrid_search
+from cocosearch.search.hybrid import hybrid_search_async
 from cocosearch.search.query_analyzer import has_identifier_pattern
 from cocosearch.validation import validate_query
 
@@ -48,6 +54,16 @@ class SearchResult:
         symbol_type: Symbol type ("function", "class", "method", "interface", or None).
         symbol_name: Symbol name (e.g., "process_data", "UserService.get_user", or None).
         symbol_signature: Symbol signature (e.g., "def process_data(items: list)", or None).
+        start_line: 1-based first line of the chunk, stored at index time
+            (None on indexes that predate line columns).
+        end_line: 1-based last line of the chunk (None likewise).
+        content: Chunk text from the index (None likewise; read it from
+            the file with ``read_chunk_content``).
+        scope_start_line: First line of the function/class enclosing the
+            chunk, stored at index time (None likewise, or when the language
+            has no scope detection). Context expansion uses it while the
+            file is unchanged.
+        scope_end_line: Last line of the enclosing function/class.
     """
 
     filename: str
@@ -68,6 +84,11 @@ class SearchResult:
     dependencies: list | None = None
     dependents: list | None = None
     index_name: str | None = None  # Source index (set for cross-index searches)
+    start_line: int | None = None
+    end_line: int | None = None
+    content: str | None = None
+    scope_start_line: int | None = None
+    scope_end_line: int | None = None
 
 
 # Language to file extension mapping
@@ -200,6 +221,17 @@ _has_content_text_column = True
 _hybrid_warning_emitted = False
 
 
+def reset_hybrid_capability() -> None:
+    """Forget that an index lacked the content_text column.
+
+    Called when an index changes (a re-index may have added it); the next
+    search checks again.
+    """
+    global _has_content_text_column, _hybrid_warning_emitted
+    _has_content_text_column = True
+    _hybrid_warning_emitted = False
+
+
 def get_extension_patterns(language: str) -> list[str]:
     """Get SQL LIKE patterns for a language.
 
@@ -306,6 +338,182 @@ def search(
             if symbol filter is used on a pre-v1.7 index,
             or if symbol_type contains invalid type names.
     """
+    cached_results, plan = _plan_search(
+        query,
+        index_name,
+        limit,
+        min_score,
+        language_filter,
+        use_hybrid,
+        symbol_type,
+        symbol_name,
+        no_cache,
+        _skip_rewrite,
+        rewrite_info,
+    )
+    if cached_results is not None:
+        return cached_results
+    query = plan.query
+
+    # Execute hybrid search if applicable
+    # Hybrid search now supports language and symbol filtering (applied before RRF fusion)
+    if plan.hybrid:
+        hybrid_results = execute_hybrid_search(
+            query,
+            index_name,
+            limit,
+            symbol_type=symbol_type,
+            symbol_name=symbol_name,
+            language_filter=plan.hybrid_language_filter,
+            query_embedding=query_embedding,
+        )
+        results = _hybrid_to_search_results(hybrid_results, min_score)
+        # Hybrid search doesn't expose the query embedding to the cache
+        return _finish_search(plan, results, None, include_deps)
+
+    # Vector-only search (existing behavior)
+    # Embed query using same model as indexing (skip if pre-computed)
+    if query_embedding is None:
+        query_embedding = embed_query(query)
+    cached_results = _semantic_cache_lookup(plan, query_embedding)
+    if cached_results is not None:
+        return cached_results
+
+    sql, params = _build_search_vector_query(plan, query_embedding, limit)
+
+    # Execute query (expects metadata columns to exist)
+    pool = get_connection_pool()
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+
+    results = _vector_rows_to_search_results(
+        rows, plan.include_symbol_columns, min_score, plan.include_line_columns
+    )
+    return _finish_search(plan, results, query_embedding, include_deps)
+
+
+async def search_async(
+    query: str,
+    index_name: str,
+    limit: int = 10,
+    min_score: float = 0.0,
+    language_filter: str | None = None,
+    use_hybrid: bool | None = None,
+    symbol_type: str | list[str] | None = None,
+    symbol_name: str | None = None,
+    no_cache: bool = False,
+    include_deps: bool = False,
+    query_embedding: list[float] | None = None,
+    _skip_rewrite: bool = False,
+    rewrite_info: dict | None = None,
+) -> list[SearchResult]:
+    """Async counterpart of :func:`search` for the MCP server.
+
+    Same arguments, results, caching and errors. The query embedding
+    (``litellm.aembedding``) and the search SQL (async connection pool)
+    are awaited; the remaining blocking steps (query rewrite, cached
+    schema checks, semantic cache lookup, dependency enrichment) run in a
+    worker thread. The event loop therefore keeps serving other requests
+    while a search is in flight.
+    """
+    cached_results, plan = await asyncio.to_thread(
+        _plan_search,
+        query,
+        index_name,
+        limit,
+        min_score,
+        language_filter,
+        use_hybrid,
+        symbol_type,
+        symbol_name,
+        no_cache,
+        _skip_rewrite,
+        rewrite_info,
+    )
+    if cached_results is not None:
+        return cached_results
+    query = plan.query
+
+    if plan.hybrid:
+        hybrid_results = await hybrid_search_async(
+            query,
+            index_name,
+            limit,
+            symbol_type=symbol_type,
+            symbol_name=symbol_name,
+            language_filter=plan.hybrid_language_filter,
+            query_embedding=query_embedding,
+        )
+        results = _hybrid_to_search_results(hybrid_results, min_score)
+        return await asyncio.to_thread(
+            _finish_search, plan, results, None, include_deps
+        )
+
+    if query_embedding is None:
+        query_embedding = await embed_query_async(query)
+    # The semantic cache is backed by SQLite; keep its I/O off the loop too.
+    cached_results = await asyncio.to_thread(
+        _semantic_cache_lookup, plan, query_embedding
+    )
+    if cached_results is not None:
+        return cached_results
+    # Warms the cached vector layout read by build_vector_query.
+    await asyncio.to_thread(get_vector_index_params, plan.table_name)
+    sql, params = _build_search_vector_query(plan, query_embedding, limit)
+
+    pool = await get_async_connection_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(sql, params)
+            rows = await cur.fetchall()
+
+    results = _vector_rows_to_search_results(
+        rows, plan.include_symbol_columns, min_score, plan.include_line_columns
+    )
+    return await asyncio.to_thread(
+        _finish_search, plan, results, query_embedding, include_deps
+    )
+
+
+@dataclass
+class _SearchPlan:
+    """Decisions search() makes before running any query."""
+
+    query: str
+    index_name: str
+    table_name: str
+    hybrid: bool
+    include_symbol_columns: bool
+    include_line_columns: bool
+    validated_languages: list[str] | None
+    hybrid_language_filter: str | None
+    symbol_type: str | list[str] | None
+    symbol_name: str | None
+    no_cache: bool
+    cache_key: dict
+
+
+def _plan_search(
+    query: str,
+    index_name: str,
+    limit: int,
+    min_score: float,
+    language_filter: str | None,
+    use_hybrid: bool | None,
+    symbol_type: str | list[str] | None,
+    symbol_name: str | None,
+    no_cache: bool,
+    _skip_rewrite: bool,
+    rewrite_info: dict | None,
+) -> tuple[list[SearchResult] | None, "_SearchPlan | None"]:
+    """Validate, rewrite and cache-check a query, then choose the search mode.
+
+    Returns:
+        (cached results, None) on a cache hit, else (None, plan). The
+        plan carries the query after rewriting.
+    """
     global _has_content_text_column, _hybrid_warning_emitted
 
     # Validate query input
@@ -332,30 +540,33 @@ def search(
         hybrid=use_hybrid,
     )
 
+    cache_key = {
+        "query": query,
+        "index_name": index_name,
+        "limit": limit,
+        "min_score": min_score,
+        "language_filter": language_filter,
+        "use_hybrid": use_hybrid,
+        "symbol_type": symbol_type,
+        "symbol_name": symbol_name,
+    }
+
     # Check cache first (exact match only at this point, semantic check after embedding)
     if not no_cache:
         cache = get_query_cache()
         cached_results, hit_type = cache.get(
-            query=query,
-            index_name=index_name,
-            limit=limit,
-            min_score=min_score,
-            language_filter=language_filter,
-            use_hybrid=use_hybrid,
-            symbol_type=symbol_type,
-            symbol_name=symbol_name,
+            **cache_key,
             query_embedding=None,  # No embedding yet for semantic check
         )
         if cached_results is not None:
             _get_cs_log().cache(f"Cache hit ({hit_type})", query=query[:100])
-            return cached_results
+            return cached_results, None
 
     # Validate and resolve language filter
     validated_languages = None
     if language_filter:
         validated_languages = validate_language_filter(language_filter)
 
-    pool = get_connection_pool()
     table_name = get_table_name(index_name)
 
     # Validate symbol filter (requires v1.7+ index with symbol columns)
@@ -368,6 +579,8 @@ def search(
 
     # Always include symbol columns when available (used by definition boost)
     include_symbol_columns = check_symbol_columns_exist(table_name)
+    # Line numbers and chunk text are served from the index when stored
+    include_line_columns = check_line_columns_exist(table_name)
 
     # Check for hybrid search capability (content_text column) on first call
     if _has_content_text_column and not _hybrid_warning_emitted:
@@ -397,74 +610,78 @@ def search(
         auto_detected=use_hybrid is None and should_use_hybrid,
     )
 
-    # Execute hybrid search if applicable
-    # Hybrid search now supports language and symbol filtering (applied before RRF fusion)
-    if should_use_hybrid:
-        hybrid_results = execute_hybrid_search(
-            query,
-            index_name,
-            limit,
-            symbol_type=symbol_type,
-            symbol_name=symbol_name,
-            language_filter=(
-                ",".join(validated_languages)
-                if validated_languages
-                else language_filter
-            ),
-            query_embedding=query_embedding,
-        )
+    plan = _SearchPlan(
+        query=query,
+        index_name=index_name,
+        table_name=table_name,
+        hybrid=should_use_hybrid,
+        include_symbol_columns=include_symbol_columns,
+        include_line_columns=include_line_columns,
+        validated_languages=validated_languages,
+        hybrid_language_filter=(
+            ",".join(validated_languages) if validated_languages else language_filter
+        ),
+        symbol_type=symbol_type,
+        symbol_name=symbol_name,
+        no_cache=no_cache,
+        cache_key=cache_key,
+    )
+    return None, plan
 
-        # Convert HybridSearchResult to SearchResult, applying min_score filter
-        results = []
-        for hr in hybrid_results:
-            if hr.combined_score >= min_score:
-                results.append(
-                    SearchResult(
-                        filename=hr.filename,
-                        start_byte=hr.start_byte,
-                        end_byte=hr.end_byte,
-                        score=hr.combined_score,
-                        block_type=hr.block_type,
-                        hierarchy=hr.hierarchy,
-                        language_id=hr.language_id,
-                        match_type=hr.match_type,
-                        vector_score=hr.vector_score,
-                        keyword_score=hr.keyword_score,
-                        symbol_type=hr.symbol_type,
-                        symbol_name=hr.symbol_name,
-                        symbol_signature=hr.symbol_signature,
-                    )
-                )
 
-        _get_cs_log().search(
-            "Search completed", mode="hybrid", results=len(results), query=query[:100]
-        )
+def _semantic_cache_lookup(
+    plan: _SearchPlan, query_embedding: list[float]
+) -> list[SearchResult] | None:
+    """Second cache lookup, once the query embedding is known.
 
-        # Cache results for future queries (hybrid search doesn't have embedding)
-        if not no_cache:
-            cache = get_query_cache()
-            cache.put(
-                query=query,
-                index_name=index_name,
-                limit=limit,
-                min_score=min_score,
-                language_filter=language_filter,
-                use_hybrid=use_hybrid,
-                symbol_type=symbol_type,
-                symbol_name=symbol_name,
-                results=results,
-                query_embedding=None,  # Hybrid search doesn't expose query embedding
-            )
+    Finds results of a paraphrased query with the same filters. Only used
+    for vector-only searches: hybrid results depend on the exact query
+    tokens, so hybrid entries are cached for exact hits only.
+    """
+    if plan.no_cache:
+        return None
+    cached_results, hit_type = get_query_cache().get(
+        **plan.cache_key, query_embedding=query_embedding
+    )
+    if cached_results is not None:
+        _get_cs_log().cache(f"Cache hit ({hit_type})", query=plan.query[:100])
+    return cached_results
 
-        if include_deps:
-            _enrich_with_deps(results, index_name)
-        return results
 
-    # Vector-only search (existing behavior)
-    # Embed query using same model as indexing (skip if pre-computed)
-    if query_embedding is None:
-        query_embedding = embed_query(query)
+def _hybrid_to_search_results(
+    hybrid_results: list, min_score: float
+) -> list[SearchResult]:
+    """Convert HybridSearchResult to SearchResult, applying min_score filter."""
+    return [
+        SearchResult(
+            filename=hr.filename,
+            start_byte=hr.start_byte,
+            end_byte=hr.end_byte,
+            score=hr.combined_score,
+            block_type=hr.block_type,
+            hierarchy=hr.hierarchy,
+            language_id=hr.language_id,
+            match_type=hr.match_type,
+            vector_score=hr.vector_score,
+            keyword_score=hr.keyword_score,
+            symbol_type=hr.symbol_type,
+            symbol_name=hr.symbol_name,
+            symbol_signature=hr.symbol_signature,
+            start_line=hr.start_line,
+            end_line=hr.end_line,
+            content=hr.content,
+            scope_start_line=hr.scope_start_line,
+            scope_end_line=hr.scope_end_line,
+        )
+        for hr in hybrid_results
+        if hr.combined_score >= min_score
+    ]
+
 
+def _build_search_vector_query(
+    plan: _SearchPlan, query_embedding: list[float], limit: int
+) -> tuple[str, list]:
+    """Vector-only search SQL with the plan's language and symbol filters."""
     # Build base SELECT columns (always include metadata)
     select_cols = (
         "filename, lower(location) as start_byte, upper(location) as end_byte, "
@@ -472,16 +689,19 @@ def search(
         "block_type, hierarchy, language_id"
     )
     # Add symbol columns when symbol filtering is active
-    if include_symbol_columns:
+    if plan.include_symbol_columns:
         select_cols += ", symbol_type, symbol_name, symbol_signature"
+    # Line columns and chunk text come last (see _line_fields)
+    if plan.include_line_columns:
+        select_cols += ", " + ", ".join(LINE_COLUMNS)
 
     # Build WHERE clause for language filter
     where_parts = []
     filter_params = []
-    if validated_languages:
+    if plan.validated_languages:
         lang_id_map = _get_language_id_map()
         lang_conditions = []
-        for lang in validated_languages:
+        for lang in plan.validated_languages:
             if lang in lang_id_map:
                 # Handler/grammar language: filter by language_id column
                 lang_conditions.append("language_id = %s")
@@ -496,9 +716,9 @@ def search(
             where_parts.append(f"({' OR '.join(lang_conditions)})")
 
     # Build WHERE clause for symbol filter (combines with language filter via AND)
-    if symbol_type is not None or symbol_name is not None:
+    if plan.symbol_type is not None or plan.symbol_name is not None:
         symbol_where, symbol_params = build_symbol_where_clause(
-            symbol_type, symbol_name
+            plan.symbol_type, plan.symbol_name
         )
         if symbol_where:
             where_parts.append(symbol_where)
@@ -508,23 +728,24 @@ def search(
     if where_parts:
         where_clause = "WHERE " + " AND ".join(where_parts)
 
-    # Build full SQL
-    sql = f"""
-        SELECT {select_cols}
-        FROM {table_name}
-        {where_clause}
-        ORDER BY embedding <=> %s::vector
-        LIMIT %s
-    """
-    params = [query_embedding] + filter_params + [query_embedding, limit]
+    # Build full SQL (two-stage when the index is quantized)
+    return build_vector_query(
+        plan.table_name,
+        f" {select_cols}",
+        where_clause,
+        filter_params,
+        query_embedding,
+        limit,
+    )
 
-    # Execute query (expects metadata columns to exist)
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql, params)
-            rows = cur.fetchall()
 
-    # Filter by min_score and convert to SearchResult
+def _vector_rows_to_search_results(
+    rows: list[tuple],
+    include_symbol_columns: bool,
+    min_score: float,
+    include_line_columns: bool = False,
+) -> list[SearchResult]:
+    """Filter vector rows by min_score and convert them to SearchResult."""
     results = []
     for row in rows:
         score = float(row[3])
@@ -538,6 +759,7 @@ def search(
                 block_type=row[4] if row[4] else "",
                 hierarchy=row[5] if row[5] else "",
                 language_id=row[6] if row[6] else "",
+                **_line_fields(row, include_line_columns),
             )
             # Add symbol columns if included (indices 7-9)
             if include_symbol_columns:
@@ -545,29 +767,30 @@ def search(
                 result.symbol_name = row[8] if row[8] else None
                 result.symbol_signature = row[9] if row[9] else None
             results.append(result)
+    return results
 
+
+def _finish_search(
+    plan: _SearchPlan,
+    results: list[SearchResult],
+    query_embedding: list[float] | None,
+    include_deps: bool,
+) -> list[SearchResult]:
+    """Log, cache and (optionally) enrich search results."""
     _get_cs_log().search(
-        "Search completed", mode="vector", results=len(results), query=query[:100]
+        "Search completed",
+        mode="hybrid" if plan.hybrid else "vector",
+        results=len(results),
+        query=plan.query[:100],
     )
 
     # Cache results for future queries (vector search includes embedding for semantic matching)
-    if not no_cache:
+    if not plan.no_cache:
         cache = get_query_cache()
-        cache.put(
-            query=query,
-            index_name=index_name,
-            limit=limit,
-            min_score=min_score,
-            language_filter=language_filter,
-            use_hybrid=use_hybrid,
-            symbol_type=symbol_type,
-            symbol_name=symbol_name,
-            results=results,
-            query_embedding=query_embedding,
-        )
+        cache.put(**plan.cache_key, results=results, query_embedding=query_embedding)
 
     if include_deps:
-        _enrich_with_deps(results, index_name)
+        _enrich_with_deps(results, plan.index_name)
     return results
 
 
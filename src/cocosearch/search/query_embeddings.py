@@ -0,0 +1,254 @@
+"""Query-embedding cache for cocosearch search.
+
+Embedding a query is an HTTP round-trip to the embedding provider, and
+agents repeat the same query text constantly (with other filters, limits or
+indexes). Query embeddings are a pure function of (provider, model, output
+dimension, query text), so :func:`cocosearch.indexer.embedder.embed_query`
+and ``embed_query_async`` look them up here first. Every search path
+(``search``, ``multi_search``, ``analyze``, ``hybrid_search`` and their
+async variants) goes through those two functions.
+
+Two tiers:
+
+1. Memory: an LRU of the most recently used embeddings (per process).
+2. Disk: a SQLite file under ``~/.cache/cocosearch`` shared by every
+   process (CLI runs, REPL sessions, MCP server restarts), trimmed to the
+   most recently used ``MAX_DISK_ENTRIES``.
+
+Query text is normalized by collapsing whitespace only; case and
+punctuation change what the model sees and are kept. Disk errors are never
+fatal: the disk tier disables itself and the memory tier keeps working.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.cache/cocosearch/query_embeddings.db")
+
+MAX_MEMORY_ENTRIES = 1024
+MAX_DISK_ENTRIES = 10000
+# Trim the disk tier every this many stores rather than on each one.
+_TRIM_EVERY = 64
+
+CacheKey = tuple[str, str, int]
+
+
+def normalize_query_text(text: str) -> str:
+    """Collapse runs of whitespace and strip the ends."""
+    return " ".join(text.split())
+
+
+def _hash_query(text: str) -> str:
+    return hashlib.sha256(normalize_query_text(text).encode("utf-8")).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """LRU query-embedding cache with an optional SQLite tier.
+
+    Thread-safe. Vectors are stored on disk as float32, the precision
+    pgvector stores them at. The tiers have separate locks, so memory
+    lookups never wait behind disk I/O; async callers answer from
+    :meth:`get_memory` inline and run :meth:`get_disk` / :meth:`store` in a
+    worker thread.
+
+    Args:
+        path: SQLite file of the disk tier, or None for memory only.
+        max_memory_entries: Size of the in-memory LRU.
+        max_disk_entries: Entries kept on disk (least recently used are
+            dropped first).
+    """
+
+    def __init__(
+        self,
+        path: str | None = DEFAULT_CACHE_PATH,
+        max_memory_entries: int = MAX_MEMORY_ENTRIES,
+        max_disk_entries: int = MAX_DISK_ENTRIES,
+    ):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()  # memory tier
+        self._disk_lock = threading.Lock()  # disk tier
+        self._memory: OrderedDict[tuple, list[float]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        self._disk_enabled = path is not None
+        self._stores = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _disk(self) -> sqlite3.Connection | None:
+        """Open the SQLite tier on first use. Must hold self._disk_lock."""
+        if not self._disk_enabled:
+            return None
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                    "  provider TEXT NOT NULL,"
+                    "  model TEXT NOT NULL,"
+                    "  dimension INTEGER NOT NULL,"
+                    "  query_hash TEXT NOT NULL,"
+                    "  embedding BLOB NOT NULL,"
+                    "  last_used_at REAL NOT NULL,"
+                    "  PRIMARY KEY (provider, model, dimension, query_hash)"
+                    ")"
+                )
+                conn.commit()
+                self._conn = conn
+            except Exception as e:
+                self._disable_disk(e)
+        return self._conn
+
+    def _disable_disk(self, exc: Exception) -> None:
+        if self._disk_enabled:
+            logger.warning("Query embedding disk cache disabled: %s", exc)
+        self._disk_enabled = False
+        self._conn = None
+
+    def get(self, key: CacheKey, text: str) -> list[float] | None:
+        """Return the cached embedding of ``text`` under ``key``, or None.
+
+        Args:
+            key: (provider, model, dimension) of the embedding config.
+            text: Query text (normalized here).
+        """
+        embedding = self.get_memory(key, text)
+        if embedding is None:
+            embedding = self.get_disk(key, text)
+        return embedding
+
+    def get_memory(self, key: CacheKey, text: str) -> list[float] | None:
+        """Look ``text`` up in the memory tier only (no I/O)."""
+        memory_key = (*key, _hash_query(text))
+        with self._lock:
+            embedding = self._memory.get(memory_key)
+            if embedding is None:
+                return None
+            self._memory.move_to_end(memory_key)
+            self.hits += 1
+            return list(embedding)
+
+    def get_disk(self, key: CacheKey, text: str) -> list[float] | None:
+        """Look ``text`` up in the disk tier, promoting a hit to memory.
+
+        Counts a miss when the embedding is in neither tier. May wait up to
+        the SQLite busy timeout on another process's write lock.
+        """
+        memory_key = (*key, _hash_query(text))
+        with self._disk_lock:
+            conn = self._disk()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT embedding FROM query_embeddings"
+                        " WHERE provider = ? AND model = ? AND dimension = ?"
+                        " AND query_hash = ?",
+                        memory_key,
+                    ).fetchone()
+                    if row is not None:
+                        conn.execute(
+                            "UPDATE query_embeddings SET last_used_at = ?"
+                            " WHERE provider = ? AND model = ? AND dimension = ?"
+                            " AND query_hash = ?",
+                            (time.time(), *memory_key),
+                        )
+                        conn.commit()
+                        embedding = np.frombuffer(row[0], dtype=np.float32).tolist()
+                        with self._lock:
+                            self._remember(memory_key, embedding)
+                            self.hits += 1
+                        return list(embedding)
+                except Exception as e:
+                    self._disable_disk(e)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, text: str, embedding: list[float]) -> None:
+        """Store the embedding of ``text`` under ``key`` in both tiers."""
+        self.remember(key, text, embedding)
+        self.store(key, text, embedding)
+
+    def remember(self, key: CacheKey, text: str, embedding: list[float]) -> None:
+        """Store the embedding of ``text`` in the memory tier only."""
+        with self._lock:
+            self._remember((*key, _hash_query(text)), list(embedding))
+
+    def store(self, key: CacheKey, text: str, embedding: list[float]) -> None:
+        """Store the embedding of ``text`` in the disk tier only."""
+        memory_key = (*key, _hash_query(text))
+        with self._disk_lock:
+            conn = self._disk()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings"
+                    " (provider, model, dimension, query_hash, embedding, last_used_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        *memory_key,
+                        np.asarray(embedding, dtype=np.float32).tobytes(),
+                        time.time(),
+                    ),
+                )
+                self._stores += 1
+                if self._stores % _TRIM_EVERY == 0:
+                    conn.execute(
+                        "DELETE FROM query_embeddings WHERE rowid IN ("
+                        "  SELECT rowid FROM query_embeddings"
+                        "  ORDER BY last_used_at DESC LIMIT -1 OFFSET ?"
+                        ")",
+                        (self.max_disk_entries,),
+                    )
+                conn.commit()
+            except Exception as e:
+                self._disable_disk(e)
+
+    def _remember(self, memory_key: tuple, embedding: list[float]) -> None:
+        """Insert into the memory LRU. Must hold self._lock."""
+        self._memory[memory_key] = embedding
+        self._memory.move_to_end(memory_key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached embedding (both tiers)."""
+        with self._disk_lock:
+            with self._lock:
+                self._memory.clear()
+            conn = self._disk()
+            if conn is not None:
+                try:
+                    conn.execute("DELETE FROM query_embeddings")
+                    conn.commit()
+                except Exception as e:
+                    self._disable_disk(e)
+
+
+# Module-level singleton
+_cache: QueryEmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get or create the process-wide query-embedding cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QueryEmbeddingCache()
+    return _cache
@@ -321,6 +321,11 @@ def run_repl(
         min_score: Minimum score threshold.
         index_names: Optional list of indexes for cross-index search.
     """
+    from cocosearch.search.invalidation import (
+        start_index_listener,
+        stop_index_listener,
+    )
+
     repl = SearchREPL(
         index_name=index_name,
         limit=limit,
@@ -328,7 +333,11 @@ def run_repl(
         min_score=min_score,
         index_names=index_names,
     )
+    # Re-indexing in another terminal invalidates this session's caches
+    start_index_listener()
     try:
         repl.cmdloop()
     except KeyboardInterrupt:
         repl.console.print("\n[dim]Interrupted. Goodbye![/dim]")
+    finally:
+        stop_index_listener()
@@ -1,9 +1,13 @@
 """Utility functions for search result processing.
 
 Provides byte offset to line number conversion and chunk content
-reading from source files for result formatting.
+reading from source files for result formatting. Files are read through
+the process-wide file cache (:mod:`cocosearch.search.file_cache`), so
+results from the same file cost one read.
 """
 
+from cocosearch.search.file_cache import get_file_cache
+
 
 def byte_to_line(filepath: str, byte_offset: int) -> int:
     """Convert byte offset to 1-based line number.
@@ -15,12 +19,10 @@ def byte_to_line(filepath: str, byte_offset: int) -> int:
     Returns:
         1-based line number, or 0 if file not accessible.
     """
-    try:
-        with open(filepath, "rb") as f:
-            content = f.read(byte_offset)
-            return content.count(b"\n") + 1
-    except (FileNotFoundError, IOError):
+    cached = get_file_cache().get(filepath)
+    if cached is None:
         return 0  # File not accessible
+    return cached.byte_to_line(byte_offset)
 
 
 def read_chunk_content(filepath: str, start_byte: int, end_byte: int) -> str:
@@ -34,10 +36,7 @@ def read_chunk_content(filepath: str, start_byte: int, end_byte: int) -> str:
     Returns:
         Chunk text content, or empty string if file not accessible.
     """
-    try:
-        with open(filepath, "rb") as f:
-            f.seek(start_byte)
-            content = f.read(end_byte - start_byte)
-            return content.decode("utf-8", errors="replace")
-    except (FileNotFoundError, IOError):
+    cached = get_file_cache().get(filepath)
+    if cached is None:
         return ""
+    return cached.data[start_byte:end_byte].decode("utf-8", errors="replace")
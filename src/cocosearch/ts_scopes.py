@@ -0,0 +1,115 @@
+"""Enclosing-scope detection on tree-sitter trees.
+
+Both the indexer (which stores each chunk's enclosing definition) and
+search-time context expansion need to know which node types count as a
+definition and which tree-sitter grammar a file uses. Keeping those tables
+here lets either side use them without importing the other.
+"""
+
+from pathlib import Path
+
+# Definition node types by language for enclosing scope detection
+DEFINITION_NODE_TYPES: dict[str, set[str]] = {
+    "python": {"function_definition", "class_definition"},
+    "javascript": {
+        "function_declaration",
+        "class_declaration",
+        "method_definition",
+        "arrow_function",
+    },
+    "typescript": {
+        "function_declaration",
+        "class_declaration",
+        "method_definition",
+        "arrow_function",
+        "interface_declaration",
+    },
+    "go": {"function_declaration", "method_declaration", "type_declaration"},
+    "rust": {"function_item", "impl_item", "struct_item", "trait_item"},
+    "scala": {
+        "class_definition",
+        "trait_definition",
+        "object_definition",
+        "function_definition",
+    },
+    "hcl": {"block"},
+    "terraform": {"block"},
+    "dockerfile": {"from_instruction"},
+    "yaml": {"block_mapping_pair"},
+}
+
+# File extension to tree-sitter language mapping
+EXTENSION_TO_LANGUAGE: dict[str, str] = {
+    # Python
+    ".py": "python",
+    # JavaScript
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    # TypeScript
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".mts": "typescript",
+    ".cts": "typescript",
+    # Go
+    ".go": "go",
+    # Rust
+    ".rs": "rust",
+    # Scala
+    ".scala": "scala",
+    # HCL / Terraform
+    ".tf": "terraform",
+    ".hcl": "hcl",
+    ".tfvars": "terraform",
+    # Dockerfile
+    ".dockerfile": "dockerfile",
+    # YAML
+    ".yaml": "yaml",
+    ".yml": "yaml",
+}
+
+
+def language_for_path(filepath: str) -> str | None:
+    """Tree-sitter language of a file, from its extension.
+
+    Args:
+        filepath: Path to the source file.
+
+    Returns:
+        Tree-sitter language name, or None if extension not supported.
+    """
+    return EXTENSION_TO_LANGUAGE.get(Path(filepath).suffix.lower())
+
+
+def definition_range(tree, byte_offset: int, language: str) -> tuple[int, int] | None:
+    """Byte range of the innermost definition enclosing ``byte_offset``.
+
+    Shared by live scope detection and the indexer, which stores each
+    chunk's enclosing scope so searches need not parse the file again.
+
+    Args:
+        tree: Parsed tree-sitter tree of the file.
+        byte_offset: Position in the file.
+        language: Tree-sitter language name (a key of DEFINITION_NODE_TYPES).
+
+    Returns:
+        (start_byte, end_byte) of the enclosing function/class, or None.
+    """
+    definition_types = DEFINITION_NODE_TYPES.get(language)
+    if not definition_types:
+        return None
+    current = tree.root_node.descendant_for_byte_range(byte_offset, byte_offset)
+    while current is not None:
+        if current.type in definition_types:
+            return (current.start_byte, current.end_byte)
+        current = current.parent
+    return None
+
+
+__all__ = [
+    "DEFINITION_NODE_TYPES",
+    "EXTENSION_TO_LANGUAGE",
+    "definition_range",
+    "language_for_path",
+]
@@ -72,6 +72,35 @@ def reset_db_pool():
     db_module._pool = None
 
 
+@pytest.fixture(autouse=True)
+def isolate_query_embedding_cache():
+    """Give each test a fresh, memory-only query-embedding cache.
+
+    embed_query() caches embeddings in ~/.cache/cocosearch; without this,
+    tests would read vectors cached by earlier tests or real runs instead of
+    calling their mocked provider.
+    """
+    import cocosearch.search.query_embeddings as qe_module
+
+    qe_module._cache = qe_module.QueryEmbeddingCache(path=None)
+    yield
+    qe_module._cache = None
+
+
+@pytest.fixture(autouse=True)
+def isolate_query_cache():
+    """Give each test a fresh, memory-only query result cache.
+
+    The result cache persists to ~/.cache/cocosearch; without this, searches
+    would be served results cached by earlier tests or real runs.
+    """
+    import cocosearch.search.cache as cache_module
+
+    cache_module._query_cache = cache_module.QueryCache(cache_dir=None)
+    yield
+    cache_module._query_cache = None
+
+
 _CONTROLLER_ENV_VARS = (
     "COCOSEARCH_CONTROLLER_ENABLED",
     "COCOSEARCH_CONTROLLER_PROVIDER",
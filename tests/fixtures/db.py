@@ -7,7 +7,12 @@ to enable testing without a real PostgreSQL database.
 import pytest
 from unittest.mock import patch
 
-from tests.mocks.db import MockConnectionPool, MockCursor, MockConnection
+from tests.mocks.db import (
+    MockAsyncConnectionPool,
+    MockConnection,
+    MockConnectionPool,
+    MockCursor,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -17,19 +22,42 @@ def reset_search_module_state():
     Autouse fixture that:
     1. Patches check_column_exists to return True (simulates v1.7+ index)
     2. Patches check_symbol_columns_exist to return True (simulates v1.7+ index)
-    3. Resets module-level flags after each test
-    4. Clears the query cache and symbol columns cache to prevent test pollution
+       and check_line_columns_exist to return False (results keep reading
+       line numbers and content from the source files unless a test opts in)
+    3. Patches get_async_connection_pool in the search modules with an async
+       view of the module's sync pool, so tests that patch
+       get_connection_pool get the same results from the async search path
+    4. Patches the query cache's database generation lookup to find nothing,
+       so cache lookups do not consume the results a test queued for search
+    5. Resets module-level flags after each test
+    6. Clears the query cache and symbol columns cache to prevent test pollution
 
     This prevents column checks from hitting a real database
     and ensures test isolation for module-level state.
     """
     import cocosearch.search.query as query_module
+    import cocosearch.search.hybrid as hybrid_module
     import cocosearch.search.cache as cache_module
     import cocosearch.search.db as db_module
 
+    def async_pool_of(module):
+        async def get_async_connection_pool():
+            return MockAsyncConnectionPool(module.get_connection_pool())
+
+        return get_async_connection_pool
+
     with (
         patch.object(query_module, "check_column_exists", return_value=True),
         patch.object(query_module, "check_symbol_columns_exist", return_value=False),
+        patch.object(query_module, "check_line_columns_exist", return_value=False),
+        patch.object(hybrid_module, "check_line_columns_exist", return_value=False),
+        patch.object(
+            query_module, "get_async_connection_pool", async_pool_of(query_module)
+        ),
+        patch.object(
+            hybrid_module, "get_async_connection_pool", async_pool_of(hybrid_module)
+        ),
+        patch.object(cache_module, "_database_generation", return_value=None),
     ):
         yield
 
@@ -42,6 +70,12 @@ def reset_search_module_state():
 
     # Clear symbol columns cache to prevent cross-test pollution
     db_module._symbol_columns_available = {}
+    db_module._line_columns_available = {}
+
+    # Drop dependency graphs loaded by tests
+    from cocosearch.deps.graph import reset_dependency_graphs
+
+    reset_dependency_graphs()
 
 
 @pytest.fixture
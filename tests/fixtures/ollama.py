@@ -10,13 +10,17 @@ from unittest.mock import patch
 from tests.mocks.ollama import deterministic_embedding
 
 
+async def _deterministic_embedding_async(text: str) -> list[float]:
+    return deterministic_embedding(text)
+
+
 @pytest.fixture
 def mock_embed_query():
-    """Mock the embed_query() function.
+    """Mock the embed_query() and embed_query_async() functions.
 
-    Patches cocosearch.indexer.embedder.embed_query with a function
-    that returns deterministic embeddings. Also patches the imported
-    references in search modules.
+    Patches cocosearch.indexer.embedder.embed_query and embed_query_async
+    with functions that return deterministic embeddings. Also patches the
+    imported references in search modules.
 
     Usage:
         def test_search(mock_embed_query, patched_db_pool):
@@ -37,7 +41,25 @@ def mock_embed_query():
                     "cocosearch.search.multi.embed_query",
                     side_effect=deterministic_embedding,
                 ):
-                    yield deterministic_embedding
+                    with (
+                        patch(
+                            "cocosearch.indexer.embedder.embed_query_async",
+                            _deterministic_embedding_async,
+                        ),
+                        patch(
+                            "cocosearch.search.query.embed_query_async",
+                            _deterministic_embedding_async,
+                        ),
+                        patch(
+                            "cocosearch.search.hybrid.embed_query_async",
+                            _deterministic_embedding_async,
+                        ),
+                        patch(
+                            "cocosearch.search.multi.embed_query_async",
+                            _deterministic_embedding_async,
+                        ),
+                    ):
+                        yield deterministic_embedding
 
 
 @pytest.fixture
@@ -1,7 +1,8 @@
 """Database mock classes for testing.
 
 Provides MockCursor, MockConnection, and MockConnectionPool that mimic
-psycopg/psycopg_pool interfaces without requiring a real database.
+psycopg/psycopg_pool interfaces without requiring a real database, and
+async views of them (MockAsyncConnectionPool) for the async search path.
 """
 
 from typing import Any
@@ -108,3 +109,63 @@ class MockConnectionPool:
     def connection(self) -> MockConnection:
         """Return a context manager yielding the mock connection."""
         return self._connection
+
+
+class MockAsyncCursor:
+    """Async view of a MockCursor (psycopg.AsyncCursor interface).
+
+    Queries and results go through the wrapped cursor, so call tracking
+    and assertions work the same for the sync and async code paths.
+    """
+
+    def __init__(self, cursor: MockCursor):
+        self._cursor = cursor
+
+    async def execute(self, query: str, params: tuple | None = None) -> None:
+        self._cursor.execute(query, params)
+
+    async def fetchone(self) -> tuple | None:
+        return self._cursor.fetchone()
+
+    async def fetchall(self) -> list[tuple]:
+        return self._cursor.fetchall()
+
+    async def __aenter__(self) -> "MockAsyncCursor":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class MockAsyncConnection:
+    """Async view of a MockConnection (psycopg.AsyncConnection interface)."""
+
+    def __init__(self, connection: MockConnection):
+        self._connection = connection
+
+    def cursor(self) -> MockAsyncCursor:
+        return MockAsyncCursor(self._connection.cursor())
+
+    async def commit(self) -> None:
+        self._connection.commit()
+
+    async def __aenter__(self) -> "MockAsyncConnection":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+
+class MockAsyncConnectionPool:
+    """Mock psycopg_pool.AsyncConnectionPool backed by a MockConnectionPool.
+
+    Lets async code paths read the same canned results as a test's sync
+    pool.
+    """
+
+    def __init__(self, pool: MockConnectionPool):
+        self._pool = pool
+
+    def connection(self) -> MockAsyncConnection:
+        """Return an async context manager yielding the mock connection."""
+        return MockAsyncConnection(self._pool.connection())
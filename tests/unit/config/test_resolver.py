@@ -297,6 +297,8 @@ class TestBridgeEmbeddingConfig:
         "COCOSEARCH_EMBEDDING_PROVIDER",
         "COCOSEARCH_EMBEDDING_MODEL",
         "COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION",
+        "COCOSEARCH_EMBEDDING_STORED_DIMENSION",
+        "COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK",
         "COCOSEARCH_EMBEDDING_BASE_URL",
     )
 
@@ -379,6 +381,18 @@ class TestBridgeEmbeddingConfig:
 
         assert "COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION" not in os.environ
 
+    def test_bridge_stored_dimension_and_rerank(self):
+        """storedDimension and fullDimensionRerank are bridged when set."""
+        config = CocoSearchConfig()
+        config.embedding.storedDimension = 256
+        config.embedding.fullDimensionRerank = True
+        resolver = ConfigResolver(config, config_path=Path("/config.yaml"))
+
+        resolver.bridge_embedding_config()
+
+        assert os.environ["COCOSEARCH_EMBEDDING_STORED_DIMENSION"] == "256"
+        assert os.environ["COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK"] == "true"
+
     def test_bridge_base_url_from_config(self):
         """baseUrl is bridged to env var when set in config."""
         config = CocoSearchConfig()
@@ -3,7 +3,7 @@
 import json
 from unittest.mock import MagicMock, patch
 
-from cocosearch.deps.models import DependencyEdge, DependencyTree
+from cocosearch.deps.models import DependencyEdge, DependencyTree, ImpactSummary
 
 # ============================================================================
 # Tests: deps_extract_command
@@ -250,6 +250,28 @@ class TestDepsStatsCommand:
         # The actual output test uses capsys indirectly through Rich
         mock_stats.assert_called_once_with("myindex")
 
+    @patch("cocosearch.cli.get_top_impact")
+    @patch("cocosearch.cli.get_dep_stats")
+    @patch("cocosearch.cli._resolve_index_name", return_value=("myindex", "config"))
+    @patch("cocosearch.cli.load_project_config")
+    @patch("cocosearch.cli.find_config_file", return_value="/fake/cocosearch.yaml")
+    def test_prints_largest_blast_radius(
+        self, mock_find, mock_load, mock_resolve, mock_stats, mock_top, capsys
+    ):
+        """Should list the files with the most transitive dependents."""
+        mock_stats.return_value = {"total_edges": 3}
+        mock_top.return_value = [ImpactSummary("core.py", 12, 4)]
+
+        args = MagicMock()
+        args.index = None
+
+        from cocosearch.cli import deps_stats_command
+
+        deps_stats_command(args)
+
+        mock_top.assert_called_once_with("myindex", limit=5)
+        assert "core.py: 12 dependents (4 direct)" in capsys.readouterr().out
+
 
 # ============================================================================
 # Tests: deps_tree_command
@@ -360,6 +382,7 @@ class TestDepsImpactCommand:
         args.depth = 3
         args.type = None
         args.json = False
+        args.summary = False
 
         from cocosearch.cli import deps_impact_command
 
@@ -386,6 +409,7 @@ class TestDepsImpactCommand:
         args.depth = 5
         args.type = None
         args.json = False
+        args.summary = False
 
         from cocosearch.cli import deps_impact_command
 
@@ -393,6 +417,100 @@ class TestDepsImpactCommand:
 
         assert result == 1
 
+    @patch("cocosearch.cli.get_impact")
+    @patch("cocosearch.cli.get_impact_summaries")
+    @patch("cocosearch.cli._resolve_index_name", return_value=("myindex", "config"))
+    @patch("cocosearch.cli.load_project_config")
+    @patch("cocosearch.cli.find_config_file", return_value="/fake/cocosearch.yaml")
+    def test_summary_skips_tree(
+        self, mock_find, mock_load, mock_resolve, mock_summaries, mock_impact, capsys
+    ):
+        """--summary should print the precomputed summary without a traversal."""
+        mock_summaries.return_value = {
+            "a.py": ImpactSummary("a.py", 5, 2, depth_histogram=[2, 3])
+        }
+
+        args = MagicMock()
+        args.index = None
+        args.file = "a.py"
+        args.json = True
+        args.summary = True
+
+        from cocosearch.cli import deps_impact_command
+
+        result = deps_impact_command(args)
+
+        assert result == 0
+        mock_impact.assert_not_called()
+        mock_summaries.assert_called_once_with("myindex", ["a.py"])
+        output = json.loads(capsys.readouterr().out)
+        assert output["dependents"] == 5
+        assert output["depth_histogram"] == [2, 3]
+
+    @patch("cocosearch.cli.get_impact_summaries", return_value={})
+    @patch("cocosearch.cli._resolve_index_name", return_value=("myindex", "config"))
+    @patch("cocosearch.cli.load_project_config")
+    @patch("cocosearch.cli.find_config_file", return_value="/fake/cocosearch.yaml")
+    def test_summary_of_file_without_dependents(
+        self, mock_find, mock_load, mock_resolve, mock_summaries, capsys
+    ):
+        """A file with no stored summary has no dependents."""
+        args = MagicMock()
+        args.index = None
+        args.file = "leaf.py"
+        args.json = True
+        args.summary = True
+
+        from cocosearch.cli import deps_impact_command
+
+        assert deps_impact_command(args) == 0
+        output = json.loads(capsys.readouterr().out)
+        assert output["dependents"] == 0
+
+    @patch("cocosearch.cli.get_impact_summaries", return_value=None)
+    @patch("cocosearch.cli._resolve_index_name", return_value=("myindex", "config"))
+    @patch("cocosearch.cli.load_project_config")
+    @patch("cocosearch.cli.find_config_file", return_value="/fake/cocosearch.yaml")
+    def test_summary_without_precomputed_data_returns_one(
+        self, mock_find, mock_load, mock_resolve, mock_summaries
+    ):
+        """--summary should fail when the index has no summaries yet."""
+        args = MagicMock()
+        args.index = None
+        args.file = "a.py"
+        args.json = False
+        args.summary = True
+
+        from cocosearch.cli import deps_impact_command
+
+        assert deps_impact_command(args) == 1
+
+    @patch("cocosearch.cli.get_impact")
+    @patch("cocosearch.cli.get_impact_summaries", side_effect=Exception("DB error"))
+    @patch("cocosearch.cli._resolve_index_name", return_value=("myindex", "config"))
+    @patch("cocosearch.cli.load_project_config")
+    @patch("cocosearch.cli.find_config_file", return_value="/fake/cocosearch.yaml")
+    def test_tree_shown_when_summary_lookup_fails(
+        self, mock_find, mock_load, mock_resolve, mock_summaries, mock_impact
+    ):
+        """A failing summary lookup should not break the impact tree."""
+        mock_impact.return_value = DependencyTree(
+            file="a.py", symbol=None, dep_type="root", children=[]
+        )
+
+        args = MagicMock()
+        args.index = None
+        args.file = "a.py"
+        args.depth = 3
+        args.type = None
+        args.json = False
+        args.summary = False
+
+        from cocosearch.cli import deps_impact_command
+
+        assert deps_impact_command(args) == 0
+        mock_impact.assert_called_once()
+
 
 # ============================================================================
 # Tests: languages_command — Deps column
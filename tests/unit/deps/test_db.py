@@ -3,8 +3,14 @@
 import json
 from unittest.mock import patch
 
-from cocosearch.deps.db import create_deps_table, drop_deps_table, insert_edges
-from cocosearch.deps.models import DependencyEdge, DepType
+from cocosearch.deps.db import (
+    create_deps_table,
+    create_impact_table,
+    drop_deps_table,
+    insert_edges,
+    replace_impact_summaries,
+)
+from cocosearch.deps.models import DependencyEdge, DepType, ImpactSummary
 
 
 class TestCreateDepsTable:
@@ -237,3 +243,52 @@ class TestInsertEdges:
 
         _, params = cursor.calls[0]
         assert json.dumps({}) in params
+
+
+class TestCreateImpactTable:
+    """Tests for create_impact_table()."""
+
+    def test_creates_table_and_ranking_index(self, mock_db_pool):
+        """Should create the summary table with an index on dependents."""
+        pool, cursor, conn = mock_db_pool()
+
+        with patch("cocosearch.deps.db.get_connection_pool", return_value=pool):
+            create_impact_table("myindex")
+
+        cursor.assert_query_contains("CREATE TABLE IF NOT EXISTS")
+        cursor.assert_query_contains("cocosearch_deps_impact_myindex")
+        cursor.assert_query_contains("depth_histogram INTEGER[] NOT NULL")
+        cursor.assert_query_contains("(dependents DESC)")
+        assert conn.committed
+
+
+class TestReplaceImpactSummaries:
+    """Tests for replace_impact_summaries()."""
+
+    def test_truncates_then_inserts(self, mock_db_pool):
+        """Should replace all rows in one transaction."""
+        pool, cursor, conn = mock_db_pool()
+        summaries = [
+            ImpactSummary("a.py", 2, 1, depth_histogram=[1, 1]),
+            ImpactSummary("b.py", 0, 0),
+        ]
+
+        with patch("cocosearch.deps.db.get_connection_pool", return_value=pool):
+            replace_impact_summaries("myindex", summaries)
+
+        assert cursor.calls[0][0] == "TRUNCATE TABLE cocosearch_deps_impact_myindex"
+        assert [params for _, params in cursor.calls[1:]] == [
+            ("a.py", 2, 1, 1, [1, 1]),
+            ("b.py", 0, 0, 1, []),
+        ]
+        assert conn.committed
+
+    def test_empty_summaries_only_truncate(self, mock_db_pool):
+        """No summaries should leave an empty table."""
+        pool, cursor, conn = mock_db_pool()
+
+        with patch("cocosearch.deps.db.get_connection_pool", return_value=pool):
+            replace_impact_summaries("myindex", [])
+
+        assert len(cursor.calls) == 1
+        cursor.assert_query_contains("TRUNCATE")
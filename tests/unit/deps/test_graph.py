@@ -0,0 +1,234 @@
+"""Tests for the in-memory dependency graph."""
+
+import json
+from unittest.mock import patch
+
+from cocosearch.deps import graph as graph_module
+from cocosearch.deps.graph import (
+    DependencyGraph,
+    forget_dependency_graph,
+    get_dependency_graph,
+    load_dependency_graph,
+)
+from cocosearch.deps.models import DependencyEdge, DepType
+from cocosearch.deps.query import (
+    _build_trees,
+    get_dep_stats_detailed,
+    get_dependency_tree,
+    get_impact_batch,
+)
+
+
+def _edge(source, target, dep_type=DepType.IMPORT, symbol=None, metadata=None):
+    return DependencyEdge(
+        source_file=source,
+        source_symbol=None,
+        target_file=target,
+        target_symbol=symbol,
+        dep_type=dep_type,
+        metadata=metadata or {},
+    )
+
+
+# a → b → c → a (cycle), a → d (call), b → fmt (external), e → c
+_EDGES = [
+    _edge("a.py", "b.py"),
+    _edge("b.py", "c.py"),
+    _edge("c.py", "a.py"),
+    _edge("a.py", "d.py", dep_type=DepType.CALL, symbol="run"),
+    _edge("b.py", None, symbol="fmt", metadata={"module": "fmt"}),
+    _edge("e.py", "c.py"),
+]
+
+
+def _by_file(edges, key):
+    grouped = {}
+    for edge in edges:
+        grouped.setdefault(getattr(edge, key), []).append(edge)
+    return grouped
+
+
+class TestDependencyGraph:
+    def test_dependencies_in_table_order(self):
+        graph = DependencyGraph(_EDGES)
+
+        edges = graph.dependencies("b.py")
+
+        assert edges == [_EDGES[1], _EDGES[4]]
+
+    def test_dependents_skip_external(self):
+        graph = DependencyGraph(_EDGES)
+
+        assert graph.dependents("c.py") == [_EDGES[1], _EDGES[5]]
+        assert graph.dependents("fmt") == []
+
+    def test_dep_type_filter(self):
+        graph = DependencyGraph(_EDGES)
+
+        assert graph.dependencies("a.py", dep_type=DepType.CALL) == [_EDGES[3]]
+        assert graph.dependencies("a.py", dep_type="reference") == []
+
+    def test_unknown_file(self):
+        graph = DependencyGraph(_EDGES)
+
+        assert graph.dependencies("missing.py") == []
+        assert graph.dependents("missing.py") == []
+
+    def test_files_interned_once(self):
+        graph = DependencyGraph(_EDGES)
+
+        assert sorted(graph.files) == ["a.py", "b.py", "c.py", "d.py", "e.py"]
+
+    def test_returned_metadata_is_a_copy(self):
+        graph = DependencyGraph(_EDGES)
+
+        graph.dependencies("b.py")[1].metadata["module"] = "changed"
+
+        assert graph.dependencies("b.py")[1].metadata == {"module": "fmt"}
+
+    def test_trees_match_query_traversal(self):
+        graph = DependencyGraph(_EDGES)
+        forward = _by_file(_EDGES, "source_file")
+        backward = _by_file([e for e in _EDGES if e.target_file], "target_file")
+
+        for files in (["a.py"], ["c.py", "b.py"]):
+            for depth in (1, 2, 5):
+                assert graph.trees(files, depth) == _build_trees(
+                    files, lambda f: forward.get(f, []), depth
+                )
+                assert graph.trees(files, depth, reverse=True) == _build_trees(
+                    files, lambda f: backward.get(f, []), depth, reverse=True
+                )
+
+    def test_top_sources_and_targets(self):
+        graph = DependencyGraph(_EDGES)
+
+        assert graph.top_sources(limit=2) == [("a.py", 2), ("b.py", 2)]
+        assert graph.top_targets(limit=1) == [("c.py", 2)]
+
+    def test_stats_format(self):
+        graph = DependencyGraph(_EDGES)
+
+        stats = graph.stats()
+
+        assert stats["total_edges"] == 6
+        assert stats["by_type"] == {"import": 5, "call": 1}
+        assert list(stats["by_type"]) == ["import", "call"]
+        assert ("e.py", 1) in stats["top_sources"]
+        assert stats["top_targets"][0] == ("c.py", 2)
+
+    def test_empty_graph(self):
+        graph = DependencyGraph([])
+
+        assert graph.stats() == {
+            "total_edges": 0,
+            "by_type": {},
+            "top_sources": [],
+            "top_targets": [],
+        }
+        assert graph.trees(["a.py"], 3)[0].children == []
+
+
+class TestLoadDependencyGraph:
+    def test_reads_all_edges_in_id_order(self, mock_db_pool):
+        pool, cursor, conn = mock_db_pool(
+            results=[
+                ("a.py", None, "b.py", None, "import", json.dumps({"line": 1})),
+                ("a.py", None, None, "os", "import", None),
+            ]
+        )
+
+        with patch("cocosearch.deps.graph.get_connection_pool", return_value=pool):
+            graph = load_dependency_graph("myindex")
+
+        cursor.assert_query_contains("cocosearch_deps_myindex")
+        cursor.assert_query_contains("ORDER BY id")
+        assert [e.target_file for e in graph.dependencies("a.py")] == ["b.py", None]
+
+
+class TestGraphCache:
+    def test_loaded_once(self):
+        with patch.object(
+            graph_module, "load_dependency_graph", return_value=DependencyGraph([])
+        ) as load:
+            first = get_dependency_graph("myindex")
+            second = get_dependency_graph("myindex")
+
+        assert first is second
+        load.assert_called_once_with("myindex")
+
+    def test_forget_reloads(self):
+        with patch.object(
+            graph_module,
+            "load_dependency_graph",
+            side_effect=lambda name: DependencyGraph([]),
+        ) as load:
+            first = get_dependency_graph("myindex")
+            forget_dependency_graph("myindex")
+            second = get_dependency_graph("myindex")
+
+        assert first is not second
+        assert load.call_count == 2
+
+    def test_expires_when_not_listening(self):
+        with (
+            patch.object(
+                graph_module,
+                "load_dependency_graph",
+                side_effect=lambda name: DependencyGraph([]),
+            ) as load,
+            patch.object(graph_module, "DEPENDENCY_GRAPH_TTL", 0.0),
+        ):
+            get_dependency_graph("myindex")
+            get_dependency_graph("myindex")
+
+        assert load.call_count == 2
+
+    def test_kept_while_listening(self):
+        with (
+            patch.object(
+                graph_module,
+                "load_dependency_graph",
+                side_effect=lambda name: DependencyGraph([]),
+            ) as load,
+            patch.object(graph_module, "DEPENDENCY_GRAPH_TTL", 0.0),
+            patch("cocosearch.search.invalidation.is_listening", return_value=True),
+        ):
+            get_dependency_graph("myindex")
+            get_dependency_graph("myindex")
+
+        assert load.call_count == 1
+
+    def test_load_racing_with_forget_not_kept(self):
+        def load(name):
+            forget_dependency_graph(name)  # Index changed mid-load
+            return DependencyGraph([])
+
+        with patch.object(graph_module, "load_dependency_graph", side_effect=load):
+            get_dependency_graph("myindex")
+
+        assert "myindex" not in graph_module._graphs
+
+
+class TestQueryUseGraph:
+    def test_traversals_served_from_graph(self):
+        graph = DependencyGraph(_EDGES)
+
+        with (
+            patch.object(graph_module, "get_dependency_graph", return_value=graph),
+            patch("cocosearch.deps.query._fetch_traversal_edges") as fetch,
+        ):
+            tree = get_dependency_tree("myindex", "a.py", use_graph=True)
+            impact = get_impact_batch("myindex", ["c.py"], use_graph=True)
+
+        fetch.assert_not_called()
+        assert [c.file for c in tree.children] == ["b.py", "d.py"]
+        assert {c.file for c in impact[0].children} == {"b.py", "e.py"}
+
+    def test_stats_served_from_graph(self):
+        graph = DependencyGraph(_EDGES)
+
+        with patch.object(graph_module, "get_dependency_graph", return_value=graph):
+            stats = get_dep_stats_detailed("myindex", use_graph=True)
+
+        assert stats == graph.stats()
@@ -0,0 +1,142 @@
+"""Tests for precomputed impact summaries."""
+
+import random
+from collections import deque
+
+from cocosearch.deps.impact import (
+    _strongly_connected_components,
+    compute_impact_summaries,
+)
+from cocosearch.deps.models import DependencyEdge, DepType
+
+
+def _edge(source, target, dep_type=DepType.IMPORT):
+    return DependencyEdge(
+        source_file=source,
+        source_symbol=None,
+        target_file=target,
+        target_symbol=None,
+        dep_type=dep_type,
+        metadata={},
+    )
+
+
+def _by_file(edges, **kwargs):
+    return {s.file: s for s in compute_impact_summaries(edges, **kwargs)}
+
+
+def _bfs_distances(edges, file):
+    """Shortest distances from *file* to each file depending on it."""
+    dependents = {}
+    for edge in edges:
+        if edge.target_file is not None:
+            dependents.setdefault(edge.target_file, set()).add(edge.source_file)
+    distances = {file: 0}
+    queue = deque([file])
+    while queue:
+        current = queue.popleft()
+        for dependent in dependents.get(current, ()):
+            if dependent not in distances:
+                distances[dependent] = distances[current] + 1
+                queue.append(dependent)
+    del distances[file]
+    return distances
+
+
+class TestStronglyConnectedComponents:
+    def test_reverse_topological_order(self):
+        # 0 → 1 → 2 → 1, 2 → 3
+        components = _strongly_connected_components([[1], [2], [1, 3], []])
+
+        assert [sorted(c) for c in components] == [[3], [1, 2], [0]]
+
+    def test_deep_chain_does_not_recurse(self):
+        count = 5000
+        succ = [[i + 1] for i in range(count - 1)] + [[]]
+
+        assert len(_strongly_connected_components(succ)) == count
+
+
+class TestComputeImpactSummaries:
+    def test_chain(self):
+        # c imports b, b imports a
+        summaries = _by_file([_edge("b.py", "a.py"), _edge("c.py", "b.py")])
+
+        assert summaries["a.py"].dependents == 2
+        assert summaries["a.py"].direct_dependents == 1
+        assert summaries["a.py"].depth_histogram == [1, 1]
+        assert summaries["c.py"].dependents == 0
+        assert summaries["c.py"].depth_histogram == []
+
+    def test_diamond_counts_each_file_once(self):
+        edges = [
+            _edge("b.py", "a.py"),
+            _edge("c.py", "a.py"),
+            _edge("d.py", "b.py"),
+            _edge("d.py", "c.py", dep_type=DepType.CALL),
+        ]
+
+        summary = _by_file(edges)["a.py"]
+
+        assert summary.dependents == 3
+        assert summary.direct_dependents == 2
+        assert summary.depth_histogram == [2, 1]
+
+    def test_cycle_members_share_dependents(self):
+        # a → b → c → a, and d imports c
+        edges = [
+            _edge("a.py", "b.py"),
+            _edge("b.py", "c.py"),
+            _edge("c.py", "a.py"),
+            _edge("d.py", "c.py"),
+        ]
+
+        summaries = _by_file(edges)
+
+        for file in ("a.py", "b.py", "c.py"):
+            assert summaries[file].cycle_size == 3
+            # The other two cycle members and d, never the file itself
+            assert summaries[file].dependents == 3
+        assert summaries["d.py"].cycle_size == 1
+        assert summaries["c.py"].depth_histogram == [2, 1]
+
+    def test_external_and_self_edges_ignored(self):
+        edges = [
+            _edge("a.py", None),
+            _edge("a.py", "a.py"),
+            _edge("b.py", "a.py"),
+            _edge("b.py", "a.py", dep_type=DepType.CALL),
+        ]
+
+        summaries = _by_file(edges)
+
+        assert summaries["a.py"].dependents == 1
+        assert summaries["a.py"].direct_dependents == 1
+        assert summaries["a.py"].cycle_size == 1
+        assert set(summaries) == {"a.py", "b.py"}
+
+    def test_histogram_capped_at_max_depth(self):
+        edges = [_edge(f"f{i + 1}.py", f"f{i}.py") for i in range(5)]
+
+        summary = _by_file(edges, max_depth=2)["f0.py"]
+
+        assert summary.dependents == 5
+        assert summary.depth_histogram == [1, 1]
+
+    def test_matches_breadth_first_search(self):
+        rng = random.Random(7)
+        files = [f"f{i}.py" for i in range(40)]
+        edges = [_edge(rng.choice(files), rng.choice(files)) for _ in range(90)]
+
+        summaries = _by_file(edges)
+
+        for file, summary in summaries.items():
+            distances = _bfs_distances(edges, file)
+            assert summary.dependents == len(distances)
+            expected = [0] * max(distances.values(), default=0)
+            for distance in distances.values():
+                expected[distance - 1] += 1
+            assert summary.depth_histogram == expected
+
+    def test_no_edges(self):
+        assert compute_impact_summaries([]) == []
@@ -644,6 +644,108 @@ class TestExtractDependenciesIncremental:
         assert len(other_edges) == 1
 
 
+# ============================================================================
+# Tests: impact summaries after extraction
+# ============================================================================
+
+
+class TestImpactSummaryUpdate:
+    """Tests for recomputing impact summaries in extract_dependencies()."""
+
+    def test_summaries_computed_from_inserted_edges(self, tmp_path):
+        """Summaries should cover exactly the edges written to the table."""
+        (tmp_path / "a.py").write_text("import b\n")
+        (tmp_path / "b.py").write_text("x = 1\n")
+        import hashlib
+
+        a_hash = hashlib.sha256(b"import b\n").hexdigest()
+        existing_edge = DependencyEdge(
+            source_file="a.py",
+            source_symbol=None,
+            target_file="b.py",
+            target_symbol=None,
+            dep_type=DepType.IMPORT,
+            metadata={"module": "b"},
+        )
+
+        with (
+            patch(
+                "cocosearch.deps.extractor.get_indexed_files",
+                return_value=[("a.py", "py"), ("b.py", "py")],
+            ),
+            patch("cocosearch.deps.extractor.create_deps_table"),
+            patch("cocosearch.deps.extractor.create_tracking_table"),
+            patch(
+                "cocosearch.deps.extractor.get_stored_hashes",
+                return_value={"a.py": a_hash, "b.py": "old_hash"},
+            ),
+            patch(
+                "cocosearch.deps.extractor.read_edges_excluding",
+                return_value=[existing_edge],
+            ),
+            patch("cocosearch.deps.extractor.truncate_deps_table"),
+            patch("cocosearch.deps.extractor.insert_edges") as mock_insert,
+            patch("cocosearch.deps.extractor.update_tracking"),
+            patch("cocosearch.deps.extractor.create_impact_table") as mock_create,
+            patch("cocosearch.deps.extractor.replace_impact_summaries") as mock_replace,
+        ):
+            from cocosearch.deps.extractor import extract_dependencies
+
+            extract_dependencies("test", str(tmp_path))
+
+        mock_create.assert_called_once_with("test")
+        index_name, summaries = mock_replace.call_args[0]
+        assert index_name == "test"
+        assert mock_insert.call_args[0][1] == [existing_edge]
+        by_file = {s.file: s for s in summaries}
+        assert by_file["b.py"].dependents == 1
+        assert by_file["a.py"].dependents == 0
+
+    def test_summary_failure_does_not_fail_extraction(self):
+        """Impact summaries are best-effort."""
+        from cocosearch.deps.extractor import _update_impact_summaries
+
+        with (
+            patch("cocosearch.deps.extractor.create_impact_table"),
+            patch(
+                "cocosearch.deps.extractor.replace_impact_summaries",
+                side_effect=Exception("DB error"),
+            ),
+        ):
+            _update_impact_summaries("test", [])
+
+    def test_unchanged_index_backfills_missing_summaries(self, tmp_path):
+        """Indexes extracted before summaries existed should get them."""
+        (tmp_path / "a.py").write_text("x = 1\n")
+        import hashlib
+
+        a_hash = hashlib.sha256(b"x = 1\n").hexdigest()
+
+        with (
+            patch(
+                "cocosearch.deps.extractor.get_indexed_files",
+                return_value=[("a.py", "py")],
+            ),
+            patch("cocosearch.deps.extractor.create_deps_table"),
+            patch("cocosearch.deps.extractor.create_tracking_table"),
+            patch(
+                "cocosearch.deps.extractor.get_stored_hashes",
+                return_value={"a.py": a_hash},
+            ),
+            patch("cocosearch.deps.extractor.impact_table_exists", return_value=False),
+            patch(
+                "cocosearch.deps.extractor.read_edges_excluding", return_value=[]
+            ) as mock_read,
+            patch("cocosearch.deps.extractor._update_impact_summaries") as mock_update,
+        ):
+            from cocosearch.deps.extractor import extract_dependencies
+
+            extract_dependencies("test", str(tmp_path))
+
+        mock_read.assert_called_once_with("test", set())
+        mock_update.assert_called_once_with("test", [])
+
+
 # ============================================================================
 # Tests: DB functions for tracking and read_edges
 # ============================================================================
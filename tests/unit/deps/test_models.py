@@ -6,7 +6,9 @@ from cocosearch.deps.models import (
     DepType,
     DependencyEdge,
     DependencyTree,
+    ImpactSummary,
     get_deps_table_name,
+    get_impact_table_name,
 )
 from cocosearch.exceptions import IndexValidationError
 
@@ -297,3 +299,35 @@ class TestGetDepsTableName:
         """Index name with SQL injection attempt raises IndexValidationError."""
         with pytest.raises(IndexValidationError):
             get_deps_table_name("'; DROP TABLE users; --")
+
+
+@pytest.mark.unit
+class TestImpactSummary:
+    """Tests for ImpactSummary."""
+
+    def test_to_dict(self):
+        """to_dict() returns all fields with a copied histogram."""
+        summary = ImpactSummary("a.py", 3, 2, depth_histogram=[2, 1])
+
+        d = summary.to_dict()
+        d["depth_histogram"].append(0)
+
+        assert d["file"] == "a.py"
+        assert d["dependents"] == 3
+        assert d["direct_dependents"] == 2
+        assert d["cycle_size"] == 1
+        assert summary.depth_histogram == [2, 1]
+
+
+@pytest.mark.unit
+class TestGetImpactTableName:
+    """Tests for get_impact_table_name()."""
+
+    def test_valid_name(self):
+        """Valid index name produces correct table name."""
+        assert get_impact_table_name("myindex") == "cocosearch_deps_impact_myindex"
+
+    def test_invalid_name_raises(self):
+        """Invalid index name raises IndexValidationError."""
+        with pytest.raises(IndexValidationError):
+            get_impact_table_name("my-index")
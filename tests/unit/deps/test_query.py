@@ -3,12 +3,14 @@
 import json
 from unittest.mock import patch
 
-from cocosearch.deps.models import DependencyEdge, DepType
+from cocosearch.deps.models import DependencyEdge, DepType, ImpactSummary
 from cocosearch.deps.query import (
     _row_to_edge,
     get_dependencies,
     get_dep_stats,
     get_dependents,
+    get_impact_summaries,
+    get_top_impact,
 )
 
 
@@ -256,3 +258,56 @@ class TestGetDepStats:
             stats = get_dep_stats("myindex")
 
         assert stats == {"total_edges": 0}
+
+
+class TestGetImpactSummaries:
+    """Tests for get_impact_summaries()."""
+
+    def test_returns_summaries_by_file(self, mock_db_pool):
+        """Should map each stored file to its summary."""
+        pool, cursor, conn = mock_db_pool(
+            results=[(True,), ("src/utils.py", 7, 2, 1, [2, 5])]
+        )
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            summaries = get_impact_summaries("myindex", ["src/utils.py", "leaf.py"])
+
+        assert summaries == {
+            "src/utils.py": ImpactSummary("src/utils.py", 7, 2, 1, [2, 5])
+        }
+        cursor.assert_query_contains("cocosearch_deps_impact_myindex")
+        cursor.assert_called_with_param(["src/utils.py", "leaf.py"])
+
+    def test_returns_none_without_table(self, mock_db_pool):
+        """Should return None when summaries were never computed."""
+        pool, cursor, conn = mock_db_pool(results=[(False,)])
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            summaries = get_impact_summaries("myindex", ["src/utils.py"])
+
+        assert summaries is None
+        assert len(cursor.calls) == 1
+
+
+class TestGetTopImpact:
+    """Tests for get_top_impact()."""
+
+    def test_ranks_by_dependents(self, mock_db_pool):
+        """Should order by transitive dependents and apply the limit."""
+        pool, cursor, conn = mock_db_pool(
+            results=[(True,), ("core.py", 12, 4, 1, [4, 8]), ("util.py", 3, 3, 1, [3])]
+        )
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            top = get_top_impact("myindex", limit=2)
+
+        assert [s.file for s in top] == ["core.py", "util.py"]
+        cursor.assert_query_contains("ORDER BY dependents DESC")
+        cursor.assert_called_with_param(2)
+
+    def test_empty_without_table(self, mock_db_pool):
+        """Should return an empty list when summaries were never computed."""
+        pool, cursor, conn = mock_db_pool(results=[(False,)])
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            assert get_top_impact("myindex") == []
@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 from cocosearch.deps.models import DependencyEdge, DepType
 from cocosearch.deps.query import (
+    _fetch_traversal_edges,
     get_dependency_tree,
     get_dependency_tree_batch,
     get_impact,
@@ -106,26 +107,18 @@ _REF_METADATA_DEPS = {
 }
 
 
-def _mock_get_dependencies(graph):
-    """Create a mock for get_dependencies using a predefined graph."""
+def _mock_traversal_edges(graph):
+    """Create a mock for _fetch_traversal_edges using a predefined graph.
 
-    def mock_fn(index_name, file, dep_type=None, symbol=None):
-        edges = graph.get(file, [])
-        if dep_type:
-            edges = [e for e in edges if e.dep_type == dep_type]
-        return edges
+    *graph* maps each file to its edges: outgoing ones for forward
+    traversals, incoming ones for impact traversals.
+    """
 
-    return mock_fn
-
-
-def _mock_get_dependents(graph):
-    """Create a mock for get_dependents using a predefined graph."""
-
-    def mock_fn(index_name, file, dep_type=None, symbol=None):
-        edges = graph.get(file, [])
-        if dep_type:
-            edges = [e for e in edges if e.dep_type == dep_type]
-        return edges
+    def mock_fn(index_name, files, max_depth, dep_type=None, reverse=False):
+        return {
+            file: [e for e in edges if not dep_type or e.dep_type == dep_type]
+            for file, edges in graph.items()
+        }
 
     return mock_fn
 
@@ -140,8 +133,8 @@ class TestGetDependencyTree:
 
     def test_linear_chain_full_depth(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_LINEAR_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPS),
         ):
             tree = get_dependency_tree("test", "a.py", max_depth=5)
 
@@ -161,8 +154,8 @@ class TestGetDependencyTree:
 
     def test_depth_limit(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_LINEAR_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPS),
         ):
             tree = get_dependency_tree("test", "a.py", max_depth=1)
 
@@ -173,8 +166,8 @@ class TestGetDependencyTree:
 
     def test_diamond_no_duplicates(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_DIAMOND_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_DIAMOND_DEPS),
         ):
             tree = get_dependency_tree("test", "a.py", max_depth=5)
 
@@ -184,8 +177,8 @@ class TestGetDependencyTree:
 
     def test_cycle_detection(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_CYCLE_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_CYCLE_DEPS),
         ):
             tree = get_dependency_tree("test", "a.py", max_depth=10)
 
@@ -197,8 +190,8 @@ class TestGetDependencyTree:
 
     def test_empty_dependencies(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            return_value=[],
+            "cocosearch.deps.query._fetch_traversal_edges",
+            return_value={},
         ):
             tree = get_dependency_tree("test", "lonely.py")
 
@@ -207,8 +200,8 @@ class TestGetDependencyTree:
 
     def test_root_node_has_root_dep_type(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            return_value=[],
+            "cocosearch.deps.query._fetch_traversal_edges",
+            return_value={},
         ):
             tree = get_dependency_tree("test", "a.py")
 
@@ -216,8 +209,8 @@ class TestGetDependencyTree:
 
     def test_mixed_local_and_external_deps(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_MIXED_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_MIXED_DEPS),
         ):
             tree = get_dependency_tree("test", "main.go", max_depth=5)
 
@@ -239,8 +232,8 @@ class TestGetDependencyTree:
 
     def test_only_external_deps(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_EXTERNAL_ONLY_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_EXTERNAL_ONLY_DEPS),
         ):
             tree = get_dependency_tree("test", "main.go", max_depth=5)
 
@@ -256,8 +249,8 @@ class TestGetDependencyTree:
 
     def test_external_deps_use_module_metadata(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_MIXED_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_MIXED_DEPS),
         ):
             tree = get_dependency_tree("test", "main.go", max_depth=5)
 
@@ -270,8 +263,8 @@ class TestGetDependencyTree:
     def test_external_deps_fallback_to_symbol(self):
         """When no metadata.module, external dep falls back to target_symbol."""
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_EXTERNAL_ONLY_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_EXTERNAL_ONLY_DEPS),
         ):
             tree = get_dependency_tree("test", "main.go", max_depth=5)
 
@@ -282,8 +275,8 @@ class TestGetDependencyTree:
     def test_external_deps_fallback_to_ref(self):
         """When no metadata.module but metadata.ref exists, use ref as label."""
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_REF_METADATA_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_REF_METADATA_DEPS),
         ):
             tree = get_dependency_tree("test", "workflow.yml", max_depth=5)
 
@@ -304,8 +297,8 @@ class TestGetDependencyTree:
     def test_external_deps_distinct_nodes(self):
         """Multiple distinct external deps should not collapse into one node."""
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_REF_METADATA_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_REF_METADATA_DEPS),
         ):
             tree = get_dependency_tree("test", "workflow.yml", max_depth=5)
 
@@ -328,8 +321,8 @@ class TestGetImpact:
 
     def test_linear_impact(self):
         with patch(
-            "cocosearch.deps.query.get_dependents",
-            side_effect=_mock_get_dependents(_LINEAR_DEPENDENTS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPENDENTS),
         ):
             tree = get_impact("test", "d.py", max_depth=5)
 
@@ -343,8 +336,8 @@ class TestGetImpact:
 
     def test_depth_limit(self):
         with patch(
-            "cocosearch.deps.query.get_dependents",
-            side_effect=_mock_get_dependents(_LINEAR_DEPENDENTS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPENDENTS),
         ):
             tree = get_impact("test", "d.py", max_depth=1)
 
@@ -353,8 +346,8 @@ class TestGetImpact:
 
     def test_empty_impact(self):
         with patch(
-            "cocosearch.deps.query.get_dependents",
-            return_value=[],
+            "cocosearch.deps.query._fetch_traversal_edges",
+            return_value={},
         ):
             tree = get_impact("test", "leaf.py")
 
@@ -376,8 +369,8 @@ class TestGetDependencyTreeBatch:
 
     def test_single_file_equivalent_to_non_batch(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_LINEAR_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPS),
         ):
             batch = get_dependency_tree_batch("test", ["a.py"], max_depth=5)
             single = get_dependency_tree("test", "a.py", max_depth=5)
@@ -389,8 +382,8 @@ class TestGetDependencyTreeBatch:
     def test_shared_visited_deduplication(self):
         """Batch on [a.py, b.py]: roots are pre-visited, non-root nodes deduplicated."""
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_LINEAR_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPS),
         ):
             trees = get_dependency_tree_batch("test", ["a.py", "b.py"], max_depth=5)
 
@@ -414,8 +407,8 @@ class TestGetDependencyTreeBatch:
     def test_diamond_overlap(self):
         """Batch on [b.py, c.py] with diamond graph — d.py appears only once total."""
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_DIAMOND_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_DIAMOND_DEPS),
         ):
             trees = get_dependency_tree_batch("test", ["b.py", "c.py"], max_depth=5)
 
@@ -426,8 +419,8 @@ class TestGetDependencyTreeBatch:
     def test_cycle_safety(self):
         """Batch with files in a cycle doesn't loop."""
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_CYCLE_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_CYCLE_DEPS),
         ):
             trees = get_dependency_tree_batch(
                 "test", ["a.py", "b.py", "c.py"], max_depth=10
@@ -445,8 +438,8 @@ class TestGetDependencyTreeBatch:
 
     def test_order_preserved(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_LINEAR_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPS),
         ):
             trees = get_dependency_tree_batch(
                 "test", ["c.py", "a.py", "b.py"], max_depth=5
@@ -456,8 +449,8 @@ class TestGetDependencyTreeBatch:
 
     def test_external_deps_in_batch(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_MIXED_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_MIXED_DEPS),
         ):
             trees = get_dependency_tree_batch(
                 "test", ["main.go", "pkg/utils.go"], max_depth=5
@@ -469,8 +462,8 @@ class TestGetDependencyTreeBatch:
 
     def test_root_nodes_have_root_dep_type(self):
         with patch(
-            "cocosearch.deps.query.get_dependencies",
-            side_effect=_mock_get_dependencies(_LINEAR_DEPS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPS),
         ):
             trees = get_dependency_tree_batch("test", ["a.py", "b.py"])
 
@@ -492,8 +485,8 @@ class TestGetImpactBatch:
 
     def test_single_file_equivalent_to_non_batch(self):
         with patch(
-            "cocosearch.deps.query.get_dependents",
-            side_effect=_mock_get_dependents(_LINEAR_DEPENDENTS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPENDENTS),
         ):
             batch = get_impact_batch("test", ["d.py"], max_depth=5)
             single = get_impact("test", "d.py", max_depth=5)
@@ -505,8 +498,8 @@ class TestGetImpactBatch:
     def test_shared_visited_deduplication(self):
         """Batch on [d.py, c.py]: roots pre-visited, non-root nodes deduplicated."""
         with patch(
-            "cocosearch.deps.query.get_dependents",
-            side_effect=_mock_get_dependents(_LINEAR_DEPENDENTS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPENDENTS),
         ):
             trees = get_impact_batch("test", ["d.py", "c.py"], max_depth=5)
 
@@ -527,8 +520,8 @@ class TestGetImpactBatch:
 
     def test_order_preserved(self):
         with patch(
-            "cocosearch.deps.query.get_dependents",
-            side_effect=_mock_get_dependents(_LINEAR_DEPENDENTS),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(_LINEAR_DEPENDENTS),
         ):
             trees = get_impact_batch("test", ["c.py", "d.py", "b.py"], max_depth=5)
 
@@ -542,8 +535,8 @@ class TestGetImpactBatch:
             "c.py": [_edge("b.py", "c.py")],
         }
         with patch(
-            "cocosearch.deps.query.get_dependents",
-            side_effect=_mock_get_dependents(cycle_dependents),
+            "cocosearch.deps.query._fetch_traversal_edges",
+            side_effect=_mock_traversal_edges(cycle_dependents),
         ):
             trees = get_impact_batch("test", ["a.py", "b.py"], max_depth=10)
 
@@ -555,6 +548,79 @@ class TestGetImpactBatch:
         assert all_files.count("b.py") == 1
 
 
+# ============================================================================
+# Tests: _fetch_traversal_edges
+# ============================================================================
+
+
+def _row(source, target, dep_type="import"):
+    return (source, None, target, None, dep_type, None)
+
+
+class TestFetchTraversalEdges:
+    """Tests for the single recursive traversal query."""
+
+    def test_one_recursive_query(self, mock_db_pool):
+        pool, cursor, conn = mock_db_pool(
+            results=[_row("a.py", "b.py"), _row("b.py", "c.py"), _row("a.py", None)]
+        )
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            edges = _fetch_traversal_edges("myindex", ["a.py"], max_depth=3)
+
+        assert len(cursor.calls) == 1
+        cursor.assert_query_contains("WITH RECURSIVE")
+        cursor.assert_query_contains("cocosearch_deps_myindex")
+        assert cursor.calls[0][1] == (["a.py"], 3)
+        assert [e.target_file for e in edges["a.py"]] == ["b.py", None]
+        assert [e.target_file for e in edges["b.py"]] == ["c.py"]
+
+    def test_reverse_groups_by_target(self, mock_db_pool):
+        pool, cursor, conn = mock_db_pool(
+            results=[_row("b.py", "a.py"), _row("c.py", "a.py"), _row("d.py", "b.py")]
+        )
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            edges = _fetch_traversal_edges(
+                "myindex", ["a.py"], max_depth=3, reverse=True
+            )
+
+        assert [e.source_file for e in edges["a.py"]] == ["b.py", "c.py"]
+        assert [e.source_file for e in edges["b.py"]] == ["d.py"]
+        cursor.assert_query_contains("e.source_file, r.depth + 1")
+
+    def test_dep_type_filters_recursion_and_edges(self, mock_db_pool):
+        pool, cursor, conn = mock_db_pool(results=[])
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            _fetch_traversal_edges(
+                "myindex", ["a.py", "b.py"], max_depth=2, dep_type="import"
+            )
+
+        assert cursor.calls[0][1] == (["a.py", "b.py"], "import", 2, "import")
+        assert cursor.calls[0][0].count("e.dep_type = %s") == 2
+
+    def test_tree_built_from_single_query(self, mock_db_pool):
+        pool, cursor, conn = mock_db_pool(
+            results=[_row("a.py", "b.py"), _row("b.py", "a.py"), _row("b.py", "c.py")]
+        )
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            tree = get_dependency_tree("myindex", "a.py", max_depth=5)
+
+        assert len(cursor.calls) == 1
+        assert _collect_files(tree) == ["a.py", "b.py", "c.py"]
+
+    def test_zero_depth_skips_query(self, mock_db_pool):
+        pool, cursor, conn = mock_db_pool(results=[])
+
+        with patch("cocosearch.deps.query.get_connection_pool", return_value=pool):
+            tree = get_impact("myindex", "a.py", max_depth=0)
+
+        assert cursor.calls == []
+        assert tree.children == []
+
+
 # ============================================================================
 # Helpers
 # ============================================================================
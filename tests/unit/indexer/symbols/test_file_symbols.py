@@ -0,0 +1,115 @@
+"""Tests for file-level symbol extraction and per-chunk assignment."""
+
+from unittest.mock import patch
+
+from cocosearch.indexer import symbols as symbols_module
+from cocosearch.indexer.symbols import (
+    clear_query_cache,
+    extract_file_symbols,
+    symbols_in_range,
+)
+
+CODE = """class Calc:
+    def add(self, x, y):
+        return x + y
+
+def helper():
+    pass
+"""
+
+
+class TestExtractFileSymbols:
+    """Tests for extract_file_symbols."""
+
+    def test_returns_all_symbols_with_byte_ranges(self):
+        """Every definition of the file is returned with its byte range."""
+        result = extract_file_symbols(CODE, "py")
+
+        names = {s["symbol_name"] for s in result}
+        assert names == {"Calc", "Calc.add", "helper"}
+        helper = next(s for s in result if s["symbol_name"] == "helper")
+        start = CODE.index("def helper")
+        assert helper["start_byte"] == start
+        assert CODE.encode()[helper["start_byte"] : helper["end_byte"]].startswith(
+            b"def helper():"
+        )
+
+    def test_non_ascii_offsets_are_bytes(self):
+        """Names after multi-byte characters are sliced from the UTF-8 bytes."""
+        code = '# héllo wörld\ndef grüße():\n    return "ü"\n'
+
+        result = extract_file_symbols(code, "py")
+
+        assert [s["symbol_name"] for s in result] == ["grüße"]
+        assert result[0]["symbol_signature"].startswith("def grüße()")
+        assert result[0]["start_byte"] == len("# héllo wörld\n".encode())
+
+    def test_unsupported_language_returns_empty(self):
+        """Languages without a grammar mapping yield no symbols."""
+        assert extract_file_symbols("whatever", "unknown") == []
+
+    def test_query_file_read_once(self):
+        """Query files are resolved once, not once per file or chunk."""
+        clear_query_cache()
+        with patch.object(
+            symbols_module,
+            "resolve_query_file",
+            wraps=symbols_module.resolve_query_file,
+        ) as resolve:
+            for _ in range(3):
+                extract_file_symbols(CODE, "py")
+
+        assert resolve.call_count == 1
+        clear_query_cache()
+
+    def test_project_override_used(self, tmp_path):
+        """A project-level query applies only when that project is passed."""
+        queries = tmp_path / ".cocosearch" / "queries"
+        queries.mkdir(parents=True)
+        (queries / "python.scm").write_text(
+            "(class_definition name: (identifier) @name) @definition.class\n"
+        )
+
+        overridden = extract_file_symbols(CODE, "py", tmp_path)
+        default = extract_file_symbols(CODE, "py")
+
+        assert [s["symbol_name"] for s in overridden] == ["Calc"]
+        assert len(default) == 3
+
+
+class TestSymbolsInRange:
+    """Tests for symbols_in_range."""
+
+    def test_assigns_symbols_starting_in_chunk(self):
+        """A chunk gets the first symbol whose definition starts inside it."""
+        file_symbols = extract_file_symbols(CODE, "py")
+        split = CODE.index("def helper")
+
+        first = symbols_in_range(file_symbols, 0, split)
+        second = symbols_in_range(file_symbols, split, len(CODE))
+
+        expected = next(s for s in file_symbols if s["start_byte"] < split)
+        assert first.symbol_name == expected["symbol_name"]
+        assert first.symbol_name in {"Calc", "Calc.add"}
+        assert second.symbol_type == "function"
+        assert second.symbol_name == "helper"
+
+    def test_chunk_inside_body_keeps_qualified_name(self):
+        """A chunk starting mid-class still gets the method's qualified name."""
+        file_symbols = extract_file_symbols(CODE, "py")
+        start = CODE.index("    def add")
+
+        result = symbols_in_range(file_symbols, start, CODE.index("def helper"))
+
+        assert result.symbol_name == "Calc.add"
+
+    def test_empty_range_returns_null_fields(self):
+        """A chunk without definitions gets NULL symbol fields."""
+        file_symbols = extract_file_symbols(CODE, "py")
+        start = CODE.index("return")
+
+        result = symbols_in_range(file_symbols, start, start + 10)
+
+        assert result.symbol_type is None
+        assert result.symbol_name is None
+        assert result.symbol_signature is None
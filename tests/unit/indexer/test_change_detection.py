@@ -0,0 +1,128 @@
+"""Tests for cocosearch.indexer.change_detection module."""
+
+import hashlib
+import os
+from unittest.mock import MagicMock
+
+from cocosearch.indexer.change_detection import (
+    RACY_WINDOW_NS,
+    FileStat,
+    TrackedFile,
+    digest_matches,
+    file_stat,
+    hash_content,
+    load_tracked_files,
+    stat_unchanged,
+)
+
+
+def _stat(size=10, mtime_ns=1_000, ino=42):
+    fields = [0o100644, ino, 0, 1, 0, 0, size, 0, 0, 0, 0.0, 0.0, 0.0, 0, mtime_ns, 0]
+    return os.stat_result(fields)
+
+
+class TestFileStat:
+    """Tests for file_stat."""
+
+    def test_returns_size_mtime_inode(self):
+        """A settled file yields its stat tuple."""
+        st = _stat(size=5, mtime_ns=1_000, ino=9)
+
+        assert file_stat(st, walk_started_ns=10 * RACY_WINDOW_NS) == FileStat(
+            5, 1_000, 9
+        )
+
+    def test_racy_mtime_is_not_trusted(self):
+        """A file modified right before the walk gets no stat."""
+        now = 10 * RACY_WINDOW_NS
+        st = _stat(mtime_ns=now - RACY_WINDOW_NS // 2)
+
+        assert file_stat(st, walk_started_ns=now) is None
+
+    def test_large_inode_fits_bigint(self):
+        """Inodes above the signed 64-bit range are wrapped, not rejected."""
+        st = _stat(ino=(1 << 64) - 1)
+
+        result = file_stat(st, walk_started_ns=10 * RACY_WINDOW_NS)
+
+        assert result.inode == -1
+
+
+class TestStatUnchanged:
+    """Tests for stat_unchanged."""
+
+    def test_matching_stat(self):
+        stat = FileStat(1, 2, 3)
+        assert stat_unchanged(TrackedFile("h", stat), FileStat(1, 2, 3))
+
+    def test_any_field_differs(self):
+        tracked = TrackedFile("h", FileStat(1, 2, 3))
+        assert not stat_unchanged(tracked, FileStat(1, 2, 4))
+        assert not stat_unchanged(tracked, FileStat(1, 5, 3))
+        assert not stat_unchanged(tracked, FileStat(6, 2, 3))
+
+    def test_missing_stat_never_matches(self):
+        """Untracked files, legacy rows and racy stats are always hashed."""
+        assert not stat_unchanged(None, FileStat(1, 2, 3))
+        assert not stat_unchanged(TrackedFile("h"), FileStat(1, 2, 3))
+        assert not stat_unchanged(TrackedFile("h", FileStat(1, 2, 3)), None)
+
+
+class TestHashContent:
+    """Tests for hash_content."""
+
+    def test_sha256_is_bare_hex(self):
+        """Default digests stay compatible with existing tracking rows."""
+        assert hash_content("abc") == hashlib.sha256(b"abc").hexdigest()
+
+    def test_fast_hash_is_prefixed(self):
+        """Non-default digests never compare equal to sha256 ones."""
+        digest = hash_content("abc", "xxh3")
+
+        assert digest.split(":", 1)[0] in ("xxh3", "blake2b")
+        assert digest == hash_content("abc", "xxh3")
+        assert digest != hash_content("abd", "xxh3")
+
+
+class TestDigestMatches:
+    """Tests for digest_matches."""
+
+    def test_matches_any_stored_algorithm(self):
+        assert digest_matches("abc", hash_content("abc"))
+        assert digest_matches("abc", hash_content("abc", "xxh3"))
+        blake = "blake2b:" + hashlib.blake2b(b"abc", digest_size=16).hexdigest()
+        assert digest_matches("abc", blake)
+
+    def test_changed_content_does_not_match(self):
+        assert not digest_matches("abd", hash_content("abc"))
+        assert not digest_matches("abd", hash_content("abc", "xxh3"))
+
+    def test_unknown_algorithm_does_not_match(self):
+        assert not digest_matches("abc", "md5:900150983cd24fb0d6963f7d28e17f72")
+
+
+class TestLoadTrackedFiles:
+    """Tests for load_tracked_files."""
+
+    def _conn(self, rows=None, error=None):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = rows or []
+        if error is not None:
+            cursor.execute.side_effect = error
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        return conn
+
+    def test_rows_with_and_without_stat(self):
+        conn = self._conn([("a.py", "h1", 1, 2, 3), ("b.py", "h2", None, None, None)])
+
+        tracked = load_tracked_files(conn, "trk")
+
+        assert tracked["a.py"] == TrackedFile("h1", FileStat(1, 2, 3))
+        assert tracked["b.py"] == TrackedFile("h2", None)
+
+    def test_unreadable_table_is_empty(self):
+        conn = self._conn(error=Exception("no table"))
+
+        assert load_tracked_files(conn, "trk") == {}
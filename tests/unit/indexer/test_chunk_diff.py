@@ -0,0 +1,151 @@
+"""Tests for cocosearch.indexer.chunk_diff module."""
+
+from dataclasses import dataclass
+from unittest.mock import MagicMock
+
+from cocosearch.indexer.chunk_diff import (
+    StoredChunk,
+    diff_chunks,
+    load_stored_chunks,
+)
+
+
+@dataclass
+class _Chunk:
+    start_byte: int
+    end_byte: int
+    text: str
+    start_line: int | None = None
+    scope_start_line: int | None = None
+    scope_end_line: int | None = None
+    symbol_type: str | None = None
+    symbol_name: str | None = None
+    symbol_signature: str | None = None
+
+
+class TestDiffChunks:
+    """Tests for diff_chunks."""
+
+    def test_no_stored_rows_embeds_everything(self):
+        diff = diff_chunks([], [_Chunk(0, 5, "a"), _Chunk(5, 10, "b")])
+
+        assert diff.kept == set()
+        assert diff.reused == {}
+        assert diff.needs_embedding(0)
+        assert diff.needs_embedding(1)
+
+    def test_unchanged_chunk_at_same_range_is_kept(self):
+        stored = [StoredChunk(0, 5, "a", [1.0]), StoredChunk(5, 10, "b", [2.0])]
+
+        diff = diff_chunks(stored, [_Chunk(0, 5, "a"), _Chunk(5, 10, "B")])
+
+        assert diff.kept == {0}
+        assert diff.reused == {}
+        assert diff.needs_embedding(1)
+
+    def test_moved_chunk_reuses_embedding(self):
+        """An edit before a chunk shifts it; its stored vector is reused."""
+        stored = [StoredChunk(0, 5, "a", [1.0]), StoredChunk(5, 10, "b", [2.0])]
+        new = [_Chunk(0, 8, "a + edit"), _Chunk(8, 13, "b")]
+
+        diff = diff_chunks(stored, new)
+
+        assert diff.kept == set()
+        assert diff.reused == {1: [2.0]}
+        assert diff.needs_embedding(0)
+        assert not diff.needs_embedding(1)
+
+    def test_chunk_on_another_line_is_rewritten(self):
+        """Same bytes and text but a shifted line keep the embedding only."""
+        stored = [StoredChunk(0, 5, "a", [1.0], start_line=1)]
+
+        diff = diff_chunks(stored, [_Chunk(0, 5, "a", start_line=2)])
+
+        assert diff.kept == set()
+        assert diff.reused == {0: [1.0]}
+
+    def test_row_without_line_is_rewritten(self):
+        """Rows written before line columns existed get their lines filled in."""
+        stored = [StoredChunk(0, 5, "a", [1.0])]
+
+        diff = diff_chunks(stored, [_Chunk(0, 5, "a", start_line=1)])
+
+        assert diff.kept == set()
+        assert not diff.needs_embedding(0)
+
+    def test_chunk_in_a_changed_scope_is_rewritten(self):
+        """An edit elsewhere in the enclosing function moves its scope end."""
+        stored = [
+            StoredChunk(
+                0, 5, "a", [1.0], start_line=1, scope_start_line=1, scope_end_line=4
+            )
+        ]
+        chunk = _Chunk(0, 5, "a", start_line=1, scope_start_line=1, scope_end_line=6)
+
+        diff = diff_chunks(stored, [chunk])
+
+        assert diff.kept == set()
+        assert diff.reused == {0: [1.0]}
+
+    def test_method_of_renamed_class_is_rewritten(self):
+        """Renaming the enclosing class changes an unchanged method's symbol."""
+        text = "    def add(self, a, b):\n        return a + b\n"
+        stored = [
+            StoredChunk(
+                20,
+                20 + len(text),
+                text,
+                [1.0],
+                start_line=2,
+                symbol_type="method",
+                symbol_name="Calc.add",
+                symbol_signature="def add(self, a, b)",
+            )
+        ]
+        chunk = _Chunk(
+            20,
+            20 + len(text),
+            text,
+            start_line=2,
+            symbol_type="method",
+            symbol_name="Calculator.add",
+            symbol_signature="def add(self, a, b)",
+        )
+
+        diff = diff_chunks(stored, [chunk])
+
+        assert diff.kept == set()
+        assert diff.reused == {0: [1.0]}
+
+    def test_same_range_different_text_not_kept(self):
+        stored = [StoredChunk(0, 5, "old", [1.0])]
+
+        diff = diff_chunks(stored, [_Chunk(0, 5, "new")])
+
+        assert diff.kept == set()
+        assert diff.needs_embedding(0)
+
+
+class TestLoadStoredChunks:
+    """Tests for load_stored_chunks."""
+
+    def test_reads_rows_for_file(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [
+            (0, 5, "a", [1.0, 2.0], 1, 1, 3, "function", "f", "def f()"),
+            (5, 10, None, [3.0], 2, None, None, None, None, None),
+        ]
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        stored = load_stored_chunks(conn, "tbl", "a.py")
+
+        sql, params = cursor.execute.call_args[0]
+        assert "lower(location)" in sql
+        assert "symbol_name" in sql
+        assert "FROM tbl WHERE filename = %s" in sql
+        assert params == ("a.py",)
+        assert stored == [
+            StoredChunk(0, 5, "a", [1.0, 2.0], 1, 1, 3, "function", "f", "def f()")
+        ]
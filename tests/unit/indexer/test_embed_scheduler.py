@@ -0,0 +1,172 @@
+"""Tests for cocosearch.indexer.embed_scheduler module."""
+
+import threading
+import time
+
+import pytest
+
+from cocosearch.indexer.embed_scheduler import EmbeddingScheduler
+
+
+def _vectors(texts):
+    return [[float(len(t))] for t in texts]
+
+
+class TestEmbeddingScheduler:
+    """Tests for EmbeddingScheduler."""
+
+    def test_results_in_input_order(self):
+        with EmbeddingScheduler(_vectors) as scheduler:
+            result = scheduler.embed(["a", "bbb", "cc"])
+
+        assert result == [[1.0], [3.0], [2.0]]
+
+    def test_empty_input(self):
+        with EmbeddingScheduler(_vectors) as scheduler:
+            assert scheduler.embed([]) == []
+
+    def test_coalesces_concurrent_callers(self):
+        """Texts from several callers share requests."""
+        calls = []
+        lock = threading.Lock()
+
+        def embed_fn(texts):
+            with lock:
+                calls.append(list(texts))
+            return _vectors(texts)
+
+        results = {}
+        with EmbeddingScheduler(embed_fn, concurrency=1, linger=0.2) as scheduler:
+            threads = [
+                threading.Thread(
+                    target=lambda i=i: results.__setitem__(
+                        i, scheduler.embed([f"file{i}-{j}" for j in range(2)])
+                    )
+                )
+                for i in range(5)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert sum(len(c) for c in calls) == 10
+        assert len(calls) < 5
+        assert results[3] == [[7.0], [7.0]]
+
+    def test_batches_capped_by_items(self):
+        calls = []
+        with EmbeddingScheduler(
+            lambda t: calls.append(len(t)) or _vectors(t), max_batch_items=3
+        ) as scheduler:
+            scheduler.embed(["x"] * 7)
+
+        assert max(calls) <= 3
+        assert sum(calls) == 7
+
+    def test_batches_capped_by_bytes(self):
+        calls = []
+        with EmbeddingScheduler(
+            lambda t: calls.append(len(t)) or _vectors(t),
+            max_batch_bytes=20,
+            min_batch_bytes=20,
+        ) as scheduler:
+            scheduler.embed(["0123456789"] * 6)
+
+        assert max(calls) <= 2
+        assert sum(calls) == 6
+
+    def test_keeps_requests_in_flight(self):
+        """Up to ``concurrency`` requests run at the same time."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow(texts):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return _vectors(texts)
+
+        with EmbeddingScheduler(slow, concurrency=3, max_batch_items=1) as scheduler:
+            scheduler.embed(["a"] * 6)
+
+        assert peak == 3
+
+    def test_transient_error_retried(self):
+        attempts = []
+
+        def flaky(texts):
+            attempts.append(len(texts))
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return _vectors(texts)
+
+        with EmbeddingScheduler(flaky, backoff=0.001) as scheduler:
+            result = scheduler.embed(["ab", "c"])
+
+        assert result == [[2.0], [1.0]]
+        assert scheduler.stats.retries == 2
+
+    def test_transient_error_gives_up(self):
+        def down(texts):
+            raise ConnectionError("down")
+
+        with EmbeddingScheduler(down, backoff=0.001, max_retries=1) as scheduler:
+            with pytest.raises(ConnectionError):
+                scheduler.embed(["a"])
+
+    def test_bad_input_splits_batch(self):
+        """A non-transient error only fails the offending text's caller."""
+
+        def picky(texts):
+            if "bad" in texts:
+                raise ValueError("input too long")
+            return _vectors(texts)
+
+        results = {}
+        errors = {}
+
+        def call(name, texts):
+            try:
+                results[name] = scheduler.embed(texts)
+            except ValueError as e:
+                errors[name] = e
+
+        with EmbeddingScheduler(picky, concurrency=1, linger=0.2) as scheduler:
+            threads = [
+                threading.Thread(target=call, args=("good", ["ok", "fine"])),
+                threading.Thread(target=call, args=("broken", ["bad"])),
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert results["good"] == [[2.0], [4.0]]
+        assert "broken" in errors
+        assert scheduler.stats.failed_texts == 1
+
+    def test_target_shrinks_on_slow_requests(self):
+        def slow(texts):
+            time.sleep(0.02)
+            return _vectors(texts)
+
+        with EmbeddingScheduler(
+            slow, target_latency=0.001, max_batch_bytes=1000, min_batch_bytes=10
+        ) as scheduler:
+            before = scheduler.target_bytes
+            scheduler.embed(["x"])
+
+        assert scheduler.target_bytes < before
+
+    def test_embed_after_close_raises(self):
+        scheduler = EmbeddingScheduler(_vectors)
+        scheduler.close()
+
+        with pytest.raises(RuntimeError):
+            scheduler.embed(["a"])
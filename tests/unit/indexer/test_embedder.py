@@ -38,39 +38,71 @@ class TestKnownDimensions:
 
 
 class TestOutputDimensionResolution:
-    """Tests for _resolve_output_dimension helper."""
+    """Tests for resolve_output_dimension helper."""
 
     def test_known_model_returns_dimension(self):
         """Known model returns its dimension from the map."""
-        from cocosearch.indexer.embedder import _resolve_output_dimension
+        from cocosearch.indexer.embedder import resolve_output_dimension
 
-        assert _resolve_output_dimension("openai/text-embedding-3-small") == 1536
+        assert resolve_output_dimension("openai/text-embedding-3-small") == 1536
 
     def test_nomic_returns_768(self):
         """Ollama default model returns 768."""
-        from cocosearch.indexer.embedder import _resolve_output_dimension
+        from cocosearch.indexer.embedder import resolve_output_dimension
 
-        assert _resolve_output_dimension("nomic-embed-text") == 768
+        assert resolve_output_dimension("nomic-embed-text") == 768
 
     def test_env_var_overrides_known_dimension(self):
         """COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION env var overrides known map."""
-        from cocosearch.indexer.embedder import _resolve_output_dimension
+        from cocosearch.indexer.embedder import resolve_output_dimension
 
         with patch.dict("os.environ", {"COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION": "512"}):
-            assert _resolve_output_dimension("nomic-embed-text") == 512
+            assert resolve_output_dimension("nomic-embed-text") == 512
 
     def test_unknown_model_returns_none(self):
         """Unknown model without env var returns None."""
-        from cocosearch.indexer.embedder import _resolve_output_dimension
+        from cocosearch.indexer.embedder import resolve_output_dimension
 
-        assert _resolve_output_dimension("some-custom-model") is None
+        assert resolve_output_dimension("some-custom-model") is None
 
     def test_unknown_model_with_env_var(self):
         """Unknown model with env var returns dimension from env."""
-        from cocosearch.indexer.embedder import _resolve_output_dimension
+        from cocosearch.indexer.embedder import resolve_output_dimension
 
         with patch.dict("os.environ", {"COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION": "256"}):
-            assert _resolve_output_dimension("some-custom-model") == 256
+            assert resolve_output_dimension("some-custom-model") == 256
+
+
+class TestStoredDimension:
+    """Tests for Matryoshka truncation helpers."""
+
+    def test_stored_dimension_from_env(self):
+        """COCOSEARCH_EMBEDDING_STORED_DIMENSION sets the stored dimension."""
+        from cocosearch.indexer.embedder import resolve_stored_dimension
+
+        with patch.dict("os.environ", {"COCOSEARCH_EMBEDDING_STORED_DIMENSION": "256"}):
+            assert resolve_stored_dimension() == 256
+
+    def test_stored_dimension_unset(self):
+        """Without the env var full vectors are stored."""
+        from cocosearch.indexer.embedder import resolve_stored_dimension
+
+        with patch.dict("os.environ", {}, clear=True):
+            assert resolve_stored_dimension() is None
+
+    def test_truncate_renormalizes(self):
+        """The kept prefix is scaled back to unit length."""
+        from cocosearch.indexer.embedder import truncate_embedding
+
+        assert truncate_embedding([3.0, 4.0, 12.0], 2) == [0.6, 0.8]
+
+    def test_truncate_noop_when_short_enough(self):
+        """Vectors at or below the dimension, or no dimension, are unchanged."""
+        from cocosearch.indexer.embedder import truncate_embedding
+
+        vector = [0.5, 0.5]
+        assert truncate_embedding(vector, 2) is vector
+        assert truncate_embedding(vector, None) is vector
 
 
 class TestGetLitellmModel:
@@ -0,0 +1,145 @@
+"""Tests for cocosearch.indexer.embedding_cache module."""
+
+from unittest.mock import MagicMock
+
+from cocosearch.indexer.embedding_cache import (
+    CACHE_TABLE,
+    EmbeddingCache,
+    embedding_cache_key,
+    hash_embedding_input,
+)
+
+
+def _mock_conn(rows=None):
+    cursor = MagicMock()
+    cursor.fetchall.return_value = rows or []
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+    conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    return conn, cursor
+
+
+class TestHashEmbeddingInput:
+    """Tests for hash_embedding_input."""
+
+    def test_is_sha256_of_exact_input(self):
+        """Different inputs (e.g. different filename context) get different keys."""
+        a = hash_embedding_input("File: a.py\nx = 1")
+        b = hash_embedding_input("File: b.py\nx = 1")
+        assert len(a) == 64
+        assert a != b
+        assert a == hash_embedding_input("File: a.py\nx = 1")
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    def test_miss_calls_embed_and_stores(self):
+        """Cache misses are embedded and written back."""
+        conn, cursor = _mock_conn()
+        cache = EmbeddingCache(conn, "ollama", "nomic-embed-text")
+        embed_fn = MagicMock(return_value=[[1.0], [2.0]])
+
+        result = cache.embed(["a", "b"], embed_fn)
+
+        assert result == [[1.0], [2.0]]
+        embed_fn.assert_called_once_with(["a", "b"])
+        cursor.executemany.assert_called_once()
+        stored = cursor.executemany.call_args[0][1]
+        assert [row[3] for row in stored] == [
+            hash_embedding_input("a"),
+            hash_embedding_input("b"),
+        ]
+        assert cache.misses == 2
+        assert cache.hits == 0
+
+    def test_hits_skip_embedding(self):
+        """Only inputs missing from the cache reach embed_fn, order preserved."""
+        conn, cursor = _mock_conn(rows=[(hash_embedding_input("a"), [9.0])])
+        cache = EmbeddingCache(conn, "ollama", "nomic-embed-text")
+        embed_fn = MagicMock(return_value=[[2.0]])
+
+        result = cache.embed(["a", "b", "a"], embed_fn)
+
+        assert result == [[9.0], [2.0], [9.0]]
+        embed_fn.assert_called_once_with(["b"])
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_lookup_keyed_by_provider_model_dimension(self):
+        """Lookups filter on provider, model and output dimension."""
+        conn, cursor = _mock_conn()
+        cache = EmbeddingCache(conn, "openai", "text-embedding-3-small", 512)
+
+        cache.embed(["a"], lambda texts: [[0.0]] * len(texts))
+
+        sql, params = cursor.execute.call_args_list[0][0]
+        assert CACHE_TABLE in sql
+        assert "ANY(%s)" in sql
+        assert params[:3] == ("openai", "text-embedding-3-small", 512)
+
+    def test_duplicate_misses_embedded_once(self):
+        """Identical inputs within one call are embedded only once."""
+        conn, _cursor = _mock_conn()
+        cache = EmbeddingCache(conn, "ollama", "m")
+        embed_fn = MagicMock(return_value=[[1.0]])
+
+        result = cache.embed(["same", "same"], embed_fn)
+
+        assert result == [[1.0], [1.0]]
+        embed_fn.assert_called_once_with(["same"])
+
+    def test_database_error_disables_cache(self):
+        """A failing cache never breaks indexing; it falls back to embed_fn."""
+        conn, cursor = _mock_conn()
+        cursor.execute.side_effect = RuntimeError("relation does not exist")
+        cache = EmbeddingCache(conn, "ollama", "m")
+        embed_fn = MagicMock(side_effect=lambda texts: [[0.5]] * len(texts))
+
+        assert cache.embed(["a"], embed_fn) == [[0.5]]
+        assert cache.enabled is False
+        assert cache.embed(["b"], embed_fn) == [[0.5]]
+        assert embed_fn.call_count == 2
+
+    def test_evict_by_age_and_size(self):
+        """Eviction removes stale rows and trims when over the cap."""
+        conn, cursor = _mock_conn()
+        cursor.rowcount = 3
+        cursor.fetchone.return_value = (10,)
+        cache = EmbeddingCache(conn, "ollama", "m")
+
+        removed = cache.evict(max_entries=5, max_age_days=30)
+
+        sqls = [c[0][0] for c in cursor.execute.call_args_list]
+        assert "last_used_at < now()" in sqls[0]
+        assert "OFFSET %s" in sqls[-1]
+        assert removed == 6
+
+    def test_evict_skips_trim_under_cap(self):
+        """The ordered trim is skipped when the table is within the cap."""
+        conn, cursor = _mock_conn()
+        cursor.rowcount = 0
+        cursor.fetchone.return_value = (10,)
+        cache = EmbeddingCache(conn, "ollama", "m")
+
+        cache.evict(max_entries=100, max_age_days=30)
+
+        assert not any("OFFSET" in c[0][0] for c in cursor.execute.call_args_list)
+
+
+class TestEmbeddingCacheKey:
+    """Tests for embedding_cache_key."""
+
+    def test_native_dimension_is_zero(self, monkeypatch):
+        monkeypatch.setenv("COCOSEARCH_EMBEDDING_PROVIDER", "ollama")
+        monkeypatch.setenv("COCOSEARCH_EMBEDDING_MODEL", "nomic-embed-text")
+        monkeypatch.delenv("COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION", raising=False)
+
+        assert embedding_cache_key() == ("ollama", "nomic-embed-text", 0)
+
+    def test_output_dimension_override(self, monkeypatch):
+        monkeypatch.setenv("COCOSEARCH_EMBEDDING_PROVIDER", "openai")
+        monkeypatch.setenv("COCOSEARCH_EMBEDDING_MODEL", "text-embedding-3-small")
+        monkeypatch.setenv("COCOSEARCH_EMBEDDING_OUTPUT_DIMENSION", "256")
+
+        assert embedding_cache_key() == ("openai", "text-embedding-3-small", 256)
@@ -1,9 +1,15 @@
 """Tests for cocosearch.indexer.file_filter module."""
 
+import os
+from unittest.mock import patch
+
 from cocosearch.indexer.file_filter import (
     DEFAULT_EXCLUDES,
+    WalkStats,
     build_exclude_patterns,
+    load_git_info_exclude_patterns,
     load_gitignore_patterns,
+    walk_codebase,
 )
 
 
@@ -158,3 +164,128 @@ class TestBuildExcludePatterns:
 
         # Should just have defaults (+ gitignore if present)
         assert len(patterns) >= len(DEFAULT_EXCLUDES)
+
+
+class TestLoadGitInfoExcludePatterns:
+    """Tests for load_git_info_exclude_patterns function."""
+
+    def test_reads_info_exclude(self, tmp_path):
+        (tmp_path / ".git" / "info").mkdir(parents=True)
+        (tmp_path / ".git" / "info" / "exclude").write_text("# comment\nlocal/\n")
+
+        assert load_git_info_exclude_patterns(str(tmp_path)) == ["local/"]
+
+    def test_missing_returns_empty(self, tmp_path):
+        assert load_git_info_exclude_patterns(str(tmp_path)) == []
+
+    def test_included_in_build_exclude_patterns(self, tmp_path):
+        (tmp_path / ".git" / "info").mkdir(parents=True)
+        (tmp_path / ".git" / "info" / "exclude").write_text("local/\n")
+
+        assert "local/" in build_exclude_patterns(str(tmp_path))
+        assert "local/" not in build_exclude_patterns(
+            str(tmp_path), respect_gitignore=False
+        )
+
+
+def _walk(root, include=("*.py",), respect_gitignore=True, stats=None):
+    excludes = build_exclude_patterns(str(root), respect_gitignore=respect_gitignore)
+    return sorted(
+        rel
+        for rel, _st in walk_codebase(
+            str(root), list(include), excludes, respect_gitignore, stats
+        )
+    )
+
+
+class TestWalkCodebase:
+    """Tests for walk_codebase function."""
+
+    def test_yields_relative_paths_and_stat(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("x = 1")
+        (tmp_path / "b.txt").write_text("skip")
+
+        entries = list(walk_codebase(str(tmp_path), ["*.py"], []))
+
+        assert [rel for rel, _ in entries] == ["pkg/a.py"]
+        assert entries[0][1].st_size == 5
+
+    def test_prunes_excluded_directories_before_descending(self, tmp_path):
+        """Excluded trees are never scanned."""
+        nm = tmp_path / "node_modules" / "dep"
+        nm.mkdir(parents=True)
+        (nm / "index.py").write_text("")
+        (tmp_path / "main.py").write_text("")
+
+        scanned = []
+        real_scandir = os.scandir
+
+        def tracking_scandir(path):
+            scanned.append(str(path))
+            return real_scandir(path)
+
+        stats = WalkStats()
+        with patch("cocosearch.indexer.file_filter.os.scandir", tracking_scandir):
+            assert _walk(tmp_path, stats=stats) == ["main.py"]
+
+        assert not any("node_modules" in p for p in scanned)
+        assert stats.pruned_dirs == 1
+        assert stats.files == 1
+        assert stats.seconds >= 0
+
+    def test_nested_gitignore_is_anchored_at_its_directory(self, tmp_path):
+        """A nested '/gen.py' only matches next to that .gitignore."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / ".gitignore").write_text("/gen.py\n*.tmp.py\n")
+        (tmp_path / "sub" / "gen.py").write_text("")
+        (tmp_path / "sub" / "keep.py").write_text("")
+        (tmp_path / "sub" / "x.tmp.py").write_text("")
+        (tmp_path / "gen.py").write_text("")
+        (tmp_path / "y.tmp.py").write_text("")
+
+        assert _walk(tmp_path) == ["gen.py", "sub/keep.py", "y.tmp.py"]
+
+    def test_nested_gitignore_negation_overrides_parent(self, tmp_path):
+        """Deeper .gitignore files win, including '!' re-includes."""
+        (tmp_path / ".gitignore").write_text("*_pb2.py\n")
+        (tmp_path / "proto").mkdir()
+        (tmp_path / "proto" / ".gitignore").write_text("!keep_pb2.py\n")
+        (tmp_path / "proto" / "keep_pb2.py").write_text("")
+        (tmp_path / "proto" / "drop_pb2.py").write_text("")
+
+        assert _walk(tmp_path) == ["proto/keep_pb2.py"]
+
+    def test_nested_gitignore_prunes_directories(self, tmp_path):
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / ".gitignore").write_text("cache/\n")
+        (tmp_path / "app" / "cache").mkdir()
+        (tmp_path / "app" / "cache" / "c.py").write_text("")
+        (tmp_path / "app" / "main.py").write_text("")
+
+        assert _walk(tmp_path) == ["app/main.py"]
+
+    def test_nested_gitignore_ignored_when_disabled(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / ".gitignore").write_text("*.py\n")
+        (tmp_path / "sub" / "a.py").write_text("")
+
+        assert _walk(tmp_path, respect_gitignore=False) == ["sub/a.py"]
+        assert _walk(tmp_path) == []
+
+    def test_info_exclude_applied(self, tmp_path):
+        (tmp_path / ".git" / "info").mkdir(parents=True)
+        (tmp_path / ".git" / "info" / "exclude").write_text("scratch.py\n")
+        (tmp_path / "scratch.py").write_text("")
+        (tmp_path / "real.py").write_text("")
+
+        assert _walk(tmp_path) == ["real.py"]
+
+    def test_is_lazy(self, tmp_path):
+        for i in range(3):
+            (tmp_path / f"f{i}.py").write_text("")
+
+        gen = walk_codebase(str(tmp_path), ["*.py"], [])
+
+        assert next(gen)[0] == "f0.py"
+        gen.close()
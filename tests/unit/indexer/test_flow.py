@@ -1,5 +1,8 @@
 """Tests for cocosearch.indexer.flow module."""
 
+import hashlib
+import os
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -91,39 +94,128 @@ class TestRunIndex:
 
         assert result["files_indexed"] >= 0
 
+    def test_bumps_index_generation_after_changes(self, tmp_path, _mock_db):
+        """Indexed changes advance the generation other processes listen for."""
+        from cocosearch.indexer.flow import run_index
+
+        mock_conn, _mock_cursor = _mock_db
+        (tmp_path / "test.py").write_text("def hello(): pass")
+
+        with (
+            patch(
+                "cocosearch.indexer.flow.embed_batch",
+                side_effect=lambda texts: [[0.1] * 768] * len(texts),
+            ),
+            patch(
+                "cocosearch.management.metadata.get_index_metadata", return_value=None
+            ),
+            patch("cocosearch.indexer.flow.ensure_vector_index", return_value=None),
+            patch("cocosearch.indexer.flow.invalidate_index_cache"),
+            patch("cocosearch.indexer.flow.track_parse_results"),
+            patch("cocosearch.management.metadata.bump_index_generation") as bump,
+        ):
+            run_index(index_name="testindex", codebase_path=str(tmp_path))
+
+        bump.assert_called_once_with("testindex", conn=mock_conn)
+
     def test_skips_parse_tracking_when_no_changes(self, tmp_path, _mock_db):
         """Skips parse tracking when no file changes detected."""
         from cocosearch.indexer.flow import run_index
 
         mock_conn, mock_cursor = _mock_db
-        mock_cursor.fetchall.return_value = [("test.py", "abc123")]
+        stored_hash = hashlib.sha256(b"def hello(): pass").hexdigest()
+        mock_cursor.fetchall.return_value = [("test.py", stored_hash, None, None, None)]
 
         (tmp_path / "test.py").write_text("def hello(): pass")
 
         with patch(
             "cocosearch.management.metadata.get_index_metadata", return_value=None
         ):
-            with patch("cocosearch.indexer.flow.hashlib") as mock_hashlib:
-                mock_hash = MagicMock()
-                mock_hash.hexdigest.return_value = "abc123"
-                mock_hashlib.sha256.return_value = mock_hash
-                with patch("cocosearch.indexer.flow.track_parse_results") as mock_track:
-                    with patch(
-                        "cocosearch.indexer.flow.invalidate_index_cache"
-                    ) as mock_invalidate:
+            with patch("cocosearch.indexer.flow.track_parse_results") as mock_track:
+                with patch(
+                    "cocosearch.indexer.flow.invalidate_index_cache"
+                ) as mock_invalidate:
+                    result = run_index(
+                        index_name="testindex",
+                        codebase_path=str(tmp_path),
+                    )
+
+        assert result["files_indexed"] == 0
+        mock_track.assert_not_called()
+        mock_invalidate.assert_not_called()
+
+    def test_unchanged_stat_skips_reading_files(self, tmp_path, _mock_db):
+        """Files whose size/mtime/inode match the tracking row are not read."""
+        from cocosearch.indexer.flow import run_index
+
+        mock_conn, mock_cursor = _mock_db
+        path = tmp_path / "test.py"
+        path.write_text("def hello(): pass")
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        st = path.stat()
+        mock_cursor.fetchall.return_value = [
+            ("test.py", "stored", st.st_size, st.st_mtime_ns, st.st_ino)
+        ]
+
+        with patch(
+            "cocosearch.management.metadata.get_index_metadata", return_value=None
+        ):
+            with patch("cocosearch.indexer.flow._read_file") as mock_read:
+                with patch("cocosearch.indexer.flow.track_parse_results"):
+                    with patch("cocosearch.indexer.flow.invalidate_index_cache"):
                         result = run_index(
                             index_name="testindex",
                             codebase_path=str(tmp_path),
                         )
 
         assert result["files_indexed"] == 0
-        mock_track.assert_not_called()
-        mock_invalidate.assert_not_called()
+        mock_read.assert_not_called()
+
+    def test_new_files_read_once_and_budget_released(self, tmp_path, _mock_db):
+        """New files skip the hashing pass; all budget is returned at the end."""
+        from cocosearch.indexer import flow
+        from cocosearch.indexer.config import IndexingConfig
+
+        for i in range(3):
+            (tmp_path / f"file{i}.py").write_text(f"x = {i}\n")
+
+        budgets = []
+        real_budget = flow.MemoryBudget
+
+        def make_budget(max_bytes):
+            budgets.append(real_budget(max_bytes))
+            return budgets[-1]
+
+        with patch(
+            "cocosearch.indexer.flow.embed_batch",
+            side_effect=lambda texts: [[0.1] * 768] * len(texts),
+        ):
+            with patch(
+                "cocosearch.management.metadata.get_index_metadata", return_value=None
+            ):
+                with patch(
+                    "cocosearch.indexer.flow._read_file", wraps=flow._read_file
+                ) as mock_read:
+                    with patch(
+                        "cocosearch.indexer.flow.MemoryBudget", side_effect=make_budget
+                    ):
+                        with patch("cocosearch.indexer.flow.invalidate_index_cache"):
+                            with patch("cocosearch.indexer.flow.track_parse_results"):
+                                result = flow.run_index(
+                                    index_name="testindex",
+                                    codebase_path=str(tmp_path),
+                                    config=IndexingConfig(max_inflight_mb=1),
+                                )
+
+        assert result["files_indexed"] == 3
+        assert mock_read.call_count == 3
+        assert budgets[0].in_use == 0
 
     def test_stop_event_cancels_indexing(self, tmp_path, _mock_db):
         """run_index stops processing files when stop_event is set."""
         import threading
 
+        from cocosearch.indexer.config import IndexingConfig
         from cocosearch.indexer.flow import run_index
 
         for i in range(10):
@@ -151,6 +243,8 @@ class TestRunIndex:
                         result = run_index(
                             index_name="testindex",
                             codebase_path=str(tmp_path),
+                            # One text per request, so calls count files.
+                            config=IndexingConfig(embed_batch_max_items=1),
                             stop_event=stop_event,
                         )
 
@@ -253,14 +347,213 @@ class TestFilenameContextIntegration:
 class TestSymbolIntegration:
     """Tests for symbol extraction integration in flow module."""
 
-    def test_extract_symbol_metadata_importable_from_flow(self):
-        """flow module successfully imports extract_symbol_metadata."""
+    def test_symbol_extraction_importable_from_flow(self):
+        """flow module successfully imports the file-level symbol helpers."""
         import cocosearch.indexer.flow as flow_module
 
-        assert hasattr(flow_module, "extract_symbol_metadata")
+        assert hasattr(flow_module, "extract_file_symbols")
+        assert hasattr(flow_module, "symbols_in_range")
 
     def test_ensure_symbol_columns_importable_from_flow(self):
         """flow module successfully imports ensure_symbol_columns."""
         import cocosearch.indexer.flow as flow_module
 
         assert hasattr(flow_module, "ensure_symbol_columns")
+
+
+class TestEmbedFile:
+    """Tests for chunk-diff aware embedding of a prepared file."""
+
+    @staticmethod
+    def _chunk(start, end, text):
+        from cocosearch.indexer.flow import PreparedChunk
+
+        return PreparedChunk(
+            start_byte=start,
+            end_byte=end,
+            start_line=1,
+            end_line=1,
+            scope_start_line=None,
+            scope_end_line=None,
+            text=text,
+            tsv_input=text,
+            block_type="",
+            hierarchy="",
+            language_id="py",
+            symbol_type=None,
+            symbol_name=None,
+            symbol_signature=None,
+        )
+
+    def test_only_changed_chunks_are_embedded(self):
+        """Kept and moved chunks skip embed_batch; new text is embedded."""
+        from cocosearch.indexer.chunk_diff import StoredChunk
+        from cocosearch.indexer.flow import PreparedFile, _embed_file
+
+        item = PreparedFile(
+            filename="a.py",
+            content_hash="h",
+            previously_indexed=True,
+            chunks=[
+                self._chunk(0, 5, "keep"),
+                self._chunk(5, 12, "changed"),
+                self._chunk(12, 17, "moved"),
+            ],
+        )
+        stored = [
+            StoredChunk(0, 5, "keep", [1.0], start_line=1),
+            StoredChunk(5, 10, "moved", [2.0], start_line=1),
+        ]
+
+        with patch("cocosearch.indexer.flow.load_stored_chunks", return_value=stored):
+            with patch(
+                "cocosearch.indexer.flow.embed_batch", return_value=[[3.0]]
+            ) as mock_embed:
+                _embed_file(item, "tbl", diff_conn=MagicMock())
+
+        mock_embed.assert_called_once_with(["File: a.py\nchanged"])
+        assert item.kept == {0}
+        assert item.embeddings == [None, [3.0], [2.0]]
+
+    def test_new_files_are_not_diffed(self):
+        """Files without stored rows skip the lookup entirely."""
+        from cocosearch.indexer.flow import PreparedFile, _embed_file
+
+        item = PreparedFile(
+            filename="a.py", content_hash="h", chunks=[self._chunk(0, 1, "x")]
+        )
+
+        with patch("cocosearch.indexer.flow.load_stored_chunks") as mock_load:
+            with patch("cocosearch.indexer.flow.embed_batch", return_value=[[1.0]]):
+                _embed_file(item, "tbl", diff_conn=MagicMock())
+
+        mock_load.assert_not_called()
+        assert item.embeddings == [[1.0]]
+
+    def test_stored_dimension_truncates_after_cache(self):
+        """Vectors are cached full-length and stored truncated to ``dimension``."""
+        from cocosearch.indexer.flow import PreparedFile, _embed_file
+
+        item = PreparedFile(
+            filename="a.py", content_hash="h", chunks=[self._chunk(0, 1, "x")]
+        )
+        cache = MagicMock()
+        cache.embed.return_value = [[3.0, 4.0, 12.0]]
+
+        _embed_file(item, "tbl", embedding_cache=cache, dimension=2)
+
+        assert item.embeddings == [[0.6, 0.8]]
+
+
+class TestChunkLines:
+    """Tests for line numbers computed at index time."""
+
+    def test_matches_byte_to_line_on_the_file(self, tmp_path):
+        """Stored lines equal what search used to read from the file."""
+        from cocosearch.indexer.flow import _line_at, _newline_offsets
+        from cocosearch.search.utils import byte_to_line
+
+        content = "# héllo\n\ndef f():\n    return 'ü'\n"
+        path = tmp_path / "a.py"
+        path.write_bytes(content.encode("utf-8"))
+        newlines = _newline_offsets(content.encode("utf-8"))
+
+        for offset in range(len(content.encode("utf-8")) + 1):
+            assert _line_at(newlines, offset) == byte_to_line(str(path), offset)
+
+    def test_prepared_chunks_carry_lines(self):
+        """Each chunk gets the lines of its start and end offsets."""
+        from types import SimpleNamespace
+
+        from cocosearch.indexer.flow import _prepare_chunks
+
+        content = "a = 1\nb = 2\nc = 3\n"
+
+        def chunk(start, end):
+            return SimpleNamespace(
+                text=content[start:end],
+                start=SimpleNamespace(byte_offset=start),
+                end=SimpleNamespace(byte_offset=end),
+            )
+
+        splitter = MagicMock()
+        splitter.split.return_value = [chunk(0, 6), chunk(6, 17)]
+
+        prepared = _prepare_chunks("a.txt", content, splitter, 1000, 0)
+
+        assert [(c.start_line, c.end_line) for c in prepared] == [(1, 2), (2, 3)]
+        # No scope detection for plain text
+        assert [c.scope_start_line for c in prepared] == [None, None]
+
+
+class TestChunkScopes:
+    """Tests for enclosing scopes computed at index time."""
+
+    def test_matches_live_scope_detection(self, tmp_path):
+        """Each line's stored scope is what context expansion would find."""
+        from cocosearch.indexer.flow import (
+            _line_at,
+            _newline_offsets,
+            _parse_for_scopes,
+            _scope_lines,
+        )
+        from cocosearch.search.context_expander import ContextExpander
+
+        content = (
+            "import os\n"
+            "\n"
+            "def f(x):\n"
+            "    return x\n"
+            "\n"
+            "class A:\n"
+            "    def m(self):\n"
+            "        return 1\n"
+        )
+        path = tmp_path / "a.py"
+        path.write_text(content)
+        source = content.encode("utf-8")
+        parsed = _parse_for_scopes("a.py", source)
+        newlines = _newline_offsets(source)
+        expander = ContextExpander()
+
+        for line in range(1, _line_at(newlines, len(source))):
+            assert _scope_lines(parsed, newlines, line, line) == (
+                expander.find_enclosing_scope(str(path), line, line, "python")
+            )
+
+    def test_unsupported_language_has_no_scope(self):
+        from cocosearch.indexer.flow import _parse_for_scopes, _scope_lines
+
+        parsed = _parse_for_scopes("notes.txt", b"hello\n")
+
+        assert parsed is None
+        assert _scope_lines(parsed, [5], 1, 1) == (None, None)
+
+
+class TestPrepareFileInProcess:
+    """Tests for the process-pool entry point of the chunk stage."""
+
+    def test_chunks_round_trip_as_tuples(self, tmp_path):
+        """Chunks come back as plain tuples that rebuild into PreparedChunk."""
+        from cocosearch.indexer.flow import PreparedChunk, _prepare_file_in_process
+
+        (tmp_path / "a.py").write_text("x = 1\n")
+        chunk = TestEmbedFile._chunk(0, 6, "x = 1\n")
+
+        with patch("cocosearch.indexer.flow._prepare_chunks", return_value=[chunk]):
+            content_hash, rows = _prepare_file_in_process(
+                str(tmp_path), "a.py", "sha256", 1000, 300
+            )
+
+        assert content_hash == hashlib.sha256(b"x = 1\n").hexdigest()
+        assert all(type(row) is tuple for row in rows)
+        assert [PreparedChunk(*row) for row in rows] == [chunk]
+
+    def test_unreadable_file_returns_none(self, tmp_path):
+        """A file that vanished is reported as None, not raised."""
+        from cocosearch.indexer.flow import _prepare_file_in_process
+
+        assert (
+            _prepare_file_in_process(str(tmp_path), "gone.py", "sha256", 1000, 300)
+            is None
+        )
@@ -0,0 +1,267 @@
+"""Tests for cocosearch.indexer.pipeline module."""
+
+import threading
+import time
+
+import pytest
+
+from cocosearch.indexer.pipeline import MemoryBudget, Stage, run_pipeline
+
+
+class TestRunPipeline:
+    """Tests for run_pipeline function."""
+
+    def test_items_flow_through_all_stages(self):
+        """Every item passes through every stage in order."""
+        out = []
+        lock = threading.Lock()
+
+        def sink(x):
+            with lock:
+                out.append(x)
+            return x
+
+        result = run_pipeline(
+            range(20),
+            [
+                Stage("double", lambda x: x * 2, workers=3),
+                Stage("inc", lambda x: x + 1, workers=2),
+                Stage("sink", sink),
+            ],
+            queue_size=2,
+        )
+
+        assert sorted(out) == [x * 2 + 1 for x in range(20)]
+        assert result.completed == 20
+        assert result.failed == 0
+        assert result.cancelled is False
+        assert set(result.stage_seconds) == {"double", "inc", "sink"}
+
+    def test_none_drops_item(self):
+        """A stage returning None stops the item from reaching later stages."""
+        seen = []
+
+        result = run_pipeline(
+            range(6),
+            [
+                Stage("filter", lambda x: x if x % 2 == 0 else None),
+                Stage("sink", lambda x: seen.append(x) or x),
+            ],
+        )
+
+        assert sorted(seen) == [0, 2, 4]
+        assert result.completed == 3
+
+    def test_exception_reported_and_run_continues(self):
+        """Exceptions drop only the failing item and invoke on_error."""
+        errors = []
+
+        def boom(x):
+            if x == 3:
+                raise ValueError("bad item")
+            return x
+
+        result = run_pipeline(
+            range(5),
+            [Stage("boom", boom, workers=2), Stage("sink", lambda x: x)],
+            on_error=lambda stage, item, exc: errors.append((stage, item, str(exc))),
+        )
+
+        assert result.completed == 4
+        assert result.failed == 1
+        assert errors == [("boom", 3, "bad item")]
+
+    def test_stop_event_cancels(self):
+        """Setting stop_event stops processing and marks the run cancelled."""
+        stop = threading.Event()
+        written = []
+
+        def embed(x):
+            if x == 2:
+                stop.set()
+            return x
+
+        result = run_pipeline(
+            range(100),
+            [Stage("embed", embed), Stage("write", lambda x: written.append(x) or x)],
+            queue_size=1,
+            stop_event=stop,
+        )
+
+        assert result.cancelled is True
+        assert len(written) < 100
+
+    def test_base_exception_is_reraised(self):
+        """Non-Exception errors abort the run and propagate to the caller."""
+
+        class Panic(BaseException):
+            pass
+
+        def panic(x):
+            raise Panic("unsendable")
+
+        with pytest.raises(Panic):
+            run_pipeline(range(10), [Stage("panic", panic), Stage("sink", lambda x: x)])
+
+    def test_stages_overlap(self):
+        """A slow downstream stage does not block upstream work on later items."""
+        first_written = threading.Event()
+        second_embedded_while_writing = threading.Event()
+
+        def embed(x):
+            if x == 1 and not first_written.is_set():
+                second_embedded_while_writing.set()
+            return x
+
+        def write(x):
+            if x == 0:
+                # Hold the writer until the embed stage has moved on.
+                second_embedded_while_writing.wait(timeout=2)
+                first_written.set()
+            return x
+
+        run_pipeline(
+            [0, 1],
+            [Stage("embed", embed), Stage("write", write)],
+            queue_size=4,
+        )
+
+        assert second_embedded_while_writing.is_set()
+
+    def test_empty_stages_rejected(self):
+        """At least one stage is required."""
+        with pytest.raises(ValueError):
+            run_pipeline([1], [])
+
+    def test_generator_input_consumed_lazily(self):
+        """The producer never runs more than the queue capacity ahead."""
+        produced = 0
+        max_lead = 0
+        consumed = 0
+        lock = threading.Lock()
+
+        def gen():
+            nonlocal produced, max_lead
+            for i in range(30):
+                with lock:
+                    produced += 1
+                    max_lead = max(max_lead, produced - consumed)
+                yield i
+
+        def slow(x):
+            nonlocal consumed
+            time.sleep(0.001)
+            with lock:
+                consumed += 1
+            return x
+
+        run_pipeline(gen(), [Stage("slow", slow)], queue_size=2)
+
+        # queue capacity + the item held by the worker + the one being put
+        assert max_lead <= 4
+
+
+class TestMemoryBudget:
+    """Tests for MemoryBudget."""
+
+    def test_acquire_within_budget(self):
+        budget = MemoryBudget(100)
+
+        assert budget.acquire(60)
+        assert budget.acquire(40)
+        assert budget.in_use == 100
+        budget.release(100)
+        assert budget.in_use == 0
+
+    def test_oversized_item_admitted_alone(self):
+        """An item larger than the budget runs once nothing else is held."""
+        budget = MemoryBudget(10)
+
+        assert budget.acquire(1000)
+        assert budget.in_use == 1000
+
+    def test_acquire_blocks_until_release(self):
+        budget = MemoryBudget(100)
+        budget.acquire(80)
+        admitted = threading.Event()
+
+        def waiter():
+            budget.acquire(50)
+            admitted.set()
+
+        t = threading.Thread(target=waiter)
+        t.start()
+        assert not admitted.wait(0.1)
+
+        budget.release(80)
+
+        assert admitted.wait(2)
+        t.join()
+        assert budget.in_use == 50
+
+    def test_close_unblocks_waiters(self):
+        budget = MemoryBudget(10)
+        budget.acquire(10)
+        results = []
+        t = threading.Thread(target=lambda: results.append(budget.acquire(5)))
+        t.start()
+
+        budget.close()
+        t.join(2)
+
+        assert results == [False]
+
+    def test_pipeline_bounds_bytes_in_flight(self):
+        """Stages acquiring and releasing the budget never exceed it."""
+        budget = MemoryBudget(30)
+        peak = 0
+        lock = threading.Lock()
+
+        def load(n):
+            nonlocal peak
+            assert budget.acquire(10)
+            with lock:
+                peak = max(peak, budget.in_use)
+            return n
+
+        def slow(n):
+            time.sleep(0.01)
+            return n
+
+        def done(n):
+            budget.release(10)
+            return n
+
+        result = run_pipeline(
+            range(20),
+            [
+                Stage("load", load, workers=4),
+                Stage("slow", slow, workers=4),
+                Stage("done", done),
+            ],
+            queue_size=8,
+            memory_budget=budget,
+        )
+
+        assert result.completed == 20
+        assert peak <= 30
+        assert budget.in_use == 0
+
+    def test_stop_event_closes_budget(self):
+        """A cancelled run does not leave a stage blocked in acquire."""
+        budget = MemoryBudget(10)
+        stop = threading.Event()
+
+        def load(n):
+            budget.acquire(10)  # never released
+            stop.set()
+            return n
+
+        result = run_pipeline(
+            range(10),
+            [Stage("load", load, workers=2), Stage("sink", lambda n: n)],
+            stop_event=stop,
+            memory_budget=budget,
+        )
+
+        assert result.cancelled is True
@@ -0,0 +1,140 @@
+"""Tests for cocosearch.indexer.vector_index module."""
+
+import json
+from unittest.mock import MagicMock
+
+from cocosearch.indexer.config import IndexingConfig
+from cocosearch.indexer.vector_index import (
+    ensure_vector_index,
+    ivfflat_lists,
+    needs_rebuild,
+    plan_vector_index,
+    vector_index_name,
+)
+
+
+def _mock_conn(fetchone):
+    cursor = MagicMock()
+    cursor.fetchone.side_effect = fetchone
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+    conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    return conn, cursor
+
+
+def _sqls(cursor):
+    return [c[0][0] for c in cursor.execute.call_args_list]
+
+
+class TestPlanning:
+    """Tests for parameter selection and rebuild decisions."""
+
+    def test_ivfflat_lists_follow_row_count(self):
+        """rows/1000 up to 1M rows, sqrt(rows) beyond, at least 1."""
+        assert ivfflat_lists(10) == 1
+        assert ivfflat_lists(250_000) == 250
+        assert ivfflat_lists(4_000_000) == 2000
+
+    def test_hnsw_plan_uses_config(self):
+        """HNSW parameters come from the indexing config."""
+        config = IndexingConfig(
+            vector_index="hnsw", hnsw_m=24, hnsw_ef_construction=100
+        )
+
+        assert plan_vector_index(config, 5000) == {
+            "method": "hnsw",
+            "m": 24,
+            "ef_construction": 100,
+        }
+
+    def test_rebuild_decisions(self):
+        """Unrecorded, switched, re-tuned or outgrown indexes are rebuilt."""
+        ivf = {"method": "ivfflat", "lists": 10, "rows": 10_000}
+        hnsw = {"method": "hnsw", "m": 16, "ef_construction": 64}
+
+        assert needs_rebuild(None, ivf, 10_000)
+        assert needs_rebuild(ivf, hnsw, 10_000)
+        assert not needs_rebuild(ivf, ivf, 15_000)
+        assert needs_rebuild(ivf, ivf, 25_000)
+        assert not needs_rebuild(hnsw, hnsw, 10_000_000)
+        assert needs_rebuild(hnsw, {**hnsw, "m": 32}, 10)
+
+
+class TestEnsureVectorIndex:
+    """Tests for ensure_vector_index."""
+
+    def test_empty_table_builds_nothing(self):
+        """No rows means no clusters to train; nothing is built."""
+        conn, cursor = _mock_conn([(False,)])
+
+        assert ensure_vector_index(conn, "tbl", "idx", IndexingConfig()) is None
+        assert not any("CREATE INDEX" in sql for sql in _sqls(cursor))
+
+    def test_missing_index_built_with_tuned_settings(self):
+        """A missing index is built with raised maintenance settings."""
+        conn, cursor = _mock_conn([(True,), (50_000.0,), (False, None)])
+
+        params = ensure_vector_index(conn, "tbl", "idx", IndexingConfig())
+
+        assert params == {"method": "ivfflat", "lists": 50, "rows": 50_000}
+        sqls = _sqls(cursor)
+        assert any("SET LOCAL maintenance_work_mem = '512MB'" in s for s in sqls)
+        assert any("max_parallel_maintenance_workers = 2" in s for s in sqls)
+        create = next(s for s in sqls if s.startswith("CREATE INDEX"))
+        assert "USING ivfflat" in create
+        assert "lists = 50" in create
+        assert f"RENAME TO {vector_index_name('tbl')}" in " ".join(sqls)
+        assert any(s.startswith("COMMENT ON INDEX") for s in sqls)
+        update = cursor.execute.call_args_list[-1][0]
+        assert "cocosearch_index_metadata" in update[0]
+        assert json.loads(update[1][0]) == params
+
+    def test_row_count_comes_from_planner_estimate(self):
+        """rows is read from pg_class; an unanalyzed table is analyzed first."""
+        conn, cursor = _mock_conn([(True,), (-1.0,), (20_000.0,), (False, None)])
+
+        params = ensure_vector_index(conn, "tbl", "idx", IndexingConfig())
+
+        assert params["rows"] == 20_000
+        sqls = _sqls(cursor)
+        assert "ANALYZE tbl" in sqls
+        assert not any("count(*)" in s for s in sqls)
+
+    def test_up_to_date_index_is_kept(self):
+        """An index whose recorded parameters still fit is left alone."""
+        recorded = json.dumps({"method": "ivfflat", "lists": 50, "rows": 50_000})
+        conn, cursor = _mock_conn([(True,), (60_000.0,), (True, recorded)])
+
+        assert ensure_vector_index(conn, "tbl", "idx", IndexingConfig()) is None
+        assert not any("CREATE INDEX" in sql for sql in _sqls(cursor))
+
+    def test_failed_build_is_not_fatal(self):
+        """A failing build is rolled back and reported as None."""
+        conn, cursor = _mock_conn([(True,), (5000.0,), (False, None)])
+
+        def execute(sql, *args):
+            if sql.startswith("CREATE INDEX"):
+                raise RuntimeError("out of memory")
+
+        cursor.execute.side_effect = execute
+
+        assert ensure_vector_index(conn, "tbl", "idx", IndexingConfig()) is None
+        conn.rollback.assert_called()
+
+    def test_quantized_index_built_on_expression(self):
+        """A halfvec index is built over the cast embedding expression."""
+        conn, cursor = _mock_conn([(True,), (50_000.0,), (768,), (False, None)])
+        config = IndexingConfig(vector_index="hnsw", vector_quantization="halfvec")
+
+        params = ensure_vector_index(conn, "tbl", "idx", config)
+
+        assert params["quantization"] == "halfvec"
+        assert params["dim"] == 768
+        create = next(s for s in _sqls(cursor) if s.startswith("CREATE INDEX"))
+        assert "(((embedding)::halfvec(768)) halfvec_cosine_ops)" in create
+
+    def test_quantization_change_triggers_rebuild(self):
+        """Switching quantization rebuilds an otherwise matching index."""
+        hnsw = {"method": "hnsw", "m": 16, "ef_construction": 64}
+
+        assert needs_rebuild(hnsw, {**hnsw, "quantization": "binary", "dim": 8}, 10)
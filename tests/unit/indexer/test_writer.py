@@ -0,0 +1,251 @@
+"""Tests for cocosearch.indexer.writer module."""
+
+from dataclasses import dataclass, field
+from unittest.mock import MagicMock
+
+from cocosearch.indexer.writer import (
+    CHUNK_COLUMNS,
+    MAX_PENDING_ROWS,
+    BulkWriter,
+    copy_chunk_rows,
+)
+
+
+@dataclass
+class _Chunk:
+    start_byte: int = 0
+    end_byte: int = 10
+    start_line: int = 1
+    end_line: int = 2
+    scope_start_line: int | None = 1
+    scope_end_line: int | None = 4
+    text: str = "x = 1"
+    tsv_input: str = "x 1"
+    block_type: str = ""
+    hierarchy: str = ""
+    language_id: str = "py"
+    symbol_type: str | None = None
+    symbol_name: str | None = None
+    symbol_signature: str | None = None
+
+
+@dataclass
+class _File:
+    filename: str
+    content_hash: str = "h"
+    stat: tuple | None = None
+    chunks: list = field(default_factory=lambda: [_Chunk()])
+    embeddings: list = field(default_factory=lambda: [[0.1, 0.2]])
+    kept: set = field(default_factory=set)
+
+
+def _mock_conn():
+    cursor = MagicMock()
+    copy = MagicMock()
+    cursor.copy.return_value.__enter__ = MagicMock(return_value=copy)
+    cursor.copy.return_value.__exit__ = MagicMock(return_value=False)
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+    conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+    return conn, cursor, copy
+
+
+class TestCopyChunkRows:
+    """Tests for copy_chunk_rows."""
+
+    def test_uses_binary_copy_with_all_columns(self):
+        """Rows are streamed with COPY ... FORMAT BINARY in column order."""
+        _conn, cursor, copy = _mock_conn()
+
+        n = copy_chunk_rows(cursor, "tbl", "a.py", [_Chunk(), _Chunk()], [[1.0]] * 2)
+
+        assert n == 2
+        sql = cursor.copy.call_args[0][0]
+        assert "FORMAT BINARY" in sql
+        assert ", ".join(CHUNK_COLUMNS) in sql
+        types = copy.set_types.call_args[0][0]
+        assert len(types) == len(CHUNK_COLUMNS)
+        assert types[CHUNK_COLUMNS.index("embedding")] == "vector"
+        row = copy.write_row.call_args[0][0]
+        assert row[0] == "a.py"
+        assert len(row) == len(CHUNK_COLUMNS)
+        assert row[CHUNK_COLUMNS.index("start_line")] == 1
+        assert row[CHUNK_COLUMNS.index("end_line")] == 2
+        assert row[CHUNK_COLUMNS.index("scope_start_line")] == 1
+        assert row[CHUNK_COLUMNS.index("scope_end_line")] == 4
+        assert types[CHUNK_COLUMNS.index("start_line")] == "int4"
+
+
+class TestBulkWriter:
+    """Tests for BulkWriter batching."""
+
+    def test_buffers_until_batch_size(self):
+        """Nothing is written until the batch fills."""
+        conn, cursor, _copy = _mock_conn()
+        writer = BulkWriter(conn, "tbl", "trk", batch_size=3)
+
+        assert writer.add(_File("a.py")) is None
+        assert writer.add(_File("b.py")) is None
+        cursor.execute.assert_not_called()
+
+        result = writer.add(_File("c.py"))
+
+        assert result.files == 3
+        assert result.chunks == 3
+        conn.commit.assert_called_once()
+        assert writer.pending == 0
+
+    def test_batch_uses_set_based_statements(self):
+        """One DELETE and one tracking upsert cover the whole batch."""
+        conn, cursor, _copy = _mock_conn()
+        writer = BulkWriter(conn, "tbl", "trk", batch_size=10)
+        writer.add(_File("a.py", content_hash="1"))
+        writer.add(_File("b.py", content_hash="2"))
+
+        writer.flush()
+
+        sqls = [c[0][0] for c in cursor.execute.call_args_list]
+        assert len(sqls) == 2
+        assert "DELETE FROM tbl WHERE filename = ANY(%s)" in sqls[0]
+        assert cursor.execute.call_args_list[0][0][1] == (["a.py", "b.py"],)
+        assert "unnest" in sqls[1]
+        assert cursor.execute.call_args_list[1][0][1] == (
+            ["a.py", "b.py"],
+            ["1", "2"],
+            [None, None],
+            [None, None],
+            [None, None],
+        )
+        cursor.copy.assert_called_once()
+
+    def test_flushes_early_on_row_budget(self):
+        """A file with many chunks triggers a flush before batch_size."""
+        conn, _cursor, _copy = _mock_conn()
+        writer = BulkWriter(conn, "tbl", "trk", batch_size=100)
+        big = _File(
+            "big.py",
+            chunks=[_Chunk()] * MAX_PENDING_ROWS,
+            embeddings=[[0.0]] * MAX_PENDING_ROWS,
+        )
+
+        result = writer.add(big)
+
+        assert result is not None
+        assert result.chunks == MAX_PENDING_ROWS
+
+    def test_on_flushed_reports_counts(self):
+        """on_flushed receives the file and chunk counts of each commit."""
+        conn, _cursor, _copy = _mock_conn()
+        calls = []
+        writer = BulkWriter(
+            conn,
+            "tbl",
+            "trk",
+            batch_size=2,
+            on_flushed=lambda f, c: calls.append((f, c)),
+        )
+        for name in ("a.py", "b.py", "c.py"):
+            writer.add(_File(name))
+        writer.flush()
+
+        assert calls == [(2, 2), (1, 1)]
+
+    def test_failed_batch_retried_per_file(self):
+        """A failing batch is rolled back and retried file by file."""
+        conn, cursor, copy = _mock_conn()
+
+        def write_row(row):
+            if row[0] == "bad.py":
+                raise ValueError("expected 768 dimensions")
+
+        copy.write_row.side_effect = write_row
+        writer = BulkWriter(conn, "tbl", "trk", batch_size=10)
+        writer.add(_File("a.py"))
+        writer.add(_File("bad.py"))
+        writer.add(_File("c.py"))
+
+        result = writer.flush()
+
+        assert result.files == 2
+        assert result.failed == 1
+        assert conn.rollback.call_count == 2
+        assert conn.commit.call_count == 2
+
+    def test_files_without_chunks_only_update_tracking(self):
+        """Empty files skip DELETE/COPY but are still tracked."""
+        conn, cursor, _copy = _mock_conn()
+        writer = BulkWriter(conn, "tbl", "trk")
+        writer.add(_File("empty.py", chunks=[], embeddings=[]))
+
+        result = writer.flush()
+
+        assert result.files == 1
+        cursor.copy.assert_not_called()
+        assert len(cursor.execute.call_args_list) == 1
+
+    def test_kept_chunks_survive_and_are_not_copied(self):
+        """Rows kept by chunk diffing are excluded from DELETE and COPY."""
+        conn, cursor, copy = _mock_conn()
+        writer = BulkWriter(conn, "tbl", "trk")
+        writer.add(
+            _File(
+                "a.py",
+                chunks=[_Chunk(0, 5), _Chunk(5, 10)],
+                embeddings=[None, [0.3]],
+                kept={0},
+            )
+        )
+
+        result = writer.flush()
+
+        sql, params = cursor.execute.call_args_list[0][0]
+        assert "NOT IN" in sql
+        assert params == (["a.py"], ["a.py"], [0], [5])
+        assert copy.write_row.call_count == 1
+        assert copy.write_row.call_args[0][0][1].lower == 5
+        assert result.chunks == 2
+
+    def test_delete_files_set_based(self):
+        """Deleted files are removed with ANY() statements, not per file."""
+        conn, cursor, _copy = _mock_conn()
+        writer = BulkWriter(conn, "tbl", "trk")
+
+        assert writer.delete_files(["a.py", "b.py"]) == 2
+
+        sqls = [c[0][0] for c in cursor.execute.call_args_list]
+        assert sqls == [
+            "DELETE FROM tbl WHERE filename = ANY(%s)",
+            "DELETE FROM trk WHERE filename = ANY(%s)",
+        ]
+        conn.commit.assert_called_once()
+
+    def test_tracking_upsert_records_stat(self):
+        """size, mtime_ns and inode are stored alongside the content hash."""
+        from cocosearch.indexer.change_detection import FileStat
+
+        conn, cursor, _copy = _mock_conn()
+        writer = BulkWriter(conn, "tbl", "trk")
+        writer.add(_File("a.py", stat=FileStat(10, 123, 7)))
+        writer.add(_File("b.py"))
+
+        writer.flush()
+
+        sql, params = cursor.execute.call_args_list[-1][0]
+        assert "mtime_ns = EXCLUDED.mtime_ns" in sql
+        assert params[2:] == ([10, None], [123, None], [7, None])
+
+    def test_refresh_stats_single_update(self):
+        """Touched-but-identical files get their stat refreshed in one UPDATE."""
+        from cocosearch.indexer.change_detection import FileStat
+
+        conn, cursor, _copy = _mock_conn()
+        writer = BulkWriter(conn, "tbl", "trk")
+
+        n = writer.refresh_stats({"a.py": FileStat(1, 2, 3), "b.py": None})
+
+        assert n == 2
+        cursor.execute.assert_called_once()
+        sql, params = cursor.execute.call_args[0]
+        assert sql.startswith("UPDATE trk")
+        assert params == (["a.py", "b.py"], [1, None], [2, None], [3, None])
+        conn.commit.assert_called_once()
@@ -66,13 +66,14 @@ class TestClearIndex:
             clear_index("myproject")
 
         drop_queries = [q for q, _ in cursor.calls if "DROP TABLE" in q]
-        assert len(drop_queries) == 6
+        assert len(drop_queries) == 7
         assert "codeindex_" in drop_queries[0] or "myproject" in drop_queries[0]
         assert "cocosearch_parse_results_myproject" in drop_queries[1]
         assert "cocosearch_deps_myproject" in drop_queries[2]
         assert "cocosearch_deps_tracking_myproject" in drop_queries[3]
-        assert "codeindex_myproject__cocoindex_tracking" in drop_queries[4]
-        assert "cocosearch_index_tracking_myproject" in drop_queries[5]
+        assert "cocosearch_deps_impact_myproject" in drop_queries[4]
+        assert "codeindex_myproject__cocoindex_tracking" in drop_queries[5]
+        assert "cocosearch_index_tracking_myproject" in drop_queries[6]
 
     def test_cleans_cocoindex_metadata(self, mock_db_pool):
         """Cleans legacy CocoIndex setup metadata."""
@@ -12,6 +12,7 @@ from unittest.mock import patch, MagicMock
 from cocosearch.management import metadata as metadata_module
 from cocosearch.management.metadata import (
     auto_recover_stale_indexing,
+    bump_index_generation,
     ensure_metadata_table,
     get_index_metadata,
     get_index_for_path,
@@ -129,10 +130,21 @@ class TestEnsureMetadataTable:
         ):
             ensure_metadata_table()
 
-        # Ninth SQL: CREATE INDEX (after CREATE TABLE + 7 ALTER TABLEs)
-        sql = cursor.calls[8][0]
-        assert "CREATE INDEX IF NOT EXISTS" in sql
-        assert "canonical_path" in sql
+        index_sql = [q for q, _ in cursor.calls if "CREATE INDEX" in q]
+        assert len(index_sql) == 1
+        assert "IF NOT EXISTS" in index_sql[0]
+        assert "canonical_path" in index_sql[0]
+
+    def test_creates_generation_column_migration(self, mock_db_pool):
+        """ensure_metadata_table adds the generation counter for existing DBs."""
+        pool, cursor, conn = mock_db_pool()
+
+        with patch(
+            "cocosearch.management.metadata.get_connection_pool", return_value=pool
+        ):
+            ensure_metadata_table()
+
+        cursor.assert_query_contains("ADD COLUMN IF NOT EXISTS generation BIGINT")
 
     def test_commits_after_creation(self, mock_db_pool):
         """ensure_metadata_table commits transaction."""
@@ -719,6 +731,19 @@ class TestClearIndexPath:
             cache_info_after = get_index_for_path.cache_info()
             assert cache_info_after.currsize == 0
 
+    def test_notifies_deletion(self, mock_db_pool):
+        """clear_index_path tells listeners the index is gone."""
+        pool, cursor, conn = mock_db_pool(results=[])
+        cursor.rowcount = 1
+
+        with patch(
+            "cocosearch.management.metadata.get_connection_pool", return_value=pool
+        ):
+            clear_index_path("myindex")
+
+        cursor.assert_query_contains("pg_notify")
+        assert cursor.calls[-1][1][1] == '{"index": "myindex", "generation": null}'
+
     def test_commits_transaction(self, mock_db_pool):
         """clear_index_path commits transaction after delete."""
         pool, cursor, conn = mock_db_pool(results=[])
@@ -1132,3 +1157,63 @@ class TestSetDepsExtractedAt:
             result = set_deps_extracted_at("myindex")
 
         assert result is False
+
+    def test_bumps_generation_and_notifies(self, mock_db_pool):
+        """Dependency changes advance the index generation."""
+        pool, cursor, conn = mock_db_pool(results=[(4,)])
+        cursor.rowcount = 1
+
+        with patch(
+            "cocosearch.management.metadata.get_connection_pool", return_value=pool
+        ):
+            set_deps_extracted_at("myindex")
+
+        assert "generation = generation + 1" in cursor.calls[0][0]
+        assert cursor.calls[1][1][1] == '{"index": "myindex", "generation": 4}'
+
+
+class TestBumpIndexGeneration:
+    """Tests for bump_index_generation function."""
+
+    def test_returns_new_generation_and_notifies(self, mock_db_pool):
+        pool, cursor, conn = mock_db_pool(results=[(7,)])
+
+        with patch(
+            "cocosearch.management.metadata.get_connection_pool", return_value=pool
+        ):
+            generation = bump_index_generation("myindex")
+
+        assert generation == 7
+        assert "RETURNING generation" in cursor.calls[0][0]
+        assert cursor.calls[1] == (
+            "SELECT pg_notify(%s, %s)",
+            ("cocosearch_index_changed", '{"index": "myindex", "generation": 7}'),
+        )
+        assert conn.committed
+
+    def test_unknown_index_not_notified(self, mock_db_pool):
+        pool, cursor, conn = mock_db_pool(results=[])
+
+        with patch(
+            "cocosearch.management.metadata.get_connection_pool", return_value=pool
+        ):
+            generation = bump_index_generation("nonexistent")
+
+        assert generation is None
+        assert len(cursor.calls) == 1
+
+    def test_uses_given_connection(self, mock_db_pool):
+        _pool, cursor, conn = mock_db_pool(results=[(2,)])
+
+        with patch("cocosearch.management.metadata.get_connection_pool") as get_pool:
+            generation = bump_index_generation("myindex", conn=conn)
+
+        assert generation == 2
+        get_pool.assert_not_called()
+        assert conn.committed
+
+    def test_returns_none_on_missing_table(self):
+        with patch("cocosearch.management.metadata.get_connection_pool") as mock_pool:
+            mock_pool.return_value.connection.side_effect = Exception("no table")
+
+            assert bump_index_generation("myindex") is None
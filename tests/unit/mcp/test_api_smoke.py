@@ -226,9 +226,16 @@ class TestApiSearchSmoke:
         mock_result.symbol_signature = "def hello()"
         mock_result.dependencies = None
         mock_result.dependents = None
+        mock_result.start_line = None
+        mock_result.end_line = None
+        mock_result.content = None
+        mock_result.scope_start_line = None
+        mock_result.scope_end_line = None
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[mock_result]):
+            with patch(
+                "cocosearch.mcp.server.search_async", return_value=[mock_result]
+            ):
                 with patch("cocosearch.mcp.server.byte_to_line", return_value=1):
                     with patch(
                         "cocosearch.mcp.server.read_chunk_content",
@@ -274,9 +281,16 @@ class TestApiSearchWithDeps:
         mock_result.dependents = [
             {"source": "main.py", "dep_type": "import"},
         ]
+        mock_result.start_line = None
+        mock_result.end_line = None
+        mock_result.content = None
+        mock_result.scope_start_line = None
+        mock_result.scope_end_line = None
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[mock_result]):
+            with patch(
+                "cocosearch.mcp.server.search_async", return_value=[mock_result]
+            ):
                 with patch("cocosearch.mcp.server.byte_to_line", return_value=1):
                     with patch(
                         "cocosearch.mcp.server.read_chunk_content",
@@ -318,9 +332,16 @@ class TestApiSearchWithDeps:
         mock_result.symbol_signature = None
         mock_result.dependencies = None
         mock_result.dependents = None
+        mock_result.start_line = None
+        mock_result.end_line = None
+        mock_result.content = None
+        mock_result.scope_start_line = None
+        mock_result.scope_end_line = None
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[mock_result]):
+            with patch(
+                "cocosearch.mcp.server.search_async", return_value=[mock_result]
+            ):
                 with patch("cocosearch.mcp.server.byte_to_line", return_value=1):
                     with patch(
                         "cocosearch.mcp.server.read_chunk_content",
@@ -10,7 +10,12 @@ import httpx
 import pytest
 import pytest_asyncio
 
-from cocosearch.deps.models import DependencyEdge, DependencyTree, DepType
+from cocosearch.deps.models import (
+    DependencyEdge,
+    DependencyTree,
+    DepType,
+    ImpactSummary,
+)
 
 
 # ============================================================================
@@ -289,7 +294,7 @@ class TestGetFileImpactTool:
             file="utils.py", symbol=None, dep_type="root", children=[]
         )
 
-        with patch("cocosearch.deps.query.get_impact", return_value=tree):
+        with patch("cocosearch.deps.query.get_impact", return_value=tree) as impact:
             from cocosearch.mcp.server import get_file_impact
 
             ctx = MagicMock()
@@ -299,6 +304,68 @@ class TestGetFileImpactTool:
 
         assert result["file"] == "utils.py"
         assert "impact_tree" in result
+        # Served from the in-memory dependency graph
+        assert impact.call_args.kwargs["use_graph"] is True
+        assert "impact_summary" not in result  # None precomputed
+
+    @pytest.mark.asyncio
+    async def test_includes_impact_summary(self):
+        tree = DependencyTree(
+            file="utils.py", symbol=None, dep_type="root", children=[]
+        )
+        summary = ImpactSummary("utils.py", 7, 2, depth_histogram=[2, 5])
+
+        with (
+            patch("cocosearch.deps.query.get_impact", return_value=tree),
+            patch(
+                "cocosearch.deps.query.get_impact_summaries",
+                return_value={"utils.py": summary},
+            ),
+        ):
+            from cocosearch.mcp.server import get_file_impact
+
+            result = await get_file_impact(
+                file="utils.py", ctx=MagicMock(), index_name="test"
+            )
+
+        assert result["impact_summary"] == summary.to_dict()
+        assert "impact_tree" in result
+
+    @pytest.mark.asyncio
+    async def test_summary_only_skips_tree(self):
+        with (
+            patch("cocosearch.deps.query.get_impact") as impact,
+            patch("cocosearch.deps.query.get_impact_summaries", return_value={}),
+        ):
+            from cocosearch.mcp.server import get_file_impact
+
+            result = await get_file_impact(
+                file="leaf.py", ctx=MagicMock(), index_name="test", summary_only=True
+            )
+
+        impact.assert_not_called()
+        assert "impact_tree" not in result
+        assert result["impact_summary"]["dependents"] == 0
+
+    @pytest.mark.asyncio
+    async def test_summary_only_falls_back_to_tree(self):
+        """Without precomputed summaries the tree is still returned."""
+        tree = DependencyTree(
+            file="utils.py", symbol=None, dep_type="root", children=[]
+        )
+
+        with (
+            patch("cocosearch.deps.query.get_impact", return_value=tree),
+            patch("cocosearch.deps.query.get_impact_summaries", return_value=None),
+        ):
+            from cocosearch.mcp.server import get_file_impact
+
+            result = await get_file_impact(
+                file="utils.py", ctx=MagicMock(), index_name="test", summary_only=True
+            )
+
+        assert "impact_tree" in result
+        assert "impact_summary" not in result
 
 
 # ============================================================================
@@ -452,7 +519,9 @@ class TestGetBatchImpactTool:
             DependencyTree(file="config.py", symbol=None, dep_type="root", children=[]),
         ]
 
-        with patch("cocosearch.deps.query.get_impact_batch", return_value=trees):
+        with patch(
+            "cocosearch.deps.query.get_impact_batch", return_value=trees
+        ) as impact_batch:
             from cocosearch.mcp.server import get_batch_impact
 
             ctx = MagicMock()
@@ -460,6 +529,7 @@ class TestGetBatchImpactTool:
                 files=["utils.py", "config.py"], ctx=ctx, index_name="test", depth=3
             )
 
+        assert impact_batch.call_args.kwargs["use_graph"] is True
         assert result["files_requested"] == 2
         assert result["depth"] == 3
         assert len(result["results"]) == 2
@@ -467,6 +537,36 @@ class TestGetBatchImpactTool:
         assert "impact_tree" in result["results"][0]
         assert result["results"][1]["file"] == "config.py"
 
+    @pytest.mark.asyncio
+    async def test_summary_only(self):
+        summary = ImpactSummary("utils.py", 3, 1, depth_histogram=[1, 2])
+
+        with (
+            patch("cocosearch.deps.query.get_impact_batch") as impact_batch,
+            patch(
+                "cocosearch.deps.query.get_impact_summaries",
+                return_value={"utils.py": summary},
+            ) as summaries,
+        ):
+            from cocosearch.mcp.server import get_batch_impact
+
+            result = await get_batch_impact(
+                files=["utils.py", "config.py"],
+                ctx=MagicMock(),
+                index_name="test",
+                summary_only=True,
+            )
+
+        impact_batch.assert_not_called()
+        summaries.assert_called_once_with("test", ["utils.py", "config.py"])
+        assert result["results"] == [
+            {"file": "utils.py", "impact_summary": summary.to_dict()},
+            {
+                "file": "config.py",
+                "impact_summary": ImpactSummary("config.py", 0, 0).to_dict(),
+            },
+        ]
+
     @pytest.mark.asyncio
     async def test_empty_files_list(self):
         """Empty files list returns empty results."""
@@ -497,7 +597,7 @@ class TestGetBatchImpactTool:
             )
 
         mock_batch.assert_called_once_with(
-            "test", ["a.py"], max_depth=20, dep_type=None
+            "test", ["a.py"], max_depth=20, dep_type=None, use_graph=True
         )
         assert result["depth"] == 20
 
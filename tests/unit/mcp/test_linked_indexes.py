@@ -67,7 +67,7 @@ class TestApiSearchLinkedIndexes:
                 ],
             ),
             patch(
-                "cocosearch.mcp.server.multi_search", return_value=mock_results
+                "cocosearch.mcp.server.multi_search_async", return_value=mock_results
             ) as mock_ms,
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
@@ -101,7 +101,9 @@ class TestApiSearchLinkedIndexes:
                 "cocosearch.mcp.server.mgmt_list_indexes",
                 return_value=[{"name": "main_proj"}],
             ),
-            patch("cocosearch.mcp.server.search", return_value=mock_results) as mock_s,
+            patch(
+                "cocosearch.mcp.server.search_async", return_value=mock_results
+            ) as mock_s,
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
                 return_value={"canonical_path": "/tmp/test"},
@@ -129,7 +131,7 @@ class TestApiSearchLinkedIndexes:
         with (
             patch("cocosearch.mcp.server._ensure_cocoindex_init", return_value=True),
             patch(
-                "cocosearch.mcp.server.multi_search", return_value=mock_results
+                "cocosearch.mcp.server.multi_search_async", return_value=mock_results
             ) as mock_ms,
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
@@ -166,7 +168,9 @@ class TestApiSearchLinkedIndexes:
                 "cocosearch.mcp.server.mgmt_list_indexes",
                 return_value=[{"name": "main_proj"}],
             ),
-            patch("cocosearch.mcp.server.search", return_value=mock_results) as mock_s,
+            patch(
+                "cocosearch.mcp.server.search_async", return_value=mock_results
+            ) as mock_s,
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
                 return_value={"canonical_path": "/tmp/test"},
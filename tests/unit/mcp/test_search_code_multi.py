@@ -49,7 +49,7 @@ class TestApiSearchMultiIndex:
         with (
             patch("cocosearch.mcp.server._ensure_cocoindex_init", return_value=True),
             patch(
-                "cocosearch.mcp.server.multi_search", return_value=mock_results
+                "cocosearch.mcp.server.multi_search_async", return_value=mock_results
             ) as mock_ms,
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
@@ -80,7 +80,9 @@ class TestApiSearchMultiIndex:
 
         with (
             patch("cocosearch.mcp.server._ensure_cocoindex_init", return_value=True),
-            patch("cocosearch.mcp.server.search", return_value=mock_results) as mock_s,
+            patch(
+                "cocosearch.mcp.server.search_async", return_value=mock_results
+            ) as mock_s,
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
                 return_value={"canonical_path": "/tmp/test"},
@@ -110,7 +112,9 @@ class TestApiSearchMultiIndex:
 
         with (
             patch("cocosearch.mcp.server._ensure_cocoindex_init", return_value=True),
-            patch("cocosearch.mcp.server.multi_search", return_value=mock_results),
+            patch(
+                "cocosearch.mcp.server.multi_search_async", return_value=mock_results
+            ),
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
                 return_value={"canonical_path": "/tmp/test"},
@@ -138,7 +142,7 @@ class TestApiSearchMultiIndex:
         with (
             patch("cocosearch.mcp.server._ensure_cocoindex_init", return_value=True),
             patch(
-                "cocosearch.mcp.server.multi_search", return_value=mock_results
+                "cocosearch.mcp.server.multi_search_async", return_value=mock_results
             ) as mock_ms,
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
@@ -166,7 +170,9 @@ class TestApiSearchMultiIndex:
 
         with (
             patch("cocosearch.mcp.server._ensure_cocoindex_init", return_value=True),
-            patch("cocosearch.mcp.server.search", return_value=mock_results) as mock_s,
+            patch(
+                "cocosearch.mcp.server.search_async", return_value=mock_results
+            ) as mock_s,
             patch(
                 "cocosearch.mcp.server.get_index_metadata",
                 return_value={"canonical_path": "/tmp/test"},
@@ -121,7 +121,9 @@ class TestSearchCodeRewrite:
     @pytest.mark.asyncio
     async def test_default_keeps_controller_active(self):
         """Default rewrite_query=True passes _skip_rewrite=False to search()."""
-        with patch("cocosearch.mcp.server.search", return_value=[]) as mock_search:
+        with patch(
+            "cocosearch.mcp.server.search_async", return_value=[]
+        ) as mock_search:
             with patch(
                 "cocosearch.mcp.server._ensure_cocoindex_init", return_value=True
             ):
@@ -139,7 +141,9 @@ class TestSearchCodeRewrite:
     @pytest.mark.asyncio
     async def test_opt_out_skips_rewrite(self):
         """rewrite_query=False passes _skip_rewrite=True to search()."""
-        with patch("cocosearch.mcp.server.search", return_value=[]) as mock_search:
+        with patch(
+            "cocosearch.mcp.server.search_async", return_value=[]
+        ) as mock_search:
             with patch(
                 "cocosearch.mcp.server._ensure_cocoindex_init", return_value=True
             ):
@@ -166,7 +170,7 @@ class TestSearchCodeRewrite:
                 info["rewritten"] = "authentication session token"
             return []
 
-        with patch("cocosearch.mcp.server.search", side_effect=_fake_search):
+        with patch("cocosearch.mcp.server.search_async", side_effect=_fake_search):
             with patch(
                 "cocosearch.mcp.server._ensure_cocoindex_init", return_value=True
             ):
@@ -184,6 +188,137 @@ class TestSearchCodeRewrite:
         assert headers[0]["original"] == "how does login work"
         assert headers[0]["rewritten"] == "authentication session token"
 
+    @pytest.mark.asyncio
+    async def test_stored_lines_and_content_skip_file_reads(self):
+        """Results carrying lines and text from the index read no files."""
+        from cocosearch.search.query import SearchResult
+
+        stored = SearchResult(
+            filename="src/a.py",
+            start_byte=0,
+            end_byte=20,
+            score=0.9,
+            start_line=3,
+            end_line=5,
+            content="def a():\n    pass",
+        )
+
+        with patch("cocosearch.mcp.server.search_async", return_value=[stored]):
+            with patch(
+                "cocosearch.mcp.server._ensure_cocoindex_init", return_value=True
+            ):
+                with patch(
+                    "cocosearch.mcp.server.get_index_metadata", return_value=None
+                ):
+                    with patch("cocosearch.mcp.server.byte_to_line") as mock_lines:
+                        with patch(
+                            "cocosearch.mcp.server.read_chunk_content"
+                        ) as mock_read:
+                            result = await search_code(
+                                query="a",
+                                ctx=_make_mock_ctx(),
+                                index_name="testindex",
+                            )
+
+        mock_lines.assert_not_called()
+        mock_read.assert_not_called()
+        assert result[0]["start_line"] == 3
+        assert result[0]["end_line"] == 5
+        assert result[0]["content"] == "def a():\n    pass"
+
+    @pytest.mark.asyncio
+    async def test_stored_scope_passed_with_indexed_hash(self):
+        """Smart context gets the stored scope and the file's tracked hash."""
+        from cocosearch.search.query import SearchResult
+
+        stored = SearchResult(
+            filename="src/a.py",
+            start_byte=0,
+            end_byte=20,
+            score=0.9,
+            start_line=3,
+            end_line=5,
+            content="def a():\n    pass",
+            scope_start_line=1,
+            scope_end_line=8,
+        )
+        expander = MagicMock()
+        expander.get_context_lines.return_value = ([], [], [], True, True)
+
+        with patch("cocosearch.mcp.server.search_async", return_value=[stored]):
+            with patch(
+                "cocosearch.mcp.server._ensure_cocoindex_init", return_value=True
+            ):
+                with patch(
+                    "cocosearch.mcp.server.get_index_metadata", return_value=None
+                ):
+                    with patch(
+                        "cocosearch.mcp.server.get_indexed_file_hashes",
+                        return_value={"src/a.py": "h"},
+                    ) as mock_hashes:
+                        with patch(
+                            "cocosearch.mcp.server.ContextExpander",
+                            return_value=expander,
+                        ):
+                            await search_code(
+                                query="a",
+                                ctx=_make_mock_ctx(),
+                                index_name="testindex",
+                            )
+
+        mock_hashes.assert_called_once_with("testindex", ["src/a.py"])
+        kwargs = expander.get_context_lines.call_args.kwargs
+        assert kwargs["scope"] == (1, 8)
+        assert kwargs["file_hash"] == "h"
+
+    @pytest.mark.asyncio
+    async def test_indexed_hash_lookup_off_event_loop(self):
+        """The tracking-table query runs in a worker thread, not on the loop."""
+        from cocosearch.search.query import SearchResult
+
+        stored = SearchResult(
+            filename="src/a.py",
+            start_byte=0,
+            end_byte=20,
+            score=0.9,
+            start_line=3,
+            end_line=5,
+            content="def a():\n    pass",
+            scope_start_line=1,
+            scope_end_line=8,
+        )
+        expander = MagicMock()
+        expander.get_context_lines.return_value = ([], [], [], True, True)
+        lookup_threads = []
+
+        def lookup(index_name, filenames):
+            lookup_threads.append(threading.get_ident())
+            return {"src/a.py": "h"}
+
+        with patch("cocosearch.mcp.server.search_async", return_value=[stored]):
+            with patch(
+                "cocosearch.mcp.server._ensure_cocoindex_init", return_value=True
+            ):
+                with patch(
+                    "cocosearch.mcp.server.get_index_metadata", return_value=None
+                ):
+                    with patch(
+                        "cocosearch.mcp.server.get_indexed_file_hashes",
+                        side_effect=lookup,
+                    ):
+                        with patch(
+                            "cocosearch.mcp.server.ContextExpander",
+                            return_value=expander,
+                        ):
+                            await search_code(
+                                query="a",
+                                ctx=_make_mock_ctx(),
+                                index_name="testindex",
+                            )
+
+        assert lookup_threads
+        assert threading.get_ident() not in lookup_threads
+
 
 class TestSearchCodeMetadata:
     """Tests for metadata fields in search_code MCP response."""
@@ -1280,6 +1415,19 @@ class TestServerLifespan:
                 pass  # simulate server running
             mock_close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_lifespan_listens_for_index_changes(self):
+        """Lifespan subscribes to index changes and unsubscribes on teardown."""
+        with (
+            patch("cocosearch.search.db.close_pool"),
+            patch("cocosearch.search.invalidation.start_index_listener") as start,
+            patch("cocosearch.search.invalidation.stop_index_listener") as stop,
+        ):
+            async with _server_lifespan(mcp):
+                start.assert_called_once()
+                stop.assert_not_called()
+            stop.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_lifespan_teardown_cancels_indexing_threads(self):
         """Lifespan teardown signals and joins active indexing threads."""
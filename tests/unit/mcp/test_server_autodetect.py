@@ -322,7 +322,8 @@ class TestSearchCodeAutoDetect:
                         ):
                             with patch("cocosearch.mcp.server.logger") as mock_logger:
                                 with patch(
-                                    "cocosearch.mcp.server.search", return_value=[]
+                                    "cocosearch.mcp.server.search_async",
+                                    return_value=[],
                                 ):
                                     await search_code(
                                         query="test query", ctx=_make_mock_ctx()
@@ -285,3 +285,40 @@ class TestFileContentEndpoint:
         resp = await api_file_content(request)
         body = json.loads(resp.body)
         assert body["language"] == "typescript"
+
+    @pytest.mark.asyncio
+    async def test_serves_from_file_cache(self, tmp_path):
+        import json
+        from cocosearch.mcp.server import api_file_content
+        from cocosearch.search.file_cache import FileCache
+
+        f = tmp_path / "test.py"
+        f.write_text("x = 1\n")
+        request = MagicMock()
+        request.query_params = {"path": str(f)}
+        cache = FileCache()
+
+        with patch("cocosearch.mcp.server.get_file_cache", return_value=cache):
+            await api_file_content(request)
+            f.write_text("x = 22\n")
+            resp = await api_file_content(request)
+
+        assert json.loads(resp.body)["content"] == "x = 22\n"
+        assert cache.stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_truncates_long_files(self, tmp_path):
+        import json
+        from cocosearch.mcp.server import api_file_content
+
+        f = tmp_path / "big.txt"
+        f.write_text("line\n" * 50_001)
+        request = MagicMock()
+        request.query_params = {"path": str(f)}
+
+        resp = await api_file_content(request)
+
+        body = json.loads(resp.body)
+        assert body["lines"] == 50_000
+        assert body["truncated"] is True
+        assert body["content"] == "line\n" * 50_000
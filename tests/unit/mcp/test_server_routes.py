@@ -523,7 +523,9 @@ class TestApiSearchEnhanced:
         )
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[]) as mock_search:
+            with patch(
+                "cocosearch.mcp.server.search_async", return_value=[]
+            ) as mock_search:
                 response = await api_search(request)
 
         body = _parse_response(response)
@@ -546,7 +548,9 @@ class TestApiSearchEnhanced:
         )
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[]) as mock_search:
+            with patch(
+                "cocosearch.mcp.server.search_async", return_value=[]
+            ) as mock_search:
                 await api_search(request)
 
         call_kwargs = mock_search.call_args[1]
@@ -581,6 +585,11 @@ class TestApiSearchEnhanced:
         mock_result.symbol_signature = None
         mock_result.dependencies = None
         mock_result.dependents = None
+        mock_result.start_line = None
+        mock_result.end_line = None
+        mock_result.content = None
+        mock_result.scope_start_line = None
+        mock_result.scope_end_line = None
 
         mock_expander_instance = MagicMock()
         mock_expander_instance.get_context_lines.return_value = (
@@ -592,7 +601,9 @@ class TestApiSearchEnhanced:
         )
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[mock_result]):
+            with patch(
+                "cocosearch.mcp.server.search_async", return_value=[mock_result]
+            ):
                 with patch("cocosearch.mcp.server.byte_to_line", return_value=1):
                     with patch(
                         "cocosearch.mcp.server.read_chunk_content",
@@ -641,6 +652,11 @@ class TestApiSearchEnhanced:
         mock_result.symbol_signature = None
         mock_result.dependencies = None
         mock_result.dependents = None
+        mock_result.start_line = None
+        mock_result.end_line = None
+        mock_result.content = None
+        mock_result.scope_start_line = None
+        mock_result.scope_end_line = None
 
         mock_expander_instance = MagicMock()
         mock_expander_instance.get_context_lines.return_value = (
@@ -652,7 +668,9 @@ class TestApiSearchEnhanced:
         )
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[mock_result]):
+            with patch(
+                "cocosearch.mcp.server.search_async", return_value=[mock_result]
+            ):
                 with patch("cocosearch.mcp.server.byte_to_line", return_value=1):
                     with patch(
                         "cocosearch.mcp.server.read_chunk_content",
@@ -685,7 +703,7 @@ class TestApiSearchEnhanced:
         )
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[]):
+            with patch("cocosearch.mcp.server.search_async", return_value=[]):
                 with patch(
                     "cocosearch.mcp.server.ContextExpander"
                 ) as mock_expander_cls:
@@ -707,7 +725,7 @@ class TestApiSearchEnhanced:
         )
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
-            with patch("cocosearch.mcp.server.search", return_value=[]):
+            with patch("cocosearch.mcp.server.search_async", return_value=[]):
                 response = await api_search(request)
 
         body = _parse_response(response)
@@ -748,7 +766,7 @@ class TestApiSearchEnhanced:
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
             with patch(
-                "cocosearch.mcp.server.search",
+                "cocosearch.mcp.server.search_async",
                 side_effect=ValueError("Bad index"),
             ):
                 response = await api_search(request)
@@ -764,7 +782,7 @@ class TestApiSearchEnhanced:
 
         with patch("cocosearch.mcp.server._ensure_cocoindex_init"):
             with patch(
-                "cocosearch.mcp.server.search",
+                "cocosearch.mcp.server.search_async",
                 side_effect=RuntimeError("DB connection lost"),
             ):
                 response = await api_search(request)
@@ -5,9 +5,11 @@ cache invalidation, and TTL expiration.
 """
 
 import time
+from unittest.mock import patch
 
 import pytest
 
+from cocosearch.search import cache as cache_module
 from cocosearch.search.cache import (
     QueryCache,
     _compute_cache_key,
@@ -411,6 +413,136 @@ class TestQueryCache:
         assert cached_b is None
 
 
+class TestSemanticIndex:
+    """Tests for the vectorized semantic level."""
+
+    FILTERS = dict(
+        index_name="test-index",
+        limit=10,
+        min_score=0.0,
+        language_filter=None,
+        use_hybrid=None,
+        symbol_type=None,
+        symbol_name=None,
+    )
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return QueryCache(cache_dir=str(tmp_path), ttl=3600)
+
+    def test_different_filters_miss(self, cache):
+        """A paraphrase under other filters must not reuse results."""
+        cache.put(
+            query="original",
+            results=[{"file": "a.py"}],
+            query_embedding=[1.0, 0.0, 0.0],
+            **self.FILTERS,
+        )
+
+        for override in ({"limit": 5}, {"language_filter": "python"}):
+            cached, hit_type = cache.get(
+                query="paraphrase",
+                query_embedding=[0.99, 0.01, 0.0],
+                **{**self.FILTERS, **override},
+            )
+            assert (cached, hit_type) == (None, "miss")
+
+    def test_scans_every_entry(self, cache):
+        """The oldest entry is still found behind many newer ones."""
+        cache.put(
+            query="oldest",
+            results=[{"file": "oldest.py"}],
+            query_embedding=[1.0, 0.0, 0.0],
+            **self.FILTERS,
+        )
+        for i in range(100):
+            cache.put(
+                query=f"other {i}",
+                results=[{"file": f"{i}.py"}],
+                query_embedding=[0.0, 1.0, float(i)],
+                **self.FILTERS,
+            )
+
+        cached, hit_type = cache.get(
+            query="paraphrase", query_embedding=[0.98, 0.02, 0.0], **self.FILTERS
+        )
+
+        assert cached == [{"file": "oldest.py"}]
+        assert hit_type == "semantic"
+
+    def test_best_match_wins(self, cache):
+        """The most similar entry above the threshold is returned."""
+        cache.put(
+            query="near",
+            results=[{"file": "near.py"}],
+            query_embedding=[1.0, 0.3, 0.0],
+            **self.FILTERS,
+        )
+        cache.put(
+            query="nearest",
+            results=[{"file": "nearest.py"}],
+            query_embedding=[1.0, 0.05, 0.0],
+            **self.FILTERS,
+        )
+
+        cached, _ = cache.get(
+            query="paraphrase", query_embedding=[1.0, 0.0, 0.0], **self.FILTERS
+        )
+
+        assert cached == [{"file": "nearest.py"}]
+
+    def test_removal_keeps_rows_consistent(self, cache):
+        """Removing a row keeps the remaining keys mapped to their vectors."""
+        for i, vector in enumerate(([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])):
+            cache.put(
+                query=f"q{i}",
+                results=[{"file": f"{i}.py"}],
+                query_embedding=vector,
+                **self.FILTERS,
+            )
+        cache._remove_from_embedding_index("test-index", next(iter(cache._cache)))
+
+        cached, _ = cache.get(
+            query="paraphrase", query_embedding=[0.0, 0.0, 1.0], **self.FILTERS
+        )
+
+        assert cached == [{"file": "2.py"}]
+        assert len(cache._embedding_index["test-index"]) == 2
+
+    def test_dimension_change_resets_index(self, cache):
+        """Embeddings of another size replace the index's matrix."""
+        cache.put(
+            query="old",
+            results=[{"file": "old.py"}],
+            query_embedding=[1.0, 0.0, 0.0],
+            **self.FILTERS,
+        )
+        cache.put(
+            query="new",
+            results=[{"file": "new.py"}],
+            query_embedding=[1.0, 0.0],
+            **self.FILTERS,
+        )
+
+        assert cache._embedding_index["test-index"].dim == 2
+        cached, _ = cache.get(
+            query="paraphrase", query_embedding=[0.99, 0.01], **self.FILTERS
+        )
+        assert cached == [{"file": "new.py"}]
+
+    def test_invalidate_drops_matrix(self, cache):
+        cache.put(
+            query="q",
+            results=[{"file": "a.py"}],
+            query_embedding=[1.0, 0.0],
+            **self.FILTERS,
+        )
+
+        cache.invalidate_index("test-index")
+
+        assert "test-index" not in cache._embedding_index
+
+
 class TestGlobalCache:
     """Tests for global cache singleton."""
 
@@ -439,3 +571,181 @@ class TestGlobalCache:
 
         removed = invalidate_index_cache("global-test-index")
         assert removed >= 0  # May be 0 if test order varies
+
+
+class TestPersistentCache:
+    """Tests for the cross-process SQLite store."""
+
+    FILTERS = dict(
+        index_name="test-index",
+        limit=10,
+        min_score=0.0,
+        language_filter=None,
+        use_hybrid=None,
+        symbol_type=None,
+        symbol_name=None,
+    )
+
+    def test_exact_hit_from_another_instance(self, tmp_path):
+        QueryCache(cache_dir=str(tmp_path)).put(
+            query="auth", results=[{"file": "a.py"}], **self.FILTERS
+        )
+
+        cached, hit_type = QueryCache(cache_dir=str(tmp_path)).get(
+            query="auth", **self.FILTERS
+        )
+
+        assert cached == [{"file": "a.py"}]
+        assert hit_type == "exact"
+
+    def test_search_results_round_trip(self, tmp_path):
+        from cocosearch.search.query import SearchResult
+
+        results = [
+            SearchResult(
+                filename="/p/a.py",
+                start_byte=0,
+                end_byte=10,
+                score=0.8,
+                symbol_name="login",
+                dependencies=[{"target": "b.py"}],
+            )
+        ]
+        QueryCache(cache_dir=str(tmp_path)).put(
+            query="auth", results=results, **self.FILTERS
+        )
+
+        cached, _ = QueryCache(cache_dir=str(tmp_path)).get(
+            query="auth", **self.FILTERS
+        )
+
+        assert cached == results
+
+    def test_semantic_hit_from_another_instance(self, tmp_path):
+        QueryCache(cache_dir=str(tmp_path)).put(
+            query="auth",
+            results=[{"file": "a.py"}],
+            query_embedding=[1.0, 0.0],
+            **self.FILTERS,
+        )
+
+        cached, hit_type = QueryCache(cache_dir=str(tmp_path)).get(
+            query="login", query_embedding=[0.99, 0.01], **self.FILTERS
+        )
+
+        assert cached == [{"file": "a.py"}]
+        assert hit_type == "semantic"
+
+    def test_invalidation_reaches_other_instances(self, tmp_path):
+        """Bumping the generation in one process stales every other one."""
+        server = QueryCache(cache_dir=str(tmp_path))
+        server.put(query="auth", results=[{"file": "a.py"}], **self.FILTERS)
+        assert server.get(query="auth", **self.FILTERS)[1] == "exact"
+
+        QueryCache(cache_dir=str(tmp_path)).invalidate_index("test-index")
+
+        assert server.get(query="auth", **self.FILTERS) == (None, "miss")
+
+    def test_results_of_stale_generation_not_served(self, tmp_path):
+        """Results computed across a reindex are stored under the old generation."""
+        server = QueryCache(cache_dir=str(tmp_path))
+        assert server.get(query="auth", **self.FILTERS) == (None, "miss")
+
+        QueryCache(cache_dir=str(tmp_path)).invalidate_index("test-index")
+        server.put(query="auth", results=[{"file": "old.py"}], **self.FILTERS)
+
+        assert server.get(query="auth", **self.FILTERS) == (None, "miss")
+        assert QueryCache(cache_dir=str(tmp_path)).get(
+            query="auth", **self.FILTERS
+        ) == (None, "miss")
+
+    def test_disk_trimmed_to_max_entries(self, tmp_path):
+        cache = QueryCache(cache_dir=str(tmp_path), max_disk_entries=10)
+        for i in range(64):
+            cache.put(query=f"q{i}", results=[{"i": i}], **self.FILTERS)
+
+        fresh = QueryCache(cache_dir=str(tmp_path))
+        assert fresh.get(query="q63", **self.FILTERS)[0] == [{"i": 63}]
+        assert fresh.get(query="q0", **self.FILTERS) == (None, "miss")
+
+    def test_disk_errors_fall_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        cache = QueryCache(cache_dir=str(blocker / "queries"))
+
+        cache.put(query="auth", results=[{"file": "a.py"}], **self.FILTERS)
+
+        assert cache.get(query="auth", **self.FILTERS)[0] == [{"file": "a.py"}]
+        assert cache.invalidate_index("test-index") == 1
+        assert cache.get(query="auth", **self.FILTERS) == (None, "miss")
+
+    def test_clear_removes_persisted_entries(self, tmp_path):
+        cache = QueryCache(cache_dir=str(tmp_path))
+        cache.put(query="auth", results=[{"file": "a.py"}], **self.FILTERS)
+
+        cache.clear()
+
+        assert QueryCache(cache_dir=str(tmp_path)).get(
+            query="auth", **self.FILTERS
+        ) == (None, "miss")
+
+
+class TestDatabaseGeneration:
+    """Tests for noticing reindexes made from other machines."""
+
+    FILTERS = TestPersistentCache.FILTERS
+
+    @pytest.fixture
+    def db_generation(self):
+        """Patch the database generation; set ``.return_value`` to change it."""
+        with patch.object(cache_module, "_database_generation") as lookup:
+            lookup.return_value = 1
+            yield lookup
+
+    @pytest.fixture
+    def always_check(self):
+        with patch.object(cache_module, "DATABASE_GENERATION_CHECK_INTERVAL", 0.0):
+            yield
+
+    def test_remote_reindex_invalidates(self, tmp_path, db_generation, always_check):
+        cache = QueryCache(cache_dir=str(tmp_path))
+        cache.get(query="auth", **self.FILTERS)
+        cache.put(query="auth", results=[{"file": "a.py"}], **self.FILTERS)
+        assert cache.get(query="auth", **self.FILTERS)[1] == "exact"
+
+        db_generation.return_value = 2
+
+        assert cache.get(query="auth", **self.FILTERS) == (None, "miss")
+
+    def test_change_acted_on_once_per_machine(
+        self, tmp_path, db_generation, always_check
+    ):
+        """A generation already handled by another process keeps entries."""
+        QueryCache(cache_dir=str(tmp_path)).get(query="auth", **self.FILTERS)
+        other = QueryCache(cache_dir=str(tmp_path))
+        other.put(query="auth", results=[{"file": "a.py"}], **self.FILTERS)
+
+        assert other.get(query="auth", **self.FILTERS)[1] == "exact"
+
+    def test_checks_are_rate_limited(self, db_generation):
+        cache = QueryCache(cache_dir=None)
+
+        cache.get(query="auth", **self.FILTERS)
+        cache.get(query="login", **self.FILTERS)
+
+        db_generation.assert_called_once_with("test-index")
+
+    def test_listening_process_skips_check(self, db_generation):
+        with patch("cocosearch.search.invalidation.is_listening", return_value=True):
+            QueryCache(cache_dir=None).get(query="auth", **self.FILTERS)
+
+        db_generation.assert_not_called()
+
+    def test_unreachable_database_keeps_entries(
+        self, tmp_path, db_generation, always_check
+    ):
+        cache = QueryCache(cache_dir=str(tmp_path))
+        cache.put(query="auth", results=[{"file": "a.py"}], **self.FILTERS)
+        db_generation.return_value = None
+
+        assert cache.get(query="auth", **self.FILTERS)[1] == "exact"
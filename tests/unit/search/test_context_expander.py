@@ -4,8 +4,12 @@ Tests smart context expansion with tree-sitter boundary detection,
 LRU caching, and edge case handling.
 """
 
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
+from cocosearch.indexer.change_detection import hash_content
 from cocosearch.search.context_expander import (
     ContextExpander,
     get_context_with_boundaries,
@@ -14,6 +18,7 @@ from cocosearch.search.context_expander import (
     _get_language_from_path,
     _truncate_line,
 )
+from cocosearch.search.file_cache import FileCache
 
 # ============================================================================
 # Test Fixtures
@@ -663,6 +668,41 @@ class TestGetContextLines:
         all_lines = before + match + after
         assert len(all_lines) > 1
 
+    def test_stored_scope_used_when_file_unchanged(self, expander, sample_python_file):
+        """A scope stored at index time spares parsing an unchanged file."""
+        file_hash = hash_content(Path(sample_python_file).read_text())
+
+        with patch.object(expander, "find_enclosing_scope") as live:
+            before, match, after, _, _ = expander.get_context_lines(
+                sample_python_file,
+                start_line=6,
+                end_line=6,
+                smart=True,
+                scope=(4, 7),
+                file_hash=file_hash,
+            )
+
+        live.assert_not_called()
+        assert [num for num, _ in before + match + after] == [4, 5, 6, 7]
+
+    def test_stored_scope_ignored_after_file_changed(
+        self, expander, sample_python_file
+    ):
+        """A file edited since indexing is parsed again."""
+        with patch.object(
+            expander, "find_enclosing_scope", wraps=expander.find_enclosing_scope
+        ) as live:
+            expander.get_context_lines(
+                sample_python_file,
+                start_line=6,
+                end_line=6,
+                smart=True,
+                scope=(1, 2),
+                file_hash=hash_content("older content"),
+            )
+
+        live.assert_called_once()
+
 
 # ============================================================================
 # Test Caching
@@ -700,15 +740,26 @@ class TestCaching:
         # Python may intern identical lists, so just check content
         assert lines1 == lines2
 
-    def test_cache_info_accessible(self, expander, sample_python_file):
-        """Should be able to check cache info."""
-        # Read file
+    def test_cache_stats_accessible(self, sample_python_file):
+        """Reads go through the file cache and show in its counters."""
+        cache = FileCache()
+        expander = ContextExpander(file_cache=cache)
+
         expander.get_file_lines(sample_python_file)
+        expander.get_file_lines(sample_python_file)
+
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_new_expander_reuses_shared_cache(self, sample_python_file):
+        """A per-request expander reuses files read by earlier ones."""
+        cache = FileCache()
+        ContextExpander(file_cache=cache).get_file_lines(sample_python_file)
+
+        ContextExpander(file_cache=cache).get_file_lines(sample_python_file)
 
-        # Cache info should be accessible
-        info = expander._read_file_cached.cache_info()
-        assert info.hits >= 0
-        assert info.misses >= 1
+        assert cache.stats()["hits"] == 1
 
 
 # ============================================================================
@@ -220,3 +220,135 @@ class TestCheckSymbolColumnsExist:
         # Verify cache is empty
         assert "test_table" not in db_module._symbol_columns_available
         assert len(db_module._symbol_columns_available) == 0
+
+
+@pytest.mark.unit
+class TestCheckLineColumnsExist:
+    """Tests for line column existence checking."""
+
+    def setup_method(self):
+        db_module.reset_symbol_columns_cache()
+
+    def _pool(self, columns):
+        mock_pool = MagicMock()
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(c,) for c in columns]
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_pool.connection.return_value.__enter__.return_value = mock_conn
+        return mock_pool, mock_cursor
+
+    def test_all_present_is_cached(self):
+        mock_pool, mock_cursor = self._pool(
+            ["start_line", "end_line", "scope_start_line", "scope_end_line"]
+        )
+
+        with patch.object(db_module, "get_connection_pool", return_value=mock_pool):
+            assert db_module.check_line_columns_exist("test_table") is True
+            assert db_module.check_line_columns_exist("test_table") is True
+
+        assert mock_cursor.execute.call_count == 1
+
+    def test_missing_on_older_index(self):
+        mock_pool, _cursor = self._pool([])
+
+        with patch.object(db_module, "get_connection_pool", return_value=mock_pool):
+            assert db_module.check_line_columns_exist("test_table") is False
+
+    def test_lines_without_scopes_count_as_missing(self):
+        """Tables not yet migrated for scope columns read from files."""
+        mock_pool, _cursor = self._pool(["start_line", "end_line"])
+
+        with patch.object(db_module, "get_connection_pool", return_value=mock_pool):
+            assert db_module.check_line_columns_exist("test_table") is False
+
+    def test_forgotten_with_table_capabilities(self):
+        db_module._line_columns_available["test_table"] = False
+
+        db_module.forget_table_capabilities("test_table")
+
+        assert "test_table" not in db_module._line_columns_available
+
+
+class TestGetIndexedFileHashes:
+    """Tests for the tracking-table hash lookup used by context expansion."""
+
+    def _pool(self, rows):
+        mock_pool = MagicMock()
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = rows
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_pool.connection.return_value.__enter__.return_value = mock_conn
+        return mock_pool, mock_cursor
+
+    def test_one_query_for_all_files(self):
+        mock_pool, mock_cursor = self._pool([("a.py", "h1"), ("b.py", None)])
+
+        with patch.object(db_module, "get_connection_pool", return_value=mock_pool):
+            hashes = db_module.get_indexed_file_hashes("myindex", ["a.py", "b.py"])
+
+        assert hashes == {"a.py": "h1"}
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "FROM cocosearch_index_tracking_myindex" in sql
+        assert sorted(params[0]) == ["a.py", "b.py"]
+
+    def test_no_files_skips_query(self):
+        with patch.object(db_module, "get_connection_pool") as get_pool:
+            assert db_module.get_indexed_file_hashes("myindex", []) == {}
+
+        get_pool.assert_not_called()
+
+    def test_lookup_failure_is_empty(self):
+        with patch.object(
+            db_module, "get_connection_pool", side_effect=Exception("no table")
+        ):
+            assert db_module.get_indexed_file_hashes("myindex", ["a.py"]) == {}
+
+
+class TestGetVectorIndexParams:
+    """Tests for vector index parameter lookup."""
+
+    def setup_method(self):
+        """Reset module state before each test."""
+        db_module.reset_vector_index_cache()
+
+    def _pool(self, row):
+        mock_pool = MagicMock()
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = row
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_pool.connection.return_value.__enter__.return_value = mock_conn
+        return mock_pool, mock_cursor
+
+    def test_returns_recorded_params_and_caches(self):
+        """Parameters are parsed from the index comment and cached."""
+        mock_pool, mock_cursor = self._pool(
+            ('{"method": "hnsw", "quantization": "halfvec", "dim": 8}', 8)
+        )
+
+        with patch.object(db_module, "get_connection_pool", return_value=mock_pool):
+            first = db_module.get_vector_index_params("test_table")
+            second = db_module.get_vector_index_params("test_table")
+
+        assert first == {"method": "hnsw", "quantization": "halfvec", "dim": 8}
+        assert second == first
+        assert db_module.get_embedding_dimension("test_table") == 8
+        assert mock_cursor.execute.call_count == 1
+
+    def test_missing_index_returns_none(self):
+        """No index (or no comment) means plain search."""
+        mock_pool, _ = self._pool((None, 256))
+
+        with patch.object(db_module, "get_connection_pool", return_value=mock_pool):
+            assert db_module.get_vector_index_params("test_table") is None
+            assert db_module.get_embedding_dimension("test_table") == 256
+
+    def test_lookup_failure_returns_none(self):
+        """Database errors fall back to plain search."""
+        mock_pool = MagicMock()
+        mock_pool.connection.side_effect = RuntimeError("down")
+
+        with patch.object(db_module, "get_connection_pool", return_value=mock_pool):
+            assert db_module.get_vector_index_params("test_table") is None
@@ -0,0 +1,226 @@
+"""Unit tests for the process-wide file and parse-tree cache."""
+
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+from cocosearch.search.file_cache import (
+    TREE_BYTES_PER_SOURCE_BYTE,
+    CachedFile,
+    FileCache,
+    get_file_cache,
+)
+
+
+def _touch(path, content: str) -> None:
+    """Rewrite a file and move its mtime, even on coarse-mtime filesystems."""
+    st = os.stat(path)
+    path.write_text(content)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestCachedFile:
+    def test_lines_without_endings(self):
+        cached = CachedFile.from_bytes("a.py", 0, b"a\r\nb\rc\n")
+
+        assert cached.text == "a\nb\nc\n"
+        assert cached.lines == ["a", "b", "c"]
+
+    def test_no_trailing_newline(self):
+        assert CachedFile.from_bytes("a.py", 0, b"a\nb").lines == ["a", "b"]
+
+    def test_empty_file(self):
+        assert CachedFile.from_bytes("a.py", 0, b"").lines == []
+
+    def test_invalid_utf8_replaced(self):
+        assert CachedFile.from_bytes("a.py", 0, b"x\xff\n").lines == ["x�"]
+
+    def test_byte_and_line_conversion(self):
+        cached = CachedFile.from_bytes("a.py", 0, b"ab\ncd\nef\n")
+
+        assert cached.byte_to_line(0) == 1
+        assert cached.byte_to_line(2) == 1  # The newline belongs to its line
+        assert cached.byte_to_line(3) == 2
+        assert cached.byte_to_line(7) == 3
+        assert cached.line_to_byte(1) == 0
+        assert cached.line_to_byte(3) == 6
+        assert cached.line_to_byte(10) == 9
+
+    def test_line_to_byte_counts_multibyte_characters(self):
+        cached = CachedFile.from_bytes("a.py", 0, "é\nx\n".encode())
+
+        assert cached.line_to_byte(2) == 3
+
+
+class TestFileCache:
+    def test_miss_then_hit(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("x = 1\n")
+        cache = FileCache()
+
+        first = cache.get(str(f))
+        second = cache.get(str(f))
+
+        assert second is first
+        assert first.lines == ["x = 1"]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_missing_file(self, tmp_path):
+        cache = FileCache()
+
+        assert cache.get(str(tmp_path / "missing.py")) is None
+
+    def test_modified_file_reread(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("x = 1\n")
+        cache = FileCache()
+        cache.get(str(f))
+
+        _touch(f, "x = 2\n")
+
+        assert cache.get(str(f)).lines == ["x = 2"]
+        assert cache.misses == 2
+        assert cache.stats()["entries"] == 1
+
+    def test_size_change_invalidates_with_same_mtime(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("x = 1\n")
+        cache = FileCache()
+        cache.get(str(f))
+        st = os.stat(f)
+
+        f.write_text("x = 100\n")
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        assert cache.get(str(f)).lines == ["x = 100"]
+
+    def test_evicts_least_recently_used_over_budget(self, tmp_path):
+        paths = []
+        for name in ("a", "b", "c"):
+            f = tmp_path / f"{name}.py"
+            f.write_text("x" * 100 + "\n")
+            paths.append(str(f))
+        one_entry = CachedFile.from_bytes("", 0, b"x" * 100 + b"\n").cost
+        cache = FileCache(max_bytes=2 * one_entry)
+
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])  # b is now least recently used
+        cache.get(paths[2])
+
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] <= cache.max_bytes
+        cache.get(paths[0])
+        assert cache.hits == 2
+        cache.get(paths[1])
+        assert cache.misses == 4
+
+    def test_oversized_file_returned_but_not_kept(self, tmp_path):
+        f = tmp_path / "big.py"
+        f.write_text("x" * 1000)
+        cache = FileCache(max_bytes=100)
+
+        assert cache.get(str(f)).size == 1000
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+    def test_clear(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("x = 1\n")
+        cache = FileCache()
+        cache.get(str(f))
+
+        cache.clear()
+
+        assert cache.stats()["entries"] == 0
+        cache.get(str(f))
+        assert cache.misses == 2
+
+
+class TestFileCacheTrees:
+    def test_tree_parsed_once_per_file_version(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("def f():\n    pass\n")
+        cache = FileCache()
+        parser = MagicMock()
+        parser.parse.side_effect = lambda data: object()
+
+        with patch("cocosearch.ts_parsers.get_parser", return_value=parser):
+            entry, tree = cache.tree(str(f), "python")
+            assert cache.tree(str(f), "python") == (entry, tree)
+            _touch(f, "def g():\n    pass\n")
+            _entry, new_tree = cache.tree(str(f), "python")
+
+        assert new_tree is not tree
+        assert parser.parse.call_count == 2
+        assert (cache.tree_hits, cache.tree_misses) == (1, 2)
+
+    def test_tree_counts_against_thread_budget(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("x = 1\n")
+        cache = FileCache()
+        content_bytes = cache.get(str(f)).cost
+
+        with patch("cocosearch.ts_parsers.get_parser"):
+            cache.tree(str(f), "python")
+
+        stats = cache.stats()
+        assert stats["bytes"] == content_bytes
+        assert stats["tree_bytes"] == TREE_BYTES_PER_SOURCE_BYTE * len("x = 1\n")
+
+    def test_evicts_least_recently_used_tree_over_budget(self, tmp_path):
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        a.write_text("x = 1\n")
+        b.write_text("y = 2\n")
+        cache = FileCache(max_tree_bytes=TREE_BYTES_PER_SOURCE_BYTE * 6)
+        parser = MagicMock()
+        parser.parse.side_effect = lambda data: object()
+
+        with patch("cocosearch.ts_parsers.get_parser", return_value=parser):
+            cache.tree(str(a), "python")
+            cache.tree(str(b), "python")
+            cache.tree(str(a), "python")
+
+        assert parser.parse.call_count == 3
+        assert cache.stats()["tree_bytes"] == TREE_BYTES_PER_SOURCE_BYTE * 6
+
+    def test_trees_are_not_shared_between_threads(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("x = 1\n")
+        cache = FileCache()
+        parser = MagicMock()
+        parser.parse.side_effect = lambda data: object()
+        trees = []
+
+        with patch("cocosearch.ts_parsers.get_parser", return_value=parser):
+            trees.append(cache.tree(str(f), "python")[1])
+            worker = threading.Thread(
+                target=lambda: trees.append(cache.tree(str(f), "python")[1])
+            )
+            worker.start()
+            worker.join()
+
+        assert trees[0] is not trees[1]
+        assert cache.stats()["hits"] == 1
+
+    def test_clear_drops_trees(self, tmp_path):
+        f = tmp_path / "a.py"
+        f.write_text("x = 1\n")
+        cache = FileCache()
+        parser = MagicMock()
+        parser.parse.side_effect = lambda data: object()
+
+        with patch("cocosearch.ts_parsers.get_parser", return_value=parser):
+            cache.tree(str(f), "python")
+            cache.clear()
+            cache.tree(str(f), "python")
+
+        assert parser.parse.call_count == 2
+
+    def test_unreadable_file(self, tmp_path):
+        assert FileCache().tree(str(tmp_path / "missing.py"), "python") is None
+
+
+class TestGetFileCache:
+    def test_singleton(self):
+        assert get_file_cache() is get_file_cache()
@@ -1,9 +1,19 @@
 """Tests for hybrid search definition boost functionality."""
 
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from cocosearch.indexer.embedder import add_filename_context
+from cocosearch.indexer.embedding_cache import hash_embedding_input
 from cocosearch.search.hybrid import (
     HybridSearchResult,
     apply_definition_boost,
+    build_fused_query,
+    build_vector_query,
+    hybrid_search_async,
 )
+from cocosearch.search.query_analyzer import normalize_query_for_keyword
 
 
 class TestApplyDefinitionBoost:
@@ -187,3 +197,281 @@ class TestApplyDefinitionBoost:
         assert result.symbol_type == "method"
         assert result.symbol_name == "Foo.bar"
         assert result.symbol_signature == "def bar(self, x: int) -> str"
+
+
+class TestBuildVectorQuery:
+    """Tests for build_vector_query."""
+
+    EMB = [0.1, 0.2]
+    COLS = " a, 1 - (embedding <=> %s::vector) AS score"
+
+    @staticmethod
+    def _layout(mocker, params=None, dimension=None):
+        mocker.patch(
+            "cocosearch.search.hybrid.get_vector_index_params", return_value=params
+        )
+        mocker.patch(
+            "cocosearch.search.hybrid.get_embedding_dimension", return_value=dimension
+        )
+
+    def test_plain_index_queries_directly(self, mocker):
+        """Without quantization the query orders by the full vector only."""
+        self._layout(mocker)
+
+        sql, params = build_vector_query(
+            "tbl", self.COLS, "WHERE x = %s", ["v"], self.EMB, 5
+        )
+
+        assert "candidates" not in sql
+        assert "ORDER BY embedding <=> %s::vector" in sql
+        assert params == [self.EMB, "v", self.EMB, 5]
+
+    def test_halfvec_index_oversamples_and_reranks(self, mocker):
+        """A halfvec index is scanned for 2x candidates, re-ranked exactly."""
+        self._layout(mocker, {"method": "hnsw", "quantization": "halfvec", "dim": 768})
+
+        sql, params = build_vector_query("tbl", self.COLS, "", [], self.EMB, 5)
+
+        assert (
+            "ORDER BY (embedding)::halfvec(768) <=> (%s::vector)::halfvec(768)" in sql
+        )
+        assert ") AS candidates" in sql
+        assert sql.rstrip().endswith("LIMIT %s")
+        assert params == [self.EMB, self.EMB, 10, self.EMB, 5]
+
+    def test_binary_index_uses_hamming_distance(self, mocker):
+        """A binary index is scanned by Hamming distance with 10x oversampling."""
+        self._layout(mocker, {"method": "hnsw", "quantization": "binary", "dim": 1024})
+
+        sql, params = build_vector_query("tbl", self.COLS, "", [], self.EMB, 3)
+
+        assert "binary_quantize(embedding)::bit(1024) <~>" in sql
+        assert params[-3:] == [30, self.EMB, 3]
+
+    def test_truncated_index_gets_truncated_query(self, mocker):
+        """The query vector is cut to the column dimension and re-normalized."""
+        self._layout(mocker, dimension=2)
+        mocker.patch.dict("os.environ", {}, clear=True)
+
+        sql, params = build_vector_query("tbl", self.COLS, "", [], [3.0, 4.0, 12.0], 5)
+
+        assert "candidates" not in sql
+        assert params == [[0.6, 0.8], [0.6, 0.8], 5]
+
+    def test_full_dimension_rerank_uses_cached_vectors(self, mocker):
+        """Candidates are re-ranked by cached full vectors when all have one."""
+        self._layout(mocker, dimension=2)
+        mocker.patch.dict(
+            "os.environ",
+            {
+                "COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK": "true",
+                "COCOSEARCH_EMBEDDING_PROVIDER": "ollama",
+                "COCOSEARCH_EMBEDDING_MODEL": "nomic-embed-text",
+            },
+            clear=True,
+        )
+        full = [3.0, 4.0, 12.0]
+
+        sql, params = build_vector_query("tbl", self.COLS, "", [], full, 5)
+
+        assert "FROM cocosearch_embedding_cache AS cache" in sql
+        distance = (
+            "CASE WHEN all_full THEN full_distance ELSE embedding <=> %s::vector END"
+        )
+        assert "bool_and(full_distance IS NOT NULL) OVER () AS all_full" in sql
+        assert f"1 - ({distance}) AS score" in sql
+        assert f"ORDER BY {distance}" in sql
+        assert params == [
+            [0.6, 0.8],
+            full,
+            "ollama",
+            "nomic-embed-text",
+            0,
+            "File: ",
+            "\n",
+            [0.6, 0.8],
+            20,
+            [0.6, 0.8],
+            5,
+        ]
+
+    def test_full_dimension_rerank_key_matches_embedding_cache(self, mocker):
+        """The SQL rebuilds the exact input the embedding cache was keyed by."""
+        self._layout(mocker, dimension=2)
+        mocker.patch.dict(
+            "os.environ", {"COCOSEARCH_EMBEDDING_FULL_DIMENSION_RERANK": "true"}
+        )
+        sql, params = build_vector_query("tbl", self.COLS, "", [], [3.0, 4.0, 1.0], 5)
+
+        concat = "%s::text || coarse.filename || %s::text || coarse.content_text"
+        assert concat in sql
+        first = sql[: sql.index(concat)].count("%s")
+        prefix, separator = params[first], params[first + 1]
+        filename, text = "src/app/main.py", "def main():\n    return 0\n"
+
+        assert hash_embedding_input(
+            prefix + filename + separator + text
+        ) == hash_embedding_input(add_filename_context(text, filename))
+
+
+class TestBuildFusedQuery:
+    """Tests for build_fused_query."""
+
+    EMB = [0.1, 0.2]
+
+    def _build(self, mocker, include_symbol_columns, include_line_columns=False):
+        mocker.patch(
+            "cocosearch.search.hybrid.get_vector_index_params", return_value=None
+        )
+        mocker.patch(
+            "cocosearch.search.hybrid.get_embedding_dimension", return_value=None
+        )
+        return build_fused_query(
+            "getUserById",
+            "tbl",
+            5,
+            "language_id = %s",
+            ["python"],
+            self.EMB,
+            include_symbol_columns,
+            10,
+            include_line_columns,
+        )
+
+    def test_single_statement_with_both_ctes(self, mocker):
+        """Vector and keyword CTEs are fused by a FULL OUTER JOIN on location."""
+        sql, params = self._build(mocker, include_symbol_columns=True)
+
+        assert "WITH vector AS" in sql
+        assert "keyword AS" in sql
+        assert "FULL OUTER JOIN keyword_ranked" in sql
+        assert "CASE WHEN symbol_type IS NOT NULL THEN %s ELSE 1 END" in sql
+        assert sql.count("%s") == len(params)
+        assert params[:4] == [self.EMB, "python", self.EMB, 10]
+        keyword = normalize_query_for_keyword("getUserById")
+        assert params[4:] == [keyword, keyword, "python", 10, 60, 60, 2.0, 5, 5]
+
+    def test_no_boost_without_symbol_columns(self, mocker):
+        """Pre-symbol indexes are fused without the definition boost."""
+        sql, params = self._build(mocker, include_symbol_columns=False)
+
+        assert "symbol_type" not in sql
+        assert 2.0 not in params
+        assert sql.count("%s") == len(params)
+
+    def test_line_columns_from_either_leg(self, mocker):
+        """Keyword-only matches carry their own lines and text."""
+        sql, params = self._build(
+            mocker, include_symbol_columns=True, include_line_columns=True
+        )
+
+        assert "COALESCE(v.start_line, k.start_line) AS start_line" in sql
+        assert "COALESCE(v.content_text, k.content_text) AS content_text" in sql
+        assert "symbol_signature, start_line, end_line, content_text" in sql
+        assert sql.count("%s") == len(params)
+
+
+def _async_pool(*row_batches):
+    """Async pool mock whose successive queries return ``row_batches``."""
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.fetchall = AsyncMock(side_effect=list(row_batches))
+    cursor.__aenter__.return_value = cursor
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    conn.__aenter__.return_value = conn
+    pool = MagicMock()
+    pool.connection.return_value = conn
+    return pool, cursor
+
+
+class TestHybridSearchAsync:
+    """Tests for hybrid_search_async."""
+
+    @pytest.fixture(autouse=True)
+    def _schema(self, mocker):
+        mocker.patch(
+            "cocosearch.search.hybrid.get_vector_index_params", return_value=None
+        )
+        mocker.patch(
+            "cocosearch.search.hybrid.get_embedding_dimension", return_value=None
+        )
+        mocker.patch(
+            "cocosearch.search.hybrid.check_symbol_columns_exist", return_value=False
+        )
+        self.embed = mocker.patch(
+            "cocosearch.search.hybrid.embed_query_async",
+            new_callable=AsyncMock,
+            return_value=[0.1, 0.2],
+        )
+
+    def _use_pool(self, mocker, pool):
+        mocker.patch(
+            "cocosearch.search.hybrid.get_async_connection_pool",
+            new_callable=AsyncMock,
+            return_value=pool,
+        )
+
+    @pytest.mark.asyncio
+    async def test_fused_statement_on_async_pool(self, mocker):
+        """With a keyword column the fused statement is awaited once."""
+        mocker.patch("cocosearch.search.hybrid.check_column_exists", return_value=True)
+        pool, cursor = _async_pool([("a.py", 0, 10, 0.03, 0.9, 0.5, "", "", "py")])
+        self._use_pool(mocker, pool)
+
+        results = await hybrid_search_async("getUserById", "testindex", limit=5)
+
+        self.embed.assert_awaited_once_with("getUserById")
+        assert cursor.execute.await_count == 1
+        assert "FULL OUTER JOIN" in cursor.execute.await_args.args[0]
+        assert [(r.filename, r.match_type) for r in results] == [("a.py", "both")]
+
+    @pytest.mark.asyncio
+    async def test_legs_run_separately_when_fused_statement_fails(self, mocker):
+        """A failing fused statement falls back to concurrent vector/keyword legs."""
+        mocker.patch("cocosearch.search.hybrid.check_column_exists", return_value=True)
+        pool, cursor = _async_pool(
+            RuntimeError("fused failed"),
+            [("a.py", 0, 10, 0.9, "", "", "py")],
+            [("b.py", 0, 10, 0.4)],
+        )
+        self._use_pool(mocker, pool)
+
+        results = await hybrid_search_async(
+            "getUserById", "testindex", limit=5, query_embedding=[0.3, 0.4]
+        )
+
+        self.embed.assert_not_awaited()
+        assert cursor.execute.await_count == 3
+        assert {r.filename for r in results} == {"a.py", "b.py"}
+
+    @pytest.mark.asyncio
+    async def test_fused_rows_carry_stored_lines(self, mocker):
+        """Indexes with line columns return lines and text with each result."""
+        mocker.patch("cocosearch.search.hybrid.check_column_exists", return_value=True)
+        mocker.patch(
+            "cocosearch.search.hybrid.check_line_columns_exist", return_value=True
+        )
+        pool, _cursor = _async_pool(
+            [("a.py", 0, 10, 0.03, None, 0.5, "", "", "py", 4, 6, "x = 1", 2, 8)]
+        )
+        self._use_pool(mocker, pool)
+
+        results = await hybrid_search_async("getUserById", "testindex", limit=5)
+
+        assert results[0].match_type == "keyword"
+        assert (results[0].start_line, results[0].end_line) == (4, 6)
+        assert results[0].content == "x = 1"
+        assert (results[0].scope_start_line, results[0].scope_end_line) == (2, 8)
+
+    @pytest.mark.asyncio
+    async def test_vector_only_without_keyword_column(self, mocker):
+        """Pre-hybrid indexes run only the vector query."""
+        mocker.patch("cocosearch.search.hybrid.check_column_exists", return_value=False)
+        pool, cursor = _async_pool([("a.py", 0, 10, 0.9, "", "", "py")])
+        self._use_pool(mocker, pool)
+
+        results = await hybrid_search_async("getUserById", "testindex", limit=5)
+
+        assert cursor.execute.await_count == 1
+        assert [(r.filename, r.match_type) for r in results] == [("a.py", "semantic")]
@@ -0,0 +1,237 @@
+"""Unit tests for cross-process cache invalidation."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from cocosearch.search import invalidation
+from cocosearch.search.invalidation import (
+    INDEX_CHANGED_CHANNEL,
+    IndexChangeListener,
+    forget_index,
+    is_listening,
+    notify_index_changed,
+)
+
+
+def _listener():
+    changed = []
+    listener = IndexChangeListener(
+        conninfo="postgresql://test", on_change=changed.append
+    )
+    return listener, changed
+
+
+def _metadata_conn(rows):
+    conn = MagicMock()
+    conn.execute.return_value.fetchall.return_value = rows
+    return conn
+
+
+class TestNotifyIndexChanged:
+    def test_sends_index_and_generation(self):
+        cur = MagicMock()
+
+        notify_index_changed(cur, "myindex", 3)
+
+        cur.execute.assert_called_once_with(
+            "SELECT pg_notify(%s, %s)",
+            (INDEX_CHANGED_CHANNEL, '{"index": "myindex", "generation": 3}'),
+        )
+
+
+class TestIndexChangeListener:
+    def test_notification_invalidates_index(self):
+        listener, changed = _listener()
+        listener._resync(_metadata_conn([("myindex", 1)]))
+
+        listener._handle('{"index": "myindex", "generation": 2}')
+
+        assert changed == ["myindex"]
+
+    def test_already_seen_generation_ignored(self):
+        listener, changed = _listener()
+        listener._resync(_metadata_conn([("myindex", 2)]))
+
+        listener._handle('{"index": "myindex", "generation": 2}')
+        listener._handle('{"index": "myindex", "generation": 3}')
+        listener._handle('{"index": "myindex", "generation": 3}')
+
+        assert changed == ["myindex"]
+
+    def test_deletion_invalidates(self):
+        listener, changed = _listener()
+        listener._resync(_metadata_conn([("myindex", 5)]))
+
+        listener._handle('{"index": "myindex", "generation": null}')
+        # Re-created index starts counting again
+        listener._handle('{"index": "myindex", "generation": 1}')
+
+        assert changed == ["myindex", "myindex"]
+
+    def test_malformed_payload_ignored(self):
+        listener, changed = _listener()
+        listener._resync(_metadata_conn([]))
+
+        listener._handle("not json")
+        listener._handle('{"generation": 1}')
+
+        assert changed == []
+
+    def test_callback_errors_do_not_propagate(self):
+        listener = IndexChangeListener(
+            conninfo="postgresql://test", on_change=MagicMock(side_effect=RuntimeError)
+        )
+        listener._resync(_metadata_conn([]))
+
+        listener._handle('{"index": "myindex", "generation": 1}')
+
+    def test_first_connection_only_records_generations(self):
+        listener, changed = _listener()
+
+        listener._resync(_metadata_conn([("a", 1), ("b", 1)]))
+
+        assert changed == []
+
+    def test_reconnect_catches_up_on_missed_changes(self):
+        listener, changed = _listener()
+        listener._resync(_metadata_conn([("a", 1), ("b", 1), ("c", 1)]))
+
+        listener._resync(_metadata_conn([("a", 1), ("b", 2), ("d", 1)]))
+
+        assert sorted(changed) == ["b", "c", "d"]
+
+    def test_missing_metadata_table(self):
+        listener, changed = _listener()
+        conn = MagicMock()
+        conn.execute.side_effect = Exception("relation does not exist")
+
+        listener._resync(conn)
+
+        assert listener._generations == {}
+
+    def test_listens_and_dispatches_notifications(self):
+        listener, changed = _listener()
+        conn = _metadata_conn([("myindex", 1)])
+        conn.__enter__.return_value = conn
+        notify = MagicMock(payload='{"index": "myindex", "generation": 2}')
+
+        def notifies(timeout):
+            assert listener.connected
+            listener._stop.set()
+            return iter([notify])
+
+        conn.notifies.side_effect = notifies
+
+        with patch("cocosearch.search.invalidation.psycopg.connect", return_value=conn):
+            listener._run()
+
+        conn.execute.assert_any_call(f"LISTEN {INDEX_CHANGED_CHANNEL}")
+        assert changed == ["myindex"]
+        assert not listener.connected
+
+    def test_connection_failure_retries_until_stopped(self):
+        listener, _changed = _listener()
+        attempts = []
+
+        def connect(*args, **kwargs):
+            attempts.append(1)
+            if len(attempts) == 2:
+                listener._stop.set()
+            raise OSError("connection refused")
+
+        with (
+            patch(
+                "cocosearch.search.invalidation.psycopg.connect", side_effect=connect
+            ),
+            patch.object(invalidation, "_RECONNECT_DELAY", 0.0),
+        ):
+            listener._run()
+
+        assert len(attempts) == 2
+
+    def test_start_and_stop(self):
+        listener, _changed = _listener()
+        started = threading.Event()
+
+        def run():
+            started.set()
+            listener._stop.wait()
+
+        with patch.object(listener, "_run", run):
+            listener.start()
+            assert started.wait(1.0)
+            listener.stop()
+
+        assert listener._thread is None
+
+
+class TestForgetIndex:
+    def test_drops_cached_results_and_table_state(self):
+        import cocosearch.search.db as db_module
+        import cocosearch.search.query as query_module
+        from cocosearch.search.cache import get_query_cache
+
+        table = db_module.get_table_name("myindex")
+        db_module._symbol_columns_available[table] = False
+        db_module._vector_index_params[table] = (0.0, {"method": "hnsw"}, 256)
+        query_module._has_content_text_column = False
+        get_query_cache().put(
+            query="auth",
+            index_name="myindex",
+            limit=10,
+            min_score=0.0,
+            language_filter=None,
+            use_hybrid=None,
+            symbol_type=None,
+            symbol_name=None,
+            results=[{"file": "a.py"}],
+        )
+
+        forget_index("myindex")
+
+        assert table not in db_module._symbol_columns_available
+        assert table not in db_module._vector_index_params
+        assert query_module._has_content_text_column is True
+        cached, _ = get_query_cache().get(
+            query="auth",
+            index_name="myindex",
+            limit=10,
+            min_score=0.0,
+            language_filter=None,
+            use_hybrid=None,
+            symbol_type=None,
+            symbol_name=None,
+        )
+        assert cached is None
+
+    def test_drops_dependency_graph(self):
+        from cocosearch.deps import graph as graph_module
+        from cocosearch.deps.graph import DependencyGraph
+
+        graph_module._graphs["myindex"] = (0.0, DependencyGraph([]))
+
+        forget_index("myindex")
+
+        assert "myindex" not in graph_module._graphs
+
+
+class TestIsListening:
+    def test_false_without_listener(self):
+        assert is_listening() is False
+
+    def test_follows_connection_state(self):
+        listener, _changed = _listener()
+        with patch.object(invalidation, "_listener", listener):
+            assert is_listening() is False
+            listener._connected.set()
+            assert is_listening() is True
+
+    def test_cached_vector_layout_kept_while_listening(self):
+        import cocosearch.search.db as db_module
+
+        db_module._vector_index_params["t"] = (-1e9, {"method": "hnsw"}, 256)
+        try:
+            with patch.object(invalidation, "is_listening", return_value=True):
+                assert db_module.get_vector_index_params("t") == {"method": "hnsw"}
+        finally:
+            db_module.reset_vector_index_cache()
@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
-from cocosearch.search.multi import multi_search
+from cocosearch.search.multi import multi_search, multi_search_async
 from cocosearch.search.query import SearchResult
 
 
@@ -246,3 +246,61 @@ class TestMultiSearchRewrite:
                 multi_search("test query", ["repo_a"])
 
         assert mock_search.call_args.kwargs["_skip_rewrite"] is True
+
+
+@pytest.fixture
+def mock_async_embedding():
+    with patch(
+        "cocosearch.search.multi.embed_query_async", return_value=[0.1] * 768
+    ) as m:
+        yield m
+
+
+class TestMultiSearchAsync:
+    @pytest.mark.asyncio
+    async def test_merged_and_tagged(
+        self, mock_list_indexes, mock_metadata, mock_async_embedding
+    ):
+        async def fake_search(**kwargs):
+            if kwargs["index_name"] == "repo_a":
+                return [_make_result("file_a1.py", 0.6)]
+            return [_make_result("file_b1.py", 0.9)]
+
+        with patch(
+            "cocosearch.search.multi.search_async", side_effect=fake_search
+        ) as mock_search:
+            results = await multi_search_async("test query", ["repo_a", "repo_b"])
+
+        assert [(r.filename, r.index_name) for r in results] == [
+            ("file_b1.py", "repo_b"),
+            ("file_a1.py", "repo_a"),
+        ]
+        mock_async_embedding.assert_awaited_once_with("test query")
+        for call in mock_search.call_args_list:
+            assert call.kwargs["query_embedding"] == [0.1] * 768
+            assert call.kwargs["_skip_rewrite"] is True
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_returns_successful_results(
+        self, mock_list_indexes, mock_metadata, mock_async_embedding
+    ):
+        async def fake_search(**kwargs):
+            if kwargs["index_name"] == "repo_a":
+                raise RuntimeError("connection lost")
+            return [_make_result("file_b1.py", 0.8)]
+
+        with patch("cocosearch.search.multi.search_async", side_effect=fake_search):
+            results = await multi_search_async("test query", ["repo_a", "repo_b"])
+
+        assert [r.filename for r in results] == ["file_b1.py"]
+
+    @pytest.mark.asyncio
+    async def test_all_indexes_fail_raises_error(
+        self, mock_list_indexes, mock_metadata, mock_async_embedding
+    ):
+        with patch(
+            "cocosearch.search.multi.search_async",
+            side_effect=RuntimeError("connection lost"),
+        ):
+            with pytest.raises(ValueError, match="All index searches failed"):
+                await multi_search_async("test query", ["repo_a", "repo_b"])
@@ -5,13 +5,16 @@ search function with mocked database and embedding calls,
 handler language filtering, alias resolution, and graceful degradation.
 """
 
-from unittest.mock import patch
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from cocosearch.search.hybrid import HybridSearchResult
 from cocosearch.search.query import (
     SearchResult,
     search,
+    search_async,
     get_extension_patterns,
     validate_language_filter,
 )
@@ -375,6 +378,28 @@ class TestSearch:
         assert results[0].hierarchy == "resource.aws_s3_bucket.data"
         assert results[0].language_id == "hcl"
 
+    def test_paraphrase_served_from_semantic_cache(self, mock_db_pool, tmp_path):
+        """A paraphrase with the same filters reuses results without SQL."""
+        from cocosearch.search.cache import QueryCache
+
+        pool, cursor, _conn = mock_db_pool(
+            results=[("/path/file.py", 0, 100, 0.85, "", "", "")]
+        )
+        cache = QueryCache(cache_dir=str(tmp_path))
+        embeddings = {"find auth code": [1.0, 0.0], "locate auth code": [0.99, 0.01]}
+
+        with (
+            patch("cocosearch.search.query.get_query_cache", return_value=cache),
+            patch("cocosearch.search.query.embed_query", side_effect=embeddings.get),
+            patch("cocosearch.search.query.get_connection_pool", return_value=pool),
+        ):
+            first = search(query="find auth code", index_name="testindex")
+            calls = len(cursor.calls)
+            second = search(query="locate auth code", index_name="testindex")
+
+        assert second == first
+        assert len(cursor.calls) == calls
+
 
 class TestHandlerLanguageFilter:
     """Tests for handler language filtering via language_id column."""
@@ -730,6 +755,87 @@ class TestSymbolFilters:
         assert "symbol_signature" not in last_query
 
 
+class TestStoredLines:
+    """Tests for line numbers and chunk text served from the index."""
+
+    def test_lines_and_content_selected_when_stored(
+        self, mock_code_to_embedding, mock_db_pool
+    ):
+        """Indexes with line columns return lines and text with each row."""
+        pool, cursor, _conn = mock_db_pool(
+            results=[
+                ("/path/file.py", 0, 100, 0.85, "", "", "", 3, 9, "def f():", 1, 12),
+            ]
+        )
+
+        with patch("cocosearch.search.query.get_connection_pool", return_value=pool):
+            with patch(
+                "cocosearch.search.query.check_line_columns_exist", return_value=True
+            ):
+                results = search(query="test", index_name="testindex")
+
+        cursor.assert_query_contains(
+            "start_line, end_line, content_text, scope_start_line, scope_end_line"
+        )
+        assert results[0].start_line == 3
+        assert results[0].end_line == 9
+        assert results[0].content == "def f():"
+        assert (results[0].scope_start_line, results[0].scope_end_line) == (1, 12)
+
+    def test_lines_follow_symbol_columns(self, mock_code_to_embedding, mock_db_pool):
+        """Line columns come after the symbol columns in each row."""
+        pool, _cursor, _conn = mock_db_pool(
+            results=[
+                (
+                    "/path/file.py",
+                    0,
+                    100,
+                    0.85,
+                    "",
+                    "",
+                    "",
+                    "function",
+                    "f",
+                    "def f()",
+                    3,
+                    9,
+                    "def f():",
+                    3,
+                    9,
+                ),
+            ]
+        )
+
+        with patch("cocosearch.search.query.get_connection_pool", return_value=pool):
+            with (
+                patch(
+                    "cocosearch.search.query.check_symbol_columns_exist",
+                    return_value=True,
+                ),
+                patch(
+                    "cocosearch.search.query.check_line_columns_exist",
+                    return_value=True,
+                ),
+            ):
+                results = search(query="test", index_name="testindex")
+
+        assert results[0].symbol_name == "f"
+        assert (results[0].start_line, results[0].end_line) == (3, 9)
+
+    def test_older_index_leaves_lines_unset(self, mock_code_to_embedding, mock_db_pool):
+        """Without line columns, results fall back to reading the file."""
+        pool, cursor, _conn = mock_db_pool(
+            results=[("/path/file.py", 0, 100, 0.85, "", "", "")]
+        )
+
+        with patch("cocosearch.search.query.get_connection_pool", return_value=pool):
+            results = search(query="test", index_name="testindex")
+
+        assert "start_line" not in cursor.calls[-1][0]
+        assert results[0].start_line is None
+        assert results[0].content is None
+
+
 # ============================================================================
 # Tests: Dependency enrichment
 # ============================================================================
@@ -765,6 +871,115 @@ def _mock_deps_pool(table_exists=True):
     )()
 
 
+class TestSearchAsync:
+    """Tests for search_async (MCP server path)."""
+
+    @pytest.fixture(autouse=True)
+    def _schema(self, mocker):
+        mocker.patch(
+            "cocosearch.search.query.check_symbol_columns_exist", return_value=False
+        )
+        mocker.patch("cocosearch.search.query.check_column_exists", return_value=True)
+        mocker.patch("cocosearch.search.query.get_vector_index_params")
+        mocker.patch(
+            "cocosearch.search.hybrid.get_vector_index_params", return_value=None
+        )
+        mocker.patch(
+            "cocosearch.search.hybrid.get_embedding_dimension", return_value=None
+        )
+        self.embed = mocker.patch(
+            "cocosearch.search.query.embed_query_async",
+            new_callable=AsyncMock,
+            return_value=[0.1] * 768,
+        )
+
+    @pytest.mark.asyncio
+    async def test_vector_search_on_async_pool(self, mocker):
+        """Vector-only search awaits the embedding and the async pool."""
+        cursor = MagicMock()
+        cursor.execute = AsyncMock()
+        cursor.fetchall = AsyncMock(
+            return_value=[
+                ("/path/a.py", 0, 100, 0.9, "", "", ""),
+                ("/path/b.py", 0, 100, 0.2, "", "", ""),
+            ]
+        )
+        cursor.__aenter__.return_value = cursor
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        conn.__aenter__.return_value = conn
+        pool = MagicMock()
+        pool.connection.return_value = conn
+        mocker.patch(
+            "cocosearch.search.query.get_async_connection_pool",
+            new_callable=AsyncMock,
+            return_value=pool,
+        )
+
+        results = await search_async(
+            query="test query",
+            index_name="testindex",
+            min_score=0.5,
+            use_hybrid=False,
+            no_cache=True,
+        )
+
+        self.embed.assert_awaited_once_with("test query")
+        sql = cursor.execute.await_args.args[0]
+        assert "codeindex_testindex__testindex_chunks" in sql
+        assert [r.filename for r in results] == ["/path/a.py"]
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_delegates_to_async_hybrid(self, mocker):
+        """Identifier queries go through hybrid_search_async."""
+        hybrid = mocker.patch(
+            "cocosearch.search.query.hybrid_search_async",
+            new_callable=AsyncMock,
+            return_value=[
+                HybridSearchResult(
+                    filename="/path/a.py",
+                    start_byte=0,
+                    end_byte=100,
+                    combined_score=0.03,
+                    match_type="both",
+                    vector_score=0.9,
+                    keyword_score=0.5,
+                )
+            ],
+        )
+
+        results = await search_async(
+            query="getUserById", index_name="testindex", no_cache=True
+        )
+
+        hybrid.assert_awaited_once()
+        self.embed.assert_not_awaited()
+        assert results[0].match_type == "both"
+        assert results[0].score == 0.03
+
+    @pytest.mark.asyncio
+    async def test_semantic_cache_lookup_off_event_loop(self, mocker):
+        """The SQLite-backed semantic cache is read in a worker thread."""
+        loop_thread = threading.get_ident()
+        lookup_threads = []
+        cached = [SearchResult("/path/a.py", 0, 100, 0.9)]
+
+        def lookup(plan, query_embedding):
+            lookup_threads.append(threading.get_ident())
+            return cached
+
+        mocker.patch(
+            "cocosearch.search.query._semantic_cache_lookup", side_effect=lookup
+        )
+
+        results = await search_async(
+            query="test query", index_name="testindex", use_hybrid=False
+        )
+
+        assert results is cached
+        assert lookup_threads and lookup_threads[0] != loop_thread
+
+
 class TestDepsEnrichment:
     """Tests for include_deps search enrichment."""
 
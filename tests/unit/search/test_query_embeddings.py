@@ -0,0 +1,178 @@
+"""Unit tests for the query-embedding cache."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cocosearch.search.query_embeddings import (
+    QueryEmbeddingCache,
+    get_query_embedding_cache,
+    normalize_query_text,
+)
+
+KEY = ("ollama", "nomic-embed-text", 0)
+
+
+class TestNormalizeQueryText:
+    def test_collapses_whitespace(self):
+        assert normalize_query_text("  find   auth\n code ") == "find auth code"
+
+    def test_keeps_case(self):
+        assert normalize_query_text("getUserById") == "getUserById"
+
+
+class TestQueryEmbeddingCache:
+    def test_miss_then_hit(self):
+        cache = QueryEmbeddingCache(path=None)
+        assert cache.get(KEY, "auth") is None
+
+        cache.put(KEY, "auth", [0.5, 0.25])
+
+        assert cache.get(KEY, "  auth ") == [0.5, 0.25]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_keyed_by_model_and_dimension(self):
+        cache = QueryEmbeddingCache(path=None)
+        cache.put(KEY, "auth", [0.5])
+
+        assert cache.get(("ollama", "other-model", 0), "auth") is None
+        assert cache.get(("ollama", "nomic-embed-text", 256), "auth") is None
+
+    def test_memory_lru_eviction(self):
+        cache = QueryEmbeddingCache(path=None, max_memory_entries=2)
+        cache.put(KEY, "a", [1.0])
+        cache.put(KEY, "b", [2.0])
+        cache.get(KEY, "a")  # "b" is now least recently used
+        cache.put(KEY, "c", [3.0])
+
+        assert cache.get(KEY, "b") is None
+        assert cache.get(KEY, "a") == [1.0]
+
+    def test_disk_tier_shared_across_instances(self, tmp_path):
+        path = str(tmp_path / "q.db")
+        QueryEmbeddingCache(path=path).put(KEY, "auth", [0.5, 0.25])
+
+        fresh = QueryEmbeddingCache(path=path)
+
+        assert fresh.get(KEY, "auth") == [0.5, 0.25]
+
+    def test_disk_tier_trimmed_to_max_entries(self, tmp_path):
+        path = str(tmp_path / "q.db")
+        cache = QueryEmbeddingCache(path=path, max_disk_entries=10)
+        for i in range(64):
+            cache.put(KEY, f"query {i}", [float(i)])
+
+        fresh = QueryEmbeddingCache(path=path)
+        assert fresh.get(KEY, "query 63") == [63.0]
+        assert fresh.get(KEY, "query 0") is None
+
+    def test_disk_errors_fall_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        cache = QueryEmbeddingCache(path=str(blocker / "q.db"))
+
+        cache.put(KEY, "auth", [0.5])
+
+        assert cache.get(KEY, "auth") == [0.5]
+
+    def test_clear(self, tmp_path):
+        cache = QueryEmbeddingCache(path=str(tmp_path / "q.db"))
+        cache.put(KEY, "auth", [0.5])
+        cache.clear()
+
+        assert cache.get(KEY, "auth") is None
+
+    def test_singleton(self):
+        assert get_query_embedding_cache() is get_query_embedding_cache()
+
+
+class TestEmbedQueryCaching:
+    def _response(self, vector):
+        response = MagicMock()
+        response.data = [{"embedding": vector}]
+        return response
+
+    def test_repeated_query_embedded_once(self):
+        from cocosearch.indexer.embedder import embed_query
+
+        with patch("cocosearch.indexer.embedder.litellm") as mock_litellm:
+            mock_litellm.embedding.return_value = self._response([0.1, 0.2])
+            with patch.dict("os.environ", {}, clear=True):
+                first = embed_query("find auth code")
+                second = embed_query("find  auth code")
+
+        assert first == second == [0.1, 0.2]
+        mock_litellm.embedding.assert_called_once()
+
+    def test_model_change_misses(self):
+        from cocosearch.indexer.embedder import embed_query
+
+        with patch("cocosearch.indexer.embedder.litellm") as mock_litellm:
+            mock_litellm.embedding.return_value = self._response([0.1])
+            with patch.dict("os.environ", {}, clear=True):
+                embed_query("auth")
+            with patch.dict(
+                "os.environ", {"COCOSEARCH_EMBEDDING_MODEL": "other"}, clear=True
+            ):
+                embed_query("auth")
+
+        assert mock_litellm.embedding.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_shares_cache(self):
+        from cocosearch.indexer.embedder import embed_query, embed_query_async
+
+        with patch("cocosearch.indexer.embedder.litellm") as mock_litellm:
+            mock_litellm.embedding.return_value = self._response([0.1])
+            mock_litellm.aembedding = AsyncMock()
+            with patch.dict("os.environ", {}, clear=True):
+                embed_query("auth")
+                result = await embed_query_async("auth")
+
+        assert result == [0.1]
+        mock_litellm.aembedding.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_async_disk_tier_keeps_loop_responsive(self):
+        """A disk tier stuck on a SQLite lock does not stall the event loop."""
+        from cocosearch.indexer.embedder import embed_query_async
+
+        cache = QueryEmbeddingCache(path=None)
+        release = threading.Event()
+
+        def blocked_get_disk(key, text):
+            release.wait(timeout=5)
+            return [0.3]
+
+        with (
+            patch.object(cache, "get_disk", side_effect=blocked_get_disk),
+            patch(
+                "cocosearch.indexer.embedder._query_embedding_cache",
+                return_value=(cache, KEY),
+            ),
+        ):
+            task = asyncio.create_task(embed_query_async("auth"))
+            await asyncio.sleep(0.05)
+            assert not task.done()  # the loop ran on while the lookup waits
+            release.set()
+            assert await task == [0.3]
+
+    @pytest.mark.asyncio
+    async def test_async_memory_hit_skips_disk(self):
+        from cocosearch.indexer.embedder import embed_query_async
+
+        cache = QueryEmbeddingCache(path=None)
+        cache.remember(KEY, "auth", [0.4])
+
+        with (
+            patch.object(cache, "get_disk") as get_disk,
+            patch(
+                "cocosearch.indexer.embedder._query_embedding_cache",
+                return_value=(cache, KEY),
+            ),
+        ):
+            assert await embed_query_async("auth") == [0.4]
+
+        get_disk.assert_not_called()
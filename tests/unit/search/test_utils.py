@@ -105,3 +105,13 @@ class TestReadChunkContent:
 
         result = read_chunk_content(str(test_file), 0, len(content))
         assert result == content
+
+    def test_rereads_modified_file(self, tmp_path):
+        """Cached content should not outlive an edit to the file."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text("old")
+        assert read_chunk_content(str(test_file), 0, 3) == "old"
+
+        test_file.write_text("newer")
+
+        assert read_chunk_content(str(test_file), 0, 5) == "newer"
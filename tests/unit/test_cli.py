@@ -275,6 +275,28 @@ class TestIndexCommand:
         assert final_call.args == ("testindex", "indexed")
         assert final_call.kwargs.get("update_timestamp") is True
 
+    def test_workers_sets_chunk_processes(self, capsys, tmp_codebase):
+        """--workers N runs the chunk stage in N processes."""
+        with (
+            patch("cocosearch.cli.run_index") as mock_run,
+            patch("cocosearch.cli.IndexingProgress"),
+            patch("cocosearch.cli.register_index_path"),
+        ):
+            mock_run.return_value = MagicMock(stats={"files": {"num_insertions": 1}})
+            args = argparse.Namespace(
+                path=str(tmp_codebase),
+                name="testindex",
+                include=None,
+                exclude=None,
+                no_gitignore=False,
+                fresh=False,
+                workers=4,
+            )
+            result = index_command(args)
+
+        assert result == 0
+        assert mock_run.call_args.kwargs["config"].chunk_processes == 4
+
 
 class TestSearchCommand:
     """Tests for search_command."""
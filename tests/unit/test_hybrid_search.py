@@ -2,6 +2,8 @@
 
 from unittest.mock import patch
 
+import pytest
+
 from cocosearch.search.hybrid import (
     KeywordResult,
     VectorResult,
@@ -244,6 +246,12 @@ class TestExecuteKeywordSearch:
 class TestHybridSearch:
     """Tests for hybrid_search function."""
 
+    @pytest.fixture(autouse=True)
+    def _plain_vector_layout(self):
+        """Keep the vector index lookup from consuming canned rows."""
+        with patch("cocosearch.search.db._vector_layout", return_value=(None, None)):
+            yield
+
     def test_hybrid_search_returns_semantic_only_when_no_keywords(self, mock_db_pool):
         """Test fallback to semantic-only when keyword search returns nothing."""
         vector_results = [
@@ -276,24 +284,23 @@ class TestHybridSearch:
         assert results[0].keyword_score is None
 
     def test_hybrid_search_fuses_when_both_available(self, mock_db_pool):
-        """Test that hybrid search fuses results when both are available."""
-        # Setup mock to return different results for vector and keyword queries
-        call_count = [0]
-        vector_results = [
-            ("/path/vector.py", 0, 100, 0.9, "function", "main", "python"),
-        ]
-        keyword_results = [
-            ("/path/keyword.py", 0, 100, 0.5),
+        """With a keyword column both searches are fused in one statement."""
+        fused_rows = [
+            (
+                "/path/vector.py",
+                0,
+                100,
+                0.0164,
+                0.9,
+                None,
+                "function",
+                "main",
+                "python",
+            ),
+            ("/path/both.py", 0, 50, 0.0325, 0.8, 0.4, "", "", ""),
+            ("/path/keyword.py", 0, 100, 0.0161, None, 0.5, "", "", ""),
         ]
-
-        def mock_fetchall():
-            call_count[0] += 1
-            if call_count[0] == 1:
-                return vector_results
-            return keyword_results
-
-        pool, cursor, conn = mock_db_pool(results=[])
-        cursor.fetchall = mock_fetchall
+        pool, cursor, conn = mock_db_pool(results=fused_rows)
 
         with patch("cocosearch.search.hybrid.get_connection_pool", return_value=pool):
             with patch("cocosearch.search.db.get_connection_pool", return_value=pool):
@@ -314,8 +321,46 @@ class TestHybridSearch:
                             ):
                                 results = hybrid_search("getUserById", "test_index")
 
-        # Should have results from both sources
-        assert len(results) >= 1
+        assert [r.match_type for r in results] == ["semantic", "both", "keyword"]
+        assert results[1].keyword_score == 0.4
+        fused = [q for q, _ in cursor.calls if "FULL OUTER JOIN" in q]
+        assert len(fused) == 1
+
+    def test_hybrid_search_falls_back_when_fused_query_fails(self, mock_db_pool):
+        """A failing fused statement falls back to separate queries."""
+        vector_rows = [("/path/file.py", 0, 100, 0.9, "", "", "")]
+        pool, cursor, conn = mock_db_pool(results=vector_rows)
+        original_execute = cursor.execute
+
+        def execute(query, params=None):
+            original_execute(query, params)
+            if "FULL OUTER JOIN" in query:
+                raise RuntimeError("syntax error in tsquery")
+
+        cursor.execute = execute
+
+        with patch("cocosearch.search.hybrid.get_connection_pool", return_value=pool):
+            with patch("cocosearch.search.db.get_connection_pool", return_value=pool):
+                with patch(
+                    "cocosearch.search.hybrid.get_table_name", return_value="test_table"
+                ):
+                    with patch(
+                        "cocosearch.search.hybrid.check_column_exists",
+                        return_value=True,
+                    ):
+                        with patch(
+                            "cocosearch.search.hybrid.check_symbol_columns_exist",
+                            return_value=False,
+                        ):
+                            with patch(
+                                "cocosearch.search.hybrid.embed_query",
+                                return_value=[0.1] * 1024,
+                            ) as mock_embed:
+                                results = hybrid_search("test", "test_index")
+
+        assert len(results) == 1
+        assert results[0].match_type == "semantic"
+        mock_embed.assert_called_once()
 
     def test_hybrid_search_respects_limit(self, mock_db_pool):
         """Test that hybrid search respects the limit parameter."""
@@ -6,15 +6,23 @@ fields are stored and the key functions are correctly wired.
 
 import inspect
 
-from cocosearch.indexer.flow import _index_file, run_index
+from cocosearch.indexer.flow import (
+    _embed_chunks,
+    _index_file,
+    _prepare_chunks,
+    _write_chunks,
+    run_index,
+)
+from cocosearch.indexer.writer import CHUNK_COLUMNS
 
 
 class TestIndexFileStructure:
     """Tests for _index_file function structure."""
 
     def test_index_file_stores_all_required_fields(self):
-        """Verify _index_file inserts all fields needed for search."""
-        source = inspect.getsource(_index_file)
+        """Verify the write stage COPYs all fields needed for search."""
+        source = inspect.getsource(_write_chunks)
+        assert "copy_chunk_rows" in source
 
         required_fields = [
             "filename",
@@ -30,41 +38,50 @@ class TestIndexFileStructure:
         ]
 
         for field in required_fields:
-            assert field in source, f"_index_file should store {field} field"
+            assert field in CHUNK_COLUMNS, f"chunk writer should store {field} field"
 
     def test_index_file_uses_add_filename_context(self):
-        """Verify _index_file enriches embedding text with filename context."""
-        source = inspect.getsource(_index_file)
+        """Verify the embed stage enriches embedding text with filename context."""
+        source = inspect.getsource(_embed_chunks)
         assert "add_filename_context" in source
 
     def test_index_file_uses_extract_chunk_metadata(self):
-        """Verify _index_file extracts chunk metadata."""
-        source = inspect.getsource(_index_file)
+        """Verify the chunk stage extracts chunk metadata."""
+        source = inspect.getsource(_prepare_chunks)
         assert "extract_chunk_metadata" in source
 
-    def test_index_file_uses_extract_symbol_metadata(self):
-        """Verify _index_file extracts symbol metadata."""
-        source = inspect.getsource(_index_file)
-        assert "extract_symbol_metadata" in source
+    def test_index_file_extracts_symbols_once_per_file(self):
+        """Verify the chunk stage parses symbols per file and slices per chunk."""
+        source = inspect.getsource(_prepare_chunks)
+        assert "extract_file_symbols" in source
+        assert "symbols_in_range" in source
 
     def test_index_file_uses_tsvector(self):
-        """Verify _index_file generates tsvector input."""
-        source = inspect.getsource(_index_file)
+        """Verify the chunk stage generates tsvector input."""
+        source = inspect.getsource(_prepare_chunks)
         assert "text_to_tsvector_sql" in source
 
     def test_index_file_uses_embed_batch(self):
-        """Verify _index_file uses batched embedding."""
-        source = inspect.getsource(_index_file)
+        """Verify the embed stage uses batched embedding."""
+        source = inspect.getsource(_embed_chunks)
         assert "embed_batch" in source
 
+    def test_index_file_composes_pipeline_stages(self):
+        """Verify _index_file runs the same chunk/embed/write stages as run_index."""
+        source = inspect.getsource(_index_file)
+        assert "_prepare_chunks" in source
+        assert "_embed_chunks" in source
+        assert "_write_chunks" in source
+
 
 class TestRunIndexStructure:
     """Tests for run_index function structure."""
 
     def test_run_index_has_incremental_tracking(self):
-        """Verify run_index uses SHA-256 content hashes for incremental indexing."""
+        """Verify run_index compares content hashes for incremental indexing."""
         source = inspect.getsource(run_index)
-        assert "sha256" in source
+        assert "hash_content" in source
+        assert "hash_algorithm" in source
         assert "content_hash" in source
 
     def test_run_index_handles_deleted_files(self):
@@ -72,6 +89,12 @@ class TestRunIndexStructure:
         source = inspect.getsource(run_index)
         assert "deleted_files" in source
 
+    def test_run_index_uses_pipeline(self):
+        """Verify run_index drives chunk/embed/write through run_pipeline."""
+        source = inspect.getsource(run_index)
+        assert "run_pipeline" in source
+        assert "stop_event" in source
+
     def test_run_index_invalidates_cache(self):
         """Verify run_index invalidates query cache after changes."""
         source = inspect.getsource(run_index)